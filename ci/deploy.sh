@@ -28,7 +28,7 @@ if ! docker compose -f docker-compose.yml -f ci/docker-compose.prod.yml build ng
   echo "   This may be due to network issues pulling base image"
 fi
 # Build other services
-docker compose -f docker-compose.yml -f ci/docker-compose.prod.yml build web celery celery-beat
+docker compose -f docker-compose.yml -f ci/docker-compose.prod.yml build web celery celery-webhooks celery-beat
 
 # Rolling deployment with automatic rollback strategy
 echo "🔄 Starting rolling deployment with automatic rollback..."
@@ -266,6 +266,10 @@ fi
 echo "🗑️ Clearing Django cache (preserving unique-visitor counts)..."
 docker compose -f docker-compose.yml -f ci/docker-compose.prod.yml exec -T web python manage.py clear_cache_preserve_uniques || true
 
+# Step 6.1: Pre-render the shared tool page fragments (every tool x language)
+echo "🔥 Warming tool page fragments..."
+docker compose -f docker-compose.yml -f ci/docker-compose.prod.yml exec -T web python manage.py warm_tool_pages || echo "⚠️ Tool page warm failed (non-critical)"
+
 # Step 6.5: Clear Cloudflare cache (optional - requires CLOUDFLARE_API_TOKEN and CLOUDFLARE_ZONE_ID secrets)
 if [ -n "${CLOUDFLARE_API_TOKEN:-}" ] && [ -n "${CLOUDFLARE_ZONE_ID:-}" ]; then
   echo "☁️ Purging Cloudflare cache..."
@@ -331,7 +335,7 @@ docker compose -f docker-compose.yml -f ci/docker-compose.prod.yml exec -T web p
 
 # Step 7: Restart other services (with rollback on failure)
 echo "🔄 Restarting background workers..."
-if ! docker compose -f docker-compose.yml -f ci/docker-compose.prod.yml up -d --no-deps celery celery-beat; then
+if ! docker compose -f docker-compose.yml -f ci/docker-compose.prod.yml up -d --no-deps celery celery-webhooks celery-beat; then
   echo "⚠️ Failed to restart celery services, but web is healthy - continuing..."
 fi
 
@@ -40,6 +40,7 @@ try:
     from src.tasks import pdf_conversion  # noqa: F401
     from src.tasks import push  # noqa: F401
     from src.tasks import user_cleanup  # noqa: F401
+    from src.tasks import webhooks  # noqa: F401
 
     # Also autodiscover from our custom tasks package
     app.autodiscover_tasks(["src.tasks"])
@@ -70,6 +71,9 @@ try:
             "push.*": {"queue": "default"},
             # Telegram tasks to default queue
             "telegram.*": {"queue": "default"},
+            # API webhook callbacks: own queue and worker, so a slow endpoint
+            # never occupies the conversion worker's slots
+            "webhooks.*": {"queue": "webhooks"},
         },
         # Queue definitions.
         # "fast" queue: PDF-only operations that complete in <15s (compress, split,
@@ -101,6 +105,10 @@ try:
                 "exchange": "default",
                 "routing_key": "default",
             },
+            "webhooks": {
+                "exchange": "webhooks",
+                "routing_key": "webhooks",
+            },
         },
         # Worker settings - optimized for premium priority
         worker_prefetch_multiplier=1,  # Process one task at a time (prevents task hoarding)
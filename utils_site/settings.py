@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 import os
 import sys
+import tempfile
 import warnings
 from importlib import metadata
 from pathlib import Path
@@ -719,6 +720,23 @@ MAX_UPLOAD_SIZE = 50 * 1024 * 1024  # 50 MB
 CONVERSION_TIMEOUT = 600  # 10 minutes (in seconds)
 TEMP_DIR_PREFIX = "convertica_"
 
+# Conversion result cache (src/tasks/result_cache.py). Outputs are keyed by
+# input SHA-256 + operation + params and kept on disk next to async_temp so a
+# hit is hard-linked into the task dir; Redis holds only the index entry.
+# Blobs are evicted least-recently-used once the directory exceeds MAX_MB.
+CONVERSION_RESULT_CACHE_ENABLED = config(
+    "CONVERSION_RESULT_CACHE_ENABLED", default=True, cast=bool
+)
+CONVERSION_RESULT_CACHE_DIR = config(
+    "CONVERSION_RESULT_CACHE_DIR", default=str(MEDIA_ROOT / "result_cache")
+)
+CONVERSION_RESULT_CACHE_MAX_MB = config(
+    "CONVERSION_RESULT_CACHE_MAX_MB", default=2048, cast=int
+)
+CONVERSION_RESULT_CACHE_MAX_ENTRY_MB = config(
+    "CONVERSION_RESULT_CACHE_MAX_ENTRY_MB", default=200, cast=int
+)
+
 # ============================================================================
 # CONVERSION LIMITS - All configurable via environment variables
 # ============================================================================
@@ -731,6 +749,27 @@ HTML_TO_PDF_MAX_CHARS_PREMIUM = config(
     "HTML_TO_PDF_MAX_CHARS_PREMIUM", default=500000, cast=int
 )
 
+# Warm Chromium pool (api/html_convert/browser_pool.py): recycle the per-process
+# browser after this many conversions or once its process tree exceeds the RSS
+# cap, so a leaky page can't grow it unbounded.
+HTML_TO_PDF_BROWSER_MAX_PAGES = config(
+    "HTML_TO_PDF_BROWSER_MAX_PAGES", default=200, cast=int
+)
+HTML_TO_PDF_BROWSER_MAX_RSS_MB = config(
+    "HTML_TO_PDF_BROWSER_MAX_RSS_MB", default=768, cast=int
+)
+
+# Warm LibreOffice listeners (api/libreoffice_pool.py), used for Word/Excel/PPT
+# → PDF only when the unoserver container is unreachable. Listeners start on
+# first fallback, one user profile each, and are restarted after MAX_CONVERSIONS
+# documents. POOL_SIZE=0 disables the pool (straight to the cold subprocess).
+# UNO_PYTHON: interpreter that can `import uno` (empty = auto-detect).
+LIBREOFFICE_POOL_SIZE = config("LIBREOFFICE_POOL_SIZE", default=1, cast=int)
+LIBREOFFICE_POOL_MAX_CONVERSIONS = config(
+    "LIBREOFFICE_POOL_MAX_CONVERSIONS", default=100, cast=int
+)
+LIBREOFFICE_UNO_PYTHON = config("LIBREOFFICE_UNO_PYTHON", default="")
+
 # Text to PDF character limits — ladder: anonymous < registered < premium.
 TEXT_TO_PDF_MAX_CHARS_FREE = config(
     "TEXT_TO_PDF_MAX_CHARS_FREE", default=10000, cast=int
@@ -781,6 +820,12 @@ IMAGE_TO_TEXT_FREE_MAX_BYTES = config(
     "IMAGE_TO_TEXT_FREE_MAX_BYTES", default=3 * 1024 * 1024, cast=int
 )  # 3 MB
 
+# Multi-page OCR (api/ocr_utils.extract_text_from_pdf) renders pages ahead of a
+# thread pool running Tesseract. At most this many pages are rendered-but-not-
+# yet-OCR'd at once, which caps both the temp PNGs on disk and the page bitmaps
+# in RAM regardless of document length (CONVERTICA-59 OOM guard).
+OCR_MAX_INFLIGHT_PAGES = config("OCR_MAX_INFLIGHT_PAGES", default=4, cast=int)
+
 # Absolute hard cap for PDF/Word parsing — defence-in-depth so a malformed or
 # malicious file never reaches PyPDF/fitz/zipfile if it slipped past higher
 # layers. Set above MAX_FILE_SIZE_PREMIUM so legitimate premium files always
@@ -812,6 +857,11 @@ except Exception:  # pragma: no cover - Pillow always present; never fail boot
 # Batch processing limits
 MAX_BATCH_FILES_FREE = config("MAX_BATCH_FILES_FREE", default=1, cast=int)
 MAX_BATCH_FILES_PREMIUM = config("MAX_BATCH_FILES_PREMIUM", default=10, cast=int)
+# Fan a queued batch out as one Celery subtask per file (group/chord) instead of
+# converting the files serially inside one task. Only pays off when several
+# premium-queue worker processes are available to pick the items up in
+# parallel, so it stays opt-in for single-worker deployments.
+BATCH_FANOUT_ENABLED = config("BATCH_FANOUT_ENABLED", default=False, cast=bool)
 
 # Global free-tier daily conversion quota, one shared bucket across ALL tools
 # (enforced by DailyQuotaMiddleware; premium users are unlimited). Calendar-day
@@ -1178,6 +1228,67 @@ CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = "UTC"
 CELERY_ENABLE_UTC = True
 
+# Consent-free page-view counting (frontend.middleware.TrafficCountingMiddleware).
+# Views are buffered in Redis and flushed to Postgres every
+# PAGEVIEW_FLUSH_INTERVAL seconds; disable to write every view directly.
+PAGEVIEW_BUFFER_ENABLED = config("PAGEVIEW_BUFFER_ENABLED", default=True, cast=bool)
+PAGEVIEW_FLUSH_INTERVAL = config("PAGEVIEW_FLUSH_INTERVAL", default=60, cast=int)
+
+# Shared per tool x language render fragments of the tool pages
+# (frontend.tool_page_cache); warmed on deploy by `manage.py warm_tool_pages`.
+TOOL_PAGE_FRAGMENT_CACHE_ENABLED = config(
+    "TOOL_PAGE_FRAGMENT_CACHE_ENABLED", default=True, cast=bool
+)
+TOOL_PAGE_FRAGMENT_TIMEOUT = config(
+    "TOOL_PAGE_FRAGMENT_TIMEOUT", default=7 * 86400, cast=int
+)
+
+# Prebuilt sitemap artifacts (frontend.sitemaps): gzip-precompressed XML
+# written by the maintenance.build_sitemaps task, served with ETag/304.
+SITEMAP_DIR = Path(
+    config(
+        "SITEMAP_DIR",
+        # Keep test runs out of the checkout's media/.
+        default=str(
+            Path(tempfile.gettempdir()) / "convertica-test-sitemaps"
+            if TESTING
+            else MEDIA_ROOT / "sitemaps"
+        ),
+    )
+)
+SITEMAP_MAX_URLS = config("SITEMAP_MAX_URLS", default=10000, cast=int)
+SITEMAP_MAX_BYTES = config("SITEMAP_MAX_BYTES", default=10 * 1024 * 1024, cast=int)
+
+# Queued IndexNow submissions (frontend.indexnow), drained by the
+# maintenance.flush_indexnow_queue beat task with one single-URL GET per URL
+# (INDEXNOW_BATCH_SIZE per round). Only the submit_sitemap_indexnow sweep
+# sends urlList batches. INDEXNOW_ENDPOINT can point at a local stub for
+# testing.
+INDEXNOW_ENDPOINT = config(
+    "INDEXNOW_ENDPOINT", default="https://api.indexnow.org/indexnow"
+)
+INDEXNOW_FLUSH_INTERVAL = config("INDEXNOW_FLUSH_INTERVAL", default=300, cast=int)
+INDEXNOW_BATCH_SIZE = config("INDEXNOW_BATCH_SIZE", default=200, cast=int)
+INDEXNOW_MAX_BATCHES_PER_FLUSH = config(
+    "INDEXNOW_MAX_BATCHES_PER_FLUSH", default=10, cast=int
+)
+INDEXNOW_BACKOFF_BASE = config("INDEXNOW_BACKOFF_BASE", default=60, cast=int)
+INDEXNOW_BACKOFF_MAX = config("INDEXNOW_BACKOFF_MAX", default=6 * 3600, cast=int)
+
+# Outbound API webhook callbacks (api.webhook_delivery): outbox rows sent per
+# destination host with exponential backoff and a per-host circuit breaker.
+WEBHOOK_DISPATCH_INTERVAL = config("WEBHOOK_DISPATCH_INTERVAL", default=30, cast=int)
+WEBHOOK_BATCH_SIZE = config("WEBHOOK_BATCH_SIZE", default=100, cast=int)
+WEBHOOK_MAX_ATTEMPTS = config("WEBHOOK_MAX_ATTEMPTS", default=8, cast=int)
+WEBHOOK_BACKOFF_BASE = config("WEBHOOK_BACKOFF_BASE", default=30, cast=int)
+WEBHOOK_BACKOFF_MAX = config("WEBHOOK_BACKOFF_MAX", default=3600, cast=int)
+WEBHOOK_CIRCUIT_THRESHOLD = config("WEBHOOK_CIRCUIT_THRESHOLD", default=5, cast=int)
+WEBHOOK_CIRCUIT_COOLDOWN = config("WEBHOOK_CIRCUIT_COOLDOWN", default=300, cast=int)
+# Seconds one deliver_host run keeps sending before it hands the rest of the
+# batch to a fresh run (the threads-pool webhook worker can't enforce Celery
+# time limits).
+WEBHOOK_SEND_BUDGET = config("WEBHOOK_SEND_BUDGET", default=240, cast=int)
+
 # Celery Beat Schedule (periodic tasks)
 # NOTE: This configuration takes precedence over celery.py configuration
 CELERY_BEAT_SCHEDULE = {
@@ -1210,6 +1321,12 @@ CELERY_BEAT_SCHEDULE = {
         "task": "maintenance.update_subscription_daily",
         "schedule": 86400,  # Every 24 hours
     },
+    # Move buffered page views (Redis) into PageViewDaily. The interval is
+    # the maximum lag of the traffic numbers in the admin/traffic_stats.
+    "flush-pageviews": {
+        "task": "maintenance.flush_pageviews",
+        "schedule": PAGEVIEW_FLUSH_INTERVAL,
+    },
     # Mark stuck operations as abandoned (but don't delete them).
     # Conversion hard time limit is 8 min, so 60 min ⇒ definitively stuck
     # (e.g. OOM-SIGKILLed worker that never updated the row).
@@ -1218,6 +1335,12 @@ CELERY_BEAT_SCHEDULE = {
         "schedule": 1800,  # Every 30 minutes
         "kwargs": {"max_age_minutes": 60},
     },
+    # Roll settled OperationRun rows into the admin analytics rollups
+    # (incremental; the reports read raw rows only for the last ~2 hours).
+    "rollup-operation-runs": {
+        "task": "maintenance.rollup_operation_runs",
+        "schedule": 900,  # Every 15 minutes
+    },
     # Delete unverified accounts older than 30 days (runs daily)
     "delete-unverified-accounts-daily": {
         "task": "user_cleanup.delete_unverified_accounts",
@@ -1248,6 +1371,26 @@ CELERY_BEAT_SCHEDULE = {
         "task": "maintenance.publish_scheduled_articles",
         "schedule": crontab(minute=10, hour=7),
     },
+    # Rebuild the sitemap artifacts whose inputs changed (article edits made in
+    # the admin). Publishing via the task above triggers a build right away.
+    "build-sitemaps-hourly": {
+        "task": "maintenance.build_sitemaps",
+        "schedule": 3600,
+    },
+    # Submit queued IndexNow URLs (article saves) one single-URL GET each.
+    "flush-indexnow-queue": {
+        "task": "maintenance.flush_indexnow_queue",
+        "schedule": INDEXNOW_FLUSH_INTERVAL,
+    },
+    # Retries and lost kicks of API webhook callbacks, one task per host.
+    "dispatch-webhooks": {
+        "task": "webhooks.dispatch",
+        "schedule": WEBHOOK_DISPATCH_INTERVAL,
+    },
+    "prune-webhook-deliveries-daily": {
+        "task": "webhooks.prune",
+        "schedule": crontab(minute=40, hour=3),
+    },
     # NB: no scheduled IndexNow sweep. Re-submitting all ~735 sitemap URLs every
     # night made Bing Webmaster Tools raise "Avoid IndexNow Batch Mode to prevent
     # excessive server load and potential indexing delays" — the same
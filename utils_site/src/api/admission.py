@@ -0,0 +1,275 @@
+"""
+Request admission: all of a request's rate limits in one Redis call.
+
+A conversion POST used to reach Redis a dozen times before any work started:
+add + incr for the per-IP flood cap, add + incr per django-ratelimit bucket
+and per usage counter, a GET for the daily quota and non-atomic get-then-set
+windows in spam protection. Each layer now describes its limits as ``Limit``
+objects and ``admit()`` evaluates them together in one Lua script. Every
+limit is checked before any is consumed, so a rejected request costs nothing
+and concurrent requests can neither lose increments nor slip past a full
+window.
+
+Kinds of limit:
+
+- ``WINDOW``: at most ``limit`` admissions per fixed window of ``window``
+  seconds, starting at the first admission.
+- ``INTERVAL``: at most one admission per ``window`` seconds.
+- ``CAP``: rejects once the stored count reaches ``limit``; never written
+  here (the daily quota is consumed only after a 2xx response).
+- ``COUNTER``: always incremented, never rejects (usage statistics).
+
+Keys are Django cache keys and counts are stored as plain integers, so
+``cache.get()`` / ``cache.incr()`` elsewhere see the same values. Without
+Redis (tests, the local file cache) the same checks run through the Django
+cache API, atomically per key but not across keys. Any cache failure admits
+the request.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from django.core.cache import cache
+
+from .logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+WINDOW = "window"
+INTERVAL = "interval"
+CAP = "cap"
+COUNTER = "counter"
+
+_RATE_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+# KEYS[i] is limit i; its ARGV triple is (kind, limit, window in ms). Returns
+# {index of the first rejecting limit or 0, then count and PTTL per limit}.
+_ADMIT_LUA = """
+local denied = 0
+local counts = {}
+for i = 1, #KEYS do
+  local kind = ARGV[i * 3 - 2]
+  local limit = tonumber(ARGV[i * 3 - 1])
+  local count
+  if kind == "interval" then
+    count = redis.call("EXISTS", KEYS[i])
+  else
+    count = tonumber(redis.call("GET", KEYS[i]) or "0") or 0
+  end
+  counts[i] = count
+  if denied == 0 and (
+    (kind == "window" and count + 1 > limit)
+    or (kind == "interval" and count > 0)
+    or (kind == "cap" and count >= limit)
+  ) then
+    denied = i
+  end
+end
+local result = {denied}
+for i = 1, #KEYS do
+  local kind = ARGV[i * 3 - 2]
+  local window = tonumber(ARGV[i * 3])
+  if kind == "counter" or (denied == 0 and kind == "window") then
+    counts[i] = redis.call("INCR", KEYS[i])
+    if redis.call("PTTL", KEYS[i]) < 0 then
+      redis.call("PEXPIRE", KEYS[i], window)
+    end
+  elseif denied == 0 and kind == "interval" then
+    redis.call("SET", KEYS[i], 1, "PX", window)
+    counts[i] = 1
+  end
+  result[#result + 1] = counts[i]
+  result[#result + 1] = redis.call("PTTL", KEYS[i])
+end
+return result
+"""
+
+_script = None
+
+
+@dataclass(frozen=True)
+class Limit:
+    """One limit a request must pass. ``window`` is in seconds."""
+
+    name: str
+    key: str
+    limit: int
+    window: int
+    kind: str = WINDOW
+
+    def rejects(self, count: int) -> bool:
+        """Whether ``count`` (the stored value before this request) rejects it."""
+        if self.kind == WINDOW:
+            return count + 1 > self.limit
+        if self.kind == INTERVAL:
+            return count > 0
+        if self.kind == CAP:
+            return count >= self.limit
+        return False
+
+
+@dataclass(frozen=True)
+class LimitState:
+    """A limit's count after admission and the seconds until it resets."""
+
+    limit: Limit
+    count: int
+    reset: int
+
+    @property
+    def remaining(self) -> int:
+        return max(0, self.limit.limit - self.count)
+
+
+@dataclass(frozen=True)
+class Decision:
+    """Outcome of ``admit()``: every limit's state and the one that rejected."""
+
+    states: tuple[LimitState, ...] = ()
+    denied: LimitState | None = None
+
+    @property
+    def allowed(self) -> bool:
+        return self.denied is None
+
+    @property
+    def retry_after(self) -> int:
+        return max(1, self.denied.reset) if self.denied else 0
+
+    def get(self, name: str) -> LimitState | None:
+        return next((s for s in self.states if s.limit.name == name), None)
+
+    def headers(self) -> dict[str, str]:
+        """``X-RateLimit-*`` for the rejecting or tightest window limit.
+
+        ``Retry-After`` is added when the request was rejected.
+        """
+        state = self.denied
+        if state is None:
+            windows = [s for s in self.states if s.limit.kind == WINDOW]
+            state = min(windows, key=lambda s: s.remaining, default=None)
+        if state is None:
+            return {}
+        headers = {}
+        if state.limit.kind == WINDOW:
+            headers = {
+                "X-RateLimit-Limit": str(state.limit.limit),
+                "X-RateLimit-Remaining": str(state.remaining),
+                "X-RateLimit-Reset": str(state.reset),
+            }
+        if self.denied is not None:
+            headers["Retry-After"] = str(self.retry_after)
+        return headers
+
+    def apply_headers(self, response):
+        """Set ``headers()`` on ``response`` without overwriting existing ones."""
+        for name, value in self.headers().items():
+            if not response.has_header(name):
+                response[name] = value
+        return response
+
+
+def parse_rate(rate: str) -> tuple[int, int]:
+    """``"30/h"`` -> ``(30, 3600)``; ``"100/5m"`` -> ``(100, 300)``."""
+    count, _, period = rate.partition("/")
+    multiplier = int(period[:-1]) if period[:-1] else 1
+    return int(count), multiplier * _RATE_UNITS[period[-1]]
+
+
+def _redis():
+    """Raw Redis client behind the default cache, or None if it isn't Redis."""
+    try:
+        from django_redis import get_redis_connection
+
+        return get_redis_connection("default")
+    except Exception:
+        return None
+
+
+def _admit_redis(conn, limits: tuple[Limit, ...]) -> Decision:
+    global _script
+    if _script is None:
+        _script = conn.register_script(_ADMIT_LUA)
+    args = []
+    for limit in limits:
+        args += [limit.kind, limit.limit, limit.window * 1000]
+    reply = _script(
+        keys=[cache.make_key(limit.key) for limit in limits], args=args, client=conn
+    )
+    denied_index = int(reply[0])
+    states = []
+    for i, limit in enumerate(limits):
+        count, ttl_ms = int(reply[1 + i * 2]), int(reply[2 + i * 2])
+        reset = -(-ttl_ms // 1000) if ttl_ms > 0 else limit.window
+        states.append(LimitState(limit, count, reset))
+    denied = states[denied_index - 1] if denied_index else None
+    return Decision(tuple(states), denied)
+
+
+def _incr(key: str, window: int) -> int:
+    cache.add(key, 0, window)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Expired between add and incr: start a new window.
+        cache.add(key, 0, window)
+        return cache.incr(key)
+
+
+def _admit_cache(limits: tuple[Limit, ...]) -> Decision:
+    values = cache.get_many([limit.key for limit in limits])
+    counts = []
+    denied_index = None
+    for i, limit in enumerate(limits):
+        value = values.get(limit.key)
+        if limit.kind == INTERVAL:
+            count = int(value is not None)
+        else:
+            count = value if isinstance(value, int) else 0
+        counts.append(count)
+        if denied_index is None and limit.rejects(count):
+            denied_index = i
+
+    # Intervals first: add(), not set(), so of two racing requests only one
+    # gets through, and the loser consumes no window.
+    for i, limit in enumerate(limits):
+        if denied_index is None and limit.kind == INTERVAL:
+            if not cache.add(limit.key, 1, limit.window):
+                denied_index = i
+            counts[i] = 1
+    for i, limit in enumerate(limits):
+        if limit.kind == COUNTER or (denied_index is None and limit.kind == WINDOW):
+            counts[i] = _incr(limit.key, limit.window)
+
+    # The cache API doesn't expose TTLs; report a full window.
+    states = tuple(
+        LimitState(limit, count, limit.window)
+        for limit, count in zip(limits, counts, strict=True)
+    )
+    denied = states[denied_index] if denied_index is not None else None
+    return Decision(states, denied)
+
+
+def admit(limits: Iterable[Limit]) -> Decision:
+    """Check ``limits`` and consume them only if none rejects.
+
+    Counters are incremented either way. The first rejecting limit, in the
+    given order, is reported as ``Decision.denied``.
+    """
+    limits = tuple(limits)
+    if not limits:
+        return Decision()
+    try:
+        conn = _redis()
+        if conn is not None:
+            return _admit_redis(conn, limits)
+        return _admit_cache(limits)
+    except Exception as e:
+        # Graceful degradation: a cache outage must not take the API down.
+        logger.warning(
+            f"Admission check failed, admitting request: {e}",
+            extra={"event": "admission_error", "limits": [x.name for x in limits]},
+        )
+        return Decision()
@@ -41,6 +41,7 @@ from .conversion_limits import (
 )
 from .logging_utils import build_request_context, get_logger, log_file_validation_error
 from .operation_run_middleware_utils import ensure_request_id, normalize_conversion_type
+from .pdf_info import get_pdf_info
 from .premium_utils import is_premium_active, ocr_premium_gate_message
 from .spam_protection import validate_spam_protection
 from .task_tokens import create_task_token, verify_task_token
@@ -410,6 +411,7 @@ class AsyncConversionAPIView(APIView, ABC):
                 )
 
             # Validate PDF pages if needed
+            pdf_info = None
             if self.VALIDATE_PDF_PAGES and self._is_pdf_file(uploaded_file):
                 # Use stricter limits for heavy operations
                 max_pages = (
@@ -417,11 +419,14 @@ class AsyncConversionAPIView(APIView, ABC):
                     if self.CONVERSION_TYPE in HEAVY_OPERATIONS
                     else self.MAX_PDF_PAGES
                 )
+                # Parsed once here; the task and its converter reuse it.
+                pdf_info = get_pdf_info(input_path)
                 is_valid, error_message, page_count = validate_pdf_pages(
                     input_path,
                     max_pages,
                     user=request.user,
                     operation=self.CONVERSION_TYPE,
+                    pdf_info=pdf_info,
                 )
                 if not is_valid:
                     cleanup_task_files(task_id)
@@ -449,6 +454,7 @@ class AsyncConversionAPIView(APIView, ABC):
                         uploaded_file.size,
                         self.CONVERSION_TYPE,
                         user=request.user,
+                        pdf_info=pdf_info,
                     )
                     if not can_process:
                         cleanup_task_files(task_id)
@@ -514,6 +520,8 @@ class AsyncConversionAPIView(APIView, ABC):
                     "is_premium": is_premium,
                 }
             )
+            if pdf_info is not None:
+                filtered_kwargs["pdf_info"] = pdf_info.to_dict()
 
             # Opt-in "email me the result" (premium): thread the recipient
             # into the task kwargs — the webhook pattern. Silently ignored
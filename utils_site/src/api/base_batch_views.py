@@ -50,6 +50,18 @@ from .premium_utils import (
 logger = get_logger(__name__)
 
 
+def is_removable_cleanup_dir(path: str | None) -> bool:
+    """True if ``path`` is a per-conversion temp dir that is safe to rmtree.
+
+    Some converters (the optimized JPG→PDF path) write their output straight
+    into ``tempfile.gettempdir()``, so ``dirname(output_path)`` is the shared
+    temp root itself; removing that wipes every concurrent job's files.
+    """
+    if not path or not os.path.isdir(path):
+        return False
+    return os.path.realpath(path) != os.path.realpath(tempfile.gettempdir())
+
+
 class BaseBatchAPIView(APIView):
     """Base class for batch conversion views (multiple files → ZIP)."""
 
@@ -273,7 +285,8 @@ class BaseBatchAPIView(APIView):
                     cleanup_dir, output_path = self.convert_single(
                         uploaded_file, context, **params
                     )
-                    tmp_dirs_to_cleanup.add(cleanup_dir)
+                    if is_removable_cleanup_dir(cleanup_dir):
+                        tmp_dirs_to_cleanup.add(cleanup_dir)
                     output_files.append((uploaded_file.name, output_path))
 
                 except Exception as e:
@@ -6,7 +6,6 @@ Reduces code duplication across conversion APIs.
 import asyncio
 import os
 import shutil
-import tempfile
 import time
 import uuid
 from abc import ABC, abstractmethod
@@ -51,6 +50,7 @@ from .logging_utils import (
     log_file_validation_error,
     log_validation_error,
 )
+from .pdf_info import PdfInfo, get_pdf_info_for_upload
 from .premium_utils import is_premium_active
 from .rate_limit_utils import combined_rate_limit
 from .spam_protection import validate_spam_protection
@@ -125,6 +125,9 @@ class BaseConversionAPIView(APIView, ABC):
 
     # PDF page limit (override in subclasses if needed)
     MAX_PDF_PAGES = MAX_PDF_PAGES  # Default from conversion_limits
+    # Parsed metadata of the current request's PDF upload (set during page
+    # validation); subclasses may read it in perform_conversion.
+    pdf_info: PdfInfo | None = None
 
     # Conversion timeout in seconds (override for heavy operations)
     CONVERSION_TIMEOUT = CONVERSION_TIMEOUT
@@ -551,25 +554,18 @@ class BaseConversionAPIView(APIView, ABC):
 
         # Page validation for PDF files
         if self.VALIDATE_PDF_PAGES and self._is_pdf_file(uploaded_file):
-            validation_tmp_dir = tempfile.mkdtemp(prefix="pdf_validate_")
-            try:
-                temp_pdf_path = os.path.join(
-                    validation_tmp_dir,
-                    get_valid_filename(uploaded_file.name),
-                )
-                with open(temp_pdf_path, "wb") as f:
-                    for chunk in uploaded_file.chunks():
-                        f.write(chunk)
-                uploaded_file.seek(0)
-
-                operation = getattr(self, "CONVERSION_TYPE", "").lower()
-                page_validation_error = self.validate_pdf_page_count(
-                    temp_pdf_path, context, user=request.user, operation=operation
-                )
-                if page_validation_error is not None:
-                    return page_validation_error
-            finally:
-                shutil.rmtree(validation_tmp_dir, ignore_errors=True)
+            self.pdf_info = get_pdf_info_for_upload(uploaded_file)
+            context["pdf_sha256"] = self.pdf_info.sha256
+            operation = getattr(self, "CONVERSION_TYPE", "").lower()
+            page_validation_error = self.validate_pdf_page_count(
+                None,
+                context,
+                user=request.user,
+                operation=operation,
+                pdf_info=self.pdf_info,
+            )
+            if page_validation_error is not None:
+                return page_validation_error
 
         tmp_dir = None
         start_time = None
@@ -919,27 +915,23 @@ class BaseConversionAPIView(APIView, ABC):
 
         tmp_dir = None
         start_time = None
-        validation_tmp_dir = None
 
         try:
-            # For PDF operations, validate page count before conversion
+            # For PDF operations, validate page count before conversion. The
+            # upload is parsed once here (no temp copy); converters find the
+            # same PdfInfo by content hash.
             if self.VALIDATE_PDF_PAGES and self._is_pdf_file(uploaded_file):
-                # Save file temporarily to validate page count
-                validation_tmp_dir = tempfile.mkdtemp(prefix="pdf_validate_")
-                temp_pdf_path = os.path.join(
-                    validation_tmp_dir,
-                    get_valid_filename(uploaded_file.name),
-                )
-                with open(temp_pdf_path, "wb") as f:
-                    for chunk in uploaded_file.chunks():
-                        f.write(chunk)
-                # Reset file pointer for later use
-                uploaded_file.seek(0)
+                self.pdf_info = get_pdf_info_for_upload(uploaded_file)
+                context["pdf_sha256"] = self.pdf_info.sha256
 
                 # Validate page count with user context
                 operation = getattr(self, "CONVERSION_TYPE", "").lower()
                 page_validation_error = self.validate_pdf_page_count(
-                    temp_pdf_path, context, user=request.user, operation=operation
+                    None,
+                    context,
+                    user=request.user,
+                    operation=operation,
+                    pdf_info=self.pdf_info,
                 )
                 if page_validation_error is not None:
                     logger.info(
@@ -947,10 +939,6 @@ class BaseConversionAPIView(APIView, ABC):
                     )
                     return page_validation_error
 
-                # Cleanup validation temp dir
-                shutil.rmtree(validation_tmp_dir, ignore_errors=True)
-                validation_tmp_dir = None
-
             # Log conversion start
             start_time = log_conversion_start(logger, self.CONVERSION_TYPE, context)
 
@@ -1029,13 +1017,10 @@ class BaseConversionAPIView(APIView, ABC):
             cleanup_dirs: list[str] = []
             if tmp_dir:
                 cleanup_dirs.append(tmp_dir)
-            if validation_tmp_dir:
-                cleanup_dirs.append(validation_tmp_dir)
             response = self._make_streaming_response(
                 output_path, cleanup_dirs=tuple(cleanup_dirs)
             )
             tmp_dir = None
-            validation_tmp_dir = None
             response["Content-Disposition"] = encode_filename_for_header(
                 output_filename
             )
@@ -1069,8 +1054,6 @@ class BaseConversionAPIView(APIView, ABC):
 
         finally:
             self.cleanup_temp_files(tmp_dir, context)
-            if validation_tmp_dir:
-                shutil.rmtree(validation_tmp_dir, ignore_errors=True)
 
     def _is_pdf_file(self, uploaded_file: UploadedFile) -> bool:
         """Check if the uploaded file is a PDF."""
@@ -1097,15 +1080,21 @@ class BaseConversionAPIView(APIView, ABC):
         return None
 
     def validate_pdf_page_count(
-        self, pdf_path: str, context: dict[str, Any], user=None, operation: str = None
+        self,
+        pdf_path: str | None,
+        context: dict[str, Any],
+        user=None,
+        operation: str = None,
+        pdf_info: PdfInfo | None = None,
     ) -> Response | None:
         """Validate PDF page count doesn't exceed limit.
 
         Args:
-            pdf_path: Path to the PDF file
+            pdf_path: Path to the PDF file (unused when ``pdf_info`` is given)
             context: Logging context
             user: Django user object (optional)
             operation: Type of operation (optional)
+            pdf_info: Already-computed PdfInfo (optional)
 
         Returns:
             Response if validation failed, None if OK
@@ -1114,7 +1103,11 @@ class BaseConversionAPIView(APIView, ABC):
             return None
 
         is_valid, error_message, page_count = validate_pdf_pages(
-            pdf_path, self.MAX_PDF_PAGES, user=user, operation=operation
+            pdf_path,
+            self.MAX_PDF_PAGES,
+            user=user,
+            operation=operation,
+            pdf_info=pdf_info,
         )
 
         context["pdf_page_count"] = page_count
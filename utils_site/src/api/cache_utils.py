@@ -1,8 +1,9 @@
 """
 Cache utilities for PDF operations.
 
-Provides caching for expensive operations like PDF validation,
-page counting, and file size calculations.
+Provides caching for expensive operations like PDF parsing (see
+``pdf_info``) and file hashing. Parsed-PDF data is keyed by content hash:
+uploads land on a fresh temp path per request, so path keys never hit.
 """
 
 import hashlib
@@ -25,87 +26,72 @@ def get_cache_key(prefix: str, *args) -> str:
     return f"{prefix}:{key_hash}"
 
 
-def cache_pdf_page_count(pdf_path: str, page_count: int, timeout: int = 3600) -> None:
-    """Cache PDF page count.
+def cache_file_hash(file_path: str, file_hash: str, timeout: int = 86400) -> None:
+    """Cache file hash (MD5/SHA256).
 
     Args:
-        pdf_path: Path to PDF file
-        page_count: Number of pages
-        timeout: Cache timeout in seconds (default: 1 hour)
+        file_path: Path to file
+        file_hash: File hash
+        timeout: Cache timeout in seconds (default: 24 hours)
     """
-    cache_key = get_cache_key("pdf_pages", pdf_path)
-    cache.set(cache_key, page_count, timeout=timeout)
+    cache_key = get_cache_key("file_hash", file_path)
+    cache.set(cache_key, file_hash, timeout=timeout)
 
 
-def get_cached_pdf_page_count(pdf_path: str) -> int | None:
-    """Get cached PDF page count.
+def get_cached_file_hash(file_path: str) -> str | None:
+    """Get cached file hash.
 
     Args:
-        pdf_path: Path to PDF file
+        file_path: Path to file
 
     Returns:
-        Cached page count or None if not cached
+        Cached file hash or None if not cached
     """
-    cache_key = get_cache_key("pdf_pages", pdf_path)
+    cache_key = get_cache_key("file_hash", file_path)
     return cache.get(cache_key)
 
 
-def cache_pdf_validation(pdf_path: str, is_valid: bool, timeout: int = 3600) -> None:
-    """Cache PDF validation result.
+def cache_pdf_info(sha256: str, info: dict, timeout: int = 3600) -> None:
+    """Cache parsed PDF metadata (``PdfInfo.to_dict()``) by content hash.
 
     Args:
-        pdf_path: Path to PDF file
-        is_valid: Whether PDF is valid
+        sha256: SHA-256 of the PDF bytes
+        info: Serialized PdfInfo
         timeout: Cache timeout in seconds (default: 1 hour)
     """
-    cache_key = get_cache_key("pdf_valid", pdf_path)
-    cache.set(cache_key, is_valid, timeout=timeout)
+    cache.set(get_cache_key("pdf_info", sha256), info, timeout=timeout)
 
 
-def get_cached_pdf_validation(pdf_path: str) -> bool | None:
-    """Get cached PDF validation result.
+def get_cached_pdf_info(sha256: str) -> dict | None:
+    """Get cached PDF metadata by content hash.
 
     Args:
-        pdf_path: Path to PDF file
+        sha256: SHA-256 of the PDF bytes
 
     Returns:
-        Cached validation result or None if not cached
+        Serialized PdfInfo or None if not cached
     """
-    cache_key = get_cache_key("pdf_valid", pdf_path)
-    return cache.get(cache_key)
+    return cache.get(get_cache_key("pdf_info", sha256))
 
 
-def cache_file_hash(file_path: str, file_hash: str, timeout: int = 86400) -> None:
-    """Cache file hash (MD5/SHA256).
+def cache_pdf_tables(sha256: str, pages: dict, timeout: int = 3600) -> None:
+    """Cache the per-page table model (``pdf_tables``) by content hash.
 
     Args:
-        file_path: Path to file
-        file_hash: File hash
-        timeout: Cache timeout in seconds (default: 24 hours)
+        sha256: SHA-256 of the PDF bytes
+        pages: Serialized pages, keyed by 0-based page index
+        timeout: Cache timeout in seconds (default: 1 hour)
     """
-    cache_key = get_cache_key("file_hash", file_path)
-    cache.set(cache_key, file_hash, timeout=timeout)
+    cache.set(get_cache_key("pdf_tables", sha256), pages, timeout=timeout)
 
 
-def get_cached_file_hash(file_path: str) -> str | None:
-    """Get cached file hash.
+def get_cached_pdf_tables(sha256: str) -> dict | None:
+    """Get the cached per-page table model by content hash.
 
     Args:
-        file_path: Path to file
+        sha256: SHA-256 of the PDF bytes
 
     Returns:
-        Cached file hash or None if not cached
-    """
-    cache_key = get_cache_key("file_hash", file_path)
-    return cache.get(cache_key)
-
-
-def invalidate_pdf_cache(pdf_path: str) -> None:
-    """Invalidate all cached data for a PDF file.
-
-    Args:
-        pdf_path: Path to PDF file
+        Serialized pages keyed by page index, or None if not cached
     """
-    cache.delete(get_cache_key("pdf_pages", pdf_path))
-    cache.delete(get_cache_key("pdf_valid", pdf_path))
-    cache.delete(get_cache_key("file_hash", pdf_path))
+    return cache.get(get_cache_key("pdf_tables", sha256))
@@ -7,22 +7,6 @@ from functools import wraps
 from threading import Lock
 from typing import Any
 
-# Use pypdf instead of PyMuPDF for better compatibility
-try:
-    from pypdf import PdfReader
-
-    try:
-        from pypdf.errors import FileNotDecryptedError, PdfReadError
-    except ImportError:
-        FileNotDecryptedError = None
-        PdfReadError = None
-
-    _pypdf_available = True
-except ImportError:
-    FileNotDecryptedError = None
-    PdfReadError = None
-    _pypdf_available = False
-
 try:
     from django.utils.translation import gettext_lazy as _
 except ImportError:
@@ -32,31 +16,11 @@ except ImportError:
 
 
 from .logging_utils import get_logger
+from .pdf_info import PdfInfo, get_pdf_info
 
 logger = get_logger(__name__)
 
 
-def _is_encrypted_pdf_error(exc: Exception) -> bool:
-    """Return True when exception indicates password-protected PDF."""
-    if FileNotDecryptedError is not None and isinstance(exc, FileNotDecryptedError):
-        return True
-
-    if PdfReadError is not None and isinstance(exc, PdfReadError):
-        error_text = str(exc).lower()
-        return (
-            "decrypt" in error_text
-            or "password" in error_text
-            or "encrypted" in error_text
-        )
-
-    error_text = str(exc).lower()
-    return (
-        "not been decrypted" in error_text
-        or "password-protected" in error_text
-        or "password protected" in error_text
-    )
-
-
 # ============================================================================
 # CONVERSION LIMITS - Now read from Django settings (configurable via .env)
 # ============================================================================
@@ -303,7 +267,11 @@ def get_max_pages_for_user(user, operation: str = None) -> int:
 
 
 def validate_pdf_pages(
-    pdf_path: str, max_pages: int = MAX_PDF_PAGES, user=None, operation: str = None
+    pdf_path: str,
+    max_pages: int = MAX_PDF_PAGES,
+    user=None,
+    operation: str = None,
+    pdf_info: PdfInfo | None = None,
 ) -> tuple[bool, str | None, int]:
     """Validate PDF doesn't exceed page limit.
 
@@ -312,19 +280,36 @@ def validate_pdf_pages(
         max_pages: Maximum allowed pages (will be overridden by user limits)
         user: Django user object (optional)
         operation: Type of operation (optional)
+        pdf_info: Already-computed PdfInfo for ``pdf_path`` (optional)
 
     Returns:
         Tuple of (is_valid, error_message, page_count)
     """
     try:
-        if not _pypdf_available:
-            # Fallback if pypdf is not available - allow file but with warning
-            logger.warning("pypdf not available, skipping page count validation")
-            return True, None, 0  # Allow file but can't validate pages
+        if pdf_info is None:
+            pdf_info = get_pdf_info(pdf_path)
+
+        if pdf_info.needs_password:
+            if operation == "unlock_pdf":
+                # Encrypted input is the unlock tool's whole purpose — don't
+                # bounce it here; the view checks the password and fails with
+                # a clear error if it's wrong. Page count can't be read without
+                # the password, so the limit is enforced by timeout instead.
+                logger.info("Encrypted PDF passed to unlock despite page validation")
+                return True, None, 0
+            logger.info("Rejected password-protected PDF during page validation")
+            return (
+                False,
+                _("PDF is password-protected. Please unlock it and try again."),
+                0,
+            )
 
-        with open(pdf_path, "rb") as f:
-            pdf_reader = PdfReader(f)
-            page_count = len(pdf_reader.pages)
+        if pdf_info.error:
+            logger.warning("Failed to validate PDF pages: %s", pdf_info.error)
+            # If we can't read the PDF, let the conversion handle the error
+            return True, None, 0
+
+        page_count = pdf_info.page_count
 
         # Get user-specific limit if user provided
         if user is not None:
@@ -385,31 +370,9 @@ def validate_pdf_pages(
 
         return True, None, page_count
 
-    except Exception as e:
-        if _is_encrypted_pdf_error(e):
-            if operation == "unlock_pdf":
-                # Encrypted input is the unlock tool's whole purpose — don't
-                # bounce it here; the view checks the password and fails with
-                # a clear error if it's wrong. Page count can't be read without
-                # the password, so the limit is enforced by timeout instead.
-                logger.info(
-                    "Encrypted PDF passed to unlock despite page validation: %s", e
-                )
-                return True, None, 0
-            logger.info("Rejected password-protected PDF during page validation: %s", e)
-            return (
-                False,
-                _("PDF is password-protected. Please unlock it and try again."),
-                0,
-            )
-
-        if isinstance(e, ValueError | OSError):
-            logger.warning("Failed to validate PDF pages: %s", e)
-            # If we can't read the PDF, let the conversion handle the error
-            return True, None, 0
-
-        logger.warning("Unexpected PDF validation error: %s", e)
-        # Preserve previous behavior for unknown parser errors.
+    except OSError as e:
+        logger.warning("Failed to validate PDF pages: %s", e)
+        # If we can't read the PDF, let the conversion handle the error
         return True, None, 0
 
 
@@ -423,15 +386,8 @@ def get_pdf_page_count(pdf_path: str) -> int:
         Number of pages, or 0 if unable to read
     """
     try:
-        if not _pypdf_available:
-            # Fallback if pypdf is not available
-            return 0
-
-        with open(pdf_path, "rb") as f:
-            pdf_reader = PdfReader(f)
-            count = len(pdf_reader.pages)
-        return count
-    except Exception:
+        return get_pdf_info(pdf_path).page_count
+    except OSError:
         return 0
 
 
@@ -565,6 +521,7 @@ def validate_file_for_operation(
     file_size: int,
     operation: str,
     user=None,
+    pdf_info: PdfInfo | None = None,
 ) -> tuple[bool, str | None]:
     """Validate if file can be processed for given operation.
 
@@ -574,6 +531,7 @@ def validate_file_for_operation(
         pdf_path: Path to PDF file
         file_size: File size in bytes
         operation: Operation type (e.g., 'pdf_to_word')
+        pdf_info: Already-computed PdfInfo for ``pdf_path`` (optional)
 
     Returns:
         Tuple of (can_process, error_message)
@@ -609,14 +567,12 @@ def validate_file_for_operation(
         max_pages = MAX_PDF_PAGES_HEAVY if is_heavy else MAX_PDF_PAGES
 
     try:
-        if not _pypdf_available:
-            # Fallback if pypdf is not available - allow file but with warning
-            logger.warning("pypdf not available, skipping page count validation")
-            return True, None  # Allow file but can't validate pages
-
-        with open(pdf_path, "rb") as f:
-            pdf_reader = PdfReader(f)
-            page_count = len(pdf_reader.pages)
+        if pdf_info is None:
+            pdf_info = get_pdf_info(pdf_path)
+        if pdf_info.error:
+            logger.warning("Failed to validate PDF for operation: %s", pdf_info.error)
+            return True, None
+        page_count = pdf_info.page_count
 
         # Check page limit
         if page_count > max_pages:
@@ -634,21 +590,9 @@ def validate_file_for_operation(
             )
 
         # For heavy operations, check PDF complexity (images, scans)
-        if is_heavy and page_count > 10:
-            total_images = 0
-            try:
-                import fitz  # PyMuPDF
-
-                with fitz.open(pdf_path) as doc:
-                    for page_index in range(min(page_count, 5)):  # first 5 pages
-                        page = doc[page_index]
-                        image_list = page.get_images(full=False)
-                        total_images += len(image_list)
-            except Exception:
-                total_images = 0  # If detection fails, continue without warning
-
+        if is_heavy and page_count > 10 and pdf_info.sample_pages:
             # If PDF has many images, it's likely a scan - warn user
-            avg_images_per_page = total_images / min(page_count, 5)
+            avg_images_per_page = pdf_info.sample_image_count / pdf_info.sample_pages
             if avg_images_per_page > 2:
                 # Estimate: scanned PDFs take much longer
                 estimated_time = page_count * 10  # ~10 sec per page for scanned
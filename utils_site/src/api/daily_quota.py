@@ -19,9 +19,11 @@ cookie+IP dual bucket only if NAT collisions show up in support.
 
 from django.conf import settings
 from django.core.cache import cache
+from django.http import JsonResponse
 from django.utils import timezone
 from django.utils.translation import gettext as _
 
+from .admission import CAP, Limit
 from .client_ip import get_client_ip
 
 # A day plus slack so a bucket created at 00:01 UTC comfortably outlives its day.
@@ -45,6 +47,50 @@ def _cache_key(identity: str) -> str:
     return f"daily_quota:{identity}:{timezone.now().date().isoformat()}"
 
 
+def quota_applies(request, is_premium: bool | None = None) -> bool:
+    """True when the daily quota gates this request.
+
+    ``is_premium`` may be passed by callers that already resolved it.
+    """
+    # The shared-IP bucket would make unrelated suite tests 429 each other;
+    # quota tests opt back in via DAILY_QUOTA_ENFORCE_IN_TESTS.
+    if getattr(settings, "TESTING", False) and not getattr(
+        settings, "DAILY_QUOTA_ENFORCE_IN_TESTS", False
+    ):
+        return False
+
+    from .middleware import is_conversion_request
+
+    if not is_conversion_request(request):
+        return False
+
+    # API-key callers (Authorization: Bearer cvk_live_…) authenticate at
+    # the DRF layer AFTER middleware and dispatch, so request.user may still
+    # be anonymous here. They are premium-only with their own monthly quota — don't
+    # IP-bucket them. (Web tokens are anonymous browser sessions with a
+    # different token format and stay quota'd via IP.)
+    # Match the EXACT key namespace (cvk_live_), not the broader "cvk_":
+    # a forged "Bearer cvk_x" would otherwise skip the daily quota here
+    # yet fall through DRF auth as anonymous (APIKeyAuthentication only
+    # claims cvk_live_ tokens), granting unlimited un-metered anon runs.
+    # A forged "cvk_live_…" instead fails DRF auth with 401, so nothing
+    # converts. See api/auth/api_key_auth.py:PREFIX_NAMESPACE.
+    if request.META.get("HTTP_AUTHORIZATION", "").startswith("Bearer cvk_live_"):
+        return False
+
+    if is_premium is None:
+        from .premium_utils import is_premium_active
+
+        is_premium = is_premium_active(getattr(request, "user", None))
+    return not is_premium
+
+
+def quota_limit(request) -> Limit:
+    """The caller's daily bucket as an admission limit (checked, not consumed)."""
+    identity, limit = _identity_and_limit(request)
+    return Limit("daily_quota", _cache_key(identity), limit, _TTL_SECONDS, kind=CAP)
+
+
 def get_quota_state(request) -> tuple[str, int, int]:
     """Return (cache_key, limit, used_today) for the caller. Cheap: one GET."""
     identity, limit = _identity_and_limit(request)
@@ -83,3 +129,33 @@ def quota_limit_message(is_authenticated: bool, limit: int) -> str:
             "Upgrade to Premium for unlimited conversions."
         ) % {"limit": limit}
     return _("You've reached your daily limit (%(limit)d/day).") % {"limit": limit}
+
+
+def _reverse_or_none(view_name: str, fallback: str) -> str:
+    try:
+        from django.urls import reverse
+
+        return reverse(view_name)
+    except Exception:
+        return fallback
+
+
+def quota_exceeded_response(request, limit: int, used: int) -> JsonResponse:
+    """429 with register/upgrade links for a caller whose day's bucket is full."""
+    user = getattr(request, "user", None)
+    is_auth = bool(user is not None and getattr(user, "is_authenticated", False))
+    payments_enabled = getattr(settings, "PAYMENTS_ENABLED", True)
+    body = {
+        "error": quota_limit_message(is_auth, limit),
+        "quota": {"limit": limit, "used": used},
+    }
+    if not is_auth:
+        body["register_url"] = _reverse_or_none("users:register", "/users/register/")
+        body["register_text"] = _("Create a free account")
+    if payments_enabled:
+        body["upgrade_url"] = _reverse_or_none("frontend:pricing", "/pricing/")
+        body["upgrade_text"] = _("Upgrade to Premium")
+    response = JsonResponse(body, status=429)
+    response["X-Daily-Quota-Limit"] = str(limit)
+    response["X-Daily-Quota-Remaining"] = "0"
+    return response
@@ -7,12 +7,8 @@ import shutil
 
 from django.conf import settings
 
-from .cache_utils import (
-    cache_pdf_page_count,
-    cache_pdf_validation,
-    get_cached_pdf_validation,
-)
 from .logging_utils import get_logger
+from .pdf_info import PdfInfo, get_pdf_info
 
 logger = get_logger(__name__)
 
@@ -28,23 +24,19 @@ DOC_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"  # OLE2 format (old .doc)
 MACRO_ENABLED_EXTENSIONS = {".docm", ".dotm", ".xlsm", ".xltm", ".pptm", ".potm"}
 
 
-def validate_pdf_file(file_path: str, context: dict) -> tuple[bool, str | None]:
+def validate_pdf_file(
+    file_path: str, context: dict, pdf_info: PdfInfo | None = None
+) -> tuple[bool, str | None]:
     """
-    Validate PDF file structure with caching.
+    Validate PDF file structure.
+
+    The parse itself is shared through ``pdf_info``: pass the PdfInfo the
+    caller already has, or it is looked up by content hash (one read of the
+    file) and only parsed if no earlier layer has done so.
 
     Returns:
         Tuple[bool, Optional[str]]: (is_valid, error_message)
     """
-    # Check cache first
-    cached_result = get_cached_pdf_validation(file_path)
-    if cached_result is not None:
-        logger.debug("Using cached PDF validation result", extra=context)
-        return (
-            (cached_result, None)
-            if cached_result
-            else (False, "Cached validation failed")
-        )
-
     try:
         # Check file exists and is not empty
         if not os.path.exists(file_path):
@@ -70,7 +62,6 @@ def validate_pdf_file(file_path: str, context: dict) -> tuple[bool, str | None]:
                     "event": "pdf_oversize_reject",
                 },
             )
-            cache_pdf_validation(file_path, False, timeout=300)
             return False, "PDF file is too large to process"
 
         # Check magic number
@@ -82,53 +73,29 @@ def validate_pdf_file(file_path: str, context: dict) -> tuple[bool, str | None]:
                     "File does not appear to be a valid PDF (missing PDF header)",
                 )
 
-        # Try to read PDF structure with PyPDF2
-        try:
-            from pypdf import PdfReader
-
-            reader = PdfReader(file_path)
+        if pdf_info is None:
+            pdf_info = get_pdf_info(file_path)
 
-            # Check if PDF is encrypted
-            if reader.is_encrypted:
-                return False, "PDF is password-protected"
+        # Check if PDF is encrypted
+        if pdf_info.is_encrypted:
+            return False, "PDF is password-protected"
 
-            # Check if PDF has pages
-            page_count = len(reader.pages)
-            if page_count == 0:
-                return False, "PDF has no pages"
-
-            # Cache page count for future use
-            cache_pdf_page_count(file_path, page_count)
-
-            # Try to access first page to verify it's readable
-            try:
-                first_page = reader.pages[0]
-                _ = first_page.extract_text()  # Try to extract text
-            except Exception as e:
-                logger.warning(
-                    "PDF page extraction test failed",
-                    extra={
-                        **context,
-                        "error": str(e),
-                        "event": "pdf_validation_warning",
-                    },
-                )
-                # Don't fail validation, just log warning
-
-        except ImportError:
-            # PyPDF2 not available, skip deep validation
-            logger.debug(
-                "PyPDF2 not available, skipping deep PDF validation", extra=context
-            )
-        except Exception as e:
+        if pdf_info.error:
             logger.warning(
-                "PDF validation with PyPDF2 failed",
-                extra={**context, "error": str(e), "event": "pdf_validation_warning"},
+                "PDF structure parse failed",
+                extra={
+                    **context,
+                    "error": pdf_info.error,
+                    "event": "pdf_validation_warning",
+                },
             )
-            # Don't fail validation if PyPDF2 has issues
+            # Don't fail validation; the converter's repair path handles it
+            return True, None
+
+        # Check if PDF has pages
+        if pdf_info.page_count == 0:
+            return False, "PDF has no pages"
 
-        # Cache successful validation
-        cache_pdf_validation(file_path, True)
         return True, None
 
     except Exception as e:
@@ -137,8 +104,6 @@ def validate_pdf_file(file_path: str, context: dict) -> tuple[bool, str | None]:
             extra={**context, "error": str(e), "event": "pdf_validation_error"},
             exc_info=True,
         )
-        # Cache failed validation (shorter timeout)
-        cache_pdf_validation(file_path, False, timeout=300)  # 5 minutes
         return False, f"Error validating PDF: {str(e)}"
 
 
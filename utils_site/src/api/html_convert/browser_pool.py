@@ -0,0 +1,242 @@
+"""
+Per-process warm Chromium pool for HTML/URL → PDF.
+
+Launching Playwright's driver plus a headless Chromium costs a second or more
+per conversion, which used to be most of the latency of our lightest tool.
+The pool keeps one Playwright driver and one browser alive per worker process
+and hands out a fresh, isolated ``BrowserContext`` per conversion (no shared
+cookies, cache or storage between users). The browser is recycled after
+``HTML_TO_PDF_BROWSER_MAX_PAGES`` contexts, when its process tree grows past
+``HTML_TO_PDF_BROWSER_MAX_RSS_MB``, or when it disconnects (crash).
+
+Playwright objects are bound to the event loop that created them, while our
+callers are synchronous (gunicorn threads, Celery prefork children) and used
+to spin up a throwaway loop per request. The pool therefore owns a private
+event loop on a daemon thread; ``run()`` submits a coroutine to it and blocks
+for the result. A fork (gunicorn/Celery prefork) is detected by pid and the
+child simply starts its own loop and browser on first use.
+"""
+
+import asyncio
+import atexit
+import contextlib
+import os
+import threading
+
+from django.conf import settings
+from src.api.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    from prometheus_client import Counter
+
+    BROWSER_POOL_EVENTS = Counter(
+        "convertica_browser_pool_events_total",
+        "Chromium pool events for HTML/URL to PDF",
+        ["event"],
+    )
+    _PROMETHEUS_AVAILABLE = True
+except ImportError:
+    _PROMETHEUS_AVAILABLE = False
+
+# Chromium flags for a container without a usable /dev/shm or GPU.
+_LAUNCH_ARGS = ["--disable-dev-shm-usage", "--disable-gpu"]
+
+
+class BrowserPool:
+    """Long-lived Chromium per process, leasing one fresh context per job."""
+
+    def __init__(self, max_pages: int | None = None, max_rss_mb: int | None = None):
+        self.max_pages = max_pages or getattr(
+            settings, "HTML_TO_PDF_BROWSER_MAX_PAGES", 200
+        )
+        self.max_rss_mb = max_rss_mb or getattr(
+            settings, "HTML_TO_PDF_BROWSER_MAX_RSS_MB", 768
+        )
+        self._lock = threading.Lock()
+        self._pid: int | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._playwright = None
+        self._browser = None
+        self._browser_lock: asyncio.Lock | None = None
+        self._pages_served = 0
+        self._leases: dict = {}  # browser -> contexts currently leased from it
+        self._stats = {"hit": 0, "launch": 0, "recycle": 0, "crash": 0}
+
+    # ------------------------------------------------------------------ loop
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._pid != os.getpid() or self._loop is None:
+                # Fresh process (or forked child): inherited loop/thread/browser
+                # handles belong to the parent and must not be touched.
+                self._pid = os.getpid()
+                self._playwright = None
+                self._browser = None
+                self._pages_served = 0
+                self._leases = {}
+                self._loop = asyncio.new_event_loop()
+                self._browser_lock = None
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name="html2pdf-browser-pool",
+                    daemon=True,
+                )
+                self._thread.start()
+            return self._loop
+
+    def run(self, coro_factory, timeout: float | None = None):
+        """Run ``coro_factory()`` on the pool loop and return its result.
+
+        Takes a factory rather than a coroutine so nothing is created on the
+        caller's thread/loop.
+        """
+        loop = self._ensure_loop()
+
+        async def _runner():
+            return await coro_factory()
+
+        future = asyncio.run_coroutine_threadsafe(_runner(), loop)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    # --------------------------------------------------------------- browser
+
+    def _count(self, event: str) -> None:
+        self._stats[event] += 1
+        if _PROMETHEUS_AVAILABLE:
+            BROWSER_POOL_EVENTS.labels(event=event).inc()
+
+    async def _get_playwright(self):
+        if self._playwright is None:
+            from playwright.async_api import async_playwright
+
+            self._playwright = await async_playwright().start()
+        return self._playwright
+
+    async def launch(self, args: list[str] | None = None):
+        """Launch a browser on the warm driver (caller owns and closes it).
+
+        Used directly where a per-browser launch flag is unavoidable (URL → PDF
+        pins the entry host's DNS with ``--host-resolver-rules``); that still
+        skips the driver start-up that dominates a cold launch.
+        """
+        playwright = await self._get_playwright()
+        self._count("launch")
+        return await playwright.chromium.launch(
+            headless=True, args=[*_LAUNCH_ARGS, *(args or [])]
+        )
+
+    def _browser_rss_mb(self) -> float:
+        """RSS of the Chromium process tree spawned under this worker."""
+        try:
+            import psutil
+
+            total = 0
+            for child in psutil.Process().children(recursive=True):
+                with contextlib.suppress(psutil.Error):
+                    name = child.name().lower()
+                    if "chrom" in name or "headless" in name:
+                        total += child.memory_info().rss
+            return total / (1024 * 1024)
+        except Exception:
+            return 0.0
+
+    def _should_recycle(self) -> bool:
+        if self._pages_served >= self.max_pages:
+            return True
+        return bool(self.max_rss_mb) and self._browser_rss_mb() > self.max_rss_mb
+
+    async def _retire(self, browser) -> None:
+        """Close ``browser`` now, or once its last leased context is released."""
+        if self._leases.get(browser, 0) == 0:
+            self._leases.pop(browser, None)
+            with contextlib.suppress(Exception):
+                await browser.close()
+
+    async def _acquire_browser(self):
+        if self._browser_lock is None:
+            self._browser_lock = asyncio.Lock()
+        async with self._browser_lock:
+            current = self._browser
+            if current is not None and not current.is_connected():
+                logger.warning("Pooled Chromium disconnected; relaunching")
+                self._count("crash")
+                self._browser = None
+                self._leases.pop(current, None)
+            elif current is not None and self._should_recycle():
+                logger.info(
+                    "Recycling pooled Chromium",
+                    extra={
+                        "event": "browser_pool_recycle",
+                        "pages_served": self._pages_served,
+                    },
+                )
+                self._count("recycle")
+                self._browser = None
+                await self._retire(current)
+
+            if self._browser is None:
+                self._browser = await self.launch()
+                self._pages_served = 0
+            else:
+                self._count("hit")
+            browser = self._browser
+            self._leases[browser] = self._leases.get(browser, 0) + 1
+            return browser
+
+    @contextlib.asynccontextmanager
+    async def context(self, **context_kwargs):
+        """Lease a fresh isolated ``BrowserContext`` from the pooled browser."""
+        browser = await self._acquire_browser()
+        browser_context = None
+        try:
+            browser_context = await browser.new_context(**context_kwargs)
+            yield browser_context
+        finally:
+            if browser_context is not None:
+                with contextlib.suppress(Exception):
+                    await browser_context.close()
+            self._leases[browser] = self._leases.get(browser, 1) - 1
+            if browser is self._browser:
+                self._pages_served += 1
+            else:
+                await self._retire(browser)
+
+    def stats(self) -> dict:
+        """Pool counters (hit/launch/recycle/crash) for this process."""
+        return {
+            **self._stats,
+            "pages_served": self._pages_served,
+            "active": sum(self._leases.values()),
+        }
+
+    # -------------------------------------------------------------- shutdown
+
+    async def _shutdown(self) -> None:
+        browser, self._browser = self._browser, None
+        if browser is not None:
+            with contextlib.suppress(Exception):
+                await browser.close()
+        if self._playwright is not None:
+            with contextlib.suppress(Exception):
+                await self._playwright.stop()
+            self._playwright = None
+
+    def close(self) -> None:
+        """Close the browser and driver (atexit / tests)."""
+        if self._loop is None or self._pid != os.getpid():
+            return
+        with contextlib.suppress(Exception):
+            self.run(self._shutdown, timeout=10)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop = None
+
+
+browser_pool = BrowserPool()
+atexit.register(browser_pool.close)
@@ -295,21 +295,25 @@ class HTMLToPDFConverter:
     ) -> None:
         """Convert HTML file to PDF using Playwright."""
         try:
-            from playwright.async_api import async_playwright
+            import playwright.async_api  # noqa: F401
         except ImportError:
             raise ConversionError(
                 "Playwright is not installed. Install with: pip install playwright",
                 context=context,
             )
 
+        from .browser_pool import browser_pool
+
         # Perform conversion with retries
         for attempt in range(self.max_retries + 1):
             try:
-                async with async_playwright() as p:
-                    browser = await p.chromium.launch(headless=True)
-                    page = await browser.new_page()
-                    # Block SSRF / file:// reads on every request & sub-resource.
-                    await page.route("**/*", self._route_guard)
+                # Fresh isolated context on the warm pooled browser; no state
+                # (cookies, cache, storage) survives into the next conversion.
+                async with browser_pool.context() as browser_context:
+                    # Block SSRF / file:// reads on every request & sub-resource
+                    # of every page in this context.
+                    await browser_context.route("**/*", self._route_guard)
+                    page = await browser_context.new_page()
 
                     try:
                         # Render the HTML directly (no file:// origin, so the
@@ -343,11 +347,12 @@ class HTMLToPDFConverter:
                                 **context,
                                 "event": "playwright_complete",
                                 "pdf_options": pdf_options,
+                                "browser_pool": browser_pool.stats(),
                             },
                         )
 
                     finally:
-                        await browser.close()
+                        await page.close()
 
                 break  # Success, exit retry loop
 
@@ -376,7 +381,7 @@ class HTMLToPDFConverter:
     ) -> None:
         """Convert URL to PDF using Playwright."""
         try:
-            from playwright.async_api import async_playwright
+            import playwright.async_api  # noqa: F401
         except ImportError:
             raise ConversionError(
                 "Playwright is not installed. Install with: pip install playwright",
@@ -394,55 +399,59 @@ class HTMLToPDFConverter:
             [f"--host-resolver-rules=MAP {_host} {_pin_ip}"] if _pin_ip else []
         )
 
+        from .browser_pool import browser_pool
+
         # Perform conversion with retries
         for attempt in range(self.max_retries + 1):
             try:
-                async with async_playwright() as p:
-                    browser = await p.chromium.launch(headless=True, args=_launch_args)
-                    page = await browser.new_page()
+                # The DNS pin is a launch flag, so URL conversions can't share
+                # the pooled browser; they still launch on the pool's warm
+                # Playwright driver instead of starting a new one.
+                browser = await browser_pool.launch(args=_launch_args)
+                try:
+                    browser_context = await browser.new_context()
                     # Re-validate every request, redirect and sub-resource so a
                     # redirect or embedded resource can't reach internal hosts.
-                    await page.route("**/*", self._route_guard)
-
-                    try:
-                        # Navigate to URL
-                        await page.goto(url, wait_until="networkidle")
-
-                        # Wait for page to load completely
-                        await page.wait_for_timeout(
-                            2000
-                        )  # 2 seconds for dynamic content
-
-                        # Default PDF options
-                        pdf_options = {
-                            "path": pdf_path,
-                            "format": "A4",
-                            "print_background": True,
-                            "margin": {
-                                "top": "1cm",
-                                "right": "1cm",
-                                "bottom": "1cm",
-                                "left": "1cm",
-                            },
-                        }
-
-                        # Override with custom options
-                        pdf_options.update(options)
-
-                        # Generate PDF
-                        await page.pdf(**pdf_options)
-
-                        logger.info(
-                            "Playwright URL conversion completed",
-                            extra={
-                                **context,
-                                "event": "playwright_url_complete",
-                                "pdf_options": pdf_options,
-                            },
-                        )
+                    await browser_context.route("**/*", self._route_guard)
+                    page = await browser_context.new_page()
+
+                    # Navigate to URL
+                    await page.goto(url, wait_until="networkidle")
+
+                    # Wait for page to load completely
+                    await page.wait_for_timeout(2000)  # 2 seconds for dynamic content
+
+                    # Default PDF options
+                    pdf_options = {
+                        "path": pdf_path,
+                        "format": "A4",
+                        "print_background": True,
+                        "margin": {
+                            "top": "1cm",
+                            "right": "1cm",
+                            "bottom": "1cm",
+                            "left": "1cm",
+                        },
+                    }
+
+                    # Override with custom options
+                    pdf_options.update(options)
+
+                    # Generate PDF
+                    await page.pdf(**pdf_options)
+
+                    logger.info(
+                        "Playwright URL conversion completed",
+                        extra={
+                            **context,
+                            "event": "playwright_url_complete",
+                            "pdf_options": pdf_options,
+                            "browser_pool": browser_pool.stats(),
+                        },
+                    )
 
-                    finally:
-                        await browser.close()
+                finally:
+                    await browser.close()
 
                 break  # Success, exit retry loop
 
@@ -559,6 +568,12 @@ class HTMLToPDFConverter:
 # Global converter instance
 _html_converter = HTMLToPDFConverter()
 
+# Upper bound for a sync caller waiting on the pool loop: every retry of a
+# conversion (timeout_seconds each) plus the 1 s back-off between them.
+_SYNC_TIMEOUT_SECONDS = (_html_converter.max_retries + 1) * (
+    _html_converter.timeout_seconds + 1
+)
+
 
 def convert_html_to_pdf(
     html_content: str,
@@ -578,16 +593,14 @@ def convert_html_to_pdf(
     Returns:
         Tuple of (input_html_path, output_pdf_path)
     """
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(
-            _html_converter.convert_html_to_pdf(
-                html_content, filename, suffix, **options
-            )
-        )
-    finally:
-        loop.close()
+    from .browser_pool import browser_pool
+
+    return browser_pool.run(
+        lambda: _html_converter.convert_html_to_pdf(
+            html_content, filename, suffix, **options
+        ),
+        timeout=_SYNC_TIMEOUT_SECONDS,
+    )
 
 
 def convert_url_to_pdf(
@@ -605,11 +618,9 @@ def convert_url_to_pdf(
     Returns:
         Tuple of (url, output_pdf_path)
     """
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    try:
-        return loop.run_until_complete(
-            _html_converter.convert_url_to_pdf(url, filename, suffix, **options)
-        )
-    finally:
-        loop.close()
+    from .browser_pool import browser_pool
+
+    return browser_pool.run(
+        lambda: _html_converter.convert_url_to_pdf(url, filename, suffix, **options),
+        timeout=_SYNC_TIMEOUT_SECONDS,
+    )
@@ -0,0 +1,417 @@
+"""
+Per-process pool of warm headless LibreOffice listeners.
+
+Second warm path for Word/Excel/PowerPoint → PDF, used when the unoserver
+container is unreachable (``convert_with_unoserver`` returned False). Instead
+of paying the 10-15s cold start of ``libreoffice --convert-to`` per document,
+each worker process keeps up to ``LIBREOFFICE_POOL_SIZE`` ``soffice``
+listeners alive, each with its own user profile (so they never fight over the
+profile lock), and leases one per conversion.
+
+The worker's Python cannot import ``uno`` (it is bound to the distro Python
+LibreOffice ships with), so the UNO conversation itself is run by
+``uno_convert.py`` under that interpreter. That costs a short interpreter
+start per document, not a LibreOffice start.
+
+Listeners are started lazily on first use, health-checked before every lease,
+and restarted after a crash, a timeout or ``LIBREOFFICE_POOL_MAX_CONVERSIONS``
+documents. A fork (Celery prefork) is detected by pid; the child starts its own
+listeners. When the pool is unavailable (no UNO Python, listener not starting,
+all listeners busy, listener unreachable) ``convert`` returns False and the
+caller uses the cold subprocess. A document that times out or fails on a
+healthy listener raises ``ConversionError`` instead: a cold start would only
+repeat the same work.
+"""
+
+import atexit
+import contextlib
+import os
+import shutil
+import signal
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from src.api.logging_utils import get_logger
+from src.exceptions import ConversionError
+
+logger = get_logger(__name__)
+
+try:
+    from prometheus_client import Counter
+
+    LIBREOFFICE_POOL_EVENTS = Counter(
+        "convertica_libreoffice_pool_events_total",
+        "Warm LibreOffice listener pool events",
+        ["event"],
+    )
+    _PROMETHEUS_AVAILABLE = True
+except ImportError:
+    _PROMETHEUS_AVAILABLE = False
+
+_CLIENT_SCRIPT = os.path.join(os.path.dirname(__file__), "uno_convert.py")
+
+# Interpreters that usually carry the ``uno`` module, in preference order.
+_UNO_PYTHON_CANDIDATES = (
+    "/usr/lib/libreoffice/program/python",
+    "/opt/libreoffice/program/python",
+    "/usr/bin/python3",
+)
+
+# Seconds to wait for a fresh listener to accept connections.
+_START_TIMEOUT = 30
+# Seconds to wait for a free listener before giving up on the warm path.
+_LEASE_TIMEOUT = 10
+
+_EXIT_UNREACHABLE = 2
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _port_open(port: int) -> bool:
+    try:
+        with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+            return True
+    except OSError:
+        return False
+
+
+def _kill_group(proc: subprocess.Popen) -> None:
+    """Kill a process started with ``start_new_session`` and its children."""
+    try:
+        os.killpg(os.getpgid(proc.pid), signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        with contextlib.suppress(OSError):
+            proc.kill()
+    with contextlib.suppress(Exception):
+        proc.wait(timeout=5)
+
+
+class _Listener:
+    """One ``soffice`` process accepting UNO connections on a local port."""
+
+    def __init__(self, soffice: str, index: int):
+        self.soffice = soffice
+        self.index = index
+        self.proc: subprocess.Popen | None = None
+        self.port = 0
+        self.profile_dir = ""
+        self.conversions = 0
+
+    def start(self) -> None:
+        self.port = _free_port()
+        self.profile_dir = tempfile.mkdtemp(
+            prefix=f"lo_pool_{os.getpid()}_{self.index}_"
+        )
+        env = os.environ.copy()
+        env.update({"SAL_DISABLE_CUPS": "1", "HOME": self.profile_dir})
+        self.proc = subprocess.Popen(
+            [
+                self.soffice,
+                "--headless",
+                "--invisible",
+                "--nologo",
+                "--norestore",
+                "--nodefault",
+                "--nolockcheck",
+                f"-env:UserInstallation=file://{self.profile_dir}",
+                f"--accept=socket,host=127.0.0.1,port={self.port};urp;"
+                "StarOffice.ComponentContext",
+            ],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+        self.conversions = 0
+        deadline = time.monotonic() + _START_TIMEOUT
+        while time.monotonic() < deadline:
+            if self.proc.poll() is not None:
+                break
+            if _port_open(self.port):
+                return
+            time.sleep(0.2)
+        self.stop()
+        raise RuntimeError("LibreOffice listener did not come up")
+
+    def healthy(self) -> bool:
+        return (
+            self.proc is not None and self.proc.poll() is None and _port_open(self.port)
+        )
+
+    def stop(self) -> None:
+        if self.proc is not None:
+            _kill_group(self.proc)
+            self.proc = None
+        if self.profile_dir:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+            self.profile_dir = ""
+
+
+class LibreOfficePool:
+    """Leases warm LibreOffice listeners to conversion threads."""
+
+    def __init__(self, size: int | None = None, max_conversions: int | None = None):
+        # Settings are read lazily: this module is imported by converters that
+        # also run outside a configured Django process (standalone scripts).
+        self._size = size
+        self._max_conversions = max_conversions
+        self._cond = threading.Condition()
+        self._pid: int | None = None
+        self._idle: list[_Listener] = []
+        self._started = 0
+        self._uno_python: str | None = None
+        self._stats = {"lease": 0, "start": 0, "restart": 0, "crash": 0, "timeout": 0}
+
+    @property
+    def size(self) -> int:
+        if self._size is not None:
+            return self._size
+        return getattr(settings, "LIBREOFFICE_POOL_SIZE", 1)
+
+    @property
+    def max_conversions(self) -> int:
+        if self._max_conversions is not None:
+            return self._max_conversions
+        return getattr(settings, "LIBREOFFICE_POOL_MAX_CONVERSIONS", 100)
+
+    def _count(self, event: str) -> None:
+        self._stats[event] += 1
+        if _PROMETHEUS_AVAILABLE:
+            LIBREOFFICE_POOL_EVENTS.labels(event=event).inc()
+
+    # ----------------------------------------------------------- availability
+
+    def _resolve_uno_python(self) -> str:
+        """Return an interpreter that can ``import uno``, or "" (cached)."""
+        if self._uno_python is not None:
+            return self._uno_python
+        configured = getattr(settings, "LIBREOFFICE_UNO_PYTHON", "")
+        candidates = [configured] if configured else list(_UNO_PYTHON_CANDIDATES)
+        self._uno_python = ""
+        for candidate in candidates:
+            if not (candidate and os.path.exists(candidate)):
+                continue
+            try:
+                subprocess.run(
+                    [candidate, "-c", "import uno"],
+                    capture_output=True,
+                    timeout=15,
+                    check=True,
+                )
+            except Exception:
+                continue
+            self._uno_python = candidate
+            break
+        if not self._uno_python:
+            logger.info(
+                "No UNO-capable Python found; warm LibreOffice pool disabled",
+                extra={"event": "libreoffice_pool_unavailable"},
+            )
+        return self._uno_python
+
+    def available(self) -> bool:
+        if self.size <= 0:
+            return False
+        if not (shutil.which("soffice") or shutil.which("libreoffice")):
+            return False
+        return bool(self._resolve_uno_python())
+
+    # ---------------------------------------------------------------- leasing
+
+    def _reset_if_forked(self) -> None:
+        if self._pid != os.getpid():
+            # Listeners inherited from the parent belong to it; forget them.
+            self._pid = os.getpid()
+            self._idle = []
+            self._started = 0
+
+    def _acquire(self) -> _Listener | None:
+        deadline = time.monotonic() + _LEASE_TIMEOUT
+        with self._cond:
+            self._reset_if_forked()
+            while not self._idle and self._started >= self.size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+            if self._idle:
+                listener = self._idle.pop()
+            else:
+                soffice = shutil.which("soffice") or shutil.which("libreoffice")
+                listener = _Listener(soffice, self._started)
+                self._started += 1
+
+        try:
+            if listener.proc is None:
+                listener.start()
+                self._count("start")
+            elif not listener.healthy():
+                logger.warning(
+                    "Warm LibreOffice listener died; restarting",
+                    extra={"event": "libreoffice_pool_crash", "port": listener.port},
+                )
+                self._count("crash")
+                listener.stop()
+                listener.start()
+            elif listener.conversions >= self.max_conversions:
+                self._count("restart")
+                listener.stop()
+                listener.start()
+        except Exception:
+            self._release(listener, broken=True)
+            raise
+        self._count("lease")
+        return listener
+
+    def _release(self, listener: _Listener, broken: bool = False) -> None:
+        with self._cond:
+            if self._pid != os.getpid():
+                return
+            if broken:
+                listener.stop()
+                self._started -= 1
+            else:
+                self._idle.append(listener)
+            self._cond.notify()
+
+    # ------------------------------------------------------------- conversion
+
+    def convert(
+        self, input_path: str, output_path: str, filter_name: str, timeout: float
+    ) -> bool:
+        """Convert via a warm listener; False means "use the cold path".
+
+        Raises ``ConversionError`` when the listener times out or fails on the
+        document itself.
+        """
+        if not self.available():
+            return False
+        try:
+            listener = self._acquire()
+        except Exception as exc:
+            logger.warning(
+                f"Warm LibreOffice listener failed to start: {exc}",
+                extra={"event": "libreoffice_pool_start_failed"},
+            )
+            return False
+        if listener is None:
+            logger.info(
+                "All warm LibreOffice listeners busy",
+                extra={"event": "libreoffice_pool_busy"},
+            )
+            return False
+
+        broken = False
+        try:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(output_path)
+            proc = subprocess.Popen(
+                [
+                    self._uno_python,
+                    _CLIENT_SCRIPT,
+                    "--port",
+                    str(listener.port),
+                    "--filter",
+                    filter_name,
+                    input_path,
+                    output_path,
+                ],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                start_new_session=True,
+            )
+            try:
+                _stdout, stderr = proc.communicate(timeout=timeout)
+            except subprocess.TimeoutExpired as exc:
+                # The listener is most likely wedged on this document.
+                _kill_group(proc)
+                self._count("timeout")
+                broken = True
+                raise ConversionError(
+                    f"LibreOffice conversion timed out after {timeout}s"
+                ) from exc
+            listener.conversions += 1
+            if proc.returncode == _EXIT_UNREACHABLE:
+                broken = True
+                logger.warning(
+                    "Warm LibreOffice listener unreachable",
+                    extra={"event": "libreoffice_pool_unreachable"},
+                )
+                return False
+            ok = (
+                proc.returncode == 0
+                and os.path.exists(output_path)
+                and os.path.getsize(output_path) > 0
+            )
+            if not ok:
+                message = stderr.decode(errors="replace")[:500]
+                logger.warning(
+                    "Warm LibreOffice conversion failed",
+                    extra={
+                        "event": "libreoffice_pool_failed",
+                        "return_code": proc.returncode,
+                        "stderr": message,
+                    },
+                )
+                raise ConversionError(
+                    f"LibreOffice conversion failed: {message or 'no output'}"
+                )
+            return True
+        except ConversionError:
+            raise
+        except Exception as exc:
+            logger.warning(
+                f"Warm LibreOffice conversion error: {exc}",
+                extra={"event": "libreoffice_pool_error"},
+            )
+            broken = True
+            return False
+        finally:
+            self._release(listener, broken=broken)
+
+    def stats(self) -> dict:
+        """Pool counters (lease/start/restart/crash/timeout) for this process."""
+        return {**self._stats, "listeners": self._started, "idle": len(self._idle)}
+
+    def close(self) -> None:
+        """Stop every idle listener owned by this process (atexit / tests)."""
+        with self._cond:
+            if self._pid != os.getpid():
+                return
+            for listener in self._idle:
+                listener.stop()
+            self._idle = []
+            self._started = 0
+
+
+libreoffice_pool = LibreOfficePool()
+atexit.register(libreoffice_pool.close)
+
+# Prefork children leave via os._exit, which skips atexit; the listeners run in
+# their own session and would otherwise outlive the child.
+try:
+    from celery.signals import worker_process_shutdown
+
+    worker_process_shutdown.connect(
+        lambda **_kwargs: libreoffice_pool.close(), weak=False
+    )
+except ImportError:
+    pass
+
+
+def convert_with_libreoffice_pool(
+    input_path: str, output_path: str, filter_name: str, timeout: float
+) -> bool:
+    """Convert on a warm pooled LibreOffice; False → fall back to subprocess.
+
+    Raises ``ConversionError`` on a timeout or a failed conversion.
+    """
+    return libreoffice_pool.convert(input_path, output_path, filter_name, timeout)
@@ -13,6 +13,8 @@ from django.utils import translation
 from django.utils.deprecation import MiddlewareMixin
 from django.utils.translation import gettext as _
 
+from .admission import Limit, admit
+
 op_tracking_logger = logging.getLogger("src.api.operation_run_tracking")
 
 
@@ -42,12 +44,21 @@ class APIKeyQuotaRefundMiddleware(MiddlewareMixin):
         return response
 
 
+# Rendered in place of the nonce by pages that are cached and shared between
+# requests (frontend.views.anonymous_cache_page), then swapped for the
+# request's own nonce on the way out. Same length as a real nonce.
+CSP_NONCE_PLACEHOLDER = "CSP-NONCE-PLACEHOLDER-00"
+
+
 class CSPNonceMiddleware(MiddlewareMixin):
     """
     Middleware to generate a unique nonce for Content Security Policy.
 
     The nonce is generated per-request and used to allow specific inline scripts
     while blocking all other inline scripts (preventing XSS attacks).
+
+    Views that cache their HTML set ``request.csp_nonce_deferred``; templates
+    then render CSP_NONCE_PLACEHOLDER and the view fills in the nonce late.
     """
 
     def process_request(self, request):
@@ -104,37 +115,20 @@ class RateLimitMiddleware(MiddlewareMixin):
             or request.META.get("REMOTE_ADDR", "")
         )
 
-        # Rate limit key
-        rate_limit_key = f"rate_limit:{ip}"
-
-        try:
-            # Atomic count for a fixed 60s window. `cache.add` only seeds the
-            # key when absent (starts a window); `cache.incr` is atomic, so
-            # concurrent same-IP requests (the norm behind Cloudflare) can't
-            # lose increments or keep re-setting the TTL the way the old
-            # get-then-set did. incr raises if the key expired mid-call — re-seed.
-            cache.add(rate_limit_key, 0, 60)
-            try:
-                current_count = cache.incr(rate_limit_key)
-            except ValueError:
-                cache.add(rate_limit_key, 0, 60)
-                current_count = cache.incr(rate_limit_key)
-
-            # Check limit (100 requests per minute)
-            if current_count > 100:
-                # This middleware runs before LocaleMiddleware, so the active
-                # locale isn't set yet — resolve the user's language from the
-                # request (Accept-Language / cookie) so the 429 is localized.
-                lang = translation.get_language_from_request(request)
-                with translation.override(lang):
-                    payload = {
-                        "error": _("Rate limit exceeded"),
-                        "message": _("Too many requests. Please try again later."),
-                    }
-                return JsonResponse(payload, status=429)
-        except Exception:
-            # If cache fails, allow request (graceful degradation)
-            pass
+        # Fixed 60s window, checked and counted in one atomic call; fails
+        # open if the cache is down.
+        decision = admit([Limit("ip", f"rate_limit:{ip}", 100, 60)])
+        if not decision.allowed:
+            # This middleware runs before LocaleMiddleware, so the active
+            # locale isn't set yet — resolve the user's language from the
+            # request (Accept-Language / cookie) so the 429 is localized.
+            lang = translation.get_language_from_request(request)
+            with translation.override(lang):
+                payload = {
+                    "error": _("Rate limit exceeded"),
+                    "message": _("Too many requests. Please try again later."),
+                }
+            return decision.apply_headers(JsonResponse(payload, status=429))
 
         return None
 
@@ -382,42 +376,26 @@ class DailyQuotaMiddleware(MiddlewareMixin):
     exhausted. Post-response: count only 2xx outcomes and expose
     X-Daily-Quota-Limit / X-Daily-Quota-Remaining headers the frontend uses for
     the "N conversions left today" nudge. Fail-open on any cache error.
+
+    Views decorated with ``combined_rate_limit`` skip the pre-view check here:
+    their admission evaluates the quota together with the rate limits and
+    leaves the bucket on the request for process_response.
     """
 
     def process_view(self, request, view_func, view_args, view_kwargs):
-        from django.conf import settings
-
-        # The shared-IP bucket would make unrelated suite tests 429 each other;
-        # quota tests opt back in via DAILY_QUOTA_ENFORCE_IN_TESTS.
-        if getattr(settings, "TESTING", False) and not getattr(
-            settings, "DAILY_QUOTA_ENFORCE_IN_TESTS", False
-        ):
-            return None
         try:
-            if not is_conversion_request(request):
-                return None
-
-            # API-key callers (Authorization: Bearer cvk_live_…) authenticate at
-            # the DRF layer AFTER middleware, so request.user is still anonymous
-            # here. They are premium-only with their own monthly quota — don't
-            # IP-bucket them. (Web tokens are anonymous browser sessions with a
-            # different token format and stay quota'd via IP.)
-            # Match the EXACT key namespace (cvk_live_), not the broader "cvk_":
-            # a forged "Bearer cvk_x" would otherwise skip the daily quota here
-            # yet fall through DRF auth as anonymous (APIKeyAuthentication only
-            # claims cvk_live_ tokens), granting unlimited un-metered anon runs.
-            # A forged "cvk_live_…" instead fails DRF auth with 401, so nothing
-            # converts. See api/auth/api_key_auth.py:PREFIX_NAMESPACE.
-            if request.META.get("HTTP_AUTHORIZATION", "").startswith(
-                "Bearer cvk_live_"
-            ):
+            # Views under combined_rate_limit check the quota in the same
+            # Redis call as their rate limits (see rate_limit_utils).
+            if _view_admits_daily_quota(view_func, request):
                 return None
 
-            from .daily_quota import get_quota_state, quota_limit_message
-            from .premium_utils import is_premium_active
+            from .daily_quota import (
+                get_quota_state,
+                quota_applies,
+                quota_exceeded_response,
+            )
 
-            user = getattr(request, "user", None)
-            if is_premium_active(user):
+            if not quota_applies(request):
                 return None
 
             key, limit, used = get_quota_state(request)
@@ -427,33 +405,7 @@ class DailyQuotaMiddleware(MiddlewareMixin):
                 request._daily_quota_limit = limit
                 return None
 
-            is_auth = bool(
-                user is not None and getattr(user, "is_authenticated", False)
-            )
-            body = {
-                "error": quota_limit_message(is_auth, limit),
-                "quota": {"limit": limit, "used": used},
-            }
-            if is_auth:
-                if getattr(settings, "PAYMENTS_ENABLED", True):
-                    body["upgrade_url"] = _reverse_or_none(
-                        "frontend:pricing", "/pricing/"
-                    )
-                    body["upgrade_text"] = _("Upgrade to Premium")
-            else:
-                body["register_url"] = _reverse_or_none(
-                    "users:register", "/users/register/"
-                )
-                body["register_text"] = _("Create a free account")
-                if getattr(settings, "PAYMENTS_ENABLED", True):
-                    body["upgrade_url"] = _reverse_or_none(
-                        "frontend:pricing", "/pricing/"
-                    )
-                    body["upgrade_text"] = _("Upgrade to Premium")
-            response = JsonResponse(body, status=429)
-            response["X-Daily-Quota-Limit"] = str(limit)
-            response["X-Daily-Quota-Remaining"] = "0"
-            return response
+            return quota_exceeded_response(request, limit, used)
         except Exception as e:
             op_tracking_logger.warning(
                 "Daily quota check failed for %s: %s: %s",
@@ -483,13 +435,15 @@ class DailyQuotaMiddleware(MiddlewareMixin):
         return response
 
 
-def _reverse_or_none(view_name: str, fallback: str) -> str:
-    try:
-        from django.urls import reverse
-
-        return reverse(view_name)
-    except Exception:
-        return fallback
+def _view_admits_daily_quota(view_func, request) -> bool:
+    """True if the view's ``combined_rate_limit`` checks the daily quota itself."""
+    view_class = getattr(view_func, "view_class", None)
+    if view_class is None:
+        return getattr(view_func, "admits_daily_quota", False)
+    return any(
+        getattr(getattr(view_class, name, None), "admits_daily_quota", False)
+        for name in ("dispatch", request.method.lower())
+    )
 
 
 class FilterProxyRequestsMiddleware(MiddlewareMixin):
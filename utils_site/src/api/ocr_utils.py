@@ -14,12 +14,14 @@ Supported languages: ar, zh-cn, zh-tw, de, en, es, fr, hi, id, it, ja, ko, pl, p
 """
 
 import asyncio
+import contextlib
 import os
 import tempfile
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 import numpy as np
 import pytesseract
+from django.conf import settings
 from django.core.files.uploadedfile import UploadedFile
 from pdf2image import convert_from_path, pdfinfo_from_path
 from PIL import Image, ImageEnhance, ImageFilter
@@ -28,6 +30,7 @@ from src.exceptions import ConversionError, StorageError
 
 from .file_validation import check_disk_space, sanitize_filename
 from .logging_utils import get_logger
+from .performance_config import get_performance_config
 
 logger = get_logger(__name__)
 
@@ -372,6 +375,149 @@ async def extract_text_from_pdf_async(
     )
 
 
+def _ocr_page_file(
+    image_path: str, user_language: str, confidence_threshold: int
+) -> str:
+    """Pipeline worker: OCR one rendered page image from disk."""
+    with Image.open(image_path) as image:
+        return extract_text_from_image(
+            image,
+            user_language=user_language,
+            confidence_threshold=confidence_threshold,
+        )
+
+
+def _ocr_pipeline_limits(total_pages: int) -> tuple[int, int]:
+    """Return ``(workers, max_inflight)`` for a document of ``total_pages``.
+
+    Workers follow the memory tier's ``ocr_processing`` budget; the number of
+    rendered-but-unfinished pages is capped by ``OCR_MAX_INFLIGHT_PAGES`` so a
+    long scan never holds more than a handful of 300-DPI bitmaps at once.
+    """
+    max_inflight = max(1, getattr(settings, "OCR_MAX_INFLIGHT_PAGES", 4))
+    try:
+        tier_workers = get_performance_config().get_thread_workers("ocr_processing")
+    except Exception:
+        tier_workers = 1
+    workers = max(1, min(tier_workers, max_inflight, total_pages))
+    return workers, max_inflight
+
+
+def _ocr_pages_sequential(
+    pdf_path: str,
+    total_pages: int,
+    dpi: int,
+    user_language: str,
+    confidence_threshold: int,
+    context: dict,
+) -> list[str]:
+    # Extract text page by page, reusing the single-image OCR core.
+    # One page is rasterized at a time: the previous approach decoded the
+    # whole document into uncompressed 300-DPI bitmaps at once, which on
+    # multi-page PDFs blew past the worker's per-child memory budget
+    # (CONVERTICA-59 OOM pattern). Peak RSS is now one page, not N pages.
+    extracted_texts = []
+    for i in range(total_pages):
+        try:
+            page_images = convert_from_path(
+                pdf_path, dpi=dpi, first_page=i + 1, last_page=i + 1
+            )
+            page_text = extract_text_from_image(
+                page_images[0],
+                user_language=user_language,
+                confidence_threshold=confidence_threshold,
+            )
+            extracted_texts.append(page_text)
+            context[f"page_{i}_text_length"] = len(page_text)
+        except Exception as e:
+            logger.warning(
+                f"OCR failed for page {i+1}",
+                extra={**context, "page": i + 1, "error": str(e)[:200]},
+            )
+            extracted_texts.append("")  # keep page alignment
+        finally:
+            page_images = None
+
+    return extracted_texts
+
+
+def _ocr_pages_pipelined(
+    pdf_path: str,
+    tmp_dir: str,
+    total_pages: int,
+    dpi: int,
+    user_language: str,
+    confidence_threshold: int,
+    workers: int,
+    max_inflight: int,
+    context: dict,
+) -> list[str]:
+    """Render pages ahead of a thread pool that runs Tesseract on them.
+
+    Rasterization (poppler) and recognition (Tesseract) overlap: while the
+    pool recognizes the pages already rendered, the next page is rendered to
+    a PNG on disk. Both poppler and Tesseract run as subprocesses, so threads
+    give real parallelism and, unlike a process pool, also work inside
+    daemonic Celery prefork children, where large scans are OCRed. At most
+    ``max_inflight`` pages are rendered but not yet recognized, which keeps
+    peak memory bounded (CONVERTICA-59) while using every core the memory
+    tier allows. Page order is preserved and a failed page yields ``""``
+    exactly like the sequential path.
+    """
+    pages_dir = tempfile.mkdtemp(prefix="pages_", dir=tmp_dir)
+    extracted_texts = [""] * total_pages
+    pending = {}  # future -> (page index, image path)
+
+    def _collect(done) -> None:
+        for future in done:
+            i, image_path = pending.pop(future)
+            try:
+                page_text = future.result()
+                extracted_texts[i] = page_text
+                context[f"page_{i}_text_length"] = len(page_text)
+            except Exception as e:
+                logger.warning(
+                    f"OCR failed for page {i+1}",
+                    extra={**context, "page": i + 1, "error": str(e)[:200]},
+                )
+            finally:
+                with contextlib.suppress(OSError):
+                    os.remove(image_path)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ocr_page") as pool:
+        for i in range(total_pages):
+            if len(pending) >= max_inflight:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                _collect(done)
+            try:
+                image_paths = convert_from_path(
+                    pdf_path,
+                    dpi=dpi,
+                    first_page=i + 1,
+                    last_page=i + 1,
+                    output_folder=pages_dir,
+                    fmt="png",
+                    paths_only=True,
+                )
+                future = pool.submit(
+                    _ocr_page_file,
+                    image_paths[0],
+                    user_language,
+                    confidence_threshold,
+                )
+            except Exception as e:
+                logger.warning(
+                    f"OCR failed for page {i+1}",
+                    extra={**context, "page": i + 1, "error": str(e)[:200]},
+                )
+                continue
+            pending[future] = (i, image_paths[0])
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            _collect(done)
+    return extracted_texts
+
+
 def extract_text_from_pdf(
     uploaded_file: UploadedFile,
     dpi: int = 300,
@@ -446,32 +592,29 @@ def extract_text_from_pdf(
                 f"Failed to read PDF page count: {e}", context=context
             ) from e
 
-        # Extract text page by page, reusing the single-image OCR core.
-        # One page is rasterized at a time: the previous approach decoded the
-        # whole document into uncompressed 300-DPI bitmaps at once, which on
-        # multi-page PDFs blew past the worker's per-child memory budget
-        # (CONVERTICA-59 OOM pattern). Peak RSS is now one page, not N pages.
-        extracted_texts = []
-        for i in range(total_pages):
-            try:
-                page_images = convert_from_path(
-                    pdf_path, dpi=dpi, first_page=i + 1, last_page=i + 1
-                )
-                page_text = extract_text_from_image(
-                    page_images[0],
-                    user_language=user_language,
-                    confidence_threshold=confidence_threshold,
-                )
-                extracted_texts.append(page_text)
-                context[f"page_{i}_text_length"] = len(page_text)
-            except Exception as e:
-                logger.warning(
-                    f"OCR failed for page {i+1}",
-                    extra={**context, "page": i + 1, "error": str(e)[:200]},
-                )
-                extracted_texts.append("")  # keep page alignment
-            finally:
-                page_images = None
+        workers, max_inflight = _ocr_pipeline_limits(total_pages)
+        context.update({"ocr_workers": workers, "ocr_max_inflight": max_inflight})
+        if workers > 1:
+            extracted_texts = _ocr_pages_pipelined(
+                pdf_path,
+                tmp_dir,
+                total_pages,
+                dpi,
+                user_language,
+                confidence_threshold,
+                workers,
+                max_inflight,
+                context,
+            )
+        else:
+            extracted_texts = _ocr_pages_sequential(
+                pdf_path,
+                total_pages,
+                dpi,
+                user_language,
+                confidence_threshold,
+                context,
+            )
 
         # Combine all pages
         full_text = "\n\n".join(extracted_texts)
@@ -3,9 +3,18 @@ Parallel processing utilities for adaptive server optimization.
 Provides memory-safe batch processing for large files based on available resources.
 """
 
+import multiprocessing
 import os
+import pickle
+import subprocess
+import sys
 from collections.abc import Callable
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
 
 from PIL import Image
 
@@ -263,3 +272,91 @@ def get_optimal_batch_size(
     if memory_gb < 4:
         return max(1, min(base, 2))
     return base
+
+
+def can_use_process_pool() -> bool:
+    """Whether this process may start multiprocessing children.
+
+    Celery's prefork children are daemonic, and multiprocessing refuses to
+    start children from a daemonic process whatever the start method
+    (``AssertionError: daemonic processes are not allowed to have
+    children``, raised on the first submit). ``get_process_pool()`` falls
+    back to one interpreter per call there; callers whose calls are too
+    small to pay that start-up check this and work in-process instead.
+    """
+    return not multiprocessing.current_process().daemon
+
+
+# Run by ``python -c`` for one SubprocessPool call: a pickled
+# ``(fn, args, kwargs)`` on stdin, a pickled ``(ok, result or error)`` on
+# stdout. stdout is swapped for stderr first so stray prints can't corrupt it.
+_SUBPROCESS_SCRIPT = """\
+import pickle
+import sys
+
+out, sys.stdout = sys.stdout.buffer, sys.stderr
+fn, args, kwargs = pickle.load(sys.stdin.buffer)
+try:
+    result = (True, fn(*args, **kwargs))
+except Exception as e:
+    result = (False, f"{type(e).__name__}: {e}")
+pickle.dump(result, out)
+"""
+
+
+def _run_in_subprocess(fn: Callable, args: tuple, kwargs: dict):
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(p for p in sys.path if p)}
+    proc = subprocess.run(
+        [sys.executable, "-c", _SUBPROCESS_SCRIPT],
+        input=pickle.dumps((fn, args, kwargs)),
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env=env,
+        check=False,
+    )
+    if proc.returncode != 0 or not proc.stdout:
+        tail = proc.stderr[-500:].decode("utf-8", "replace").strip()
+        raise RuntimeError(f"Worker exited with {proc.returncode}: {tail}")
+    ok, result = pickle.loads(proc.stdout)
+    if not ok:
+        raise RuntimeError(result)
+    return result
+
+
+class SubprocessPool(Executor):
+    """Executor that runs each call in a fresh interpreter via ``subprocess``.
+
+    Daemonic processes may start plain subprocesses (pdf_to_word/chunked.py
+    relies on the same thing), so this works inside Celery prefork children.
+    At most ``max_workers`` interpreters run at once. Each call pays an
+    interpreter start-up, so submit coarse work such as a chunk of pages.
+    """
+
+    def __init__(self, max_workers: int):
+        self._threads = ThreadPoolExecutor(
+            max_workers=max(1, max_workers), thread_name_prefix="subprocess_pool"
+        )
+
+    def submit(self, fn, /, *args, **kwargs):
+        return self._threads.submit(_run_in_subprocess, fn, args, kwargs)
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        self._threads.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+
+def get_process_pool(max_workers: int) -> Executor:
+    """Process pool for CPU-bound page work (rendering, recompression).
+
+    Children are started with ``spawn``: forking a gunicorn worker copies its
+    threads' locks (the RSS sampler, Sentry, DB connections) in whatever
+    state they happen to be. Where ``can_use_process_pool()`` is false
+    (Celery prefork children) a ``SubprocessPool`` is returned instead.
+    Either way, worker functions must be module-level, importable without
+    Django settings, and take and return picklable values.
+    """
+    if not can_use_process_pool():
+        return SubprocessPool(max_workers)
+    return ProcessPoolExecutor(
+        max_workers=max(1, max_workers),
+        mp_context=multiprocessing.get_context("spawn"),
+    )
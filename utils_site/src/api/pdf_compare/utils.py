@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 import difflib
+import hashlib
 import json
 import os
+import re
 import tempfile
 import zipfile
 from datetime import UTC, datetime
@@ -22,12 +24,24 @@ from src.api.file_validation import (
     validate_pdf_file,
 )
 from src.api.logging_utils import get_logger
+from src.api.parallel_processing import get_process_pool
+from src.api.performance_config import get_performance_config
 from src.exceptions import ConversionError, InvalidPDFError, StorageError
 
 logger = get_logger(__name__)
 
 
-def _render_page_rgb_array(page: fitz.Page, zoom: float = 1.6) -> np.ndarray:
+# Full-resolution render scale for the images in the report.
+RENDER_ZOOM = 1.6
+# Screening pass renders at RENDER_ZOOM / _SCREEN_FACTOR in grayscale; one
+# screening pixel covers a _SCREEN_FACTOR x _SCREEN_FACTOR block of the report.
+_SCREEN_FACTOR = 4
+# Screening tile edge, in screening pixels. Only tiles with a difference get a
+# full-resolution diff and highlight.
+_SCREEN_TILE = 16
+
+
+def _render_page_rgb_array(page: fitz.Page, zoom: float = RENDER_ZOOM) -> np.ndarray:
     matrix = fitz.Matrix(zoom, zoom)
     pixmap = page.get_pixmap(matrix=matrix, alpha=False)
     array = np.frombuffer(pixmap.samples, dtype=np.uint8).reshape(
@@ -40,24 +54,344 @@ def _render_page_rgb_array(page: fitz.Page, zoom: float = 1.6) -> np.ndarray:
     return np.ascontiguousarray(array)
 
 
+def _render_page_gray_array(page: fitz.Page, zoom: float) -> np.ndarray:
+    pixmap = page.get_pixmap(
+        matrix=fitz.Matrix(zoom, zoom), colorspace=fitz.csGRAY, alpha=False
+    )
+    return np.frombuffer(pixmap.samples, dtype=np.uint8).reshape(
+        pixmap.height, pixmap.width
+    )
+
+
+def _render_size(page: fitz.Page, zoom: float = RENDER_ZOOM) -> tuple[int, int]:
+    """(height, width) of ``_render_page_rgb_array`` output, without rendering."""
+    rect = (page.rect * fitz.Matrix(zoom, zoom)).irect
+    return rect.height, rect.width
+
+
 def _pad_to_same_canvas(
     first: np.ndarray,
     second: np.ndarray,
 ) -> tuple[np.ndarray, np.ndarray]:
     target_height = max(first.shape[0], second.shape[0])
     target_width = max(first.shape[1], second.shape[1])
+    channels = first.shape[2:]
 
-    canvas_first = np.full((target_height, target_width, 3), 255, dtype=np.uint8)
-    canvas_second = np.full((target_height, target_width, 3), 255, dtype=np.uint8)
+    canvas_first = np.full((target_height, target_width, *channels), 255, np.uint8)
+    canvas_second = np.full((target_height, target_width, *channels), 255, np.uint8)
 
-    canvas_first[: first.shape[0], : first.shape[1], : first.shape[2]] = first[:, :, :3]
-    canvas_second[: second.shape[0], : second.shape[1], : second.shape[2]] = second[
-        :, :, :3
-    ]
+    canvas_first[: first.shape[0], : first.shape[1]] = first
+    canvas_second[: second.shape[0], : second.shape[1]] = second
 
     return canvas_first, canvas_second
 
 
+def _absdiff(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    """|first - second| for uint8 arrays, staying in uint8."""
+    return np.maximum(first, second) - np.minimum(first, second)
+
+
+# Indirect reference inside an object's source, e.g. ``12 0 R``.
+_REF = re.compile(r"\b(\d+) \d+ R\b")
+# Page-tree nodes are reached through /Parent, /P and link destinations; they
+# say where a page is, not what it draws.
+_PAGE_TREE_TYPES = {"/Page", "/Pages"}
+
+
+class _PageFingerprints:
+    """Content hashes of a document's pages, memoising shared objects.
+
+    A page's fingerprint covers its geometry, its content streams and every
+    object the page object reaches: the whole /Resources dictionary (fonts,
+    images, form XObjects, ExtGState, ColorSpace, Pattern, Shading) and the
+    /Annots array with each annotation's and widget's appearance streams.
+    Reference numbers are left out, so the same page saved with renumbered
+    objects still matches. Two pages with the same fingerprint draw the same
+    thing; unchanged pages of a revised contract normally match and can be
+    skipped without rendering.
+    """
+
+    def __init__(self, document: fitz.Document):
+        self.document = document
+        self._objects: dict[int, bytes] = {}
+
+    def _object_digest(self, xref: int, active: set[int]) -> bytes:
+        digest = self._objects.get(xref)
+        if digest is not None:
+            return digest
+        document = self.document
+        if not 0 < xref < document.xref_length():
+            return b"null"
+        if document.xref_get_key(xref, "Type")[1] in _PAGE_TREE_TYPES:
+            return b"page"
+        if xref in active:
+            return b"cycle"
+        active.add(xref)
+        digest = self._objects[xref] = self._source_digest(xref, active)
+        active.discard(xref)
+        return digest
+
+    def _source_digest(self, xref: int, active: set[int]) -> bytes:
+        source = self.document.xref_object(xref, compressed=True)
+        hasher = hashlib.sha256(_REF.sub("R", source).encode())
+        for ref in _REF.findall(source):
+            hasher.update(self._object_digest(int(ref), active))
+        if self.document.xref_is_stream(xref):
+            hasher.update(self.document.xref_stream_raw(xref) or b"")
+        return hasher.digest()
+
+    def page(self, page: fitz.Page) -> bytes:
+        hasher = hashlib.sha256()
+        hasher.update(repr((tuple(page.rect), page.rotation)).encode())
+        hasher.update(page.read_contents())
+        hasher.update(self._source_digest(page.xref, {page.xref}))
+        # Resources inherited from the page tree aren't in the page object.
+        inherited = (
+            page.get_fonts(full=True) + page.get_images(full=True) + page.get_xobjects()
+        )
+        for item in inherited:
+            if item[0] > 0:
+                hasher.update(self._object_digest(item[0], set()))
+        return hasher.digest()
+
+
+def _changed_tiles(
+    base_page: fitz.Page, compare_page: fitz.Page, diff_threshold: int
+) -> list[tuple[int, int, int, int]]:
+    """Screen two pages at low resolution; return changed full-res boxes.
+
+    Boxes are ``(top, left, bottom, right)`` in report (RENDER_ZOOM) pixels.
+    The screening threshold is halved because downsampling spreads a thin
+    change over a lighter, wider area.
+    """
+    zoom = RENDER_ZOOM / _SCREEN_FACTOR
+    base_small, compare_small = _pad_to_same_canvas(
+        _render_page_gray_array(base_page, zoom),
+        _render_page_gray_array(compare_page, zoom),
+    )
+    hot = _absdiff(base_small, compare_small) >= max(1, diff_threshold // 2)
+    if not hot.any():
+        return []
+
+    height, width = hot.shape
+    rows = -(-height // _SCREEN_TILE)
+    cols = -(-width // _SCREEN_TILE)
+    padded = np.zeros((rows * _SCREEN_TILE, cols * _SCREEN_TILE), dtype=bool)
+    padded[:height, :width] = hot
+    tiles = padded.reshape(rows, _SCREEN_TILE, cols, _SCREEN_TILE).any(axis=(1, 3))
+
+    edge = _SCREEN_TILE * _SCREEN_FACTOR
+    # One screening pixel of slack: rounding can shift content by a pixel.
+    slack = _SCREEN_FACTOR
+    return [
+        (
+            max(0, row * edge - slack),
+            max(0, col * edge - slack),
+            (row + 1) * edge + slack,
+            (col + 1) * edge + slack,
+        )
+        for row, col in zip(*np.nonzero(tiles), strict=True)
+    ]
+
+
+def _highlight(canvas: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """60% page + 40% red on ``mask`` pixels, in integer arithmetic."""
+    blended = canvas.copy()
+    pixels = canvas[mask].astype(np.uint16) * 3 // 5
+    pixels[:, 0] += 102  # 0.4 * 255
+    blended[mask] = pixels.astype(np.uint8)
+    return blended
+
+
+def _compare_page(
+    base_document: fitz.Document,
+    compare_document: fitz.Document,
+    base_fingerprints: _PageFingerprints,
+    compare_fingerprints: _PageFingerprints,
+    page_index: int,
+    diff_threshold: int,
+    assets_dir: str,
+) -> dict[str, object]:
+    page_number = page_index + 1
+    base_page = base_document[page_index] if page_index < len(base_document) else None
+    compare_page = (
+        compare_document[page_index] if page_index < len(compare_document) else None
+    )
+
+    if base_page is None:
+        page_status = "added_in_second_pdf"
+    elif compare_page is None:
+        page_status = "missing_in_second_pdf"
+    else:
+        page_status = "present_in_both"
+
+    report: dict[str, object] = {
+        "page": page_number,
+        "status": page_status,
+        "identical": False,
+        "changed_pixels": 0,
+        "total_pixels": 0,
+        "change_percent": 0.0,
+        "words_added": 0,
+        "words_removed": 0,
+        "text_similarity_percent": 100.0,
+        "diff_image": None,
+        "base_image": None,
+        "compare_image": None,
+    }
+
+    boxes: list[tuple[int, int, int, int]] | None = None  # None = whole page
+    if page_status == "present_in_both":
+        if base_fingerprints.page(base_page) == compare_fingerprints.page(compare_page):
+            height, width = _render_size(base_page)
+            report["identical"] = True
+            report["total_pixels"] = height * width
+            return report
+        if base_page.rect == compare_page.rect:
+            boxes = _changed_tiles(base_page, compare_page, diff_threshold)
+
+    old_text = base_page.get_text("text").strip() if base_page is not None else ""
+    new_text = compare_page.get_text("text").strip() if compare_page is not None else ""
+    words_added, words_removed, similarity = _word_diff_stats(old_text, new_text)
+    report.update(
+        words_added=words_added,
+        words_removed=words_removed,
+        text_similarity_percent=similarity,
+    )
+
+    if boxes == []:
+        # Content streams differ but nothing visible changed (re-saved or
+        # re-ordered drawing operators): no images needed.
+        height, width = _render_size(base_page)
+        report["total_pixels"] = height * width
+        return report
+
+    if base_page is None:
+        compare_image = _render_page_rgb_array(compare_page)
+        base_image = np.full_like(compare_image, 255)
+    elif compare_page is None:
+        base_image = _render_page_rgb_array(base_page)
+        compare_image = np.full_like(base_image, 255)
+    else:
+        base_image = _render_page_rgb_array(base_page)
+        compare_image = _render_page_rgb_array(compare_page)
+
+    base_canvas, compare_canvas = _pad_to_same_canvas(base_image, compare_image)
+    change_mask = np.zeros(base_canvas.shape[:2], dtype=bool)
+    if boxes is None:
+        boxes = [(0, 0, change_mask.shape[0], change_mask.shape[1])]
+    for top, left, bottom, right in boxes:
+        # Channel mean >= threshold  <=>  channel sum >= 3 * threshold.
+        diff = _absdiff(
+            base_canvas[top:bottom, left:right], compare_canvas[top:bottom, left:right]
+        ).sum(axis=2, dtype=np.uint16)
+        change_mask[top:bottom, left:right] |= diff >= 3 * diff_threshold
+
+    changed_pixels = int(np.count_nonzero(change_mask))
+    page_pixels = int(change_mask.size)
+
+    old_image_name = f"page_{page_number:03d}_base.png"
+    new_image_name = f"page_{page_number:03d}_compare.png"
+    diff_image_name = f"page_{page_number:03d}_diff.png"
+    Image.fromarray(base_canvas).save(os.path.join(assets_dir, old_image_name))
+    Image.fromarray(compare_canvas).save(os.path.join(assets_dir, new_image_name))
+    Image.fromarray(_highlight(compare_canvas, change_mask)).save(
+        os.path.join(assets_dir, diff_image_name)
+    )
+
+    report.update(
+        changed_pixels=changed_pixels,
+        total_pixels=page_pixels,
+        change_percent=round((changed_pixels / max(page_pixels, 1)) * 100, 2),
+        diff_image=f"comparison_assets/{diff_image_name}",
+        base_image=f"comparison_assets/{old_image_name}",
+        compare_image=f"comparison_assets/{new_image_name}",
+    )
+    return report
+
+
+def _compare_page_range(
+    base_path: str,
+    compare_path: str,
+    page_indices: list[int],
+    diff_threshold: int,
+    assets_dir: str,
+) -> list[dict[str, object]]:
+    """Compare ``page_indices`` of two PDFs; runs in a pool worker process."""
+    try:
+        with fitz.open(base_path) as base_document, fitz.open(
+            compare_path
+        ) as compare_document:
+            base_fingerprints = _PageFingerprints(base_document)
+            compare_fingerprints = _PageFingerprints(compare_document)
+            return [
+                _compare_page(
+                    base_document,
+                    compare_document,
+                    base_fingerprints,
+                    compare_fingerprints,
+                    page_index,
+                    diff_threshold,
+                    assets_dir,
+                )
+                for page_index in page_indices
+            ]
+    except Exception as e:
+        # MuPDF exceptions don't always pickle back to the parent process.
+        raise RuntimeError(f"{type(e).__name__}: {e}") from None
+
+
+def _compare_pages(
+    base_path: str,
+    compare_path: str,
+    max_pages: int,
+    diff_threshold: int,
+    assets_dir: str,
+    context: dict,
+) -> list[dict[str, object]]:
+    """Compare every page, in page-range chunks across the process pool.
+
+    Small documents and single-worker tiers compare in-process. Inside a
+    Celery prefork child the pool runs each chunk in its own interpreter
+    (see ``get_process_pool``).
+    """
+    perf = get_performance_config()
+    chunk_size = max(1, perf.get_batch_size("pdf_pages"))
+    chunks = [
+        list(range(start, min(start + chunk_size, max_pages)))
+        for start in range(0, max_pages, chunk_size)
+    ]
+    workers = min(perf.get_thread_workers("image_processing"), len(chunks))
+    if workers <= 1:
+        return _compare_page_range(
+            base_path, compare_path, list(range(max_pages)), diff_threshold, assets_dir
+        )
+
+    logger.info(
+        "Comparing PDF pages in parallel",
+        extra={
+            **context,
+            "event": "pdf_compare_parallel",
+            "pages": max_pages,
+            "workers": workers,
+            "chunk_size": chunk_size,
+        },
+    )
+    with get_process_pool(workers) as pool:
+        futures = [
+            pool.submit(
+                _compare_page_range,
+                base_path,
+                compare_path,
+                chunk,
+                diff_threshold,
+                assets_dir,
+            )
+            for chunk in chunks
+        ]
+        return [report for future in futures for report in future.result()]
+
+
 def _word_diff_stats(old_text: str, new_text: str) -> tuple[int, int, float]:
     old_words = old_text.split()
     new_words = new_text.split()
@@ -112,8 +446,11 @@ def compare_pdf_files(
 
         base_name = sanitize_filename(get_valid_filename(uploaded_file_1.name))
         compare_name = sanitize_filename(get_valid_filename(uploaded_file_2.name))
-        base_path = os.path.join(tmp_dir, base_name)
-        compare_path = os.path.join(tmp_dir, compare_name)
+        # Distinct on-disk names: two uploads called "contract.pdf" must not
+        # overwrite each other (the compare would then match a file to itself
+        # and every page would be reported identical).
+        base_path = os.path.join(tmp_dir, f"1_{base_name}")
+        compare_path = os.path.join(tmp_dir, f"2_{compare_name}")
 
         with open(base_path, "wb") as file_obj:
             for chunk in uploaded_file_1.chunks():
@@ -136,104 +473,15 @@ def compare_pdf_files(
             compare_path
         ) as compare_document:
             max_pages = max(len(base_document), len(compare_document))
-            assets_dir = os.path.join(tmp_dir, "comparison_assets")
-            os.makedirs(assets_dir, exist_ok=True)
-
-            page_reports: list[dict[str, object]] = []
-            total_changed_pixels = 0
-            total_pixels = 0
-
-            for page_index in range(max_pages):
-                page_number = page_index + 1
-                base_page = (
-                    base_document[page_index]
-                    if page_index < len(base_document)
-                    else None
-                )
-                compare_page = (
-                    compare_document[page_index]
-                    if page_index < len(compare_document)
-                    else None
-                )
-
-                if base_page is None and compare_page is not None:
-                    compare_image = _render_page_rgb_array(compare_page)
-                    base_image = np.full_like(compare_image, 255)
-                    page_status = "added_in_second_pdf"
-                elif compare_page is None and base_page is not None:
-                    base_image = _render_page_rgb_array(base_page)
-                    compare_image = np.full_like(base_image, 255)
-                    page_status = "missing_in_second_pdf"
-                else:
-                    base_image = _render_page_rgb_array(base_page)
-                    compare_image = _render_page_rgb_array(compare_page)
-                    page_status = "present_in_both"
-
-                base_canvas, compare_canvas = _pad_to_same_canvas(
-                    base_image, compare_image
-                )
+        assets_dir = os.path.join(tmp_dir, "comparison_assets")
+        os.makedirs(assets_dir, exist_ok=True)
 
-                diff_mean = np.abs(
-                    base_canvas.astype(np.int16) - compare_canvas.astype(np.int16)
-                )
-                diff_gray = diff_mean.mean(axis=2)
-                change_mask = diff_gray >= diff_threshold
-
-                changed_pixels = int(np.count_nonzero(change_mask))
-                page_pixels = int(change_mask.size)
-                change_percent = round((changed_pixels / max(page_pixels, 1)) * 100, 2)
-
-                total_changed_pixels += changed_pixels
-                total_pixels += page_pixels
-
-                highlight_overlay = compare_canvas.copy()
-                highlight_overlay[change_mask] = [255, 0, 0]
-                blended = np.clip(
-                    (compare_canvas.astype(np.float32) * 0.6)
-                    + (highlight_overlay.astype(np.float32) * 0.4),
-                    0,
-                    255,
-                ).astype(np.uint8)
-
-                old_image_name = f"page_{page_number:03d}_base.png"
-                new_image_name = f"page_{page_number:03d}_compare.png"
-                diff_image_name = f"page_{page_number:03d}_diff.png"
-
-                Image.fromarray(base_canvas).save(
-                    os.path.join(assets_dir, old_image_name)
-                )
-                Image.fromarray(compare_canvas).save(
-                    os.path.join(assets_dir, new_image_name)
-                )
-                Image.fromarray(blended).save(os.path.join(assets_dir, diff_image_name))
-
-                old_text = (
-                    base_page.get_text("text").strip() if base_page is not None else ""
-                )
-                new_text = (
-                    compare_page.get_text("text").strip()
-                    if compare_page is not None
-                    else ""
-                )
-                words_added, words_removed, similarity = _word_diff_stats(
-                    old_text, new_text
-                )
-
-                page_reports.append(
-                    {
-                        "page": page_number,
-                        "status": page_status,
-                        "changed_pixels": changed_pixels,
-                        "total_pixels": page_pixels,
-                        "change_percent": change_percent,
-                        "words_added": words_added,
-                        "words_removed": words_removed,
-                        "text_similarity_percent": similarity,
-                        "diff_image": f"comparison_assets/{diff_image_name}",
-                        "base_image": f"comparison_assets/{old_image_name}",
-                        "compare_image": f"comparison_assets/{new_image_name}",
-                    }
-                )
+        page_reports = _compare_pages(
+            base_path, compare_path, max_pages, diff_threshold, assets_dir, context
+        )
+        total_changed_pixels = sum(report["changed_pixels"] for report in page_reports)
+        total_pixels = sum(report["total_pixels"] for report in page_reports)
+        identical_pages = sum(1 for report in page_reports if report["identical"])
 
         overall_change = round((total_changed_pixels / max(total_pixels, 1)) * 100, 2)
         generated_at = datetime.now(UTC).isoformat()
@@ -245,6 +493,7 @@ def compare_pdf_files(
             f"- Base file: `{base_name}`",
             f"- Compared file: `{compare_name}`",
             f"- Pages analyzed: `{max_pages}`",
+            f"- Identical pages: `{identical_pages}`",
             f"- Overall visual change: `{overall_change}%`",
             "",
             "## Page Summary",
@@ -266,9 +515,10 @@ def compare_pdf_files(
 
         report_markdown_lines.extend(["", "## Visual Assets", ""])
         for page_report in page_reports:
-            report_markdown_lines.append(
-                f"- Page {page_report['page']}: `{page_report['diff_image']}`"
-            )
+            if page_report["diff_image"]:
+                report_markdown_lines.append(
+                    f"- Page {page_report['page']}: `{page_report['diff_image']}`"
+                )
 
         report_markdown = "\n".join(report_markdown_lines).strip() + "\n"
 
@@ -277,6 +527,7 @@ def compare_pdf_files(
             "base_file": base_name,
             "compared_file": compare_name,
             "pages_analyzed": max_pages,
+            "identical_pages": identical_pages,
             "overall_visual_change_percent": overall_change,
             "page_reports": page_reports,
         }
@@ -300,9 +551,14 @@ def compare_pdf_files(
             archive.write(report_md_path, arcname="report.md")
             archive.write(report_json_path, arcname="report.json")
 
+            # PNGs are already deflated; storing them skips a second pass.
             for asset_name in sorted(os.listdir(assets_dir)):
                 asset_path = os.path.join(assets_dir, asset_name)
-                archive.write(asset_path, arcname=f"comparison_assets/{asset_name}")
+                archive.write(
+                    asset_path,
+                    arcname=f"comparison_assets/{asset_name}",
+                    compress_type=zipfile.ZIP_STORED,
+                )
 
         is_output_valid, output_error = validate_output_file(
             output_path,
@@ -321,6 +577,7 @@ def compare_pdf_files(
                 "output_path": output_path,
                 "output_size": os.path.getsize(output_path),
                 "pages": max_pages,
+                "identical_pages": identical_pages,
                 "overall_change_percent": overall_change,
             },
         )
@@ -20,6 +20,7 @@ from ...file_validation import (
     validate_pdf_file,
 )
 from ...logging_utils import get_logger
+from ...pdf_tables import extract_page_tables
 from ...pdf_utils import execute_with_repair_fallback
 
 logger = get_logger(__name__)
@@ -105,7 +106,6 @@ def convert_pdf_to_excel(
         raise InvalidPDFError(validation_error or "Invalid PDF", context=context)
 
     def _pdf_to_excel_operation(pdf_path_inner: str):
-        import pdfplumber
         from openpyxl.drawing.image import Image as XLImage
         from pdf2image import convert_from_path
 
@@ -131,50 +131,31 @@ def convert_pdf_to_excel(
         text_pages = []
         image_pages = []
 
-        with pdfplumber.open(pdf_path_inner) as pdf:
-            total_pages = len(pdf.pages)
-            context["total_pages"] = total_pages
-
-            indices = page_indices if page_indices is not None else range(total_pages)
-
-            for idx in indices:
-                # Check cancellation at the start of each page
-                if callable(check_cancelled):
-                    check_cancelled()
-
-                if idx < 0 or idx >= total_pages:
-                    continue
-
-                page = pdf.pages[idx]
-                page_has_content = False
-
-                extracted_tables = []
-                try:
-                    extracted_tables = page.extract_tables() or []
-                except Exception:
-                    extracted_tables = []
+        page_models = extract_page_tables(
+            pdf_path_inner,
+            page_indices,
+            check_cancelled=check_cancelled,
+            context=context,
+        )
+        context["pages_processed"] = len(page_models)
 
-                for table in extracted_tables:
-                    if _is_real_table(table):
-                        tables.append({"page": idx + 1, "table": table})
-                        page_has_content = True
+        for idx, model in page_models.items():
+            page_has_content = False
+            for table in model.tables:
+                if _is_real_table(table.rows):
+                    tables.append({"page": idx + 1, "table": table.rows})
+                    page_has_content = True
 
-                if page_has_content:
-                    continue
+            if page_has_content:
+                continue
 
-                try:
-                    text = page.extract_text()
-                except Exception:
-                    text = None
-
-                if text:
-                    lines = [_normalize_text_line(line) for line in text.splitlines()]
-                    lines = [l for l in lines if l]
-                    if lines:
-                        text_pages.append({"page": idx + 1, "lines": lines})
-                        continue
+            lines = [_normalize_text_line(line) for line in model.text.splitlines()]
+            lines = [l for l in lines if l]
+            if lines:
+                text_pages.append({"page": idx + 1, "lines": lines})
+                continue
 
-                image_pages.append(idx)
+            image_pages.append(idx)
 
         with pd.ExcelWriter(output_path, engine="openpyxl") as writer:
             for i, item in enumerate(tables):
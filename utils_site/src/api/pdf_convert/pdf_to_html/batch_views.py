@@ -24,7 +24,9 @@ class PDFToHTMLBatchAPIView(BaseBatchAPIView):
         return os.path.dirname(input_path), output_path
 
     def get_zip_entry_name(self, original_name, output_path):
-        return f"{os.path.splitext(original_name)[0]}_convertica.html"
+        # .html, or .zip when page images were too large to inline
+        ext = os.path.splitext(output_path)[1]
+        return f"{os.path.splitext(original_name)[0]}_convertica{ext}"
 
     @combined_rate_limit(group="api_batch", ip_rate="10/h", methods=["POST"])
     @batch_premium_docs(summary="Pdf To Html (batch, premium)", file_field="pdf_files")
@@ -21,10 +21,21 @@ def pdf_to_html_docs():
             openapi.Parameter(
                 "extract_images",
                 openapi.IN_FORM,
-                description="Extract and embed images from PDF",
+                description="Add a picture of every page",
                 type=openapi.TYPE_BOOLEAN,
                 default=True,
             ),
+            openapi.Parameter(
+                "link_images",
+                openapi.IN_FORM,
+                description=(
+                    "Link page pictures too large to inline instead of "
+                    "embedding them; the response is then a ZIP of the HTML "
+                    "and its images"
+                ),
+                type=openapi.TYPE_BOOLEAN,
+                default=False,
+            ),
             openapi.Parameter(
                 "preserve_layout",
                 openapi.IN_FORM,
@@ -37,7 +48,10 @@ def pdf_to_html_docs():
         consumes=["multipart/form-data"],
         responses={
             200: openapi.Response(
-                description="HTML file",
+                description=(
+                    "HTML file, or with link_images a ZIP of the HTML and "
+                    "its page images"
+                ),
                 schema=openapi.Schema(type=openapi.TYPE_FILE),
             ),
             400: "Bad request - invalid file or parameters",
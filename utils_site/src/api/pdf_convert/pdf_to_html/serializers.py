@@ -14,7 +14,16 @@ class PDFToHTMLSerializer(serializers.Serializer):
     extract_images = serializers.BooleanField(
         default=True,
         required=False,
-        help_text="Extract and embed images from PDF",
+        help_text="Add a picture of every page",
+    )
+
+    link_images = serializers.BooleanField(
+        default=False,
+        required=False,
+        help_text=(
+            "Return page pictures too large to inline as files next to the "
+            "HTML; the response is then a ZIP"
+        ),
     )
 
     preserve_layout = serializers.BooleanField(
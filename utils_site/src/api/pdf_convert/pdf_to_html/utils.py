@@ -1,18 +1,33 @@
 """
 PDF to HTML conversion utilities.
 
-Converts PDF documents to HTML format with text extraction and optional image embedding.
+Converts PDF documents to HTML format with text extraction and optional page
+images.
+
+The document is written to disk page by page. PyMuPDF's structured text
+supplies the blocks of each page: positioned like the original with
+``preserve_layout``, or as flowing paragraphs without it. With
+``extract_images`` each page is also rendered as a WebP picture. Small
+pictures are inlined as data URIs. Larger ones become lazily loaded files
+next to the HTML, and the result is then a ZIP of the HTML plus a
+``<name>_files/`` folder. Memory and HTML size therefore stay flat however
+many pages the PDF has.
 """
 
 import base64
+import contextlib
+import html
+import io
 import os
+import shutil
 import tempfile
+import zipfile
+from collections.abc import Callable
 from pathlib import Path
 
+import fitz
 from django.core.files.uploadedfile import UploadedFile
 from django.utils.text import get_valid_filename
-from pdf2image import convert_from_path
-from pypdf import PdfReader
 from src.api.file_validation import (
     check_disk_space,
     sanitize_filename,
@@ -23,34 +38,218 @@ from src.exceptions import ConversionError, InvalidPDFError, StorageError
 
 logger = get_logger(__name__)
 
+IMAGE_DPI = 150
+IMAGE_QUALITY = 80
+# With ``link_images``, page images up to this size are inlined as data URIs;
+# larger ones are written next to the HTML and the output becomes a ZIP.
+INLINE_IMAGE_MAX_BYTES = 32 * 1024
+
+_HTML_HEAD = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title}</title>
+    <style>
+        body {{
+            font-family: Arial, sans-serif;
+            max-width: 800px;
+            margin: 0 auto;
+            padding: 20px;
+            background-color: #f5f5f5;
+        }}
+        .page {{
+            background-color: white;
+            padding: 40px;
+            margin-bottom: 20px;
+            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+            page-break-after: always;
+        }}
+        .layout {{
+            position: relative;
+            margin: 0 auto;
+            max-width: 100%;
+            overflow: hidden;
+        }}
+        .layout p {{
+            position: absolute;
+            margin: 0;
+            white-space: pre;
+            line-height: 1.15;
+        }}
+        .page-number {{
+            text-align: center;
+            color: #666;
+            font-size: 12px;
+            margin-top: 20px;
+        }}
+        img {{
+            display: block;
+            max-width: 100%;
+            height: auto;
+            margin: 20px auto 0;
+        }}
+    </style>
+</head>
+<body>
+"""
+
+_HTML_TAIL = """
+</body>
+</html>
+"""
+
+
+def _image_encoder() -> tuple[str, str, str]:
+    """(Pillow format, extension, MIME type): WebP when Pillow can write it."""
+    from PIL import features
+
+    if features.check("webp"):
+        return "WEBP", "webp", "image/webp"
+    return "JPEG", "jpg", "image/jpeg"
+
+
+def _render_page_image(page, image_format: str) -> bytes:
+    from PIL import Image
+
+    pix = page.get_pixmap(dpi=IMAGE_DPI, alpha=False, colorspace=fitz.csRGB)
+    image = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+    pix = None
+    buf = io.BytesIO()
+    image.save(buf, image_format, quality=IMAGE_QUALITY)
+    return buf.getvalue()
+
+
+class _PageImages:
+    """Page pictures: always inlined, or with ``link`` linked files in a ZIP.
+
+    When linking, the ZIP is only created for the first picture too large
+    to inline. ``finish()`` then adds the HTML to it and returns the ZIP as
+    the output.
+    """
+
+    def __init__(self, zip_path: str, assets_dir: str, link: bool = False):
+        self.zip_path = zip_path
+        self.assets_dir = assets_dir
+        self.link = link
+        self.format, self.ext, self.mime = _image_encoder()
+        self.linked = 0
+        self._zip = None
+
+    def img_tag(self, page, page_number: int) -> str:
+        data = _render_page_image(page, self.format)
+        if not self.link or len(data) <= INLINE_IMAGE_MAX_BYTES:
+            src = f"data:{self.mime};base64,{base64.b64encode(data).decode()}"
+        else:
+            if self._zip is None:
+                self._zip = zipfile.ZipFile(self.zip_path, "w", zipfile.ZIP_DEFLATED)
+            src = f"{self.assets_dir}/page-{page_number}.{self.ext}"
+            # Already compressed: store, don't deflate.
+            self._zip.writestr(src, data, zipfile.ZIP_STORED)
+            self.linked += 1
+        return (
+            f'<img src="{html.escape(src)}" alt="Page {page_number}" '
+            'loading="lazy" decoding="async" />\n'
+        )
+
+    def finish(self, html_path: str, html_name: str) -> str:
+        """Return the output path: the HTML, or the ZIP with the HTML added."""
+        if self._zip is None:
+            return html_path
+        with open(html_path, "rb") as src, self._zip.open(html_name, "w") as dst:
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+        self._zip.close()
+        self._zip = None
+        os.remove(html_path)
+        return self.zip_path
+
+    def discard(self) -> None:
+        """Drop a half-written ZIP after a failure (no-op after ``finish``)."""
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+            with contextlib.suppress(OSError):
+                os.remove(self.zip_path)
+
+
+def _line_text(line: dict) -> str:
+    return "".join(span["text"] for span in line.get("spans", []))
+
+
+def _flow_blocks(text_dict: dict):
+    """One ``<p>`` per text block, its lines joined with spaces."""
+    for block in text_dict.get("blocks", []):
+        if block.get("type") != 0:
+            continue
+        text = " ".join(
+            line_text.strip()
+            for line_text in map(_line_text, block.get("lines", []))
+            if line_text.strip()
+        )
+        if text:
+            yield f"<p>{html.escape(text)}</p>\n"
+
+
+def _layout_blocks(text_dict: dict):
+    """Absolutely positioned lines, in PDF points, inside a page-sized box."""
+    yield (
+        f'<div class="layout" style="width:{text_dict["width"]:.0f}pt;'
+        f'height:{text_dict["height"]:.0f}pt">\n'
+    )
+    for block in text_dict.get("blocks", []):
+        if block.get("type") != 0:
+            continue
+        for line in block.get("lines", []):
+            text = _line_text(line)
+            if not text.strip():
+                continue
+            x0, y0 = line["bbox"][:2]
+            size = max(span["size"] for span in line["spans"])
+            yield (
+                f'<p style="left:{x0:.1f}pt;top:{y0:.1f}pt;font-size:{size:.1f}pt">'
+                f"{html.escape(text)}</p>\n"
+            )
+    yield "</div>\n"
+
 
 def convert_pdf_to_html(
     uploaded_file: UploadedFile,
     extract_images: bool = True,
     preserve_layout: bool = True,
+    link_images: bool = False,
     suffix: str = "_convertica",
+    context: dict | None = None,
+    check_cancelled: Callable[[], None] | None = None,
 ) -> tuple[str, str]:
     """Convert PDF to HTML.
 
     Args:
         uploaded_file: PDF file to convert
-        extract_images: Whether to extract and embed images
+        extract_images: Whether to add a picture of every page
         preserve_layout: Whether to preserve PDF layout
+        link_images: Return page pictures too large to inline as files
+            next to the HTML, in a ZIP, instead of inlining every picture
         suffix: Suffix for output filename
+        context: Optional logging context
+        check_cancelled: Called between pages; raises to abort
 
     Returns:
-        Tuple of (input_path, output_path)
+        Tuple of (input_path, output_path). ``output_path`` is a single
+        ``.html`` file, or with ``link_images`` a ``.zip`` of the HTML and
+        its page images when any image was too large to inline.
 
     Raises:
         ConversionError: If conversion fails
         StorageError: If disk space is insufficient
     """
     context = {
+        **(context or {}),
         "function": "convert_pdf_to_html",
         "input_filename": os.path.basename(uploaded_file.name),
         "input_size": uploaded_file.size,
         "extract_images": extract_images,
         "preserve_layout": preserve_layout,
+        "link_images": link_images,
     }
 
     logger.info("Starting PDF to HTML conversion", extra=context)
@@ -75,129 +274,64 @@ def convert_pdf_to_html(
                 f.write(chunk)
 
         # Validate up front so a corrupt / non-PDF .pdf is a clean 400 instead
-        # of a generic 500 out of PdfReader/pdf2image.
+        # of a generic 500 out of the renderer.
         is_valid, pdf_error = validate_pdf_file(input_path, context)
         if not is_valid:
             raise InvalidPDFError(pdf_error or "Invalid or corrupt PDF file.")
 
         logger.debug("Saved PDF file", extra={**context, "input_path": input_path})
 
-        # Read PDF
-        reader = PdfReader(input_path)
-        num_pages = len(reader.pages)
-
-        logger.info(
-            f"Processing {num_pages} pages",
-            extra={**context, "num_pages": num_pages},
-        )
-
-        # Start HTML document
-        html_content = """<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>PDF to HTML - Convertica</title>
-    <style>
-        body {
-            font-family: Arial, sans-serif;
-            max-width: 800px;
-            margin: 0 auto;
-            padding: 20px;
-            background-color: #f5f5f5;
-        }
-        .page {
-            background-color: white;
-            padding: 40px;
-            margin-bottom: 20px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            page-break-after: always;
-        }
-        .page-number {
-            text-align: center;
-            color: #666;
-            font-size: 12px;
-            margin-top: 20px;
-        }
-        img {
-            max-width: 100%;
-            height: auto;
-        }
-    </style>
-</head>
-<body>
-"""
-
-        # Process each page
-        for page_num in range(num_pages):
-            page = reader.pages[page_num]
-
-            html_content += '<div class="page">\n'
-
-            # Extract text
-            try:
-                text = page.extract_text()
-                if text.strip():
-                    # Convert text to HTML paragraphs
-                    paragraphs = text.split("\n\n")
-                    for para in paragraphs:
-                        if para.strip():
-                            html_content += f"<p>{para.strip()}</p>\n"
-            except Exception as e:
-                logger.warning(
-                    f"Failed to extract text from page {page_num + 1}: {e}",
-                    extra={**context, "page": page_num + 1},
+        base_name = Path(safe_filename).stem
+        html_name = f"{base_name}{suffix}.html"
+        html_path = os.path.join(tmp_dir, html_name)
+        zip_path = os.path.join(tmp_dir, f"{base_name}{suffix}.zip")
+        images = _PageImages(zip_path, f"{base_name}{suffix}_files", link_images)
+
+        try:
+            with (
+                fitz.open(input_path) as doc,
+                open(html_path, "w", encoding="utf-8") as out,
+            ):
+                num_pages = doc.page_count
+                logger.info(
+                    f"Processing {num_pages} pages",
+                    extra={**context, "num_pages": num_pages},
                 )
-
-            # Add page number
-            html_content += (
-                f'<div class="page-number">Page {page_num + 1} of {num_pages}</div>\n'
-            )
-            html_content += "</div>\n\n"
-
-        # If extract_images is enabled, convert pages to images as fallback
-        if extract_images:
-            logger.info("Converting pages to images", extra=context)
-            try:
-                images = convert_from_path(input_path, dpi=150)
-
-                html_content += '<div class="page">\n'
-                html_content += "<h2>PDF Pages as Images</h2>\n"
-
-                for idx, image in enumerate(images):
-                    # Save image temporarily
-                    img_path = os.path.join(tmp_dir, f"page_{idx + 1}.png")
-                    image.save(img_path, "PNG")
-
-                    # Read and encode image as base64
-                    with open(img_path, "rb") as img_file:
-                        img_data = base64.b64encode(img_file.read()).decode()
-
-                    html_content += f'<img src="data:image/png;base64,{img_data}" alt="Page {idx + 1}" />\n'
-
-                    # Clean up temp image
-                    os.remove(img_path)
-
-                html_content += "</div>\n"
-            except Exception as e:
-                logger.warning(
-                    f"Failed to convert pages to images: {e}",
-                    extra={**context, "error": str(e)},
+                out.write(
+                    _HTML_HEAD.format(title=html.escape(f"{base_name} - Convertica"))
                 )
 
-        # Close HTML document
-        html_content += """
-</body>
-</html>
-"""
-
-        # Save HTML file
-        base_name = Path(safe_filename).stem
-        output_filename = f"{base_name}{suffix}.html"
-        output_path = os.path.join(tmp_dir, output_filename)
-
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
+                for page_num in range(num_pages):
+                    if callable(check_cancelled):
+                        check_cancelled()
+                    page = doc[page_num]
+
+                    out.write('<div class="page">\n')
+                    try:
+                        text_dict = page.get_text("dict", flags=fitz.TEXTFLAGS_TEXT)
+                        out.writelines(
+                            _layout_blocks(text_dict)
+                            if preserve_layout
+                            else _flow_blocks(text_dict)
+                        )
+                    except RuntimeError as e:
+                        logger.warning(
+                            f"Failed to extract text from page {page_num + 1}: {e}",
+                            extra={**context, "page": page_num + 1},
+                        )
+                    if extract_images:
+                        out.write(images.img_tag(page, page_num + 1))
+                    out.write(
+                        f'<div class="page-number">Page {page_num + 1} of {num_pages}</div>\n'
+                    )
+                    out.write("</div>\n\n")
+                    page = None
+
+                out.write(_HTML_TAIL)
+
+            output_path = images.finish(html_path, html_name)
+        finally:
+            images.discard()
 
         output_size = os.path.getsize(output_path)
         logger.info(
@@ -207,12 +341,17 @@ def convert_pdf_to_html(
                 "output_path": output_path,
                 "output_size": output_size,
                 "num_pages": num_pages,
+                "linked_images": images.linked,
             },
         )
 
         return input_path, output_path
 
-    except Exception as e:
+    except ConversionError:
+        raise
+    # Renderer / encoder / filesystem failures. Anything else (notably the
+    # task's cancellation exception) propagates unchanged.
+    except (RuntimeError, ValueError, OSError, zipfile.BadZipFile) as e:
         logger.exception(
             "PDF to HTML conversion failed",
             extra={**context, "error": str(e)},
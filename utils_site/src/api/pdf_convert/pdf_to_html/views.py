@@ -39,12 +39,15 @@ class PDFToHTMLAPIView(BaseConversionAPIView):
         """Convert PDF to HTML."""
         extract_images = kwargs.get("extract_images", True)
         preserve_layout = kwargs.get("preserve_layout", True)
+        link_images = kwargs.get("link_images", False)
 
         input_path, output_path = convert_pdf_to_html(
             uploaded_file=uploaded_file,
             extract_images=extract_images,
             preserve_layout=preserve_layout,
+            link_images=link_images,
             suffix="_convertica",
+            context=context,
         )
 
         return input_path, output_path
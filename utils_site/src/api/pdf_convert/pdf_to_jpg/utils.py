@@ -2,12 +2,14 @@
 PDF to JPG conversion utilities with parallel processing optimization.
 """
 
+import contextlib
 import os
-import shutil
 import tempfile
 import zipfile
 from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, wait
 
+import fitz
 from asgiref.sync import async_to_sync
 from django.core.files.uploadedfile import UploadedFile
 
@@ -20,9 +22,146 @@ from ....exceptions import ConversionError, InvalidPDFError, StorageError
 from ...file_validation import check_disk_space, sanitize_filename
 from ...logging_utils import get_logger
 from ...optimization_manager import optimization_manager
+from ...parallel_processing import get_process_pool
+from ...performance_config import get_performance_config
 
 logger = get_logger(__name__)
 
+# JPEG quality for rendered pages (visually lossless at print DPIs).
+JPEG_QUALITY = 85
+
+
+def _render_page_chunk(
+    pdf_path: str,
+    page_indices: list[int],
+    dpi: int,
+    out_dir: str,
+    check_cancelled: Callable[[], None] | None = None,
+) -> list[tuple[int, str]]:
+    """Render ``page_indices`` (0-based) to ``page_<n>.jpg`` files in ``out_dir``.
+
+    Module-level so it can run in a pool worker process. Pages beyond the
+    end of the document (as MuPDF counts them) are skipped, not errors.
+    ``check_cancelled`` (in-process use only) runs before each page.
+    """
+    rendered = []
+    with fitz.open(pdf_path) as doc:
+        for idx in page_indices:
+            if callable(check_cancelled):
+                check_cancelled()
+            if idx >= doc.page_count:
+                continue
+            pix = doc[idx].get_pixmap(dpi=dpi, alpha=False)
+            out_path = os.path.join(out_dir, f"page_{idx + 1}.jpg")
+            pix.save(out_path, jpg_quality=JPEG_QUALITY)
+            pix = None
+            rendered.append((idx, out_path))
+    return rendered
+
+
+def _render_pages_to_zip(
+    pdf_path: str,
+    page_indices: list[int],
+    dpi: int,
+    tmp_dir: str,
+    zip_path: str,
+    check_cancelled: Callable[[], None] | None = None,
+    context: dict | None = None,
+) -> int:
+    """Render pages with PyMuPDF and stream them into an uncompressed ZIP.
+
+    Pages are split into chunks of the tier's ``pdf_pages`` batch size and
+    rendered across a process pool (MuPDF holds the GIL while rasterizing, so
+    threads would not help). Each JPEG is appended to the archive, in page
+    order, and deleted as soon as it is archived, so disk use stays at a few
+    chunks rather than the whole document. JPEG data is already compressed;
+    ``ZIP_STORED`` skips a deflate pass that saved almost nothing.
+
+    Small jobs (one chunk, or a single-worker tier) render in-process, in one
+    pass over a single open document, to avoid the pool's start-up cost.
+    Inside a Celery prefork child the pool runs each chunk in its own
+    interpreter (see ``get_process_pool``), so the worker renders in parallel
+    too. ``check_cancelled`` runs between pages/chunks.
+    Returns the number of pages written.
+    """
+    perf = get_performance_config()
+    chunk_size = max(1, perf.get_batch_size("pdf_pages"))
+    chunks = [
+        page_indices[i : i + chunk_size]
+        for i in range(0, len(page_indices), chunk_size)
+    ]
+    workers = min(perf.get_thread_workers("image_processing"), len(chunks))
+    written = 0
+
+    def _cancelled() -> None:
+        if callable(check_cancelled):
+            check_cancelled()
+
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_STORED) as zipf:
+
+        def _add(render) -> None:
+            nonlocal written
+            try:
+                rendered = render()
+            except Exception as e:
+                logger.error(f"PDF page rendering failed: {e}")
+                raise ConversionError(
+                    f"Failed to convert PDF pages to images: {e}"
+                ) from e
+            for _idx, image_path in rendered:
+                zipf.write(image_path, os.path.basename(image_path))
+                with contextlib.suppress(OSError):
+                    os.remove(image_path)
+                written += 1
+
+        if workers <= 1:
+            _add(
+                lambda: _render_page_chunk(
+                    pdf_path, page_indices, dpi, tmp_dir, check_cancelled
+                )
+            )
+            return written
+
+        logger.info(
+            "Rendering PDF pages in parallel",
+            extra={
+                **(context or {}),
+                "event": "pdf_to_jpg_parallel",
+                "pages": len(page_indices),
+                "workers": workers,
+                "chunk_size": chunk_size,
+            },
+        )
+        pool = get_process_pool(workers)
+        pending: dict = {}  # future -> chunk number
+        finished: dict = {}  # chunk number -> future, awaiting its turn
+        next_chunk = 0
+
+        def _collect(done) -> None:
+            # Archive in page order: hold early finishers until their turn.
+            nonlocal next_chunk
+            for future in done:
+                finished[pending.pop(future)] = future
+            while next_chunk in finished:
+                _add(finished.pop(next_chunk).result)
+                next_chunk += 1
+
+        try:
+            for chunk_no, chunk in enumerate(chunks):
+                _cancelled()
+                if len(pending) >= workers:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    _collect(done)
+                future = pool.submit(_render_page_chunk, pdf_path, chunk, dpi, tmp_dir)
+                pending[future] = chunk_no
+            while pending:
+                _cancelled()
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                _collect(done)
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+    return written
+
 
 def convert_pdf_to_jpg(
     uploaded_file: UploadedFile,
@@ -136,79 +275,26 @@ def convert_pdf_to_jpg_sequential(
         if not page_indices:
             raise InvalidPDFError(f"No valid pages found for pages={pages}")
 
-        # Fast PDF to JPG conversion using pdf2image
-        try:
-            from pdf2image import convert_from_path
-
-            first_page = page_indices[0] + 1
-            last_page = page_indices[-1] + 1
-
-            thread_count = 1
-            try:
-                thread_count = max(
-                    1,
-                    min(
-                        2,
-                        int(
-                            getattr(optimization_manager, "config", {})
-                            .get("thread_workers", {})
-                            .get("image", 1)
-                        ),
-                    ),
-                )
-            except Exception:
-                thread_count = 1
-
-            # Use paths_only to avoid holding large PIL images in memory
-            image_paths = convert_from_path(
-                pdf_path,
-                dpi=dpi,
-                first_page=first_page,
-                last_page=last_page,
-                fmt="jpeg",
-                output_folder=tmp_dir,
-                paths_only=True,
-                thread_count=thread_count,
-                use_pdftocairo=True,
-            )
-
-            images = []
-            for i, src_path in enumerate(image_paths):
-                if callable(check_cancelled):
-                    check_cancelled()
-                page_num = page_indices[i] + 1
-                dst_path = os.path.join(tmp_dir, f"page_{page_num}.jpg")
-                if src_path != dst_path:
-                    try:
-                        os.replace(src_path, dst_path)
-                    except OSError:
-                        shutil.copy2(src_path, dst_path)
-                        try:
-                            os.remove(src_path)
-                        except OSError:
-                            pass
-                images.append(dst_path)
-
-        except ImportError as e:
-            logger.error("pdf2image not available: %s", e)
-            raise ConversionError(
-                "PDF to JPG conversion requires pdf2image and Poppler to be installed."
-            ) from e
-        except Exception as e:
-            logger.error(f"pdf2image conversion failed: {e}")
-            raise ConversionError(f"Failed to convert PDF pages to images: {e}") from e
-
-        if not images:
-            # pdf2image returned an empty list WITHOUT raising. This happens when
-            # poppler's own page count (pdfinfo) disagrees with pypdf's: the
-            # first_page/last_page range — derived above from pypdf's total_pages
-            # — gets clamped down to poppler's count, collapses to empty, and
-            # convert_from_path silently returns [] (pdf2image.py:172-173). The
-            # file is one poppler cannot rasterize (malformed / unsupported), not
-            # a transient system fault. Raise InvalidPDFError so the Celery task
-            # classifies it as user input (_is_user_input_error) and does NOT
-            # retry — retrying a deterministically-unrenderable PDF only
-            # amplified the same failure into Sentry (CONVERTICA-5D).
+        rendered = _render_pages_to_zip(
+            pdf_path,
+            page_indices,
+            dpi,
+            tmp_dir,
+            zip_path,
+            check_cancelled=check_cancelled,
+            context=parse_context,
+        )
+
+        if not rendered:
+            # The renderer produced nothing WITHOUT raising. This happens when
+            # the renderer's own page count disagrees with pypdf's: every index
+            # in page_indices — derived above from pypdf's total_pages — is
+            # past the end of the document as MuPDF sees it. The file is one we
+            # cannot rasterize (malformed / unsupported), not a transient
+            # system fault. Raise InvalidPDFError so the Celery task classifies
+            # it as user input (_is_user_input_error) and does NOT retry —
+            # retrying a deterministically-unrenderable PDF only amplified the
+            # same failure into Sentry (CONVERTICA-5D).
             raise InvalidPDFError(
                 "The PDF could not be rendered to images. It may be invalid, "
                 "corrupted, or use unsupported features — try re-saving it "
@@ -216,13 +302,6 @@ def convert_pdf_to_jpg_sequential(
                 context=parse_context,
             )
 
-        # Create ZIP archive
-        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zipf:
-            for image_path in images:
-                if callable(check_cancelled):
-                    check_cancelled()
-                zipf.write(image_path, os.path.basename(image_path))
-
         return pdf_path, zip_path
 
     except Exception:
@@ -231,7 +310,7 @@ def convert_pdf_to_jpg_sequential(
         raise
 
     finally:
-        # Cleanup temporary images
+        # Cleanup temporary images (normally already removed once zipped)
         for page_idx in page_indices:
             image_path = os.path.join(tmp_dir, f"page_{page_idx + 1}.jpg")
             if os.path.exists(image_path):
@@ -9,7 +9,6 @@ from collections import Counter
 from pathlib import Path
 
 import fitz
-import pdfplumber
 from django.core.files.uploadedfile import UploadedFile
 from django.utils.text import get_valid_filename
 from src.api.file_validation import (
@@ -19,6 +18,7 @@ from src.api.file_validation import (
     validate_pdf_file,
 )
 from src.api.logging_utils import get_logger
+from src.api.pdf_tables import extract_page_tables
 from src.exceptions import ConversionError, InvalidPDFError, StorageError
 
 logger = get_logger(__name__)
@@ -45,10 +45,10 @@ def _render_markdown_table(rows: list[list[str | None]]) -> str:
         return ""
 
     max_cols = max(len(row) for row in normalized_rows)
-    # A one-column "table" carries no tabular information, and pdfplumber reports
-    # one for any bordered box — a framed page or a callout swallowed the whole
-    # text into a single cell, losing headings and paragraph breaks. Decline it so
-    # the caller keeps the lines as prose.
+    # A one-column "table" carries no tabular information, and table detection
+    # reports one for any bordered box — a framed page or a callout swallowed the
+    # whole text into a single cell, losing headings and paragraph breaks. Decline
+    # it so the caller keeps the lines as prose.
     if max_cols < 2:
         return ""
     padded_rows = [row + [""] * (max_cols - len(row)) for row in normalized_rows]
@@ -179,132 +179,131 @@ def convert_pdf_to_markdown(
                 validation_error or "Invalid PDF file", context=context
             )
 
+        page_tables = {}
+        if preserve_tables:
+            try:
+                page_tables = extract_page_tables(input_path, context=context)
+            except Exception as table_error:  # noqa: BLE001
+                logger.warning(
+                    "Table extraction warning",
+                    extra={**context, "error": str(table_error)},
+                )
+
         with fitz.open(input_path) as document:
             body_size, heading_levels = _collect_heading_levels(document)
             page_markdown_blocks: list[str] = []
 
-            with pdfplumber.open(input_path) as plumber_doc:
-                for page_index, page in enumerate(document):
-                    text_items: list[dict[str, object]] = []
-                    table_items: list[dict[str, object]] = []
-                    table_bboxes: list[tuple[float, float, float, float]] = []
-
-                    if preserve_tables:
-                        try:
-                            for table in plumber_doc.pages[page_index].find_tables():
-                                markdown_table = _render_markdown_table(table.extract())
-                                if markdown_table:
-                                    x0, y0, x1, y1 = tuple(float(v) for v in table.bbox)
-                                    table_bboxes.append((x0, y0, x1, y1))
-                                    table_items.append(
-                                        {
-                                            "type": "table",
-                                            "x": x0,
-                                            "y": y0,
-                                            "text": markdown_table,
-                                        }
-                                    )
-                        except Exception as table_error:  # noqa: BLE001
-                            logger.warning(
-                                "Table extraction warning",
-                                extra={
-                                    **context,
-                                    "page": page_index + 1,
-                                    "error": str(table_error),
-                                },
-                            )
+            for page_index, page in enumerate(document):
+                text_items: list[dict[str, object]] = []
+                table_items: list[dict[str, object]] = []
+                table_bboxes: list[tuple[float, float, float, float]] = []
+
+                page_model = page_tables.get(page_index)
+                for table in page_model.tables if page_model else []:
+                    markdown_table = _render_markdown_table(table.rows)
+                    if markdown_table:
+                        x0, y0, x1, y1 = table.bbox
+                        table_bboxes.append((x0, y0, x1, y1))
+                        table_items.append(
+                            {
+                                "type": "table",
+                                "x": x0,
+                                "y": y0,
+                                "text": markdown_table,
+                            }
+                        )
+
+                blocks = page.get_text("dict").get("blocks", [])
+                for block in blocks:
+                    if block.get("type") != 0:
+                        continue
+
+                    for line in block.get("lines", []):
+                        spans = line.get("spans", [])
+                        line_text = _clean_text(
+                            "".join(span.get("text", "") for span in spans)
+                        )
+                        if not line_text:
+                            continue
 
-                    blocks = page.get_text("dict").get("blocks", [])
-                    for block in blocks:
-                        if block.get("type") != 0:
+                        bbox = line.get("bbox")
+                        if not bbox or len(bbox) != 4:
                             continue
 
-                        for line in block.get("lines", []):
-                            spans = line.get("spans", [])
-                            line_text = _clean_text(
-                                "".join(span.get("text", "") for span in spans)
-                            )
-                            if not line_text:
-                                continue
-
-                            bbox = line.get("bbox")
-                            if not bbox or len(bbox) != 4:
-                                continue
-
-                            bbox_tuple = tuple(float(value) for value in bbox)
-                            if _bbox_is_inside_any_table(bbox_tuple, table_bboxes):
-                                continue
-
-                            line_font_size = max(
-                                (
-                                    round(float(span.get("size", body_size)), 1)
-                                    for span in spans
-                                    if _clean_text(span.get("text", ""))
-                                ),
-                                default=body_size,
-                            )
+                        bbox_tuple = tuple(float(value) for value in bbox)
+                        if _bbox_is_inside_any_table(bbox_tuple, table_bboxes):
+                            continue
 
-                            heading_level = None
-                            if detect_headings:
-                                heading_level = _resolve_heading_level(
-                                    line_text=line_text,
-                                    line_font_size=line_font_size,
-                                    body_size=body_size,
-                                    heading_levels=heading_levels,
-                                )
-
-                            if heading_level:
-                                markdown_line = f"{'#' * heading_level} {line_text}"
-                            else:
-                                markdown_line = line_text
-
-                            text_items.append(
-                                {
-                                    "type": "text",
-                                    "x": bbox_tuple[0],
-                                    "y": bbox_tuple[1],
-                                    "text": markdown_line,
-                                }
+                        line_font_size = max(
+                            (
+                                round(float(span.get("size", body_size)), 1)
+                                for span in spans
+                                if _clean_text(span.get("text", ""))
+                            ),
+                            default=body_size,
+                        )
+
+                        heading_level = None
+                        if detect_headings:
+                            heading_level = _resolve_heading_level(
+                                line_text=line_text,
+                                line_font_size=line_font_size,
+                                body_size=body_size,
+                                heading_levels=heading_levels,
                             )
 
-                    merged_items = sorted(
-                        [*text_items, *table_items],
-                        key=lambda item: (float(item["y"]), float(item["x"])),
-                    )
-
-                    page_lines: list[str] = []
-                    for item in merged_items:
-                        item_text = str(item["text"]).strip()
-                        if not item_text:
-                            continue
-
-                        if item["type"] == "table":
-                            if page_lines and page_lines[-1] != "":
-                                page_lines.append("")
-                            page_lines.extend(item_text.splitlines())
+                        if heading_level:
+                            markdown_line = f"{'#' * heading_level} {line_text}"
+                        else:
+                            markdown_line = line_text
+
+                        text_items.append(
+                            {
+                                "type": "text",
+                                "x": bbox_tuple[0],
+                                "y": bbox_tuple[1],
+                                "text": markdown_line,
+                            }
+                        )
+
+                merged_items = sorted(
+                    [*text_items, *table_items],
+                    key=lambda item: (float(item["y"]), float(item["x"])),
+                )
+
+                page_lines: list[str] = []
+                for item in merged_items:
+                    item_text = str(item["text"]).strip()
+                    if not item_text:
+                        continue
+
+                    if item["type"] == "table":
+                        if page_lines and page_lines[-1] != "":
                             page_lines.append("")
-                            continue
+                        page_lines.extend(item_text.splitlines())
+                        page_lines.append("")
+                        continue
 
-                        if item_text.startswith("#"):
-                            if page_lines and page_lines[-1] != "":
-                                page_lines.append("")
-                            page_lines.append(item_text)
+                    if item_text.startswith("#"):
+                        if page_lines and page_lines[-1] != "":
                             page_lines.append("")
-                        else:
-                            page_lines.append(item_text)
-
-                    page_content = re.sub(
-                        r"\n{3,}",
-                        "\n\n",
-                        "\n".join(page_lines).strip(),
-                    )
-
-                    if not page_content:
-                        page_content = "_No extractable text on this page._"
-
-                    if len(document) > 1:
-                        page_content = f"## Page {page_index + 1}\n\n{page_content}"
-                    page_markdown_blocks.append(page_content)
+                        page_lines.append(item_text)
+                        page_lines.append("")
+                    else:
+                        page_lines.append(item_text)
+
+                page_content = re.sub(
+                    r"\n{3,}",
+                    "\n\n",
+                    "\n".join(page_lines).strip(),
+                )
+
+                if not page_content:
+                    page_content = "_No extractable text on this page._"
+
+                if len(document) > 1:
+                    page_content = f"## Page {page_index + 1}\n\n{page_content}"
+                page_markdown_blocks.append(page_content)
 
         markdown_content = "\n\n---\n\n".join(page_markdown_blocks).strip() + "\n"
 
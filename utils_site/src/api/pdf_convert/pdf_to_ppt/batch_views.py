@@ -17,9 +17,15 @@ class PDFToPowerPointBatchAPIView(BaseBatchAPIView):
     TMP_PREFIX = "pdf2ppt_batch_"
     OUTPUT_ZIP_FILENAME = "pdf_to_ppt_convertica.zip"
 
+    def get_post_params(self, request):
+        return {
+            "editable_text": str(request.POST.get("editable_text", "false")).lower()
+            == "true",
+        }
+
     def convert_single(self, uploaded_file, context, **params):
         input_path, output_path = convert_pdf_to_ppt(
-            uploaded_file, suffix="_convertica"
+            uploaded_file, suffix="_convertica", **params
         )
         return os.path.dirname(input_path), output_path
 
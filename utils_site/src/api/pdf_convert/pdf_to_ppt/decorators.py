@@ -25,6 +25,13 @@ def pdf_to_ppt_docs():
                 type=openapi.TYPE_BOOLEAN,
                 default=True,
             ),
+            openapi.Parameter(
+                "editable_text",
+                openapi.IN_FORM,
+                description="Add the page text as editable text boxes over each slide",
+                type=openapi.TYPE_BOOLEAN,
+                default=False,
+            ),
         ],
         request_body=None,  # disable auto-detect (manual params use multipart/form-data)
         consumes=["multipart/form-data"],
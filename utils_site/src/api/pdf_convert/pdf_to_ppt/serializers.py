@@ -16,3 +16,9 @@ class PDFToPowerPointSerializer(serializers.Serializer):
         required=False,
         help_text="Extract and include images from PDF",
     )
+
+    editable_text = serializers.BooleanField(
+        default=False,
+        required=False,
+        help_text="Add the page text as editable text boxes over each slide",
+    )
@@ -1,13 +1,29 @@
 """
 PDF to PowerPoint conversion utilities.
 
-Note: This is a basic implementation that extracts PDF pages as images
-and creates a PowerPoint presentation. For production use, consider using
-specialized libraries or services for better quality conversion.
+Every PDF page becomes one slide holding a picture of the page, optionally
+with the page's text laid over it as editable text boxes.
+
+Pages are rendered one at a time with PyMuPDF and written to disk, so
+memory stays at one rendered page no matter how long the document is:
+
+1. python-pptx builds the deck with a tiny, unique stand-in picture per
+   slide (it keeps every image blob in memory and de-duplicates by SHA-1,
+   so the real page images must not go through it).
+2. The saved deck is copied into the final ``.pptx`` entry by entry, with
+   each stand-in replaced by its page image streamed from disk.
+
+Each page is stored as JPEG when raster images cover most of it (scans,
+photos) and as PNG otherwise, which keeps text and line art sharp.
 """
 
+import contextlib
+import io
 import os
+import shutil
 import tempfile
+import zipfile
+from collections.abc import Callable
 from pathlib import Path
 
 from django.core.files.uploadedfile import UploadedFile
@@ -22,11 +38,236 @@ from src.exceptions import ConversionError, InvalidPDFError, StorageError
 
 logger = get_logger(__name__)
 
+RENDER_DPI = 150
+JPEG_QUALITY = 85
+# Share of the page covered by raster images above which it is stored as JPEG.
+PHOTO_COVERAGE = 0.5
+SLIDE_WIDTH_INCHES = 10
+# PowerPoint rejects slides taller than 56 inches.
+MAX_SLIDE_HEIGHT_INCHES = 56
+
+# span["flags"] bits in PyMuPDF's text dict.
+_FLAG_ITALIC = 2
+_FLAG_BOLD = 16
+
+
+def _page_image_format(page) -> str:
+    """Return ``"jpeg"`` for photo-like pages and ``"png"`` for everything else."""
+    import fitz
+
+    page_area = abs(page.rect)
+    if not page_area:
+        return "png"
+    covered = 0.0
+    for info in page.get_image_info():
+        covered += abs(fitz.Rect(info["bbox"]) & page.rect)
+    return "jpeg" if covered >= PHOTO_COVERAGE * page_area else "png"
+
+
+def _stand_in_image(index: int, image_format: str) -> bytes:
+    """Tiny picture for slide ``index``, replaced by the page image later.
+
+    Its width is ``index + 1`` pixels, so every stand-in has unique bytes
+    and python-pptx gives every slide its own media part.
+    """
+    import fitz
+
+    pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, index + 1, 1), False)
+    pix.clear_with(255)
+    return pix.tobytes("jpg" if image_format == "jpeg" else "png")
+
+
+def _strip_text(page) -> None:
+    """Remove the page's text (in memory only) so it is not baked into the picture."""
+    import fitz
+
+    page.add_redact_annot(page.rect, fill=False, cross_out=False)
+    page.apply_redactions(
+        images=fitz.PDF_REDACT_IMAGE_NONE,
+        graphics=fitz.PDF_REDACT_LINE_ART_NONE,
+        text=fitz.PDF_REDACT_TEXT_REMOVE,
+    )
+
+
+def _font_name(pdf_font: str) -> str:
+    """``ABCDEF+Arial-BoldMT`` -> ``Arial``."""
+    return pdf_font.split("+")[-1].split("-")[0].split(",")[0] or "Arial"
+
+
+def _add_text_layer(slide, text_dict: dict, origin, scale: float) -> int:
+    """Add one text box per PDF text line; return the number of boxes.
+
+    ``scale`` converts PDF points to slide EMUs; ``origin`` is the page's
+    top-left corner on the slide.
+    """
+    from pptx.dml.color import RGBColor
+    from pptx.enum.text import MSO_AUTO_SIZE
+    from pptx.util import Emu, Pt
+
+    left0, top0 = origin
+    # Slide points per PDF point (1 pt = 12700 EMU).
+    font_scale = scale / 12700
+    boxes = 0
+    for block in text_dict.get("blocks", []):
+        if block.get("type") != 0:
+            continue
+        for line in block.get("lines", []):
+            spans = [span for span in line.get("spans", []) if span["text"].strip()]
+            if not spans:
+                continue
+            x0, y0, x1, y1 = line["bbox"]
+            box = slide.shapes.add_textbox(
+                Emu(left0 + int(x0 * scale)),
+                Emu(top0 + int(y0 * scale)),
+                Emu(max(1, int((x1 - x0) * scale))),
+                Emu(max(1, int((y1 - y0) * scale))),
+            )
+            frame = box.text_frame
+            frame.word_wrap = False
+            frame.auto_size = MSO_AUTO_SIZE.NONE
+            frame.margin_left = frame.margin_right = 0
+            frame.margin_top = frame.margin_bottom = 0
+            paragraph = frame.paragraphs[0]
+            for span in line["spans"]:
+                run = paragraph.add_run()
+                run.text = span["text"]
+                font = run.font
+                font.size = Pt(max(1.0, round(span["size"] * font_scale, 1)))
+                font.name = _font_name(span.get("font", ""))
+                font.bold = bool(span.get("flags", 0) & _FLAG_BOLD)
+                font.italic = bool(span.get("flags", 0) & _FLAG_ITALIC)
+                font.color.rgb = RGBColor.from_string(f"{span.get('color', 0):06X}")
+            boxes += 1
+    return boxes
+
+
+def _write_package(skeleton_path: str, output_path: str, media: dict) -> None:
+    """Copy the deck to ``output_path``, streaming page images in for stand-ins.
+
+    ``media`` maps ZIP entry names (``ppt/media/imageN.png``) to image files.
+    Images are already compressed, so they are stored rather than deflated.
+    """
+    with (
+        zipfile.ZipFile(skeleton_path) as src,
+        zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED) as dst,
+    ):
+        for info in src.infolist():
+            image_path = media.get(info.filename)
+            if image_path is None:
+                with src.open(info) as fin, dst.open(info.filename, "w") as fout:
+                    shutil.copyfileobj(fin, fout, 1024 * 1024)
+                continue
+            entry = zipfile.ZipInfo(info.filename, date_time=info.date_time)
+            entry.compress_type = zipfile.ZIP_STORED
+            with open(image_path, "rb") as fin, dst.open(entry, "w") as fout:
+                shutil.copyfileobj(fin, fout, 1024 * 1024)
+            with contextlib.suppress(OSError):
+                os.remove(image_path)
+
+
+def _build_presentation(
+    pdf_path: str,
+    output_path: str,
+    work_dir: str,
+    editable_text: bool,
+    check_cancelled: Callable[[], None] | None,
+    context: dict,
+) -> int:
+    """Render ``pdf_path`` page by page into ``output_path``; return slide count."""
+    import fitz
+    from pptx import Presentation
+    from pptx.util import Emu, Inches
+
+    prs = Presentation()
+    media: dict[str, str] = {}
+
+    with fitz.open(pdf_path) as doc:
+        if doc.page_count == 0:
+            raise InvalidPDFError("PDF file has no pages")
+
+        # Slide aspect follows the first page (decks are usually uniform);
+        # other pages are fitted and centred inside it.
+        first = doc[0].rect
+        if first.is_empty:
+            raise InvalidPDFError("The first PDF page has no width or height")
+        slide_width = Inches(SLIDE_WIDTH_INCHES)
+        slide_height = min(
+            int(slide_width * first.height / first.width),
+            Inches(MAX_SLIDE_HEIGHT_INCHES),
+        )
+        prs.slide_width, prs.slide_height = slide_width, Emu(slide_height)
+        blank_layout = prs.slide_layouts[6]
+
+        for index in range(doc.page_count):
+            if callable(check_cancelled):
+                check_cancelled()
+
+            page = doc[index]
+            rect = page.rect
+            if rect.is_empty:
+                raise InvalidPDFError(f"PDF page {index + 1} has no width or height")
+            scale = min(slide_width / rect.width, slide_height / rect.height)
+            width, height = int(rect.width * scale), int(rect.height * scale)
+            origin = ((slide_width - width) // 2, (slide_height - height) // 2)
+
+            image_format = _page_image_format(page)
+            text_dict = None
+            if editable_text:
+                text_dict = page.get_text("dict", flags=fitz.TEXT_PRESERVE_WHITESPACE)
+                _strip_text(page)
+
+            pix = page.get_pixmap(dpi=RENDER_DPI, alpha=False)
+            image_path = os.path.join(work_dir, f"page_{index + 1}.{image_format}")
+            if image_format == "jpeg":
+                pix.save(image_path, output="jpg", jpg_quality=JPEG_QUALITY)
+            else:
+                pix.save(image_path, output="png")
+            pix = None
+            page = None
+
+            slide = prs.slides.add_slide(blank_layout)
+            picture = slide.shapes.add_picture(
+                io.BytesIO(_stand_in_image(index, image_format)),
+                Emu(origin[0]),
+                Emu(origin[1]),
+                width=Emu(width),
+                height=Emu(height),
+            )
+            image_part = slide.part.related_part(picture._element.blip_rId)
+            media[str(image_part.partname).lstrip("/")] = image_path
+
+            if text_dict is not None:
+                _add_text_layer(slide, text_dict, origin, scale)
+
+            logger.debug(
+                f"Added slide {index + 1}/{doc.page_count}",
+                extra={
+                    **context,
+                    "slide_number": index + 1,
+                    "image_format": image_format,
+                },
+            )
+
+        slide_count = doc.page_count
+
+    if callable(check_cancelled):
+        check_cancelled()
+
+    skeleton_path = os.path.join(work_dir, "skeleton.pptx")
+    prs.save(skeleton_path)
+    prs = None
+    _write_package(skeleton_path, output_path, media)
+    os.remove(skeleton_path)
+    return slide_count
+
 
 def convert_pdf_to_ppt(
     uploaded_file: UploadedFile,
     extract_images: bool = True,
     suffix: str = "_convertica",
+    editable_text: bool = False,
+    context: dict | None = None,
+    check_cancelled: Callable[[], None] | None = None,
 ) -> tuple[str, str]:
     """Convert PDF to PowerPoint presentation.
 
@@ -34,6 +275,10 @@ def convert_pdf_to_ppt(
         uploaded_file: PDF file to convert
         extract_images: Whether to extract images from PDF
         suffix: Suffix for output filename
+        editable_text: Overlay the page text as editable text boxes instead
+            of baking it into the slide picture
+        context: Optional logging context
+        check_cancelled: Called between pages; raises to abort
 
     Returns:
         Tuple of (input_path, output_path)
@@ -43,24 +288,25 @@ def convert_pdf_to_ppt(
         StorageError: If disk space is insufficient
     """
     context = {
+        **(context or {}),
         "function": "convert_pdf_to_ppt",
         "input_filename": os.path.basename(uploaded_file.name),
         "input_size": uploaded_file.size,
         "extract_images": extract_images,
+        "editable_text": editable_text,
     }
 
     logger.info("Starting PDF to PowerPoint conversion", extra=context)
 
     try:
-        from pdf2image import convert_from_path
+        import fitz  # noqa: F401
     except ModuleNotFoundError as e:
         raise ConversionError(
-            "PDF to PowerPoint conversion requires 'pdf2image' to be installed."
+            "PDF to PowerPoint conversion requires 'PyMuPDF' to be installed."
         ) from e
 
     try:
-        from pptx import Presentation
-        from pptx.util import Inches
+        import pptx  # noqa: F401
     except ModuleNotFoundError as e:
         raise ConversionError(
             "PDF to PowerPoint conversion requires 'python-pptx' to be installed."
@@ -87,8 +333,8 @@ def convert_pdf_to_ppt(
                 f.write(chunk)
 
         # Validate the PDF up front so a corrupt / non-PDF .pdf is a clean 400
-        # instead of a generic 500 out of pdf2image (validate_pdf_pages swallows
-        # parser errors, so without this it slipped through).
+        # instead of a generic 500 out of the renderer (validate_pdf_pages
+        # swallows parser errors, so without this it slipped through).
         is_valid, pdf_error = validate_pdf_file(input_path, context)
         if not is_valid:
             raise InvalidPDFError(pdf_error or "Invalid or corrupt PDF file.")
@@ -102,54 +348,18 @@ def convert_pdf_to_ppt(
             },
         )
 
-        # Convert PDF pages to images
-        logger.info("Converting PDF pages to images", extra=context)
-        images = convert_from_path(input_path, dpi=150)
-
-        if not images:
-            raise ConversionError("Failed to extract pages from PDF")
-
-        logger.info(
-            f"Extracted {len(images)} pages from PDF",
-            extra={**context, "num_pages": len(images)},
-        )
-
-        # Create PowerPoint presentation
-        prs = Presentation()
-        prs.slide_width = Inches(10)
-        prs.slide_height = Inches(7.5)
-
-        for idx, image in enumerate(images):
-            logger.debug(
-                f"Adding slide {idx + 1}/{len(images)}",
-                extra={**context, "slide_number": idx + 1},
-            )
-
-            # Add blank slide
-            blank_slide_layout = prs.slide_layouts[6]  # Blank layout
-            slide = prs.slides.add_slide(blank_slide_layout)
-
-            # Save image temporarily
-            img_path = os.path.join(tmp_dir, f"page_{idx + 1}.png")
-            image.save(img_path, "PNG")
-
-            # Add image to slide
-            left = Inches(0)
-            top = Inches(0)
-            width = prs.slide_width
-            height = prs.slide_height
-
-            slide.shapes.add_picture(img_path, left, top, width=width, height=height)
-
-            # Clean up temp image
-            os.remove(img_path)
-
-        # Save PowerPoint file
         base_name = Path(safe_filename).stem
         output_filename = f"{base_name}{suffix}.pptx"
         output_path = os.path.join(tmp_dir, output_filename)
 
-        prs.save(output_path)
+        num_slides = _build_presentation(
+            input_path,
+            output_path,
+            tmp_dir,
+            editable_text=editable_text,
+            check_cancelled=check_cancelled,
+            context=context,
+        )
 
         output_size = os.path.getsize(output_path)
         logger.info(
@@ -158,13 +368,21 @@ def convert_pdf_to_ppt(
                 **context,
                 "output_path": output_path,
                 "output_size": output_size,
-                "num_slides": len(images),
+                "num_slides": num_slides,
             },
         )
 
         return input_path, output_path
 
+    except ConversionError:
+        raise
     except Exception as e:
+        from celery.exceptions import SoftTimeLimitExceeded
+        from src.tasks.pdf_conversion import TaskCancelledException
+
+        # The task handles cancellation and its time limit itself.
+        if isinstance(e, TaskCancelledException | SoftTimeLimitExceeded):
+            raise
         logger.exception(
             "PDF to PowerPoint conversion failed",
             extra={**context, "error": str(e)},
@@ -38,11 +38,14 @@ class PDFToPowerPointAPIView(BaseConversionAPIView):
     ) -> tuple[str, str]:
         """Convert PDF to PowerPoint."""
         extract_images = kwargs.get("extract_images", True)
+        editable_text = kwargs.get("editable_text", False)
 
         input_path, output_path = convert_pdf_to_ppt(
             uploaded_file=uploaded_file,
             extract_images=extract_images,
             suffix="_convertica",
+            editable_text=editable_text,
+            context=context,
         )
 
         return input_path, output_path
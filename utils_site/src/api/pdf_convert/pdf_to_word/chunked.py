@@ -0,0 +1,243 @@
+"""
+Page-parallel PDF → DOCX for long documents.
+
+pdf2docx's own ``multi_processing`` starts multiprocessing children from
+inside the converter, which Celery's daemonic prefork children forbid (so
+does any multiprocessing pool, whatever the start method), so every
+conversion ran on one core. Here the document is split into page chunks and
+each chunk is converted by a fresh Python interpreter started with
+``subprocess``, which daemonic processes may do. The resulting DOCX bodies
+are merged back in page order: section layout (page size, margins, columns)
+is kept per chunk, missing styles are copied, and images/hyperlinks are
+re-linked into the merged package.
+
+Chunk size and worker count come from ``PerformanceConfig``
+(``pdf_to_word_pages`` / ``pdf_to_word``); on tiers with a single worker the
+caller keeps converting in one pass exactly as before.
+"""
+
+import copy
+import io
+import os
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+
+from ...logging_utils import get_logger
+from ...performance_config import get_performance_config
+
+logger = get_logger(__name__)
+
+_R_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+_WP_NS = "http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing"
+_IMAGE_RELTYPE = f"{_R_NS}/image"
+
+# Run by ``python -c`` for one chunk: argv is pdf path, docx path, start, end.
+_CHUNK_SCRIPT = """\
+import sys
+
+from pdf2docx import Converter
+
+pdf_path, out_path = sys.argv[1], sys.argv[2]
+cv = Converter(pdf_path)
+try:
+    cv.convert(
+        out_path,
+        start=int(sys.argv[3]),
+        end=int(sys.argv[4]),
+        multi_processing=False,
+        debug=False,
+    )
+finally:
+    cv.close()
+"""
+_POLL_SECONDS = 0.2
+
+
+def chunk_plan(page_count: int) -> tuple[int, int]:
+    """Return ``(chunk_size, workers)``; ``workers <= 1`` means single pass."""
+    perf = get_performance_config()
+    chunk_size = max(1, perf.get_batch_size("pdf_to_word_pages"))
+    if not perf.can_use_parallel_processing() or page_count <= chunk_size:
+        return chunk_size, 1
+    chunks = -(-page_count // chunk_size)
+    return chunk_size, min(perf.get_thread_workers("pdf_to_word"), chunks)
+
+
+def _start_chunk(pdf_path: str, out_path: str, start: int, end: int, log):
+    """Start converting pages ``[start, end)`` to ``out_path``.
+
+    pdf2docx logs every page, so stderr goes to ``log`` (a file) rather than
+    a pipe nobody drains until the chunk exits.
+    """
+    return subprocess.Popen(
+        [sys.executable, "-c", _CHUNK_SCRIPT, pdf_path, out_path, str(start), str(end)],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=log,
+    )
+
+
+def _log_tail(path: str, limit: int = 500) -> str:
+    try:
+        with open(path, "rb") as fh:
+            fh.seek(0, os.SEEK_END)
+            fh.seek(max(0, fh.tell() - limit))
+            return fh.read().decode("utf-8", "replace").strip()
+    except OSError:
+        return ""
+
+
+def _relink(element, src_part, dst_part) -> None:
+    """Point every r:* reference inside ``element`` at ``dst_part``'s rels."""
+    for node in list(element.iter()):
+        for attr, r_id in list(node.attrib.items()):
+            if not attr.startswith(f"{{{_R_NS}}}"):
+                continue
+            rel = src_part.rels.get(r_id)
+            if rel is None:
+                continue
+            if rel.is_external:
+                new_id = dst_part.relate_to(rel.target_ref, rel.reltype, True)
+            elif rel.reltype == _IMAGE_RELTYPE:
+                new_id, _image = dst_part.get_or_add_image(
+                    io.BytesIO(rel.target_part.blob)
+                )
+            else:
+                # Headers/footers and other parts pdf2docx doesn't emit.
+                parent = node.getparent()
+                if parent is not None:
+                    parent.remove(node)
+                break
+            node.set(attr, new_id)
+
+
+def _close_section(body) -> None:
+    """Turn the body-level sectPr into a section break at the end of the body.
+
+    The last section of a chunk is described by ``w:body/w:sectPr``. Before
+    appending the next chunk, that layout is moved into an empty paragraph's
+    ``w:pPr`` so it keeps applying to the pages already in the document.
+    """
+    sect_pr = body.find(f"{{{_W_NS}}}sectPr")
+    if sect_pr is None:
+        return
+    para = body.makeelement(f"{{{_W_NS}}}p", {})
+    ppr = para.makeelement(f"{{{_W_NS}}}pPr", {})
+    ppr.append(copy.deepcopy(sect_pr))
+    para.append(ppr)
+    sect_pr.addprevious(para)
+
+
+def merge_docx_chunks(chunk_paths: list[str], output_path: str) -> None:
+    """Concatenate DOCX files (in order) into ``output_path``."""
+    from docx import Document
+
+    merged = Document(chunk_paths[0])
+    body = merged.element.body
+    styles = merged.styles.element
+    known_styles = {
+        s.get(f"{{{_W_NS}}}styleId") for s in styles.findall(f"{{{_W_NS}}}style")
+    }
+
+    for path in chunk_paths[1:]:
+        chunk = Document(path)
+        for style in chunk.styles.element.findall(f"{{{_W_NS}}}style"):
+            style_id = style.get(f"{{{_W_NS}}}styleId")
+            if style_id not in known_styles:
+                styles.append(copy.deepcopy(style))
+                known_styles.add(style_id)
+
+        _close_section(body)
+        merged_sect_pr = body.find(f"{{{_W_NS}}}sectPr")
+        for element in chunk.element.body:
+            clone = copy.deepcopy(element)
+            _relink(clone, chunk.part, merged.part)
+            if clone.tag == f"{{{_W_NS}}}sectPr":
+                # The chunk's final section becomes the document's.
+                if merged_sect_pr is not None:
+                    merged_sect_pr.getparent().replace(merged_sect_pr, clone)
+                else:
+                    body.append(clone)
+                merged_sect_pr = clone
+            elif merged_sect_pr is not None:
+                merged_sect_pr.addprevious(clone)
+            else:
+                body.append(clone)
+
+    # Drawing ids must be unique across the merged document.
+    for n, doc_pr in enumerate(body.iter(f"{{{_WP_NS}}}docPr"), start=1):
+        doc_pr.set("id", str(n))
+    merged.save(output_path)
+
+
+def convert_pdf_to_docx_chunked(
+    pdf_path: str,
+    docx_path: str,
+    page_count: int,
+    chunk_size: int,
+    workers: int,
+    check_cancelled: Callable[[], None] | None = None,
+    context: dict | None = None,
+) -> None:
+    """Convert ``pdf_path`` chunk by chunk in parallel and merge into ``docx_path``.
+
+    At most ``workers`` chunk interpreters run at once; ``check_cancelled``
+    runs while they do. Raises on any chunk failure; the caller falls back to
+    a single pass so its repair/RGB-normalisation retries see the original
+    exception. Chunks still running on the way out are killed.
+    """
+    work_dir = os.path.dirname(docx_path)
+    stem = os.path.splitext(os.path.basename(docx_path))[0]
+    ranges = [
+        (start, min(start + chunk_size, page_count))
+        for start in range(0, page_count, chunk_size)
+    ]
+    chunk_paths = [
+        os.path.join(work_dir, f"{stem}.part{n:04d}.docx") for n in range(len(ranges))
+    ]
+    log_paths = [f"{path}.log" for path in chunk_paths]
+    logger.info(
+        "Converting PDF to DOCX in parallel chunks",
+        extra={
+            **(context or {}),
+            "event": "pdf2docx_chunked",
+            "pages": page_count,
+            "chunks": len(ranges),
+            "workers": workers,
+        },
+    )
+
+    queued = list(enumerate(ranges))
+    running = {}  # Popen -> chunk number
+    try:
+        while queued or running:
+            if callable(check_cancelled):
+                check_cancelled()
+            while queued and len(running) < max(1, workers):
+                n, (start, end) = queued.pop(0)
+                with open(log_paths[n], "wb") as log:
+                    proc = _start_chunk(pdf_path, chunk_paths[n], start, end, log)
+                running[proc] = n
+            finished = [proc for proc in running if proc.poll() is not None]
+            for proc in finished:
+                n = running.pop(proc)
+                if proc.returncode != 0:
+                    raise RuntimeError(
+                        f"Chunk {n} (pages {ranges[n][0] + 1}-{ranges[n][1]}) "
+                        f"exited with {proc.returncode}: {_log_tail(log_paths[n])}"
+                    )
+            if not finished:
+                time.sleep(_POLL_SECONDS)
+        if callable(check_cancelled):
+            check_cancelled()
+        merge_docx_chunks(chunk_paths, docx_path)
+    finally:
+        for proc in running:
+            proc.kill()
+            proc.wait()
+        for path in chunk_paths + log_paths:
+            if os.path.exists(path):
+                os.remove(path)
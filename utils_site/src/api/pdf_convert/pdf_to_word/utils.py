@@ -16,6 +16,7 @@ from ...file_validation import check_disk_space, sanitize_filename, validate_out
 from ...font_utils import unicode_font_file
 from ...logging_utils import get_logger
 from ...optimization_manager import optimization_manager
+from ...pdf_info import get_pdf_info
 from ...pdf_utils import repair_pdf
 
 logger = get_logger(__name__)
@@ -91,37 +92,23 @@ async def _convert_pdf_to_docx_sequential(
             },
         )
 
-        # Quick page count check and text detection
-        import fitz  # PyMuPDF
-
-        try:
-            doc = fitz.open(pdf_path)
-            total_pages = len(doc)
-
-            # Check if PDF already has extractable text
-            has_text = False
-            text_sample = ""
-            for page_num in range(min(3, total_pages)):  # Check first 3 pages
-                page = doc[page_num]
-                page_text = page.get_text().strip()
-                if len(page_text) > 50:  # If page has meaningful text
-                    has_text = True
-                    text_sample = page_text[:200]
-                    break
-
-            doc.close()
-
-            logger.info(
-                f"PDF analysis: {total_pages} pages, {'text-based' if has_text else 'image-based/scanned'}",
-                extra={
-                    **context,
-                    "total_pages": total_pages,
-                    "has_extractable_text": has_text,
-                    "text_sample_length": len(text_sample),
-                },
+        # Page count and text-layer detection (shared parse, see pdf_info)
+        pdf_info = get_pdf_info(pdf_path)
+        if pdf_info.error:
+            raise InvalidPDFError(
+                f"Failed to read PDF: {pdf_info.error}", context=context
             )
-        except Exception as e:
-            raise InvalidPDFError(f"Failed to read PDF: {e}", context=context) from e
+        total_pages = pdf_info.page_count
+        has_text = pdf_info.has_text_layer
+
+        logger.info(
+            f"PDF analysis: {total_pages} pages, {'text-based' if has_text else 'image-based/scanned'}",
+            extra={
+                **context,
+                "total_pages": total_pages,
+                "has_extractable_text": has_text,
+            },
+        )
 
         # OCR processing - only for scanned/image-based PDFs
         ocr_text_content = None
@@ -18,6 +18,10 @@ from src.api.file_validation import check_disk_space, sanitize_filename
 from src.api.font_utils import unicode_font_file
 from src.api.logging_utils import get_logger
 from src.api.ocr_utils import extract_text_from_pdf_async
+from src.api.pdf_convert.pdf_to_word.chunked import (
+    chunk_plan,
+    convert_pdf_to_docx_chunked,
+)
 from src.api.pdf_utils import repair_pdf
 from src.exceptions import ConversionError, StorageError
 
@@ -519,6 +523,41 @@ class OptimizedPDFToWordConverter:
         """
 
         def _convert(pdf_to_use: str):
+            # Long documents: convert page chunks in parallel processes where
+            # the memory tier allows it. Any chunk failure falls through to
+            # the single-pass conversion below, so the repair/RGB retries in
+            # the caller still see pdf2docx's original exception.
+            try:
+                with fitz.open(pdf_to_use) as doc:
+                    page_count = doc.page_count
+            except Exception:
+                page_count = 0
+            chunk_size, workers = chunk_plan(page_count)
+            if workers > 1:
+                try:
+                    convert_pdf_to_docx_chunked(
+                        pdf_to_use,
+                        docx_path,
+                        page_count,
+                        chunk_size,
+                        workers,
+                        check_cancelled=check_cancelled,
+                        context=context,
+                    )
+                    return
+                except Exception as chunk_exc:
+                    # A user cancellation must not turn into a full re-run.
+                    if callable(check_cancelled):
+                        check_cancelled()
+                    logger.warning(
+                        "Chunked pdf2docx conversion failed, using single pass",
+                        extra={
+                            **context,
+                            "event": "pdf2docx_chunked_fallback",
+                            "error": str(chunk_exc)[:200],
+                        },
+                    )
+
             cv = Converter(pdf_to_use)
             try:
                 # Optimized settings for memory efficiency
@@ -166,8 +166,8 @@ class PowerPointToPDFConverter:
         """
         loop = asyncio.get_event_loop()
 
-        # --- Fast path: unoserver warm instance ---
-        def _try_unoserver() -> bool:
+        # --- Fast path: warm LibreOffice (unoserver, then the in-process pool) ---
+        def _try_warm_libreoffice() -> bool:
             try:
                 from src.api.unoserver_client import convert_with_unoserver
 
@@ -176,23 +176,42 @@ class PowerPointToPDFConverter:
                     if ppt_path.lower().endswith(".pptx")
                     else "MS PowerPoint 97"
                 )
-                return convert_with_unoserver(
+                if convert_with_unoserver(
                     ppt_path,
                     pdf_path,
                     filterin=filterin,
                     filterout="pdf:impress_pdf_Export",
                     timeout=self.timeout_seconds,
-                )
+                ):
+                    return True
+            except ConversionError:
+                # Timed out or failed on the document: the next tier would
+                # only repeat it. Fall through only when unoserver is down.
+                raise
             except Exception as exc:
                 logger.warning(
-                    f"unoserver attempt failed ({exc}), falling back to subprocess",
+                    f"unoserver attempt failed ({exc}), trying warm LibreOffice pool",
                     extra={**context, "event": "unoserver_fallback"},
                 )
+            # unoserver is down: lease a pooled listener before a cold start.
+            try:
+                from src.api.libreoffice_pool import convert_with_libreoffice_pool
+
+                return convert_with_libreoffice_pool(
+                    ppt_path, pdf_path, "impress_pdf_Export", self.timeout_seconds
+                )
+            except ConversionError:
+                raise
+            except Exception as exc:
+                logger.warning(
+                    f"Warm LibreOffice pool failed ({exc}), falling back to subprocess",
+                    extra={**context, "event": "libreoffice_pool_fallback"},
+                )
                 return False
 
-        used_unoserver = await loop.run_in_executor(None, _try_unoserver)
-        if used_unoserver:
-            # unoserver writes directly to pdf_path; rename logic below is skipped.
+        used_warm = await loop.run_in_executor(None, _try_warm_libreoffice)
+        if used_warm:
+            # The warm path writes directly to pdf_path; rename logic is skipped.
             return
 
         # --- Slow path: LibreOffice subprocess (original logic below) ---
@@ -430,8 +430,8 @@ class OptimizedWordToPDFConverter:
         """
         import asyncio as _asyncio
 
-        # --- Fast path: unoserver warm instance ---
-        def _try_unoserver() -> bool:
+        # --- Fast path: warm LibreOffice (unoserver, then the in-process pool) ---
+        def _try_warm_libreoffice() -> bool:
             try:
                 from src.api.unoserver_client import convert_with_unoserver
 
@@ -440,25 +440,44 @@ class OptimizedWordToPDFConverter:
                     if docx_path.lower().endswith(".docx")
                     else "MS Word 97"
                 )
-                return convert_with_unoserver(
+                if convert_with_unoserver(
                     docx_path,
                     pdf_path,
                     filterin=filterin,
                     filterout="pdf:writer_pdf_Export",
                     timeout=self.timeout_seconds,
-                )
+                ):
+                    return True
+            except ConversionError:
+                # Timed out or failed on the document: the next tier would
+                # only repeat it. Fall through only when unoserver is down.
+                raise
             except Exception as exc:
                 logger.warning(
-                    f"unoserver attempt failed ({exc}), falling back to subprocess",
+                    f"unoserver attempt failed ({exc}), trying warm LibreOffice pool",
                     extra={**context, "event": "unoserver_fallback"},
                 )
+            # unoserver is down: lease a pooled listener before a cold start.
+            try:
+                from src.api.libreoffice_pool import convert_with_libreoffice_pool
+
+                return convert_with_libreoffice_pool(
+                    docx_path, pdf_path, "writer_pdf_Export", self.timeout_seconds
+                )
+            except ConversionError:
+                raise
+            except Exception as exc:
+                logger.warning(
+                    f"Warm LibreOffice pool failed ({exc}), falling back to subprocess",
+                    extra={**context, "event": "libreoffice_pool_fallback"},
+                )
                 return False
 
         loop = _asyncio.get_event_loop()
         if callable(check_cancelled):
             check_cancelled()
-        used_unoserver = await loop.run_in_executor(None, _try_unoserver)
-        if used_unoserver:
+        used_warm = await loop.run_in_executor(None, _try_warm_libreoffice)
+        if used_warm:
             return
 
         # --- Slow path: LibreOffice subprocess (original logic below) ---
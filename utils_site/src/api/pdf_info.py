@@ -0,0 +1,215 @@
+"""
+Parsed-PDF metadata shared by every validation layer.
+
+A single upload used to be parsed again and again: the view's page-limit
+check, the heavy-operation complexity check, ``validate_pdf_file`` inside the
+converter, the converter's own page count. The old validation cache was keyed
+by file *path*, and every request writes the upload to a fresh temp path, so it
+never hit.
+
+``PdfInfo`` holds what those layers need (page count, encryption, page sizes,
+text-layer presence, image density, SHA-256) and is computed in one PyMuPDF
+pass. It is cached by content hash: in-process for the current worker and in
+the Django cache for the next one, so the Celery task and the converter find
+the info the view computed. Looking it up costs one hash of the file, not a
+parse.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+
+from django.core.files.uploadedfile import UploadedFile
+
+from .cache_utils import cache_pdf_info, get_cached_pdf_info
+from .logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+# Pages sampled for text-layer and image-density detection.
+SAMPLE_PAGES = 5
+# A sampled page with more characters than this counts as a text layer (same
+# threshold pdf_to_word used for its OCR decision).
+TEXT_LAYER_MIN_CHARS = 50
+
+# Per-process memo in front of the Django cache (sha256 -> PdfInfo).
+_LOCAL_MAX_ENTRIES = 64
+_local: OrderedDict[str, "PdfInfo"] = OrderedDict()
+_local_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class PdfInfo:
+    """What the validation layers need to know about one PDF."""
+
+    sha256: str
+    size: int
+    page_count: int = 0
+    # Any encryption dictionary (pypdf's ``is_encrypted`` semantics).
+    is_encrypted: bool = False
+    # Encrypted with a user password: pages can't be read without it.
+    needs_password: bool = False
+    page_sizes: list[tuple[float, float]] = field(default_factory=list)
+    has_text_layer: bool = False
+    # Images found on the first ``sample_pages`` pages.
+    sample_image_count: int = 0
+    sample_pages: int = 0
+    # Set when the file could not be parsed; the other fields are then empty.
+    error: str | None = None
+
+    def to_dict(self) -> dict:
+        """JSON-safe form (Celery kwargs, cache)."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PdfInfo":
+        data = dict(data)
+        data["page_sizes"] = [tuple(size) for size in data.get("page_sizes") or []]
+        return cls(**data)
+
+
+def _remember(info: PdfInfo) -> PdfInfo:
+    with _local_lock:
+        _local[info.sha256] = info
+        _local.move_to_end(info.sha256)
+        while len(_local) > _LOCAL_MAX_ENTRIES:
+            _local.popitem(last=False)
+    return info
+
+
+def _lookup(sha256: str) -> PdfInfo | None:
+    with _local_lock:
+        info = _local.get(sha256)
+        if info is not None:
+            _local.move_to_end(sha256)
+            return info
+    try:
+        cached = get_cached_pdf_info(sha256)
+    except Exception as exc:
+        logger.debug(f"PDF info cache lookup skipped: {exc}")
+        return None
+    if cached is None:
+        return None
+    try:
+        return _remember(PdfInfo.from_dict(cached))
+    except (TypeError, ValueError):
+        return None
+
+
+def _sha256_path(path: str) -> str:
+    hasher = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1024 * 1024), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _parse(sha256: str, size: int, path: str | None, data: bytes | None) -> PdfInfo:
+    """Open the PDF once with PyMuPDF and collect everything."""
+    import fitz
+
+    try:
+        doc = fitz.open(path) if path else fitz.open(stream=data, filetype="pdf")
+    except Exception as exc:
+        return PdfInfo(sha256=sha256, size=size, error=f"{type(exc).__name__}: {exc}")
+
+    try:
+        is_encrypted = bool(doc.is_encrypted or (doc.metadata or {}).get("encryption"))
+        if doc.needs_pass:
+            return PdfInfo(
+                sha256=sha256, size=size, is_encrypted=True, needs_password=True
+            )
+
+        page_count = doc.page_count
+        if page_count == 0 and doc.is_repaired:
+            # MuPDF rebuilt a broken xref and still found no pages: this is
+            # an unreadable file, not a well-formed empty document.
+            return PdfInfo(
+                sha256=sha256,
+                size=size,
+                is_encrypted=is_encrypted,
+                error="No pages could be recovered from the PDF structure",
+            )
+
+        page_sizes = []
+        has_text_layer = False
+        sample_image_count = 0
+        sample_pages = min(page_count, SAMPLE_PAGES)
+        for index in range(page_count):
+            page = doc.load_page(index)
+            rect = page.rect
+            page_sizes.append((round(rect.width, 1), round(rect.height, 1)))
+            if index < sample_pages:
+                sample_image_count += len(page.get_images(full=False))
+                if (
+                    not has_text_layer
+                    and len(page.get_text().strip()) > TEXT_LAYER_MIN_CHARS
+                ):
+                    has_text_layer = True
+
+        return PdfInfo(
+            sha256=sha256,
+            size=size,
+            page_count=page_count,
+            is_encrypted=is_encrypted,
+            page_sizes=page_sizes,
+            has_text_layer=has_text_layer,
+            sample_image_count=sample_image_count,
+            sample_pages=sample_pages,
+        )
+    except Exception as exc:
+        return PdfInfo(sha256=sha256, size=size, error=f"{type(exc).__name__}: {exc}")
+    finally:
+        doc.close()
+
+
+def _store(info: PdfInfo) -> PdfInfo:
+    try:
+        # Parse failures are cached briefly: the same upload retried should
+        # not be re-parsed, but a fixed parser should be picked up soon.
+        cache_pdf_info(info.sha256, info.to_dict(), timeout=300 if info.error else 3600)
+    except Exception as exc:
+        logger.debug(f"PDF info cache store skipped: {exc}")
+    return _remember(info)
+
+
+def get_pdf_info(pdf_path: str) -> PdfInfo:
+    """Return ``PdfInfo`` for the file at ``pdf_path`` (hash, then cache/parse)."""
+    sha256 = _sha256_path(pdf_path)
+    info = _lookup(sha256)
+    if info is not None:
+        return info
+    return _store(_parse(sha256, os.path.getsize(pdf_path), pdf_path, None))
+
+
+def get_pdf_info_for_upload(uploaded_file: UploadedFile) -> PdfInfo:
+    """Return ``PdfInfo`` for an upload without writing a temp copy.
+
+    Large uploads are already spooled to disk by Django and are parsed in
+    place; small in-memory ones are parsed from their bytes.
+    """
+    hasher = hashlib.sha256()
+    for chunk in uploaded_file.chunks():
+        hasher.update(chunk)
+    uploaded_file.seek(0)
+    sha256 = hasher.hexdigest()
+
+    info = _lookup(sha256)
+    if info is not None:
+        return info
+
+    path = None
+    data = None
+    if hasattr(uploaded_file, "temporary_file_path"):
+        path = uploaded_file.temporary_file_path()
+    else:
+        data = uploaded_file.read()
+        uploaded_file.seek(0)
+    return _store(_parse(sha256, uploaded_file.size, path, data))
+
+
+def remember_pdf_info(info: PdfInfo) -> PdfInfo:
+    """Seed this process with ``info`` received from elsewhere (task kwargs)."""
+    return _remember(info)
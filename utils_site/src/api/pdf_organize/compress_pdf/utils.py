@@ -1,6 +1,8 @@
+import hashlib
 import os
 import shutil
 from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from io import BytesIO
 
 import fitz
@@ -15,10 +17,308 @@ from src.exceptions import (
 
 from ...logging_utils import get_logger
 from ...pdf_processing import BasePDFProcessor
+from ...performance_config import get_performance_config
 
 logger = get_logger(__name__)
 
 
+# Images smaller than this (pixels) are left alone: little to gain.
+_MIN_IMAGE_PIXELS = 10000
+# A re-encoded image replaces the original only if it is this much smaller.
+_MIN_SAVING_RATIO = 0.9
+# Unique images re-encoded in-process as the savings sample.
+_SAMPLE_IMAGES = 6
+# Below this share of image bytes saved by the sample, skip the full pass.
+_MIN_SAMPLE_SAVING = 0.05
+# Fewer unique images than this are re-encoded on the calling thread (pool
+# start-up costs more than it saves).
+_PARALLEL_MIN_IMAGES = 8
+
+
+def _jpeg_quality(level: str) -> int:
+    # Increased quality to prevent black pages with noise
+    if level == "high":
+        return 65  # Was 40 - too aggressive, caused artifacts
+    if level == "medium":
+        return 75  # Was 60 - increased for better quality
+    return 85  # Was 80
+
+
+def _jpeg_max_dim(level: str) -> int:
+    # Increased dimensions to preserve quality
+    if level == "high":
+        return 2000  # Was 1600 - too small, caused quality loss
+    if level == "medium":
+        return 2800  # Was 2400
+    return 4000
+
+
+def _recompress_jpeg(img_bytes: bytes, quality: int, max_dim: int) -> bytes | None:
+    """Re-encode one JPEG; ``None`` when it should be kept as is.
+
+    Pillow releases the GIL while decoding and encoding, so calls run in
+    parallel on a thread pool (also inside daemonic Celery prefork children).
+    """
+    try:
+        im = Image.open(BytesIO(img_bytes))
+        im.load()
+    except Exception:
+        return None
+
+    # Skip images that are not RGB or grayscale to prevent color space issues
+    if im.mode not in {"RGB", "L", "CMYK"}:
+        try:
+            im = im.convert("RGB")
+        except Exception:
+            return None
+
+    # Preserve CMYK images for print quality
+    if im.mode == "CMYK":
+        return None
+
+    w, h = im.size
+    original_pixels = w * h
+
+    # Skip very small images - compression won't help much
+    if original_pixels < _MIN_IMAGE_PIXELS:
+        return None
+
+    max_side = max(w, h)
+    if max_side > max_dim:
+        scale = max_dim / float(max_side)
+        new_size = (max(1, int(w * scale)), max(1, int(h * scale)))
+
+        # Don't resize if it would reduce quality too much
+        new_pixels = new_size[0] * new_size[1]
+        if new_pixels < original_pixels * 0.25:  # Don't reduce by more than 75%
+            return None
+
+        try:
+            im = im.resize(new_size, Image.LANCZOS)
+        except Exception:
+            pass
+
+    out = BytesIO()
+    try:
+        im.save(out, format="JPEG", quality=quality, optimize=True)
+    except Exception:
+        return None
+
+    new_bytes = out.getvalue()
+    # Only replace if we save at least 10% (not just any reduction)
+    if not new_bytes or len(new_bytes) >= len(img_bytes) * _MIN_SAVING_RATIO:
+        return None
+    return new_bytes
+
+
+def _collect_jpegs(
+    doc: fitz.Document, check_cancelled: Callable[[], None] | None
+) -> dict[str, tuple[list[int], int]]:
+    """Map content hash -> (xrefs, JPEG size) for every DCT image in ``doc``.
+
+    Identical images embedded under several xrefs are re-encoded once. Only
+    the hash and size are kept: the bytes are re-extracted when each image is
+    encoded, so a large scan never sits in memory all at once.
+    """
+    images: dict[str, tuple[list[int], int]] = {}
+    seen = set()
+    for page in doc:
+        # Check cancellation at the start of each page
+        if callable(check_cancelled):
+            check_cancelled()
+        for img in page.get_images(full=True):
+            xref = img[0]
+            if xref in seen:
+                continue
+            seen.add(xref)
+
+            try:
+                flt = doc.xref_get_key(xref, "Filter")[1]
+            except Exception:
+                flt = ""
+            if "DCTDecode" not in (flt or ""):
+                continue
+
+            try:
+                info = doc.extract_image(xref)
+            except Exception as e:
+                logger.debug(
+                    "compress_pdf: skip image xref=%d — extract_image failed: %s",
+                    xref,
+                    e,
+                )
+                continue
+            if (info.get("ext") or "").lower() not in {"jpeg", "jpg"}:
+                continue
+            img_bytes = info.get("image")
+            if not img_bytes:
+                continue
+
+            digest = hashlib.sha256(img_bytes).hexdigest()
+            if digest in images:
+                images[digest][0].append(xref)
+            else:
+                images[digest] = ([xref], len(img_bytes))
+    return images
+
+
+def _extract_jpeg(doc: fitz.Document, xref: int) -> bytes | None:
+    """Return the JPEG bytes stored at ``xref``, or ``None`` if unreadable."""
+    try:
+        return doc.extract_image(xref).get("image") or None
+    except Exception as e:
+        logger.debug(
+            "compress_pdf: skip image xref=%d — extract_image failed: %s", xref, e
+        )
+        return None
+
+
+def _write_back(doc: fitz.Document, xrefs: list[int], new_bytes: bytes) -> bool:
+    """Replace the stream of every xref sharing an image; True if any took."""
+    written = False
+    for xref in xrefs:
+        try:
+            doc.update_stream(xref, new_bytes)
+            written = True
+        except Exception as e:
+            logger.debug(
+                "compress_pdf: skip image xref=%d — update_stream failed: %s",
+                xref,
+                e,
+            )
+    return written
+
+
+def _recompress_images(
+    doc: fitz.Document,
+    level: str,
+    check_cancelled: Callable[[], None] | None = None,
+    context: dict | None = None,
+) -> dict | None:
+    """Re-encode the document's JPEGs for ``level`` and write them back.
+
+    Three phases: hash and deduplicate every DCT image up front, re-encode a
+    small sample on the calling thread to estimate the saving (and stop there
+    when there is nothing worth the work), then re-encode the rest on a thread
+    pool. Each image is extracted just before it is encoded and written back
+    as soon as its result arrives, so only the pool's in-flight window is
+    held in memory. Returns the size and quality report for the
+    level, or ``None`` for levels that keep images.
+    """
+    if level not in {"medium", "high"}:
+        return None
+
+    quality = _jpeg_quality(level)
+    max_dim = _jpeg_max_dim(level)
+    images = _collect_jpegs(doc, check_cancelled)
+    report = {
+        "level": level,
+        "jpeg_quality": quality,
+        "max_dim": max_dim,
+        "images": sum(len(xrefs) for xrefs, _size in images.values()),
+        "unique_images": len(images),
+        "recompressed": 0,
+        "image_bytes_before": sum(size for _xrefs, size in images.values()),
+        "image_bytes_after": 0,
+        "estimated_saving_ratio": 0.0,
+    }
+    if not images:
+        return report
+
+    def settle(digest: str, new_bytes: bytes | None) -> int:
+        """Write one result back, update the report; return its final size."""
+        xrefs, size = images[digest]
+        if new_bytes and _write_back(doc, xrefs, new_bytes):
+            report["recompressed"] += len(xrefs)
+            size = len(new_bytes)
+        report["image_bytes_after"] += size
+        return size
+
+    def encode(digest: str) -> bytes | None:
+        data = _extract_jpeg(doc, images[digest][0][0])
+        return _recompress_jpeg(data, quality, max_dim) if data else None
+
+    # Largest images first: they dominate both the saving and the run time,
+    # and the pool then finishes on small ones.
+    order = sorted(images, key=lambda digest: images[digest][1], reverse=True)
+
+    # Sampling pass: evenly spread over the size ranking.
+    step = max(1, len(order) // _SAMPLE_IMAGES)
+    sample = order[::step][:_SAMPLE_IMAGES]
+    sample_before = sample_after = 0
+    for digest in sample:
+        if callable(check_cancelled):
+            check_cancelled()
+        sample_before += images[digest][1]
+        sample_after += settle(digest, encode(digest))
+    estimated = 1 - sample_after / sample_before if sample_before else 0.0
+    report["estimated_saving_ratio"] = round(estimated, 3)
+    logger.info(
+        "compress_pdf savings estimate",
+        extra={
+            **(context or {}),
+            "event": "compress_pdf_estimate",
+            "unique_images": len(images),
+            "sampled": len(sample),
+            "estimated_saving_ratio": report["estimated_saving_ratio"],
+            "estimated_bytes_saved": int(report["image_bytes_before"] * estimated),
+        },
+    )
+
+    sampled = set(sample)
+    remaining = [digest for digest in order if digest not in sampled]
+    if remaining and estimated < _MIN_SAMPLE_SAVING:
+        # Already-optimised images: not worth re-encoding.
+        for digest in remaining:
+            settle(digest, None)
+        return report
+
+    perf = get_performance_config()
+    workers = min(perf.get_thread_workers("image_processing"), len(remaining))
+    if len(remaining) < _PARALLEL_MIN_IMAGES or workers <= 1:
+        for digest in remaining:
+            if callable(check_cancelled):
+                check_cancelled()
+            settle(digest, encode(digest))
+        return report
+
+    # Bounded in-flight window: only the images currently submitted have
+    # their bytes in memory.
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="compress_img")
+    pending: dict = {}
+    try:
+        todo = iter(remaining)
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < workers * 2:
+                digest = next(todo, None)
+                if digest is None:
+                    exhausted = True
+                    break
+                data = _extract_jpeg(doc, images[digest][0][0])
+                if not data:
+                    settle(digest, None)
+                    continue
+                future = pool.submit(_recompress_jpeg, data, quality, max_dim)
+                pending[future] = digest
+            if not pending:
+                break
+            if callable(check_cancelled):
+                check_cancelled()
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                digest = pending.pop(future)
+                try:
+                    new_bytes = future.result()
+                except Exception as e:
+                    logger.debug("compress_pdf: image re-encode failed: %s", e)
+                    new_bytes = None
+                settle(digest, new_bytes)
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+    return report
+
+
 def compress_pdf(
     uploaded_file: UploadedFile,
     compression_level: str = "medium",
@@ -110,146 +410,6 @@ def compress_pdf(
                 reduced.pop(key, None)
             doc.save(output_path, **reduced)
 
-        def _jpeg_quality(level: str) -> int:
-            # Increased quality to prevent black pages with noise
-            if level == "high":
-                return 65  # Was 40 - too aggressive, caused artifacts
-            if level == "medium":
-                return 75  # Was 60 - increased for better quality
-            return 85  # Was 80
-
-        def _jpeg_max_dim(level: str) -> int:
-            # Increased dimensions to preserve quality
-            if level == "high":
-                return 2000  # Was 1600 - too small, caused quality loss
-            if level == "medium":
-                return 2800  # Was 2400
-            return 4000
-
-        def _recompress_jpegs(doc: fitz.Document, level: str) -> None:
-            if level not in {"medium", "high"}:
-                return
-
-            quality = _jpeg_quality(level)
-            max_dim = _jpeg_max_dim(level)
-            seen = set()
-
-            for page in doc:
-                # Check cancellation at the start of each page
-                if callable(check_cancelled):
-                    check_cancelled()
-                for img in page.get_images(full=True):
-                    xref = img[0]
-                    if xref in seen:
-                        continue
-                    seen.add(xref)
-
-                    try:
-                        info = doc.extract_image(xref)
-                    except Exception as e:
-                        logger.debug(
-                            "compress_pdf: skip image xref=%d — extract_image failed: %s",
-                            xref,
-                            e,
-                        )
-                        continue
-
-                    ext = (info.get("ext") or "").lower()
-                    if ext not in {"jpeg", "jpg"}:
-                        continue
-
-                    try:
-                        flt = doc.xref_get_key(xref, "Filter")[1]
-                    except Exception:
-                        flt = ""
-                    if "DCTDecode" not in (flt or ""):
-                        continue
-
-                    img_bytes = info.get("image")
-                    if not img_bytes:
-                        continue
-
-                    try:
-                        im = Image.open(BytesIO(img_bytes))
-                        im.load()
-                    except Exception as e:
-                        logger.debug(
-                            "compress_pdf: skip image xref=%d — PIL open failed: %s",
-                            xref,
-                            e,
-                        )
-                        continue
-
-                    # Skip images that are not RGB or grayscale to prevent color space issues
-                    if im.mode not in {"RGB", "L", "CMYK"}:
-                        try:
-                            im = im.convert("RGB")
-                        except Exception as e:
-                            logger.debug(
-                                "compress_pdf: skip image xref=%d mode=%s — convert to RGB failed: %s",
-                                xref,
-                                im.mode,
-                                e,
-                            )
-                            continue
-
-                    # Preserve CMYK images for print quality
-                    if im.mode == "CMYK":
-                        continue
-
-                    w, h = im.size
-                    original_pixels = w * h
-
-                    # Skip very small images - compression won't help much
-                    if original_pixels < 10000:  # Less than 100x100
-                        continue
-
-                    max_side = max(w, h)
-                    if max_side > max_dim:
-                        scale = max_dim / float(max_side)
-                        new_size = (max(1, int(w * scale)), max(1, int(h * scale)))
-
-                        # Don't resize if it would reduce quality too much
-                        new_pixels = new_size[0] * new_size[1]
-                        if (
-                            new_pixels < original_pixels * 0.25
-                        ):  # Don't reduce by more than 75%
-                            continue
-
-                        try:
-                            im = im.resize(new_size, Image.LANCZOS)
-                        except Exception:
-                            pass
-
-                    out = BytesIO()
-                    try:
-                        im.save(out, format="JPEG", quality=quality, optimize=True)
-                    except Exception as e:
-                        logger.debug(
-                            "compress_pdf: skip image xref=%d — JPEG re-save failed: %s",
-                            xref,
-                            e,
-                        )
-                        continue
-
-                    new_bytes = out.getvalue()
-                    if not new_bytes:
-                        continue
-
-                    # Only replace if we save at least 10% (not just any reduction)
-                    if len(new_bytes) >= len(img_bytes) * 0.9:
-                        continue
-
-                    try:
-                        doc.update_stream(xref, new_bytes)
-                    except Exception as e:
-                        logger.debug(
-                            "compress_pdf: skip image xref=%d — update_stream failed: %s",
-                            xref,
-                            e,
-                        )
-                        continue
-
         def _op(input_pdf_path: str, *, output_path: str, compression_level: str):
             # Check cancellation before opening document
             if callable(check_cancelled):
@@ -275,7 +435,14 @@ def compress_pdf(
                         except Exception:
                             pass
 
-                _recompress_jpegs(doc, compression_level)
+                report = _recompress_images(
+                    doc, compression_level, check_cancelled, context
+                )
+                if report:
+                    logger.info(
+                        "compress_pdf image recompression",
+                        extra={**context, "event": "compress_pdf_images", **report},
+                    )
                 _save_with_fallback(doc, output_path, _save_kwargs(compression_level))
             finally:
                 doc.close()
@@ -0,0 +1,328 @@
+"""
+Table detection shared by PDF → Excel and PDF → Markdown.
+
+Both tools used to run pdfplumber over every page: ``extract_tables()`` in
+pdf_to_excel, ``find_tables()`` in pdf_to_markdown (which also had the same
+file open in PyMuPDF). pdfplumber re-parses each page's content stream in
+pure Python and was the slowest step in both.
+
+``extract_page_tables()`` returns a ``PageTables`` per page, with the
+page's tables (cell rows plus bbox in PyMuPDF page coordinates) and its
+plain text:
+
+- PyMuPDF ``find_tables()`` is the fast path for every page.
+- pdfplumber runs only on pages where that result is doubtful: a detected
+  table is mostly empty cells, or there are no tables but the page has
+  enough horizontal/vertical rulings to look like one. Its tables replace
+  the fast ones only if it finds any.
+- Long documents are split into chunks and detected across the process
+  pool, in the same way pdf_to_jpg renders pages (one interpreter per chunk
+  inside Celery prefork children).
+- Results are cached by content hash and per page (in-process and in the
+  Django cache), so converting the same upload to the other format, or
+  after a retry, skips detection altogether.
+"""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from concurrent.futures import FIRST_COMPLETED, wait
+from dataclasses import asdict, dataclass, field
+
+from .cache_utils import cache_pdf_tables, get_cached_pdf_tables
+from .logging_utils import get_logger
+from .parallel_processing import get_process_pool
+from .pdf_info import get_pdf_info
+from .performance_config import get_performance_config
+
+logger = get_logger(__name__)
+
+# Bump when detection changes so cached models from older code are ignored.
+ENGINE_VERSION = 1
+
+# A detected table with more empty cells than this is re-checked.
+SPARSE_TABLE_EMPTY_RATIO = 0.6
+# A table-less page with at least this many straight rulings is re-checked.
+MIN_RULINGS_FOR_RECHECK = 6
+
+_LOCAL_MAX_ENTRIES = 16
+_local: OrderedDict[str, dict] = OrderedDict()
+_local_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class PageTable:
+    """One detected table."""
+
+    bbox: tuple[float, float, float, float]
+    rows: list[list[str | None]]
+    # "pymupdf" or "pdfplumber"
+    source: str = "pymupdf"
+
+
+@dataclass(frozen=True)
+class PageTables:
+    """Tables and plain text of one page (``index`` is 0-based)."""
+
+    index: int
+    tables: list[PageTable] = field(default_factory=list)
+    text: str = ""
+    # pdfplumber was consulted because the fast result was doubtful.
+    rechecked: bool = False
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PageTables":
+        tables = [
+            PageTable(
+                bbox=tuple(table["bbox"]),
+                rows=[list(row) for row in table["rows"]],
+                source=table.get("source", "pymupdf"),
+            )
+            for table in data.get("tables", [])
+        ]
+        return cls(
+            index=data["index"],
+            tables=tables,
+            text=data.get("text", ""),
+            rechecked=data.get("rechecked", False),
+        )
+
+
+def _empty_ratio(rows: list[list[str | None]]) -> float:
+    cells = [cell for row in rows for cell in (row or [])]
+    if not cells:
+        return 1.0
+    empty = sum(1 for cell in cells if not (cell and str(cell).strip()))
+    return empty / len(cells)
+
+
+def _ruling_count(page) -> int:
+    """Straight horizontal/vertical segments drawn on ``page``."""
+    count = 0
+    for path in page.get_drawings():
+        for item in path.get("items", []):
+            if item[0] == "re":
+                count += 4
+            elif item[0] == "l":
+                start, end = item[1], item[2]
+                if abs(start.x - end.x) < 1 or abs(start.y - end.y) < 1:
+                    count += 1
+    return count
+
+
+def _needs_recheck(page, tables: list[PageTable]) -> bool:
+    if tables:
+        return any(_empty_ratio(t.rows) > SPARSE_TABLE_EMPTY_RATIO for t in tables)
+    return _ruling_count(page) >= MIN_RULINGS_FOR_RECHECK
+
+
+def _fast_tables(page) -> list[PageTable] | None:
+    """PyMuPDF tables, or None if its detector failed on this page."""
+    try:
+        found = page.find_tables()
+    except Exception as exc:
+        logger.debug(f"find_tables failed on page {page.number + 1}: {exc}")
+        return None
+    tables = []
+    for table in found.tables:
+        rows = table.extract()
+        if rows:
+            bbox = tuple(float(v) for v in table.bbox)
+            tables.append(PageTable(bbox=bbox, rows=rows, source="pymupdf"))
+    return tables
+
+
+def _plumber_tables(plumber_page) -> list[PageTable]:
+    tables = []
+    for table in plumber_page.find_tables():
+        rows = table.extract()
+        if rows:
+            bbox = tuple(float(v) for v in table.bbox)
+            tables.append(PageTable(bbox=bbox, rows=rows, source="pdfplumber"))
+    return tables
+
+
+def _detect_chunk(
+    pdf_path: str,
+    page_indices: list[int],
+    check_cancelled: Callable[[], None] | None = None,
+) -> list[dict]:
+    """Detect tables on ``page_indices`` (0-based) of ``pdf_path``.
+
+    Module-level so it can run in a pool worker process. Returns
+    ``PageTables.to_dict()`` per page that exists in the document.
+    ``check_cancelled`` (in-process use only) runs before each page.
+    """
+    import fitz
+
+    if hasattr(fitz, "no_recommend_layout"):
+        fitz.no_recommend_layout()
+
+    results = []
+    plumber_doc = None
+    try:
+        with fitz.open(pdf_path) as doc:
+            for index in page_indices:
+                if callable(check_cancelled):
+                    check_cancelled()
+                if index < 0 or index >= doc.page_count:
+                    continue
+                page = doc[index]
+                tables = _fast_tables(page)
+                rechecked = tables is None or _needs_recheck(page, tables)
+                if rechecked:
+                    try:
+                        if plumber_doc is None:
+                            import pdfplumber
+
+                            plumber_doc = pdfplumber.open(pdf_path)
+                        plumber_found = _plumber_tables(plumber_doc.pages[index])
+                    except Exception as exc:
+                        logger.debug(f"pdfplumber failed on page {index + 1}: {exc}")
+                        plumber_found = []
+                    if plumber_found or tables is None:
+                        tables = plumber_found
+                results.append(
+                    PageTables(
+                        index=index,
+                        tables=tables,
+                        text=page.get_text(),
+                        rechecked=rechecked,
+                    ).to_dict()
+                )
+    finally:
+        if plumber_doc is not None:
+            plumber_doc.close()
+    return results
+
+
+def _cache_lookup(sha256: str) -> dict:
+    with _local_lock:
+        pages = _local.get(sha256)
+        if pages is not None:
+            _local.move_to_end(sha256)
+            return dict(pages)
+    try:
+        cached = get_cached_pdf_tables(sha256)
+    except Exception as exc:
+        logger.debug(f"PDF tables cache lookup skipped: {exc}")
+        return {}
+    if not cached or cached.get("version") != ENGINE_VERSION:
+        return {}
+    return dict(cached.get("pages") or {})
+
+
+def _cache_store(sha256: str, pages: dict) -> None:
+    with _local_lock:
+        _local[sha256] = pages
+        _local.move_to_end(sha256)
+        while len(_local) > _LOCAL_MAX_ENTRIES:
+            _local.popitem(last=False)
+    try:
+        cache_pdf_tables(sha256, {"version": ENGINE_VERSION, "pages": pages})
+    except Exception as exc:
+        logger.debug(f"PDF tables cache store skipped: {exc}")
+
+
+def _detect(
+    pdf_path: str,
+    page_indices: list[int],
+    check_cancelled: Callable[[], None] | None,
+    context: dict,
+) -> list[dict]:
+    perf = get_performance_config()
+    chunk_size = max(1, perf.get_batch_size("pdf_pages"))
+    chunks = [
+        page_indices[i : i + chunk_size]
+        for i in range(0, len(page_indices), chunk_size)
+    ]
+    workers = min(perf.get_thread_workers("image_processing"), len(chunks))
+    if workers <= 1:
+        # One chunk or a single-worker tier: skip the pool's start-up cost.
+        return _detect_chunk(pdf_path, page_indices, check_cancelled)
+
+    def _cancelled() -> None:
+        if callable(check_cancelled):
+            check_cancelled()
+
+    logger.info(
+        "Detecting PDF tables in parallel",
+        extra={
+            **context,
+            "event": "pdf_tables_parallel",
+            "pages": len(page_indices),
+            "workers": workers,
+            "chunk_size": chunk_size,
+        },
+    )
+    results = []
+    pool = get_process_pool(workers)
+    pending = set()
+    try:
+        for chunk in chunks:
+            _cancelled()
+            if len(pending) >= workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results.extend(future.result())
+            pending.add(pool.submit(_detect_chunk, pdf_path, chunk))
+        while pending:
+            _cancelled()
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                results.extend(future.result())
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+    return results
+
+
+def extract_page_tables(
+    pdf_path: str,
+    page_indices: Iterable[int] | None = None,
+    check_cancelled: Callable[[], None] | None = None,
+    context: dict | None = None,
+) -> dict[int, PageTables]:
+    """Return ``{page index: PageTables}`` for ``page_indices`` (default: all).
+
+    Indices are 0-based; ones outside the document are left out. Pages
+    already in the cache for this file's content are not detected again.
+    """
+    context = context or {}
+    info = get_pdf_info(pdf_path)
+    page_count = info.page_count
+    if info.error:
+        # Let the parser raise its own error (the repair fallback in the
+        # callers acts on it).
+        import fitz
+
+        with fitz.open(pdf_path) as doc:
+            page_count = doc.page_count
+    if page_indices is None:
+        wanted = list(range(page_count))
+    else:
+        wanted = sorted({i for i in page_indices if 0 <= i < page_count})
+
+    sha256 = info.sha256
+    # Cache keys are strings: the Django cache may round-trip through JSON.
+    cached = _cache_lookup(sha256)
+    missing = [i for i in wanted if str(i) not in cached]
+    if missing:
+        for page in _detect(pdf_path, missing, check_cancelled, context):
+            cached[str(page["index"])] = page
+        _cache_store(sha256, cached)
+
+    result = {i: PageTables.from_dict(cached[str(i)]) for i in wanted}
+    logger.debug(
+        "PDF tables ready",
+        extra={
+            **context,
+            "event": "pdf_tables",
+            "pages": len(wanted),
+            "detected": len(missing),
+            "rechecked": sum(1 for page in result.values() if page.rechecked),
+        },
+    )
+    return result
@@ -97,8 +97,14 @@ class PerformanceConfig:
                 "batch_processing": 4,
                 "image_processing": 6,
                 "ocr_processing": 3,
+                "pdf_to_word": 4,
+            },
+            "batch_sizes": {
+                "pdf_pages": 20,
+                "image_processing": 15,
+                "ocr_pages": 10,
+                "pdf_to_word_pages": 25,
             },
-            "batch_sizes": {"pdf_pages": 20, "image_processing": 15, "ocr_pages": 10},
             "memory_limits": {
                 "max_batch_memory_mb": 1000,
                 "ocr_text_limit": 100000,
@@ -123,8 +129,14 @@ class PerformanceConfig:
                 "batch_processing": 3,
                 "image_processing": 4,
                 "ocr_processing": 2,
+                "pdf_to_word": 2,
+            },
+            "batch_sizes": {
+                "pdf_pages": 10,
+                "image_processing": 8,
+                "ocr_pages": 5,
+                "pdf_to_word_pages": 25,
             },
-            "batch_sizes": {"pdf_pages": 10, "image_processing": 8, "ocr_pages": 5},
             "memory_limits": {
                 "max_batch_memory_mb": 700,
                 "ocr_text_limit": 75000,
@@ -151,8 +163,14 @@ class PerformanceConfig:
                 "batch_processing": 2,
                 "image_processing": 3,
                 "ocr_processing": 1,
+                "pdf_to_word": 1,
+            },
+            "batch_sizes": {
+                "pdf_pages": 5,
+                "image_processing": 4,
+                "ocr_pages": 3,
+                "pdf_to_word_pages": 25,
             },
-            "batch_sizes": {"pdf_pages": 5, "image_processing": 4, "ocr_pages": 3},
             "memory_limits": {
                 "max_batch_memory_mb": 500,
                 "ocr_text_limit": 50000,
@@ -177,8 +195,14 @@ class PerformanceConfig:
                 "batch_processing": 1,
                 "image_processing": 1,
                 "ocr_processing": 1,
+                "pdf_to_word": 1,
+            },
+            "batch_sizes": {
+                "pdf_pages": 2,
+                "image_processing": 2,
+                "ocr_pages": 1,
+                "pdf_to_word_pages": 25,
             },
-            "batch_sizes": {"pdf_pages": 2, "image_processing": 2, "ocr_pages": 1},
             "memory_limits": {
                 "max_batch_memory_mb": 200,
                 "ocr_text_limit": 25000,
@@ -7,6 +7,7 @@ premium-specific features like batch processing and unlimited limits.
 
 from django.core.cache import cache
 from django.utils.translation import gettext as _
+from src.users.local_cache import MISSING, premium_status
 
 _PREMIUM_CACHE_TTL = 60  # seconds — short, so a webhook flip propagates quickly
 
@@ -20,27 +21,33 @@ def is_premium_active(user) -> bool:
     payment provider's webhook does not silently grant premium.
 
     Caches the result per-user for _PREMIUM_CACHE_TTL seconds to avoid
-    hitting the DB on every request — the cache is invalidated when the
-    User model is saved (see users/models.save).
+    hitting the DB on every request, and in a process-local copy in front of
+    that (see users/local_cache) — both are invalidated when the User model
+    is saved (see users/models.save).
     """
     if not user or not user.is_authenticated:
         return False
 
+    local_key = ("active", user.pk)
+    local = premium_status.get(local_key)
+    if local is not MISSING:
+        return local
+
     cache_key = f"user_premium_active:{user.pk}"
     cached = cache.get(cache_key)
     if cached is not None:
+        premium_status.set(local_key, bool(cached))
         return bool(cached)
 
     if not hasattr(user, "is_premium") or not user.is_premium:
-        cache.set(cache_key, False, _PREMIUM_CACHE_TTL)
-        return False
-
-    if hasattr(user, "is_subscription_active"):
+        result = False
+    elif hasattr(user, "is_subscription_active"):
         result = bool(user.is_subscription_active())
     else:
         result = False
 
     cache.set(cache_key, result, _PREMIUM_CACHE_TTL)
+    premium_status.set(local_key, result)
     return result
 
 
@@ -1,18 +1,51 @@
 """
 Rate limiting utilities with premium user support.
 Provides decorators and helpers for combined IP + User rate limiting.
+
+``combined_rate_limit`` evaluates the per-user tier bucket, the anonymous
+IP bucket, the daily quota and the usage counters in one admission call
+(see admission.py).
 """
 
 import logging
 from functools import wraps
 
+from django.conf import settings
 from django.core.cache import cache
 from django.http import JsonResponse
-from django_ratelimit.decorators import ratelimit
-from django_ratelimit.exceptions import Ratelimited
+
+from .admission import COUNTER, Limit, admit, parse_rate
 
 logger = logging.getLogger(__name__)
 
+PREMIUM_RATES = {
+    "api_conversion": "10000/h",
+    "api_batch": "500/h",
+    "api_auth": "100/h",
+}
+AUTHENTICATED_RATES = {
+    "api_conversion": "1000/h",
+    "api_batch": "50/h",
+    "api_auth": "50/h",
+}
+# IP bucket (ip_rate= on @combined_rate_limit) is what actually fires for anon users;
+# these per-user fallbacks apply only to non-IP-keyed scenarios.
+ANONYMOUS_RATES = {
+    "api_conversion": "30/h",
+    "api_batch": "0/h",
+    "api_auth": "20/h",
+}
+
+_STATS_TTL = 3600
+
+
+def _tier_rate(group, is_authenticated, is_premium):
+    if is_premium:
+        return PREMIUM_RATES.get(group, "5000/h")
+    if is_authenticated:
+        return AUTHENTICATED_RATES.get(group, "500/h")
+    return ANONYMOUS_RATES.get(group, "50/h")
+
 
 def get_user_rate_limit(group, request):
     """
@@ -25,36 +58,16 @@ def get_user_rate_limit(group, request):
     Returns:
         Rate limit string (e.g., '1000/h', '10000/h')
     """
-    premium_rates = {
-        "api_conversion": "10000/h",
-        "api_batch": "500/h",
-        "api_auth": "100/h",
-    }
-    authenticated_rates = {
-        "api_conversion": "1000/h",
-        "api_batch": "50/h",
-        "api_auth": "50/h",
-    }
-    # IP bucket (ip_rate= on @combined_rate_limit) is what actually fires for anon users;
-    # these per-user fallbacks apply only to non-IP-keyed scenarios.
-    anonymous_rates = {
-        "api_conversion": "30/h",
-        "api_batch": "0/h",
-        "api_auth": "20/h",
-    }
-
     if request.user.is_authenticated:
         try:
             from .premium_utils import is_premium_active
 
-            if is_premium_active(request.user):
-                return premium_rates.get(group, "5000/h")
-            return authenticated_rates.get(group, "500/h")
+            return _tier_rate(group, True, is_premium_active(request.user))
         except Exception as e:
             logger.warning(f"Error checking premium status: {e}")
-            return authenticated_rates.get(group, "500/h")
+            return _tier_rate(group, True, False)
 
-    return anonymous_rates.get(group, "50/h")
+    return _tier_rate(group, False, False)
 
 
 def combined_rate_limit(group="api", ip_rate="100/h", methods=None):
@@ -77,7 +90,7 @@ def combined_rate_limit(group="api", ip_rate="100/h", methods=None):
     if methods is None:
         methods = ["POST"]
 
-    method_str = ",".join(methods) if isinstance(methods, list) else methods
+    allowed_methods = set(methods.split(",") if isinstance(methods, str) else methods)
 
     def decorator(func):
         @wraps(func)
@@ -112,95 +125,116 @@ def combined_rate_limit(group="api", ip_rate="100/h", methods=None):
                     return func(self_obj, req, *a, **kw)
                 return func(req, *a, **kw)
 
-            # Apply rate limits to a callable where request is the first argument.
-            # The inner user_or_ip limit already differentiates anonymous /
-            # authenticated / premium via get_user_rate_limit. The outer key="ip"
-            # bucket is an extra abuse guard that must bind ONLY anonymous callers:
-            # applied to everyone it caps authenticated & premium users far below
-            # their advertised per-user limits (e.g. api_conversion ip_rate=30/h
-            # would override the 10000/h premium rate, and a shared NAT/CGNAT IP
-            # would make paying users throttle each other).
-            user = getattr(request, "user", None)
-            is_authenticated = bool(getattr(user, "is_authenticated", False))
-
-            limited = ratelimit(
-                key="user_or_ip",
-                rate=get_user_rate_limit,
-                group=group,
-                method=method_str,
-                block=True,
-            )(call_original)
-            if not is_authenticated:
-                limited = ratelimit(
-                    key="ip",
-                    rate=ip_rate,
-                    method=method_str,
-                    block=True,
-                )(limited)
+            if request is None:
+                return call_original(*remaining_args, **kwargs)
+
+            decision, is_premium = _admit(request, group, ip_rate, allowed_methods)
 
             # Log rate limit hits (best-effort, should never break the request)
             try:
-                if request is not None:
-                    _log_rate_limit_usage(request, group)
+                _log_rate_limit_usage(request, group, is_premium)
             except Exception as e:
                 logger.error(f"Error logging rate limit usage: {e}")
 
-            try:
-                return limited(request, *remaining_args, **kwargs)
-            except Ratelimited as e:
-                return handle_rate_limit_exception(request, e)
+            if decision.allowed:
+                quota = decision.get("daily_quota")
+                if quota is not None:
+                    # DailyQuotaMiddleware.process_response counts 2xx outcomes.
+                    http_request = getattr(request, "_request", request)
+                    http_request._daily_quota_key = quota.limit.key
+                    http_request._daily_quota_limit = quota.limit.limit
+                response = call_original(request, *remaining_args, **kwargs)
+            elif decision.denied.limit.name == "daily_quota":
+                from .daily_quota import quota_exceeded_response
+
+                response = quota_exceeded_response(
+                    request, decision.denied.limit.limit, decision.denied.count
+                )
+            else:
+                response = rate_limit_response(
+                    request, decision.denied.limit.name, decision.retry_after
+                )
+            return decision.apply_headers(response)
 
+        # DailyQuotaMiddleware leaves the quota check to the wrapper.
+        wrapper.admits_daily_quota = True
         return wrapper
 
     return decorator
 
 
-def _log_rate_limit_usage(request, group):
+def _admit(request, group, ip_rate, methods):
+    """Run the request's admission; return ``(decision, is_premium)``.
+
+    The per-user bucket (``user_or_ip``) differentiates anonymous /
+    authenticated / premium via the tier rates. The IP bucket is an extra
+    abuse guard that must bind ONLY anonymous callers: applied to everyone it
+    caps authenticated & premium users far below their advertised per-user
+    limits (e.g. api_conversion ip_rate=30/h would override the 10000/h
+    premium rate, and a shared NAT/CGNAT IP would make paying users throttle
+    each other).
+    """
+    from .daily_quota import quota_applies, quota_limit
+    from .premium_utils import is_premium_active
+
+    user = getattr(request, "user", None)
+    is_authenticated = bool(getattr(user, "is_authenticated", False))
+    try:
+        is_premium = is_premium_active(user)
+    except Exception as e:
+        logger.warning(f"Error checking premium status: {e}")
+        is_premium = False
+    ip = _get_client_ip(request) or "unknown"
+
+    # The quota goes first so an exhausted day shows its register/upgrade
+    # prompt rather than a generic rate-limit message.
+    limits = []
+    if quota_applies(request, is_premium):
+        limits.append(quota_limit(request))
+    if request.method in methods and getattr(settings, "RATELIMIT_ENABLE", True):
+        identity = f"user:{user.pk}" if is_authenticated else f"ip:{ip}"
+        count, window = parse_rate(_tier_rate(group, is_authenticated, is_premium))
+        limits.append(Limit("user", f"rate_limit:{group}:{identity}", count, window))
+        if not is_authenticated:
+            count, window = parse_rate(ip_rate)
+            limits.append(Limit("ip", f"rate_limit:{group}:anon:{ip}", count, window))
+    limits += _usage_counters(group, is_authenticated, is_premium)
+    return admit(limits), is_premium
+
+
+def _usage_counters(group, is_authenticated, is_premium):
+    """Hourly request counters read by ``get_rate_limit_stats``."""
+    if is_premium:
+        user_type = "premium"
+    elif is_authenticated:
+        user_type = "authenticated"
+    else:
+        user_type = "anonymous"
+    prefix = f"rate_limit_stats:{group}"
+    return [
+        Limit("stats_total", f"{prefix}:total", 0, _STATS_TTL, kind=COUNTER),
+        Limit("stats_user_type", f"{prefix}:{user_type}", 0, _STATS_TTL, kind=COUNTER),
+    ]
+
+
+def _log_rate_limit_usage(request, group, is_premium):
     """
     Log rate limit usage for monitoring.
 
     Args:
         request: Django request object
         group: Rate limit group name
+        is_premium: Whether the caller has an active premium subscription
     """
     # Get user identifier
     if request.user.is_authenticated:
         user_id = request.user.id
-        try:
-            from .premium_utils import is_premium_active
-
-            is_premium = is_premium_active(request.user)
-        except Exception:
-            is_premium = False
     else:
         user_id = "anonymous"
-        is_premium = False
 
     # Get IP
     ip = _get_client_ip(request)
 
-    # Increment counters in cache
-    cache_key_prefix = f"rate_limit_stats:{group}"
-
-    # Total requests
-    total_key = f"{cache_key_prefix}:total"
-    cache.add(total_key, 0, timeout=3600)
-    cache.incr(total_key, 1)
-
-    # Requests by user type
-    if is_premium:
-        premium_key = f"{cache_key_prefix}:premium"
-        cache.add(premium_key, 0, timeout=3600)
-        cache.incr(premium_key, 1)
-    elif request.user.is_authenticated:
-        auth_key = f"{cache_key_prefix}:authenticated"
-        cache.add(auth_key, 0, timeout=3600)
-        cache.incr(auth_key, 1)
-    else:
-        anon_key = f"{cache_key_prefix}:anonymous"
-        cache.add(anon_key, 0, timeout=3600)
-        cache.incr(anon_key, 1)
-
     # Log to file for analysis. Hash user_id and truncate IP to the /24 prefix
     # so we keep enough signal to debug rate-limit issues but minimize PII in
     # log files (GDPR / log retention concerns).
@@ -293,8 +327,7 @@ def log_rate_limit_block(request, limit_type="ip"):
 
     # Increment blocked counter
     cache_key = f"rate_limit_stats:blocked_{limit_type}"
-    cache.add(cache_key, 0, timeout=3600)
-    cache.incr(cache_key, 1)
+    admit([Limit("blocked", cache_key, 0, _STATS_TTL, kind=COUNTER)])
 
 
 # Custom exception handler for rate limit errors
@@ -312,7 +345,21 @@ def handle_rate_limit_exception(request, exception):
 
     # Determine which limit was hit
     limit_type = "ip" if "ip" in str(exception) else "user"
+    return rate_limit_response(request, limit_type)
 
+
+def rate_limit_response(request, limit_type, retry_after=60):
+    """
+    429 for a request over its IP or per-user limit.
+
+    Args:
+        request: Django request object
+        limit_type: Type of limit that blocked ('ip' or 'user')
+        retry_after: Seconds until the limit resets
+
+    Returns:
+        JSON response with rate limit error
+    """
     # Log the block
     log_rate_limit_block(request, limit_type)
 
@@ -337,7 +384,7 @@ def handle_rate_limit_exception(request, exception):
             "error": "Rate limit exceeded",
             "message": message,
             "limit_type": limit_type,
-            "retry_after": 60,  # Suggest retry after 60 seconds
+            "retry_after": retry_after,
         },
         status=429,
     )
@@ -2,8 +2,6 @@
 Anti-spam protection utilities for API endpoints.
 """
 
-import time
-
 from django.conf import settings
 from django.core.cache import cache
 from django.http import HttpRequest
@@ -11,11 +9,17 @@ from django.utils.translation import gettext as _
 from rest_framework import status
 from rest_framework.response import Response
 
+from .admission import INTERVAL, Limit, admit
 from .client_ip import get_client_ip
 from .logging_utils import build_request_context, get_logger
 
 logger = get_logger(__name__)
 
+# File uploads allowed per IP per minute, and the minimum gap between two of
+# them (0 disables the gap check).
+UPLOAD_REQUESTS_PER_MINUTE = 20
+MIN_SECONDS_BETWEEN_REQUESTS = 2
+
 
 def verify_turnstile(token: str, remote_ip: str | None = None) -> bool | str:
     """
@@ -96,32 +100,23 @@ def _check_fallback_rate_limit(request, remote_ip: str) -> tuple[bool, str | Non
     """
     fallback_key = f"turnstile_fallback:{remote_ip}"
 
-    try:
-        current_count = cache.get(fallback_key, 0)
-
-        # Strict limit: 4 requests per minute (vs normal 20)
-        if current_count >= 4:
-            logger.warning(
-                "Fallback rate limit exceeded (Turnstile unavailable)",
-                extra={
-                    **build_request_context(request),
-                    "ip": remote_ip,
-                    "current_count": current_count,
-                    "event": "fallback_rate_limit_exceeded",
-                },
-            )
-            return False, _(
-                "Service temporarily unavailable. Please wait a moment and try again."
-            )
-
-        # Increment counter with 60-second window
-        cache.set(fallback_key, current_count + 1, 60)
-        return True, None
-
-    except Exception as e:
-        logger.error(f"Fallback rate limit check error: {str(e)}", exc_info=True)
-        # On error, allow request but with warning
-        return True, None
+    # Strict limit: 4 requests per minute (vs normal 20). Fails open on
+    # cache errors.
+    decision = admit([Limit("turnstile_fallback", fallback_key, 4, 60)])
+    if not decision.allowed:
+        logger.warning(
+            "Fallback rate limit exceeded (Turnstile unavailable)",
+            extra={
+                **build_request_context(request),
+                "ip": remote_ip,
+                "current_count": decision.denied.count,
+                "event": "fallback_rate_limit_exceeded",
+            },
+        )
+        return False, _(
+            "Service temporarily unavailable. Please wait a moment and try again."
+        )
+    return True, None
 
 
 def check_honeypot(request: HttpRequest, honeypot_field: str = "website") -> bool:
@@ -156,102 +151,33 @@ def check_honeypot(request: HttpRequest, honeypot_field: str = "website") -> boo
     return True
 
 
-def check_rate_limit_by_ip(
-    request: HttpRequest,
-    limit: int = 10,
-    window: int = 60,
-    key_prefix: str = "spam_protection",
-) -> tuple[bool, str | None]:
-    """
-    Check rate limit by IP address.
-
-    Args:
-        request: HTTP request
-        limit: Maximum number of requests
-        window: Time window in seconds
-        key_prefix: Cache key prefix
-
-    Returns:
-        Tuple of (is_allowed, error_message)
-    """
-    # Get client IP (trusted: CF-Connecting-IP / rightmost XFF, never the
-    # spoofable leftmost XFF entry).
-    ip = get_client_ip(request) or "unknown"
-
-    cache_key = f"{key_prefix}:{ip}"
-
-    try:
-        current_count = cache.get(cache_key, 0)
-
-        if current_count >= limit:
-            logger.warning(
-                f"Rate limit exceeded for IP {ip}",
-                extra={
-                    **build_request_context(request),
-                    "ip": ip,
-                    "limit": limit,
-                    "window": window,
-                },
-            )
-            return False, _(
-                "Too many requests. Please try again in %(seconds)d seconds."
-            ) % {"seconds": window}
-
-        # Increment counter
-        cache.set(cache_key, current_count + 1, window)
-        return True, None
-    except Exception as e:
-        logger.error(f"Rate limit check error: {str(e)}", exc_info=True)
-        # On error, allow request (fail open)
-        return True, None
-
-
-def check_minimum_time_between_requests(
-    request: HttpRequest, min_seconds: int = 2, key_prefix: str = "request_timing"
-) -> tuple[bool, str | None]:
-    """
-    Check minimum time between requests (prevents rapid-fire bot requests).
-
-    Args:
-        request: HTTP request
-        min_seconds: Minimum seconds between requests
-        key_prefix: Cache key prefix
-
-    Returns:
-        Tuple of (is_allowed, error_message)
-    """
-    # Get client IP (trusted: CF-Connecting-IP / rightmost XFF, never the
-    # spoofable leftmost XFF entry).
-    ip = get_client_ip(request) or "unknown"
-
-    cache_key = f"{key_prefix}:{ip}"
-    current_time = time.time()
-
-    try:
-        last_request_time = cache.get(cache_key)
-
-        if last_request_time:
-            time_since_last = current_time - last_request_time
-            if time_since_last < min_seconds:
-                logger.warning(
-                    f"Request too soon after previous request for IP {ip}",
-                    extra={
-                        **build_request_context(request),
-                        "ip": ip,
-                        "time_since_last": time_since_last,
-                        "min_seconds": min_seconds,
-                    },
-                )
-                return False, _("Please wait %(seconds)d seconds between requests.") % {
-                    "seconds": min_seconds
-                }
-
-        # Update last request time
-        cache.set(cache_key, current_time, min_seconds * 2)
-        return True, None
-    except Exception as e:
-        logger.error(f"Timing check error: {str(e)}", exc_info=True)
-        return True, None
+def _ip_limit_message(request: HttpRequest, decision, ip: str) -> str:
+    """Log an IP window or interval rejection and return its user message."""
+    limit = decision.denied.limit
+    if limit.kind == INTERVAL:
+        logger.warning(
+            f"Request too soon after previous request for IP {ip}",
+            extra={
+                **build_request_context(request),
+                "ip": ip,
+                "min_seconds": limit.window,
+            },
+        )
+        return _("Please wait %(seconds)d seconds between requests.") % {
+            "seconds": limit.window
+        }
+    logger.warning(
+        f"Rate limit exceeded for IP {ip}",
+        extra={
+            **build_request_context(request),
+            "ip": ip,
+            "limit": limit.limit,
+            "window": limit.window,
+        },
+    )
+    return _("Too many requests. Please try again in %(seconds)d seconds.") % {
+        "seconds": decision.retry_after
+    }
 
 
 def validate_spam_protection(request: HttpRequest) -> Response | None:
@@ -322,32 +248,8 @@ def validate_spam_protection(request: HttpRequest) -> Response | None:
                     exc_info=True,
                 )
 
-    # 3. Check rate limit (stricter for file uploads)
-    # Check rate limit BEFORE incrementing to see if we're approaching limit
-    rate_limit_key = f"file_upload_spam:{remote_ip}"
-    rate_limit_count_before = cache.get(rate_limit_key, 0)
-
-    # If approaching limit (>= 14 out of 20), require CAPTCHA if not already required
-    # This provides proactive protection
-    if not is_premium and not captcha_required and rate_limit_count_before >= 14:
-        captcha_required = True
-        ip_captcha_key = f"captcha_required_ip:{remote_ip}"
-        try:
-            cache.set(ip_captcha_key, True, 3600)  # Remember for 1 hour
-            logger.info(
-                "CAPTCHA required for IP due to high request rate",
-                extra={
-                    **context,
-                    "ip": remote_ip,
-                    "request_count": rate_limit_count_before,
-                    "reason": "rate_limit_approaching",
-                },
-            )
-        except Exception as e:
-            logger.error(
-                f"Error setting IP-based CAPTCHA requirement: {str(e)}", exc_info=True
-            )
-
+    # 3. + 4. IP rate limit for file uploads and minimum time between requests,
+    # checked and counted together in one atomic call.
     # Premium exemption (mirrors the CAPTCHA skip above): these IP-based file-upload
     # guards exist to bound anonymous/abusive traffic. They are NOT premium-aware, so
     # for a paying user they cap throughput far below the advertised per-user limit
@@ -355,26 +257,58 @@ def validate_spam_protection(request: HttpRequest) -> Response | None:
     # Premium users are still bounded by their per-user hourly limit (api_conversion
     # 10000/h) enforced in rate_limit_utils, so skipping these here is safe.
     if not is_premium:
-        # Now actually check and increment rate limit
-        is_allowed, error_msg = check_rate_limit_by_ip(
-            request,
-            limit=20,  # 20 requests per minute for file uploads
-            window=60,
-            key_prefix="file_upload_spam",
-        )
-        if not is_allowed:
-            return Response(
-                {"error": error_msg}, status=status.HTTP_429_TOO_MANY_REQUESTS
+        limits = [
+            Limit(
+                "file_upload",
+                f"file_upload_spam:{remote_ip}",
+                UPLOAD_REQUESTS_PER_MINUTE,
+                60,
             )
+        ]
+        if MIN_SECONDS_BETWEEN_REQUESTS > 0:
+            limits.append(
+                Limit(
+                    "interval",
+                    f"request_timing:{remote_ip}",
+                    1,
+                    MIN_SECONDS_BETWEEN_REQUESTS,
+                    kind=INTERVAL,
+                )
+            )
+        decision = admit(limits)
+        # Count before this request (it was only added if admitted); 0 when
+        # the cache was unavailable and the check failed open.
+        upload = decision.get("file_upload")
+        count_before = 0
+        if upload is not None:
+            count_before = upload.count - 1 if decision.allowed else upload.count
+
+        # If approaching limit (>= 14 out of 20), require CAPTCHA if not already
+        # required. This provides proactive protection.
+        if not captcha_required and count_before >= 14:
+            captcha_required = True
+            ip_captcha_key = f"captcha_required_ip:{remote_ip}"
+            try:
+                cache.set(ip_captcha_key, True, 3600)  # Remember for 1 hour
+                logger.info(
+                    "CAPTCHA required for IP due to high request rate",
+                    extra={
+                        **context,
+                        "ip": remote_ip,
+                        "request_count": count_before,
+                        "reason": "rate_limit_approaching",
+                    },
+                )
+            except Exception as e:
+                logger.error(
+                    f"Error setting IP-based CAPTCHA requirement: {str(e)}",
+                    exc_info=True,
+                )
 
-        # 4. Check minimum time between requests
-        is_allowed, error_msg = check_minimum_time_between_requests(
-            request,
-            min_seconds=2,  # At least 2 seconds between requests
-        )
-        if not is_allowed:
+        if not decision.allowed:
             return Response(
-                {"error": error_msg}, status=status.HTTP_429_TOO_MANY_REQUESTS
+                {"error": _ip_limit_message(request, decision, remote_ip)},
+                status=status.HTTP_429_TOO_MANY_REQUESTS,
             )
 
     # 5. Verify Turnstile (if required or token provided)
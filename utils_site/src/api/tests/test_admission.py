@@ -0,0 +1,101 @@
+"""Admission engine: all-or-nothing limits, headers, Redis reply and fail-open."""
+
+from unittest.mock import MagicMock, patch
+
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import SimpleTestCase
+from src.api import admission
+from src.api.admission import CAP, COUNTER, INTERVAL, Limit, admit, parse_rate
+
+
+class AdmitTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_window_admits_up_to_limit(self):
+        limit = Limit("ip", "t:window", 2, 60)
+        self.assertTrue(admit([limit]).allowed)
+        self.assertTrue(admit([limit]).allowed)
+        decision = admit([limit])
+        self.assertFalse(decision.allowed)
+        self.assertEqual(decision.denied.limit, limit)
+        self.assertEqual(cache.get("t:window"), 2)
+
+    def test_rejection_consumes_no_other_limit(self):
+        window = Limit("ip", "t:window", 5, 60)
+        cap = Limit("quota", "t:cap", 3, 60, kind=CAP)
+        counter = Limit("stats", "t:counter", 0, 60, kind=COUNTER)
+        cache.set("t:cap", 3, 60)
+
+        decision = admit([cap, window, counter])
+
+        self.assertEqual(decision.denied.limit.name, "quota")
+        self.assertIsNone(cache.get("t:window"))
+        # Usage counters count rejected requests too; the cap is never written.
+        self.assertEqual(cache.get("t:counter"), 1)
+        self.assertEqual(cache.get("t:cap"), 3)
+
+    def test_interval(self):
+        limit = Limit("interval", "t:interval", 1, 2, kind=INTERVAL)
+        self.assertTrue(admit([limit]).allowed)
+        self.assertFalse(admit([limit]).allowed)
+        cache.delete("t:interval")
+        self.assertTrue(admit([limit]).allowed)
+
+    def test_headers(self):
+        tight = Limit("ip", "t:tight", 3, 60)
+        loose = Limit("user", "t:loose", 100, 3600)
+        response = admit([loose, tight]).apply_headers(HttpResponse())
+        self.assertEqual(response["X-RateLimit-Limit"], "3")
+        self.assertEqual(response["X-RateLimit-Remaining"], "2")
+        self.assertEqual(response["X-RateLimit-Reset"], "60")
+        self.assertFalse(response.has_header("Retry-After"))
+
+        cache.set("t:tight", 3, 60)
+        headers = admit([loose, tight]).headers()
+        self.assertEqual(headers["X-RateLimit-Remaining"], "0")
+        self.assertEqual(headers["Retry-After"], "60")
+
+    def test_cache_failure_admits(self):
+        with patch.object(admission, "_admit_cache", side_effect=OSError("down")):
+            decision = admit([Limit("ip", "t:window", 0, 60)])
+        self.assertTrue(decision.allowed)
+        self.assertEqual(decision.headers(), {})
+
+    def test_parse_rate(self):
+        self.assertEqual(parse_rate("30/h"), (30, 3600))
+        self.assertEqual(parse_rate("100/5m"), (100, 300))
+        self.assertEqual(parse_rate("0/d"), (0, 86400))
+
+
+class AdmitRedisTests(SimpleTestCase):
+    def setUp(self):
+        self.addCleanup(setattr, admission, "_script", None)
+        admission._script = None
+
+    def test_one_script_call_for_all_limits(self):
+        script = MagicMock(return_value=[2, 1, 86_000_000, 31, 1500, 7, 3_600_000])
+        conn = MagicMock()
+        conn.register_script.return_value = script
+        limits = [
+            Limit("quota", "t:cap", 10, 90_000, kind=CAP),
+            Limit("ip", "t:window", 30, 3600),
+            Limit("stats", "t:counter", 0, 3600, kind=COUNTER),
+        ]
+
+        with patch.object(admission, "_redis", return_value=conn):
+            decision = admit(limits)
+
+        script.assert_called_once()
+        kwargs = script.call_args.kwargs
+        self.assertEqual(kwargs["keys"], [cache.make_key(x.key) for x in limits])
+        self.assertEqual(
+            kwargs["args"],
+            ["cap", 10, 90_000_000, "window", 30, 3_600_000, "counter", 0, 3_600_000],
+        )
+        self.assertEqual(decision.denied.limit.name, "ip")
+        self.assertEqual(decision.denied.count, 31)
+        # PTTL is rounded up to whole seconds.
+        self.assertEqual(decision.retry_after, 2)
+        self.assertEqual(decision.get("stats").count, 7)
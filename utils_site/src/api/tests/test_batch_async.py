@@ -9,6 +9,7 @@ from __future__ import annotations
 
 import io
 import os
+import shutil
 import zipfile
 from unittest.mock import MagicMock, patch
 
@@ -19,6 +20,8 @@ from rest_framework import status
 from rest_framework.test import APITestCase
 from src.users.models import User
 
+VIEW_DOTTED = "src.api.pdf_convert.jpg_to_pdf.batch_views.JPGToPDFBatchAPIView"
+
 
 def _jpeg(name="photo.jpg", colour=(200, 30, 30)):
     buf = io.BytesIO()
@@ -92,6 +95,9 @@ class BatchAsyncSubmitTests(APITestCase):
         self.assertEqual(len(task_kwargs["input_files"]), 2)
         for entry in task_kwargs["input_files"]:
             self.assertTrue(os.path.exists(entry["path"]))
+            self.addCleanup(
+                shutil.rmtree, os.path.dirname(entry["path"]), ignore_errors=True
+            )
 
 
 class BatchConversionTaskTests(APITestCase):
@@ -102,6 +108,7 @@ class BatchConversionTaskTests(APITestCase):
 
         task_id = "batch-test-task"
         task_dir = get_task_temp_dir(task_id)
+        self.addCleanup(shutil.rmtree, task_dir, ignore_errors=True)
 
         good = os.path.join(task_dir, "input_0")
         buf = io.BytesIO()
@@ -131,3 +138,114 @@ class BatchConversionTaskTests(APITestCase):
             pdf_entries = [n for n in names if n.endswith(".pdf")]
             self.assertEqual(len(pdf_entries), 1)
             self.assertTrue(zf.read(pdf_entries[0]).startswith(b"%PDF"))
+
+
+class BatchFanoutTests(APITestCase):
+    """BATCH_FANOUT_ENABLED: per-file subtasks + a zip-assembly chord callback."""
+
+    def _inputs(self, task_id):
+        from src.api.async_views import get_task_temp_dir
+
+        task_dir = get_task_temp_dir(task_id)
+        self.addCleanup(shutil.rmtree, task_dir, ignore_errors=True)
+        good = os.path.join(task_dir, "input_0")
+        buf = io.BytesIO()
+        Image.new("RGB", (40, 40), (10, 120, 10)).save(buf, "JPEG")
+        with open(good, "wb") as f:
+            f.write(buf.getvalue())
+        bad = os.path.join(task_dir, "input_1")
+        with open(bad, "wb") as f:
+            f.write(b"not an image at all")
+        return [{"path": good, "name": "good.jpg"}, {"path": bad, "name": "bad.jpg"}]
+
+    @override_settings(BATCH_FANOUT_ENABLED=True)
+    def test_enabled_batch_replaces_itself_with_a_chord(self):
+        from src.tasks.batch_conversion import batch_conversion_task
+
+        input_files = self._inputs("batch-fanout-dispatch")
+        with (
+            patch("src.tasks.batch_conversion.update_progress"),
+            patch.object(
+                batch_conversion_task, "replace", side_effect=RuntimeError("replaced")
+            ) as mock_replace,
+            self.assertRaisesMessage(RuntimeError, "replaced"),
+        ):
+            batch_conversion_task.run(
+                task_id="batch-fanout-dispatch",
+                view_dotted=VIEW_DOTTED,
+                input_files=input_files,
+                params={},
+                output_zip_filename="jpg_to_pdf_convertica.zip",
+            )
+
+        sig = mock_replace.call_args.args[0]
+        self.assertEqual(len(sig.tasks), 2)
+        self.assertEqual(sig.body.task, "batch.assemble")
+        # Inputs must survive the dispatch: the subtasks still need them.
+        for entry in input_files:
+            self.assertTrue(os.path.exists(entry["path"]))
+
+    @patch("src.tasks.batch_conversion.update_progress")
+    def test_items_and_assemble_keep_partial_failure_contract(self, _mock_progress):
+        from src.tasks.batch_conversion import (
+            batch_assemble_task,
+            batch_convert_item_task,
+        )
+
+        task_id = "batch-fanout-items"
+        input_files = self._inputs(task_id)
+        # Completion order differs from upload order on a real cluster.
+        items = [
+            batch_convert_item_task.run(
+                task_id=task_id,
+                view_dotted=VIEW_DOTTED,
+                entry=input_files[idx],
+                index=idx,
+                total=2,
+                params={},
+            )
+            for idx in (1, 0)
+        ]
+        self.assertIn("error", items[0])
+        self.assertNotIn("error", items[1])
+        # The callback may run on another worker: outputs must be in the
+        # shared async_temp dir, not in the converting worker's temp dir.
+        task_dir = os.path.dirname(input_files[0]["path"])
+        item_dir = os.path.dirname(items[1]["output_path"])
+        self.assertEqual(os.path.dirname(item_dir), task_dir)
+        self.assertTrue(os.path.isfile(items[1]["output_path"]))
+
+        result = batch_assemble_task.run(
+            items,
+            task_id=task_id,
+            view_dotted=VIEW_DOTTED,
+            input_files=input_files,
+            output_zip_filename="jpg_to_pdf_convertica.zip",
+            started_ts=0.0,
+        )
+
+        self.assertEqual(result["batch_count"], 1)
+        self.assertEqual(result["batch_failed_count"], 1)
+        with zipfile.ZipFile(result["output_path"]) as zf:
+            self.assertIn("bad.jpg", zf.read("conversion_errors.txt").decode())
+        self.assertFalse(os.path.exists(item_dir))
+
+    @patch("src.tasks.batch_conversion.update_progress")
+    def test_assemble_with_only_user_input_failures_raises(self, _mock_progress):
+        from src.exceptions import ConversionError
+        from src.tasks.batch_conversion import batch_assemble_task
+
+        input_files = self._inputs("batch-fanout-allfail")
+        items = [
+            {"index": 0, "name": "a.pdf", "error": "encrypted", "user_input": True},
+            {"index": 1, "name": "b.pdf", "error": "broken", "user_input": True},
+        ]
+        with self.assertRaisesMessage(ConversionError, "Failed to process any files"):
+            batch_assemble_task.run(
+                items,
+                task_id="batch-fanout-allfail",
+                view_dotted=VIEW_DOTTED,
+                input_files=input_files,
+                output_zip_filename="out.zip",
+                started_ts=0.0,
+            )
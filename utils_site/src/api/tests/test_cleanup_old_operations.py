@@ -0,0 +1,97 @@
+"""Tests for the streaming export-and-delete of expired OperationRun rows."""
+
+import gzip
+import json
+import shutil
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db.models import QuerySet
+from django.test import TestCase
+from django.utils import timezone
+from src.tasks import maintenance
+from src.tasks.maintenance import cleanup_old_operations
+from src.users.models import OperationRun
+
+
+def _read_export(path: str) -> list[dict]:
+    with gzip.open(path, "rt") as fh:
+        return [json.loads(line) for line in fh]
+
+
+class CleanupOldOperationsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.export_dir = Path(tempfile.mkdtemp(prefix="test_op_export_"))
+        patcher = patch.object(maintenance, "OPERATION_EXPORT_DIR", self.export_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.export_dir, ignore_errors=True)
+
+    def _make(self, count: int, days_ago: int) -> list[int]:
+        ids = []
+        for n in range(count):
+            op = OperationRun.objects.create(
+                conversion_type="pdf_to_word", status="success", input_size=n
+            )
+            OperationRun.objects.filter(pk=op.pk).update(
+                created_at=timezone.now() - timedelta(days=days_ago)
+            )
+            ids.append(op.pk)
+        return ids
+
+    def test_exports_in_chunks_and_keeps_recent_rows(self):
+        old = self._make(7, days_ago=400)
+        recent = self._make(2, days_ago=10)
+
+        result = cleanup_old_operations(retention_days=365, chunk_size=3)
+
+        self.assertEqual(result["deleted_count"], 7)
+        rows = _read_export(result["export_file"])
+        self.assertEqual([r["id"] for r in rows], old)
+        self.assertIsNotNone(rows[0]["created_at"])
+        self.assertEqual(
+            sorted(OperationRun.objects.values_list("pk", flat=True)), recent
+        )
+        self.assertFalse((self.export_dir / maintenance._CLEANUP_STATE_FILE).exists())
+
+    def test_nothing_expired_leaves_no_file(self):
+        self._make(2, days_ago=10)
+        result = cleanup_old_operations(retention_days=365)
+        self.assertEqual(result, {"status": "success", "deleted_count": 0})
+        self.assertEqual(list(self.export_dir.iterdir()), [])
+
+    def test_interrupted_run_resumes_without_loss_or_duplicates(self):
+        old = self._make(8, days_ago=400)
+        real_delete = QuerySet.delete
+        calls = {"n": 0}
+
+        def _crash_on_second_chunk(qs):
+            calls["n"] += 1
+            # Call 1 is the (empty) leftover sweep, call 2 the first chunk.
+            if calls["n"] == 3:
+                raise RuntimeError("worker killed")
+            return real_delete(qs)
+
+        with patch.object(QuerySet, "delete", _crash_on_second_chunk):
+            result = cleanup_old_operations(retention_days=365, chunk_size=3)
+        self.assertEqual(result["status"], "error")
+        # Chunk 2 was exported but not deleted; a torn member is appended too.
+        self.assertEqual(OperationRun.objects.count(), 5)
+        state = json.loads(
+            (self.export_dir / maintenance._CLEANUP_STATE_FILE).read_text()
+        )
+        with open(state["export_file"], "ab") as fh:
+            fh.write(b"\x1f\x8b partial")
+
+        result = cleanup_old_operations(retention_days=365, chunk_size=3)
+
+        self.assertEqual(result["deleted_count"], 8)
+        self.assertEqual(result["export_file"], state["export_file"])
+        self.assertEqual([r["id"] for r in _read_export(state["export_file"])], old)
+        self.assertFalse(OperationRun.objects.exists())
@@ -0,0 +1,126 @@
+"""Tests for compress_pdf's image recompression engine.
+
+Covers deduplication of identical embedded JPEGs, the sampling estimate that
+skips already-optimised documents, and the thread-pool path (also inside a
+daemonic Celery prefork child).
+"""
+
+import hashlib
+import multiprocessing
+from io import BytesIO
+from unittest.mock import MagicMock, patch
+
+import fitz
+import numpy as np
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase
+from PIL import Image
+from src.api.pdf_organize.compress_pdf import utils
+from src.api.pdf_organize.compress_pdf.utils import _recompress_images, compress_pdf
+
+_MODULE = "src.api.pdf_organize.compress_pdf.utils"
+
+
+def _jpeg(seed: int, quality: int = 98, size: int = 600) -> bytes:
+    rng = np.random.default_rng(seed)
+    # Smooth gradient plus mild noise: compresses well at lower quality.
+    base = np.linspace(0, 255, size, dtype=np.float32)
+    pixels = (base[None, :, None] + rng.normal(0, 12, (size, size, 3))).clip(0, 255)
+    buf = BytesIO()
+    Image.fromarray(pixels.astype(np.uint8)).save(buf, format="JPEG", quality=quality)
+    return buf.getvalue()
+
+
+def _pdf_with_images(images: list[bytes]) -> fitz.Document:
+    doc = fitz.open()
+    for data in images:
+        page = doc.new_page(width=400, height=400)
+        page.insert_image(fitz.Rect(0, 0, 400, 400), stream=data)
+    return fitz.open("pdf", doc.tobytes())
+
+
+def _perf(workers: int) -> MagicMock:
+    perf = MagicMock()
+    perf.get_thread_workers.return_value = workers
+    return perf
+
+
+class RecompressImagesTests(SimpleTestCase):
+    def test_low_level_keeps_images(self):
+        doc = _pdf_with_images([_jpeg(1)])
+        self.assertIsNone(_recompress_images(doc, "low"))
+
+    def test_collect_keeps_sizes_not_image_bytes(self):
+        same = _jpeg(1)
+        doc = _pdf_with_images([same, same, _jpeg(2)])
+        images = utils._collect_jpegs(doc, None)
+
+        self.assertEqual(len(images), 2)
+        for digest, (xrefs, size) in images.items():
+            data = doc.extract_image(xrefs[0])["image"]
+            self.assertEqual(digest, hashlib.sha256(data).hexdigest())
+            self.assertEqual(size, len(data))
+
+    def test_identical_images_are_encoded_once(self):
+        same = _jpeg(1)
+        doc = _pdf_with_images([same, same, _jpeg(2)])
+        with patch(f"{_MODULE}._recompress_jpeg", wraps=utils._recompress_jpeg) as enc:
+            report = _recompress_images(doc, "high")
+
+        self.assertEqual(report["unique_images"], 2)
+        self.assertEqual(enc.call_count, 2)
+        self.assertGreater(report["recompressed"], 0)
+        self.assertLess(report["image_bytes_after"], report["image_bytes_before"])
+        self.assertGreater(report["estimated_saving_ratio"], 0)
+
+    def test_optimised_document_stops_after_sample(self):
+        images = [_jpeg(seed, quality=30) for seed in range(12)]
+        doc = _pdf_with_images(images)
+        with patch(f"{_MODULE}._recompress_jpeg", return_value=None) as enc:
+            report = _recompress_images(doc, "medium")
+
+        self.assertEqual(enc.call_count, utils._SAMPLE_IMAGES)
+        self.assertEqual(report["recompressed"], 0)
+        self.assertEqual(report["image_bytes_after"], report["image_bytes_before"])
+
+    def test_parallel_path_writes_every_image_back(self):
+        images = [_jpeg(seed, size=300) for seed in range(20)]
+        doc = _pdf_with_images(images)
+        with (
+            patch(f"{_MODULE}.get_performance_config", return_value=_perf(3)),
+            patch(
+                f"{_MODULE}.ThreadPoolExecutor", wraps=utils.ThreadPoolExecutor
+            ) as pool,
+        ):
+            report = _recompress_images(doc, "high")
+
+        self.assertEqual(pool.call_args.kwargs["max_workers"], 3)
+        self.assertEqual(report["unique_images"], 20)
+        self.assertEqual(report["recompressed"], 20)
+        for page in doc:
+            xref = page.get_images(full=True)[0][0]
+            self.assertLess(len(doc.xref_stream_raw(xref)), len(images[page.number]))
+
+    def test_celery_prefork_child_recompresses_in_parallel(self):
+        images = [_jpeg(seed, size=300) for seed in range(20)]
+        doc = _pdf_with_images(images)
+        with (
+            patch(f"{_MODULE}.get_performance_config", return_value=_perf(3)),
+            patch.dict(multiprocessing.current_process()._config, {"daemon": True}),
+            patch(
+                f"{_MODULE}.ThreadPoolExecutor", wraps=utils.ThreadPoolExecutor
+            ) as pool,
+        ):
+            report = _recompress_images(doc, "high")
+
+        pool.assert_called_once()
+        self.assertEqual(report["recompressed"], 20)
+
+    def test_compress_pdf_end_to_end_shrinks_output(self):
+        data = _pdf_with_images([_jpeg(seed) for seed in range(3)]).tobytes()
+        _input_path, output_path = compress_pdf(
+            SimpleUploadedFile("scan.pdf", data, content_type="application/pdf"),
+            compression_level="high",
+        )
+        with open(output_path, "rb") as fh:
+            self.assertLess(len(fh.read()), len(data))
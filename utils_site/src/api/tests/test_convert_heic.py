@@ -158,11 +158,8 @@ class ConvertHEICAPITests(TestCase):
     # The 2s-between-requests timing guard is keyed on IP and would reject the
     # rapid same-IP calls these quota tests need; neutralise just that guard so
     # we exercise the daily-quota gate in isolation.
-    @patch(
-        "src.api.spam_protection.check_minimum_time_between_requests",
-        return_value=(True, None),
-    )
-    def test_anon_blocked_after_daily_quota(self, _timing):
+    @patch("src.api.spam_protection.MIN_SECONDS_BETWEEN_REQUESTS", 0)
+    def test_anon_blocked_after_daily_quota(self):
         """Anon gets DAILY_QUOTA_ANON (2) free/day, then 429 with CTAs."""
         first = self._convert()
         self.assertEqual(first.status_code, 200)
@@ -178,11 +175,8 @@ class ConvertHEICAPITests(TestCase):
         self.assertIn("register_url", body)
         self.assertIn("upgrade_url", body)
 
-    @patch(
-        "src.api.spam_protection.check_minimum_time_between_requests",
-        return_value=(True, None),
-    )
-    def test_registered_user_gets_higher_quota_then_429(self, _timing):
+    @patch("src.api.spam_protection.MIN_SECONDS_BETWEEN_REQUESTS", 0)
+    def test_registered_user_gets_higher_quota_then_429(self):
         """Registered-free gets DAILY_QUOTA_REGISTERED (3) — more than anon."""
         self.client.force_login(self.free_user)
         for _ in range(3):
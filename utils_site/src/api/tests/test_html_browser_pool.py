@@ -0,0 +1,121 @@
+"""Warm Chromium pool for HTML/URL -> PDF.
+
+Runs against a fake Playwright so no real browser is needed: the pool must
+launch once and then reuse the browser (hits), recycle it after the page
+budget, relaunch after a crash, and always install the SSRF route guard on
+each leased context.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from django.test import SimpleTestCase
+from src.api.html_convert.browser_pool import BrowserPool
+from src.api.html_convert.utils import HTMLToPDFConverter
+
+
+def _fake_browser():
+    browser = MagicMock()
+    browser.is_connected.return_value = True
+    browser.close = AsyncMock()
+    page = MagicMock()
+    page.set_content = AsyncMock()
+    page.close = AsyncMock()
+    page.pdf = AsyncMock(
+        side_effect=lambda **opts: open(opts["path"], "wb").write(b"%PDF-1.4")
+    )
+    browser_context = MagicMock()
+    browser_context.route = AsyncMock()
+    browser_context.new_page = AsyncMock(return_value=page)
+    browser_context.close = AsyncMock()
+    browser.new_context = AsyncMock(return_value=browser_context)
+    return browser
+
+
+class BrowserPoolTests(SimpleTestCase):
+    def setUp(self):
+        self.pool = BrowserPool(max_pages=2, max_rss_mb=0)
+        self.launched = []
+
+        async def _launch(args=None):
+            self.pool._count("launch")
+            browser = _fake_browser()
+            self.launched.append(browser)
+            return browser
+
+        patcher = patch.object(self.pool, "launch", side_effect=_launch)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.pool.close)
+
+    def _lease(self):
+        async def _job():
+            async with self.pool.context() as browser_context:
+                return browser_context
+
+        return self.pool.run(_job, timeout=5)
+
+    def test_second_lease_reuses_warm_browser(self):
+        self._lease()
+        self._lease()
+        stats = self.pool.stats()
+        self.assertEqual(stats["launch"], 1)
+        self.assertEqual(stats["hit"], 1)
+        self.assertEqual(len(self.launched), 1)
+
+    def test_browser_recycled_after_page_budget(self):
+        for _ in range(3):
+            self._lease()
+        self.assertEqual(self.pool.stats()["recycle"], 1)
+        self.assertEqual(len(self.launched), 2)
+        self.launched[0].close.assert_awaited()
+
+    def test_disconnected_browser_is_relaunched(self):
+        self._lease()
+        self.launched[0].is_connected.return_value = False
+        self._lease()
+        self.assertEqual(self.pool.stats()["crash"], 1)
+        self.assertEqual(len(self.launched), 2)
+
+    def test_each_context_is_closed_after_use(self):
+        browser_context = self._lease()
+        browser_context.close.assert_awaited()
+        self.assertEqual(self.pool.stats()["active"], 0)
+
+
+class PooledConversionTests(SimpleTestCase):
+    def test_html_conversion_guards_the_leased_context(self):
+        pool = BrowserPool(max_pages=10, max_rss_mb=0)
+        self.addCleanup(pool.close)
+        browser = _fake_browser()
+
+        async def _launch(args=None):
+            return browser
+
+        converter = HTMLToPDFConverter()
+        tmp_dir = tempfile.mkdtemp()
+        html_path = os.path.join(tmp_dir, "in.html")
+        pdf_path = os.path.join(tmp_dir, "out.pdf")
+        with open(html_path, "w", encoding="utf-8") as fh:
+            fh.write("<p>hi</p>")
+
+        with (
+            patch.object(pool, "launch", side_effect=_launch),
+            patch("src.api.html_convert.browser_pool.browser_pool", pool),
+        ):
+            pool.run(
+                lambda: converter._convert_with_playwright_async(
+                    html_path, pdf_path, {}
+                ),
+                timeout=5,
+            )
+
+        browser_context = browser.new_context.return_value
+        browser_context.route.assert_awaited_once_with("**/*", converter._route_guard)
+        self.assertTrue(os.path.exists(pdf_path))
+        # The pooled browser outlives the conversion; only the context closes.
+        browser.close.assert_not_awaited()
+        browser_context.close.assert_awaited()
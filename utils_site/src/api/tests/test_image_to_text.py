@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import io
+import os
 from unittest.mock import patch
 
 from django.core.cache import cache
@@ -58,6 +59,7 @@ class ExtractTextFromImageTests(TestCase):
         self.assertEqual(result, "Invoice 2026\nTotal 42\n\nThanks")
 
 
+@override_settings(OCR_MAX_INFLIGHT_PAGES=1)  # single worker: sequential path
 class ExtractTextFromPdfRefactorTests(TestCase):
     @patch("src.api.ocr_utils.pytesseract.image_to_data", return_value=FAKE_OCR_DATA)
     @patch("src.api.ocr_utils.pdfinfo_from_path", return_value={"Pages": 2})
@@ -80,6 +82,91 @@ class ExtractTextFromPdfRefactorTests(TestCase):
             self.assertEqual(call.kwargs["first_page"], call.kwargs["last_page"])
 
 
+class ExtractTextFromPdfPipelineTests(TestCase):
+    """Render-ahead + pool path used when the memory tier allows >1 worker."""
+
+    def _run(self, total_pages, fail_page=None):
+        from src.api.ocr_utils import extract_text_from_pdf
+
+        inflight = {"now": 0, "peak": 0}
+
+        def fake_convert(pdf_path, dpi, first_page, last_page, output_folder, **kw):
+            self.assertEqual(first_page, last_page)
+            self.assertTrue(kw.get("paths_only"))
+            path = f"{output_folder}/p{first_page}.png"
+            Image.new("RGB", (40, 20), (255, 255, 255)).save(path)
+            inflight["now"] += 1
+            inflight["peak"] = max(inflight["peak"], inflight["now"])
+            return [path]
+
+        def fake_ocr(image, **kw):
+            inflight["now"] -= 1
+            page = int(os.path.basename(image.filename)[1:-4])
+            if page == fail_page:
+                raise RuntimeError("tesseract crashed")
+            return f"page {page}"
+
+        uploaded = SimpleUploadedFile(
+            "doc.pdf", b"%PDF-1.4 fake", content_type="application/pdf"
+        )
+        with (
+            patch(
+                "src.api.ocr_utils.pdfinfo_from_path",
+                return_value={"Pages": total_pages},
+            ),
+            patch("src.api.ocr_utils.convert_from_path", side_effect=fake_convert),
+            patch("src.api.ocr_utils.extract_text_from_image", side_effect=fake_ocr),
+            patch("src.api.ocr_utils._ocr_pipeline_limits", return_value=(2, 2)),
+        ):
+            _path, text = extract_text_from_pdf(uploaded, user_language="en")
+        return text, inflight["peak"]
+
+    def test_pages_are_joined_in_document_order(self):
+        text, peak = self._run(6)
+        self.assertEqual(text, "\n\n".join(f"page {n}" for n in range(1, 7)))
+        self.assertLessEqual(peak, 3)  # max_inflight pending + one rendering
+
+    def test_failed_page_keeps_alignment(self):
+        text, _ = self._run(3, fail_page=2)
+        self.assertEqual(text, "page 1\n\n\n\npage 3")
+
+
+class ExtractTextFromPdfCeleryWorkerTests(TestCase):
+    """Celery prefork children are daemonic: the pipeline must not fork."""
+
+    def test_daemonic_process_ocrs_pages_on_threads(self):
+        import multiprocessing
+        import threading
+
+        from src.api.ocr_utils import extract_text_from_pdf
+
+        threads = set()
+
+        def fake_convert(pdf_path, dpi, first_page, last_page, output_folder, **kw):
+            path = f"{output_folder}/p{first_page}.png"
+            Image.new("RGB", (40, 20), (255, 255, 255)).save(path)
+            return [path]
+
+        def fake_ocr(image, **kw):
+            threads.add(threading.current_thread().name)
+            return f"page {os.path.basename(image.filename)[1:-4]}"
+
+        uploaded = SimpleUploadedFile(
+            "doc.pdf", b"%PDF-1.4 fake", content_type="application/pdf"
+        )
+        with (
+            patch.dict(multiprocessing.current_process()._config, {"daemon": True}),
+            patch("src.api.ocr_utils.pdfinfo_from_path", return_value={"Pages": 2}),
+            patch("src.api.ocr_utils.convert_from_path", side_effect=fake_convert),
+            patch("src.api.ocr_utils.extract_text_from_image", side_effect=fake_ocr),
+            patch("src.api.ocr_utils._ocr_pipeline_limits", return_value=(2, 2)),
+        ):
+            _path, text = extract_text_from_pdf(uploaded, user_language="en")
+        self.assertEqual(text, "page 1\n\npage 2")
+        self.assertTrue(threads)
+        self.assertTrue(all(name.startswith("ocr_page") for name in threads))
+
+
 class RunImageOCRTests(TestCase):
     @patch("src.api.ocr_utils.pytesseract.image_to_data", return_value=FAKE_OCR_DATA)
     def test_writes_txt_with_extracted_text(self, _mock):
@@ -221,13 +308,10 @@ class ImageToTextLimitsTests(TestCase):
         cache.delete(f"user_premium_active:{u.pk}")
         return u
 
-    @patch(
-        "src.api.spam_protection.check_minimum_time_between_requests",
-        return_value=(True, None),
-    )
+    @patch("src.api.spam_protection.MIN_SECONDS_BETWEEN_REQUESTS", 0)
     @patch("src.api.ocr_utils.pytesseract.image_to_data", return_value=FAKE_OCR_DATA)
-    def test_free_daily_limit_then_429(self, _ocr, _timing):
-        # _timing patch disables the 2s anti-burst cooldown so we can fire the
+    def test_free_daily_limit_then_429(self, _ocr):
+        # The interval patch disables the 2s anti-burst cooldown so we can fire the
         # daily quota back-to-back.
         for _i in range(2):  # DAILY_QUOTA_ANON=2
             r = self.client.post(self.URL, data={"image_file": self._png()})
@@ -264,12 +348,9 @@ class ImageToTextLimitsTests(TestCase):
         )
         self.assertEqual(body[:2], b"PK")  # .docx is a zip container
 
-    @patch(
-        "src.api.spam_protection.check_minimum_time_between_requests",
-        return_value=(True, None),
-    )
+    @patch("src.api.spam_protection.MIN_SECONDS_BETWEEN_REQUESTS", 0)
     @patch("src.api.ocr_utils.pytesseract.image_to_data", return_value=FAKE_OCR_DATA)
-    def test_premium_has_no_daily_limit(self, _ocr, _timing):
+    def test_premium_has_no_daily_limit(self, _ocr):
         self.client.force_login(self._premium_user())
         for _i in range(4):  # well over the free daily cap of 2
             r = self.client.post(self.URL, data={"image_file": self._png()})
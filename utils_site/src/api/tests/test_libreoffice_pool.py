@@ -0,0 +1,181 @@
+"""Warm LibreOffice listener pool (src/api/libreoffice_pool.py).
+
+No LibreOffice needed: a fake ``soffice`` just listens on the ``--accept``
+port and a fake UNO client copies input to output, so the real process
+management (lazy start, reuse, restart after N conversions or a crash) runs.
+Other fake clients hang, fail or report the listener unreachable to check
+which outcomes fall back to the cold path and which raise.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import textwrap
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+from src.api.libreoffice_pool import LibreOfficePool
+from src.api.pdf_convert.word_to_pdf_optimized import OptimizedWordToPDFConverter
+from src.exceptions import ConversionError
+
+_FAKE_SOFFICE = textwrap.dedent(
+    f"""\
+    #!{sys.executable}
+    import re, socket, sys
+    port = int(re.search(r"port=(\\d+)", " ".join(sys.argv)).group(1))
+    srv = socket.socket()
+    srv.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    srv.bind(("127.0.0.1", port))
+    srv.listen(8)
+    while True:
+        srv.accept()[0].close()
+    """
+)
+
+_FAKE_CLIENT = textwrap.dedent(
+    """\
+    import shutil, sys
+    shutil.copyfile(sys.argv[-2], sys.argv[-1])
+    """
+)
+
+
+class LibreOfficePoolTests(SimpleTestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="test_lo_pool_")
+        self.addCleanup(shutil.rmtree, self.tmp, True)
+        soffice = os.path.join(self.tmp, "soffice")
+        with open(soffice, "w") as fh:
+            fh.write(_FAKE_SOFFICE)
+        os.chmod(soffice, os.stat(soffice).st_mode | stat.S_IEXEC)
+        client = os.path.join(self.tmp, "client.py")
+        with open(client, "w") as fh:
+            fh.write(_FAKE_CLIENT)
+
+        for patcher in (
+            patch("src.api.libreoffice_pool._CLIENT_SCRIPT", client),
+            patch(
+                "src.api.libreoffice_pool.shutil.which",
+                side_effect=lambda name: soffice if name == "soffice" else None,
+            ),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.pool = LibreOfficePool(size=1, max_conversions=2)
+        self.pool._uno_python = sys.executable
+        self.addCleanup(self.pool.close)
+        self.src = os.path.join(self.tmp, "in.docx")
+        with open(self.src, "wb") as fh:
+            fh.write(b"PK\x03\x04 document")
+
+    def _convert(self, n=0, timeout=20):
+        out = os.path.join(self.tmp, f"out{n}.pdf")
+        ok = self.pool.convert(self.src, out, "writer_pdf_Export", timeout=timeout)
+        return ok, out
+
+    def _use_client(self, source: str) -> None:
+        client = os.path.join(self.tmp, "other_client.py")
+        with open(client, "w") as fh:
+            fh.write(source)
+        patcher = patch("src.api.libreoffice_pool._CLIENT_SCRIPT", client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_listener_is_started_once_and_reused(self):
+        for n in range(2):
+            ok, out = self._convert(n)
+            self.assertTrue(ok)
+            self.assertTrue(os.path.getsize(out) > 0)
+        stats = self.pool.stats()
+        self.assertEqual(stats["start"], 1)
+        self.assertEqual(stats["lease"], 2)
+
+    def test_listener_restarted_after_conversion_budget(self):
+        for n in range(3):
+            self.assertTrue(self._convert(n)[0])
+        self.assertEqual(self.pool.stats()["restart"], 1)
+
+    def test_crashed_listener_is_restarted(self):
+        self.assertTrue(self._convert(0)[0])
+        listener = self.pool._idle[0]
+        listener.proc.kill()
+        listener.proc.wait()
+        self.assertTrue(self._convert(1)[0])
+        self.assertEqual(self.pool.stats()["crash"], 1)
+
+    def test_unavailable_without_uno_python(self):
+        self.pool._uno_python = ""
+        self.assertFalse(self._convert()[0])
+        self.assertEqual(self.pool.stats()["start"], 0)
+
+    def test_disabled_when_size_is_zero(self):
+        pool = LibreOfficePool(size=0)
+        self.assertFalse(pool.available())
+
+    def test_timeout_raises_and_replaces_listener(self):
+        self._use_client("import time\ntime.sleep(30)\n")
+        with self.assertRaises(ConversionError):
+            self._convert(timeout=1)
+        stats = self.pool.stats()
+        self.assertEqual(stats["timeout"], 1)
+        self.assertEqual(stats["listeners"], 0)
+
+    def test_failed_document_raises(self):
+        self._use_client("import sys\nsys.exit(1)\n")
+        with self.assertRaises(ConversionError):
+            self._convert()
+        self.assertEqual(self.pool.stats()["idle"], 1)
+
+    def test_unreachable_listener_falls_back(self):
+        self._use_client("import sys\nsys.exit(2)\n")
+        self.assertFalse(self._convert()[0])
+        self.assertEqual(self.pool.stats()["listeners"], 0)
+
+
+class WarmTierFallthroughTests(SimpleTestCase):
+    """unoserver → warm pool → cold subprocess, in the Word converter."""
+
+    def _run(self, unoserver, pool):
+        converter = OptimizedWordToPDFConverter()
+        with (
+            patch(
+                "src.api.unoserver_client.convert_with_unoserver", **unoserver
+            ) as uno,
+            patch(
+                "src.api.libreoffice_pool.convert_with_libreoffice_pool", **pool
+            ) as warm,
+            patch("src.api.pdf_convert.word_to_pdf_optimized._run_libreoffice") as cold,
+        ):
+            try:
+                asyncio.run(
+                    converter._convert_with_libreoffice_async(
+                        "/tmp/in.docx", "/tmp/out.pdf", {}
+                    )
+                )
+            finally:
+                self.calls = (uno.call_count, warm.call_count, cold.call_count)
+
+    def test_unoserver_down_uses_warm_pool(self):
+        self._run({"return_value": False}, {"return_value": True})
+        self.assertEqual(self.calls, (1, 1, 0))
+
+    def test_unoserver_timeout_is_not_retried(self):
+        with self.assertRaises(ConversionError):
+            self._run(
+                {"side_effect": ConversionError("timed out")}, {"return_value": True}
+            )
+        self.assertEqual(self.calls, (1, 0, 0))
+
+    def test_pool_timeout_is_not_retried_cold(self):
+        with self.assertRaises(ConversionError):
+            self._run(
+                {"return_value": False},
+                {"side_effect": ConversionError("timed out")},
+            )
+        self.assertEqual(self.calls, (1, 1, 0))
@@ -0,0 +1,35 @@
+"""get_process_pool() inside daemonic Celery prefork children."""
+
+import math
+import multiprocessing
+import os
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+from src.api.parallel_processing import SubprocessPool, get_process_pool
+
+
+class SubprocessPoolTests(SimpleTestCase):
+    def test_daemonic_process_gets_a_subprocess_pool(self):
+        with patch.dict(multiprocessing.current_process()._config, {"daemon": True}):
+            pool = get_process_pool(2)
+        self.addCleanup(pool.shutdown)
+        self.assertIsInstance(pool, SubprocessPool)
+
+    def test_calls_run_in_another_interpreter(self):
+        with SubprocessPool(2) as pool:
+            pids = [pool.submit(os.getpid).result() for _ in range(2)]
+            self.assertEqual(pool.submit(math.factorial, 5).result(), 120)
+        self.assertNotIn(os.getpid(), pids)
+
+    def test_worker_errors_are_raised_as_runtime_errors(self):
+        with SubprocessPool(1) as pool:
+            future = pool.submit(math.sqrt, -1)
+            with self.assertRaisesMessage(RuntimeError, "ValueError"):
+                future.result()
+
+    def test_crashed_worker_reports_its_exit_code(self):
+        with SubprocessPool(1) as pool:
+            future = pool.submit(os._exit, 3)
+            with self.assertRaisesMessage(RuntimeError, "exited with 3"):
+                future.result()
@@ -0,0 +1,181 @@
+"""Tests for the PDF compare engine (fingerprint skip, tiled diff, parallelism)."""
+
+import json
+import os
+import shutil
+import tempfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import fitz
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase
+from src.api.pdf_compare import utils
+from src.api.pdf_compare.utils import compare_pdf_files
+
+_MODULE = "src.api.pdf_compare.utils"
+
+
+def _pdf(pages: list[str]) -> bytes:
+    doc = fitz.open()
+    for text in pages:
+        page = doc.new_page(width=300, height=400)
+        page.insert_text((40, 60), text, fontsize=14)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def _perf(workers: int, chunk: int) -> MagicMock:
+    perf = MagicMock()
+    perf.get_batch_size.return_value = chunk
+    perf.get_thread_workers.return_value = workers
+    return perf
+
+
+class ComparePdfFilesTests(SimpleTestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="test_compare_pdf_")
+        mkdtemp = tempfile.mkdtemp
+        patcher = patch(
+            f"{_MODULE}.tempfile.mkdtemp",
+            side_effect=lambda **kw: mkdtemp(dir=self.tmp, **kw),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _compare(self, first: bytes, second: bytes) -> tuple[dict, list[str]]:
+        _base_path, output_path = compare_pdf_files(
+            SimpleUploadedFile("a.pdf", first, content_type="application/pdf"),
+            SimpleUploadedFile("b.pdf", second, content_type="application/pdf"),
+        )
+        with zipfile.ZipFile(output_path) as archive:
+            report = json.loads(archive.read("report.json"))
+            return report, archive.namelist()
+
+    def test_identical_pages_are_skipped_without_images(self):
+        data = _pdf(["one", "two", "three"])
+        report, names = self._compare(data, data)
+
+        self.assertEqual(report["identical_pages"], 3)
+        self.assertEqual(report["overall_visual_change_percent"], 0)
+        self.assertTrue(all(p["total_pixels"] > 0 for p in report["page_reports"]))
+        self.assertFalse([n for n in names if n.startswith("comparison_assets/")])
+
+    def test_only_edited_page_gets_highlight_images(self):
+        report, names = self._compare(
+            _pdf(["one", "two", "three"]), _pdf(["one", "TWO changed", "three"])
+        )
+
+        pages = report["page_reports"]
+        self.assertEqual([p["identical"] for p in pages], [True, False, True])
+        self.assertGreater(pages[1]["changed_pixels"], 0)
+        self.assertEqual(pages[1]["words_added"], 2)
+        self.assertEqual(
+            sorted(n for n in names if n.startswith("comparison_assets/")),
+            [
+                "comparison_assets/page_002_base.png",
+                "comparison_assets/page_002_compare.png",
+                "comparison_assets/page_002_diff.png",
+            ],
+        )
+
+    def test_annotation_only_change_is_not_skipped(self):
+        doc = fitz.open(stream=_pdf(["one", "two", "three"]), filetype="pdf")
+        doc[1].add_freetext_annot(fitz.Rect(40, 100, 200, 160), "VOID", fontsize=24)
+        report, _names = self._compare(_pdf(["one", "two", "three"]), doc.tobytes())
+
+        pages = report["page_reports"]
+        self.assertEqual([p["identical"] for p in pages], [True, False, True])
+        self.assertGreater(pages[1]["changed_pixels"], 0)
+
+    def test_resources_beyond_fonts_and_images_are_fingerprinted(self):
+        doc = fitz.open(stream=_pdf(["one"]), filetype="pdf")
+        page = doc[0]
+        # Same content stream, different graphics state: 50% opacity.
+        gstate = doc.get_new_xref()
+        doc.update_object(gstate, "<< /Type /ExtGState /ca 0.5 /CA 0.5 >>")
+        _kind, resources = doc.xref_get_key(page.xref, "Resources")
+        doc.xref_set_key(int(resources.split()[0]), "ExtGState/GS1", f"{gstate} 0 R")
+        first = doc.tobytes()
+        doc.update_object(gstate, "<< /Type /ExtGState /ca 1 /CA 1 >>")
+        second = doc.tobytes()
+
+        with fitz.open(stream=first) as a, fitz.open(stream=second) as b:
+            fingerprint = utils._PageFingerprints
+            self.assertNotEqual(fingerprint(a).page(a[0]), fingerprint(b).page(b[0]))
+            self.assertEqual(fingerprint(a).page(a[0]), fingerprint(a).page(a[0]))
+
+    def test_renumbered_objects_still_match(self):
+        def build(spare_objects: int) -> fitz.Document:
+            doc = fitz.open()
+            for _ in range(spare_objects):
+                doc.update_object(doc.get_new_xref(), "<< /Spare true >>")
+            for text in ("one", "two"):
+                page = doc.new_page(width=300, height=400)
+                page.insert_text((40, 60), text, fontsize=14)
+            return fitz.open(stream=doc.tobytes())
+
+        with build(0) as a, build(3) as b:
+            self.assertNotEqual(a[0].xref, b[0].xref)
+            self.assertEqual(
+                [utils._PageFingerprints(a).page(p) for p in a],
+                [utils._PageFingerprints(b).page(p) for p in b],
+            )
+
+    def test_celery_prefork_child_compares_chunks_in_subprocesses(self):
+        import multiprocessing
+
+        from src.api import parallel_processing
+
+        first = _pdf([f"page {n}" for n in range(1, 6)])
+        second = _pdf([f"page {n}" + (" edit" if n == 4 else "") for n in range(1, 6)])
+        with (
+            patch.dict(multiprocessing.current_process()._config, {"daemon": True}),
+            patch(f"{_MODULE}.get_performance_config", return_value=_perf(2, 2)),
+            patch.object(
+                parallel_processing,
+                "_run_in_subprocess",
+                wraps=parallel_processing._run_in_subprocess,
+            ) as run,
+        ):
+            report, names = self._compare(first, second)
+
+        self.assertEqual(run.call_count, 3)
+        pages = report["page_reports"]
+        self.assertEqual([p["page"] for p in pages], [1, 2, 3, 4, 5])
+        self.assertEqual(
+            [p["identical"] for p in pages], [True, True, True, False, True]
+        )
+        self.assertIn("comparison_assets/page_004_diff.png", names)
+
+    def test_added_page_is_fully_changed(self):
+        report, _names = self._compare(_pdf(["one"]), _pdf(["one", "two"]))
+
+        added = report["page_reports"][1]
+        self.assertEqual(added["status"], "added_in_second_pdf")
+        self.assertGreater(added["changed_pixels"], 0)
+        self.assertIsNotNone(added["diff_image"])
+
+    def test_parallel_chunks_keep_page_order(self):
+        first = _pdf([f"page {n}" for n in range(1, 6)])
+        second = _pdf([f"page {n}" + (" edit" if n == 4 else "") for n in range(1, 6)])
+        with (
+            patch(f"{_MODULE}.get_performance_config", return_value=_perf(2, 2)),
+            patch(
+                f"{_MODULE}.get_process_pool",
+                side_effect=lambda n: ThreadPoolExecutor(max_workers=n),
+            ) as pool,
+        ):
+            report, _names = self._compare(first, second)
+
+        pool.assert_called_once_with(2)
+        pages = report["page_reports"]
+        self.assertEqual([p["page"] for p in pages], [1, 2, 3, 4, 5])
+        self.assertEqual(
+            [p["identical"] for p in pages], [True, True, True, False, True]
+        )
@@ -0,0 +1,102 @@
+"""Tests for the shared parsed-PDF metadata (PdfInfo) and its callers."""
+
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+
+import fitz
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase
+from pypdf import PdfWriter
+from src.api import pdf_info as pdf_info_module
+from src.api.conversion_limits import validate_pdf_pages
+from src.api.file_validation import validate_pdf_file
+from src.api.pdf_info import PdfInfo, get_pdf_info, get_pdf_info_for_upload
+
+
+def _text_pdf(pages: int = 3) -> bytes:
+    doc = fitz.open()
+    for n in range(pages):
+        page = doc.new_page(width=300 + n, height=400)
+        page.insert_text((40, 60), "Convertica shared metadata test " * 4)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+class PdfInfoTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        pdf_info_module._local.clear()
+        self.tmp = tempfile.mkdtemp(prefix="test_pdf_info_")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+        pdf_info_module._local.clear()
+
+    def _write(self, name: str, data: bytes) -> str:
+        path = os.path.join(self.tmp, name)
+        with open(path, "wb") as fh:
+            fh.write(data)
+        return path
+
+    def test_single_pass_collects_metadata(self):
+        info = get_pdf_info(self._write("a.pdf", _text_pdf()))
+
+        self.assertIsNone(info.error)
+        self.assertEqual(info.page_count, 3)
+        self.assertEqual(info.page_sizes[2], (302.0, 400.0))
+        self.assertTrue(info.has_text_layer)
+        self.assertFalse(info.is_encrypted)
+        self.assertEqual(PdfInfo.from_dict(info.to_dict()), info)
+
+    def test_same_content_at_new_path_is_not_reparsed(self):
+        data = _text_pdf()
+        first = get_pdf_info(self._write("request1.pdf", data))
+
+        # A later layer (other temp path, other process) only hashes the file.
+        pdf_info_module._local.clear()
+        with patch.object(pdf_info_module, "_parse") as parse:
+            second = get_pdf_info(self._write("request2.pdf", data))
+            from_upload = get_pdf_info_for_upload(
+                SimpleUploadedFile("x.pdf", data, content_type="application/pdf")
+            )
+        parse.assert_not_called()
+        self.assertEqual(first, second)
+        self.assertEqual(first, from_upload)
+
+    def test_upload_is_parsed_without_temp_copy(self):
+        upload = SimpleUploadedFile("x.pdf", _text_pdf(2))
+        info = get_pdf_info_for_upload(upload)
+        self.assertEqual(info.page_count, 2)
+        self.assertEqual(upload.tell(), 0)
+
+    def test_password_protected_pdf(self):
+        writer = PdfWriter()
+        writer.add_blank_page(width=200, height=200)
+        writer.encrypt("secret")
+        path = os.path.join(self.tmp, "locked.pdf")
+        with open(path, "wb") as fh:
+            writer.write(fh)
+
+        info = get_pdf_info(path)
+        self.assertTrue(info.needs_password)
+        ok, message = validate_pdf_file(path, {})
+        self.assertFalse(ok)
+        self.assertIn("password", message)
+
+    def test_unparseable_pdf_is_flagged_not_raised(self):
+        info = get_pdf_info(self._write("junk.pdf", b"%PDF-1.4\n" + b"x" * 200))
+        self.assertIsNotNone(info.error)
+        self.assertEqual(validate_pdf_pages("unused", pdf_info=info), (True, None, 0))
+
+    def test_validators_use_supplied_info_without_reading_the_file(self):
+        info = PdfInfo(sha256="0" * 64, size=1000, page_count=500)
+        is_valid, _error, page_count = validate_pdf_pages(
+            "/nonexistent.pdf", max_pages=30, user=AnonymousUser(), pdf_info=info
+        )
+        self.assertFalse(is_valid)
+        self.assertEqual(page_count, 500)
@@ -0,0 +1,177 @@
+"""Shared table detection: PyMuPDF fast path, pdfplumber recheck, cache, pool."""
+
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import fitz
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase
+from openpyxl import load_workbook
+from src.api import pdf_tables
+from src.api.pdf_convert.pdf_to_excel.utils import convert_pdf_to_excel
+from src.api.pdf_tables import PageTable, extract_page_tables
+
+
+def _ruled_table_page(doc, rows=(("Region", "Q1", "Q2"), ("EMEA", "120", "138"))):
+    page = doc.new_page()
+    page.insert_text((60, 80), "Quarterly figures", fontsize=11)
+    cell_w, cell_h = 160, 24
+    for r, row in enumerate(rows):
+        for c, cell in enumerate(row):
+            rect = fitz.Rect(
+                60 + c * cell_w,
+                140 + r * cell_h,
+                60 + (c + 1) * cell_w,
+                140 + (r + 1) * cell_h,
+            )
+            page.draw_rect(rect, width=0.7)
+            page.insert_text((rect.x0 + 6, rect.y1 - 8), cell, fontsize=11)
+
+
+def _prose_page(doc, text="Just a paragraph of prose."):
+    doc.new_page().insert_text((60, 80), text, fontsize=11)
+
+
+class PdfTablesTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        pdf_tables._local.clear()
+        self.tmp_dir = tempfile.mkdtemp(prefix="test_pdf_tables_")
+        self.addCleanup(shutil.rmtree, self.tmp_dir, True)
+
+    def _pdf(self, *builders) -> str:
+        doc = fitz.open()
+        for build in builders:
+            build(doc)
+        path = os.path.join(self.tmp_dir, "doc.pdf")
+        doc.save(path)
+        doc.close()
+        return path
+
+    def test_ruled_table_comes_from_pymupdf_without_recheck(self):
+        path = self._pdf(_ruled_table_page, _prose_page)
+
+        with patch.object(pdf_tables, "_plumber_tables") as plumber:
+            pages = extract_page_tables(path)
+
+        plumber.assert_not_called()
+        self.assertEqual(sorted(pages), [0, 1])
+        (table,) = pages[0].tables
+        self.assertEqual(table.source, "pymupdf")
+        self.assertEqual(table.rows[0], ["Region", "Q1", "Q2"])
+        self.assertFalse(pages[0].rechecked)
+        self.assertEqual(pages[1].tables, [])
+        self.assertIn("Just a paragraph of prose.", pages[1].text)
+
+    def test_sparse_fast_table_is_rechecked_with_pdfplumber(self):
+        path = self._pdf(_prose_page)
+        sparse = PageTable(bbox=(0, 0, 10, 10), rows=[["a", None, None, None]])
+        better = PageTable(
+            bbox=(0, 0, 10, 10), rows=[["a", "b"], ["c", "d"]], source="pdfplumber"
+        )
+
+        with (
+            patch.object(pdf_tables, "_fast_tables", return_value=[sparse]),
+            patch.object(pdf_tables, "_plumber_tables", return_value=[better]) as plumb,
+        ):
+            pages = extract_page_tables(path)
+
+        plumb.assert_called_once()
+        self.assertTrue(pages[0].rechecked)
+        self.assertEqual(pages[0].tables, [better])
+
+    def test_results_are_cached_by_content(self):
+        path = self._pdf(_ruled_table_page, _prose_page, _prose_page)
+        first = extract_page_tables(path, page_indices=[0, 1])
+
+        with patch.object(pdf_tables, "_detect", wraps=pdf_tables._detect) as detect:
+            again = extract_page_tables(path, page_indices=[1, 0, 7])
+            detect.assert_not_called()
+            self.assertEqual(again, first)
+
+            # Only the page not seen before is detected.
+            extract_page_tables(path)
+            self.assertEqual(detect.call_args.args[1], [2])
+
+        # The shared cache alone is enough in another process.
+        pdf_tables._local.clear()
+        with patch.object(pdf_tables, "_detect") as detect:
+            self.assertEqual(extract_page_tables(path, page_indices=[0, 1]), first)
+        detect.assert_not_called()
+
+    def _parallel(self, path, check_cancelled=None):
+        with (
+            patch.object(pdf_tables, "get_performance_config") as perf,
+            patch.object(
+                pdf_tables,
+                "get_process_pool",
+                side_effect=lambda n: ThreadPoolExecutor(max_workers=n),
+            ) as pool,
+        ):
+            perf.return_value.get_batch_size.return_value = 1
+            perf.return_value.get_thread_workers.return_value = 2
+            pages = extract_page_tables(path, check_cancelled=check_cancelled)
+        pool.assert_called_once_with(2)
+        return pages
+
+    def test_long_documents_are_detected_in_chunks_on_the_pool(self):
+        path = self._pdf(_prose_page, _ruled_table_page, _prose_page)
+
+        pages = self._parallel(path)
+
+        self.assertEqual(sorted(pages), [0, 1, 2])
+        self.assertEqual(len(pages[1].tables), 1)
+        self.assertEqual(pages[2].tables, [])
+
+    def test_celery_prefork_child_detects_chunks_in_subprocesses(self):
+        import multiprocessing
+
+        from src.api import parallel_processing
+
+        path = self._pdf(_prose_page, _ruled_table_page, _prose_page)
+
+        with (
+            patch.dict(multiprocessing.current_process()._config, {"daemon": True}),
+            patch.object(pdf_tables, "get_performance_config") as perf,
+            patch.object(
+                parallel_processing,
+                "_run_in_subprocess",
+                wraps=parallel_processing._run_in_subprocess,
+            ) as run,
+        ):
+            perf.return_value.get_batch_size.return_value = 1
+            perf.return_value.get_thread_workers.return_value = 2
+            pages = extract_page_tables(path)
+
+        self.assertEqual(run.call_count, 3)
+        self.assertEqual(sorted(pages), [0, 1, 2])
+        self.assertEqual(len(pages[1].tables), 1)
+
+    def test_cancellation_between_chunks(self):
+        class Cancelled(Exception):
+            pass
+
+        def check_cancelled():
+            raise Cancelled()
+
+        path = self._pdf(_prose_page, _prose_page)
+        with self.assertRaises(Cancelled):
+            self._parallel(path, check_cancelled=check_cancelled)
+        self.assertEqual(pdf_tables._local, {})
+
+    def test_pdf_to_excel_writes_detected_table(self):
+        with open(self._pdf(_ruled_table_page), "rb") as fh:
+            upload = SimpleUploadedFile("report.pdf", fh.read())
+        input_path, output_path = convert_pdf_to_excel(upload)
+        self.addCleanup(shutil.rmtree, os.path.dirname(input_path), True)
+
+        values = [
+            [cell for cell in row if cell is not None]
+            for sheet in load_workbook(output_path)
+            for row in sheet.iter_rows(values_only=True)
+        ]
+        self.assertIn(["Region", "Q1", "Q2"], values)
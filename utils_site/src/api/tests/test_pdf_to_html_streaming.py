@@ -0,0 +1,144 @@
+"""Streaming PDF → HTML: structured text, inline vs linked page images."""
+
+import os
+import shutil
+import tempfile
+import zipfile
+from unittest.mock import patch
+
+import fitz
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from src.api.pdf_convert.pdf_to_html import utils
+from src.api.pdf_convert.pdf_to_html.utils import convert_pdf_to_html
+
+
+def _pdf_bytes(pages=2) -> bytes:
+    doc = fitz.open()
+    for n in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 100), f"Heading {n + 1} <b> & co", fontsize=20)
+        page.insert_text((72, 140), "First line of the body", fontsize=11)
+        page.insert_text((72, 154), "second line of the body", fontsize=11)
+    return doc.tobytes()
+
+
+class PdfToHtmlStreamingTests(SimpleTestCase):
+    def _convert(self, **kwargs):
+        uploaded = SimpleUploadedFile(
+            "report.pdf", _pdf_bytes(), content_type="application/pdf"
+        )
+        input_path, output_path = convert_pdf_to_html(uploaded, **kwargs)
+        self.addCleanup(shutil.rmtree, os.path.dirname(input_path), True)
+        return output_path
+
+    def _read(self, path):
+        with open(path, encoding="utf-8") as fh:
+            return fh.read()
+
+    def test_layout_mode_positions_escaped_lines(self):
+        output_path = self._convert(extract_images=False)
+
+        self.assertTrue(output_path.endswith("report_convertica.html"))
+        body = self._read(output_path)
+        self.assertEqual(body.count('<div class="page">'), 2)
+        self.assertIn("Heading 1 &lt;b&gt; &amp; co</p>", body)
+        self.assertIn('<p style="left:72.0pt;', body)
+        self.assertIn("font-size:20.0pt", body)
+        self.assertIn("Page 2 of 2", body)
+        self.assertNotIn("<img", body)
+
+    def test_flow_mode_joins_block_lines(self):
+        body = self._read(self._convert(extract_images=False, preserve_layout=False))
+
+        self.assertNotIn('class="layout"', body)
+        self.assertIn("<p>Heading 1 &lt;b&gt; &amp; co</p>", body)
+        self.assertIn("First line of the body", body)
+
+    def test_small_page_images_are_inlined(self):
+        body = self._read(self._convert())
+
+        self.assertEqual(body.count("<img "), 2)
+        self.assertIn('src="data:image/webp;base64,', body)
+        self.assertIn('loading="lazy"', body)
+
+    def test_large_page_images_stay_inline_by_default(self):
+        with patch.object(utils, "INLINE_IMAGE_MAX_BYTES", 0):
+            output_path = self._convert()
+
+        self.assertTrue(output_path.endswith("report_convertica.html"))
+        self.assertEqual(self._read(output_path).count("base64,"), 2)
+
+    def test_large_page_images_are_linked_from_a_zip(self):
+        with patch.object(utils, "INLINE_IMAGE_MAX_BYTES", 0):
+            output_path = self._convert(link_images=True)
+
+        self.assertTrue(output_path.endswith("report_convertica.zip"))
+        self.assertFalse(
+            os.path.exists(output_path.replace(".zip", ".html")),
+            "the HTML lives inside the ZIP only",
+        )
+        with zipfile.ZipFile(output_path) as zf:
+            names = zf.namelist()
+            self.assertEqual(
+                sorted(names),
+                [
+                    "report_convertica.html",
+                    "report_convertica_files/page-1.webp",
+                    "report_convertica_files/page-2.webp",
+                ],
+            )
+            image = zf.getinfo("report_convertica_files/page-1.webp")
+            self.assertEqual(image.compress_type, zipfile.ZIP_STORED)
+            body = zf.read("report_convertica.html").decode()
+        self.assertIn('src="report_convertica_files/page-2.webp"', body)
+        self.assertNotIn("base64", body)
+
+    def test_cancellation_between_pages_leaves_no_zip(self):
+        class Cancelled(Exception):
+            pass
+
+        calls = {"n": 0}
+
+        def check_cancelled():
+            calls["n"] += 1
+            if calls["n"] == 2:
+                raise Cancelled()
+
+        uploaded = SimpleUploadedFile(
+            "report.pdf", _pdf_bytes(), content_type="application/pdf"
+        )
+        tmp_dir = tempfile.mkdtemp(prefix="test_pdf2html_")
+        self.addCleanup(shutil.rmtree, tmp_dir, True)
+        with (
+            patch.object(utils, "INLINE_IMAGE_MAX_BYTES", 0),
+            patch.object(utils.tempfile, "mkdtemp", return_value=tmp_dir),
+            self.assertRaises(Cancelled),
+        ):
+            convert_pdf_to_html(
+                uploaded, link_images=True, check_cancelled=check_cancelled
+            )
+        self.assertFalse([n for n in os.listdir(tmp_dir) if n.endswith(".zip")])
+
+
+@override_settings(RATELIMIT_ENABLE=False)
+class PdfToHtmlViewTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_default_params_return_a_single_html_file(self):
+        """The web UI saves the download as ``.html``: no ZIP unless asked."""
+        uploaded = SimpleUploadedFile(
+            "report.pdf", _pdf_bytes(), content_type="application/pdf"
+        )
+        with patch.object(utils, "INLINE_IMAGE_MAX_BYTES", 0):
+            response = self.client.post("/api/pdf-to-html/", {"pdf_file": uploaded})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            'report_convertica.html"', response.headers["Content-Disposition"]
+        )
+        body = b"".join(response.streaming_content).decode()
+        self.assertEqual(body.count('<div class="page">'), 2)
+        self.assertEqual(body.count("base64,"), 2)
@@ -1,15 +1,17 @@
 """Regression tests for pdf_to_jpg rendering edge cases (CONVERTICA-5D).
 
-When poppler's own page count (via ``pdfinfo``) disagrees with pypdf's, the
-page range handed to ``pdf2image.convert_from_path`` can collapse to empty and
-the call returns ``[]`` WITHOUT raising. The conversion util must treat that as
-bad input (``InvalidPDFError``) so the Celery task does not pointlessly retry a
-file poppler can never render — the retries are what flooded Sentry with 11
+When the renderer's own page count disagrees with pypdf's, every requested
+page can fall past the end of the document and the render returns ``[]``
+WITHOUT raising. The conversion util must treat that as bad input
+(``InvalidPDFError``) so the Celery task does not pointlessly retry a file we
+can never render — the retries are what flooded Sentry with 11
 events for a single upload.
 """
 
 import os
 import tempfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import patch
 
 from django.core.files.uploadedfile import SimpleUploadedFile
@@ -18,6 +20,8 @@ from src.api.pdf_convert.pdf_to_jpg.utils import convert_pdf_to_jpg_sequential
 from src.exceptions import InvalidPDFError
 from src.tasks.pdf_conversion import _is_user_input_error
 
+_RENDER = "src.api.pdf_convert.pdf_to_jpg.utils._render_page_chunk"
+
 _MINIMAL_PDF = b"""%PDF-1.4
 1 0 obj
 <<
@@ -66,15 +70,13 @@ class PdfToJpgEmptyRenderTests(SimpleTestCase):
         shutil.rmtree(self.tmp_dir, ignore_errors=True)
 
     def test_empty_render_raises_invalid_pdf_error(self):
-        """convert_from_path returning [] (no exception) => InvalidPDFError."""
+        """Render returning [] (no exception) => InvalidPDFError."""
         uploaded = SimpleUploadedFile(
             "foto1.pdf", _MINIMAL_PDF, content_type="application/pdf"
         )
 
-        # Simulate poppler rendering zero pages while pypdf reports one page.
-        with patch("pdf2image.convert_from_path", return_value=[]), self.assertRaises(
-            InvalidPDFError
-        ) as ctx:
+        # Simulate MuPDF rendering zero pages while pypdf reports one page.
+        with patch(_RENDER, return_value=[]), self.assertRaises(InvalidPDFError) as ctx:
             convert_pdf_to_jpg_sequential(
                 uploaded, pages="all", dpi=400, tmp_dir=self.tmp_dir
             )
@@ -91,9 +93,7 @@ class PdfToJpgEmptyRenderTests(SimpleTestCase):
         uploaded = SimpleUploadedFile(
             "foto1.pdf", _MINIMAL_PDF, content_type="application/pdf"
         )
-        with patch("pdf2image.convert_from_path", return_value=[]), self.assertRaises(
-            InvalidPDFError
-        ):
+        with patch(_RENDER, return_value=[]), self.assertRaises(InvalidPDFError):
             convert_pdf_to_jpg_sequential(
                 uploaded, pages="all", dpi=400, tmp_dir=self.tmp_dir
             )
@@ -112,3 +112,134 @@ class PdfToJpgEmptyRenderTests(SimpleTestCase):
                 convert_pdf_to_jpg_sequential(
                     uploaded, pages=bad, dpi=72, tmp_dir=self.tmp_dir
                 )
+
+
+class PdfToJpgRenderEngineTests(SimpleTestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix="test_pdf2jpg_")
+        self.addCleanup(self._cleanup)
+
+    def _cleanup(self):
+        import shutil
+
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _uploaded(self):
+        return SimpleUploadedFile(
+            "foto1.pdf", _MINIMAL_PDF, content_type="application/pdf"
+        )
+
+    def test_renders_with_pymupdf_into_stored_zip(self):
+        _pdf, zip_path = convert_pdf_to_jpg_sequential(
+            self._uploaded(), pages="all", dpi=72, tmp_dir=self.tmp_dir
+        )
+        with zipfile.ZipFile(zip_path) as zf:
+            infos = zf.infolist()
+            self.assertEqual([i.filename for i in infos], ["page_1.jpg"])
+            self.assertEqual(infos[0].compress_type, zipfile.ZIP_STORED)
+            self.assertEqual(zf.read("page_1.jpg")[:2], b"\xff\xd8")
+        # Page JPEGs are removed as soon as they are archived.
+        self.assertFalse(os.path.exists(os.path.join(self.tmp_dir, "page_1.jpg")))
+
+    def _parallel(self, render, check_cancelled=None, workers=2):
+        perf = patch("src.api.pdf_convert.pdf_to_jpg.utils.get_performance_config")
+        with (
+            perf as mock_perf,
+            patch(
+                "src.api.pdf_convert.pdf_to_jpg.utils.get_process_pool",
+                side_effect=lambda n: ThreadPoolExecutor(max_workers=n),
+            ),
+            patch(_RENDER, side_effect=render),
+            patch("src.api.pdf_convert.pdf_to_jpg.utils.PdfReader") as reader,
+        ):
+            mock_perf.return_value.get_batch_size.return_value = 2
+            mock_perf.return_value.get_thread_workers.return_value = workers
+            reader.return_value.pages = [object()] * 5
+            return convert_pdf_to_jpg_sequential(
+                self._uploaded(),
+                pages="all",
+                dpi=72,
+                tmp_dir=self.tmp_dir,
+                check_cancelled=check_cancelled,
+            )
+
+    def _fake_render(self, calls):
+        def render(pdf_path, page_indices, dpi, out_dir, check_cancelled=None):
+            calls.append(list(page_indices))
+            out = []
+            for idx in page_indices:
+                path = os.path.join(out_dir, f"page_{idx + 1}.jpg")
+                with open(path, "wb") as fh:
+                    fh.write(b"\xff\xd8jpeg")
+                out.append((idx, path))
+            return out
+
+        return render
+
+    def test_parallel_path_renders_chunks_and_zips_every_page(self):
+        calls = []
+        _pdf, zip_path = self._parallel(self._fake_render(calls))
+        self.assertEqual(sorted(calls), [[0, 1], [2, 3], [4]])
+        with zipfile.ZipFile(zip_path) as zf:
+            self.assertEqual(zf.namelist(), [f"page_{n}.jpg" for n in range(1, 6)])
+
+    def test_single_worker_renders_every_page_in_one_pass(self):
+        calls = []
+        _pdf, zip_path = self._parallel(self._fake_render(calls), workers=1)
+        self.assertEqual(calls, [[0, 1, 2, 3, 4]])
+        with zipfile.ZipFile(zip_path) as zf:
+            self.assertEqual(zf.namelist(), [f"page_{n}.jpg" for n in range(1, 6)])
+
+    def test_cancellation_between_chunks_stops_rendering(self):
+        calls = []
+        checks = {"n": 0}
+
+        class Cancelled(Exception):
+            pass
+
+        def check_cancelled():
+            checks["n"] += 1
+            if checks["n"] > 2:  # upload chunk + first render chunk
+                raise Cancelled()
+
+        with self.assertRaises(Cancelled):
+            self._parallel(self._fake_render(calls), check_cancelled)
+        self.assertLess(len(calls), 3)
+        zips = [f for f in os.listdir(self.tmp_dir) if f.endswith(".zip")]
+        self.assertEqual(zips, [])
+
+    def test_daemonic_process_renders_chunks_in_subprocesses(self):
+        """Celery prefork children are daemonic: chunks run via subprocess."""
+        import multiprocessing
+
+        import fitz
+        from src.api import parallel_processing
+
+        doc = fitz.open()
+        for n in range(5):
+            doc.new_page().insert_text((72, 72), f"page {n + 1}")
+        pdf_bytes = doc.tobytes()
+        doc.close()
+
+        with (
+            patch.dict(multiprocessing.current_process()._config, {"daemon": True}),
+            patch(
+                "src.api.pdf_convert.pdf_to_jpg.utils.get_performance_config"
+            ) as perf,
+            patch.object(
+                parallel_processing,
+                "_run_in_subprocess",
+                wraps=parallel_processing._run_in_subprocess,
+            ) as run,
+        ):
+            perf.return_value.get_batch_size.return_value = 2
+            perf.return_value.get_thread_workers.return_value = 2
+            _pdf, zip_path = convert_pdf_to_jpg_sequential(
+                SimpleUploadedFile("doc.pdf", pdf_bytes),
+                pages="all",
+                dpi=36,
+                tmp_dir=self.tmp_dir,
+            )
+        self.assertEqual(run.call_count, 3)
+        with zipfile.ZipFile(zip_path) as zf:
+            self.assertEqual(zf.namelist(), [f"page_{n}.jpg" for n in range(1, 6)])
@@ -0,0 +1,131 @@
+"""Streaming PDF → PowerPoint: per-page rendering, media format, cancellation."""
+
+import os
+import shutil
+import zipfile
+from unittest.mock import patch
+
+import fitz
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase
+from pptx import Presentation
+from pptx.enum.shapes import MSO_SHAPE_TYPE
+from src.api.pdf_convert.pdf_to_ppt import utils
+from src.api.pdf_convert.pdf_to_ppt.utils import convert_pdf_to_ppt
+from src.exceptions import ConversionError, InvalidPDFError
+from src.tasks.pdf_conversion import TaskCancelledException
+
+
+def _pdf_bytes(pages=3, photo_pages=(2,)) -> bytes:
+    doc = fitz.open()
+    for n in range(pages):
+        page = doc.new_page()
+        page.insert_text((72, 72), f"Slide text {n + 1}", fontsize=18)
+        if n in photo_pages:
+            pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 64, 64), False)
+            pix.clear_with(128)
+            page.insert_image(page.rect, pixmap=pix)
+    return doc.tobytes()
+
+
+class PdfToPptStreamingTests(SimpleTestCase):
+    def _convert(self, data=None, **kwargs):
+        uploaded = SimpleUploadedFile(
+            "deck.pdf", data or _pdf_bytes(), content_type="application/pdf"
+        )
+        input_path, output_path = convert_pdf_to_ppt(uploaded, **kwargs)
+        self.addCleanup(shutil.rmtree, os.path.dirname(input_path), True)
+        return output_path
+
+    def _media(self, output_path):
+        with zipfile.ZipFile(output_path) as zf:
+            return {
+                info.filename: (zf.read(info.filename), info.compress_type)
+                for info in zf.infolist()
+                if info.filename.startswith("ppt/media/")
+            }
+
+    def test_one_picture_slide_per_page_with_format_by_content(self):
+        output_path = self._convert()
+
+        prs = Presentation(output_path)
+        self.assertEqual(len(prs.slides), 3)
+        for slide in prs.slides:
+            kinds = [shape.shape_type for shape in slide.shapes]
+            self.assertEqual(kinds, [MSO_SHAPE_TYPE.PICTURE])
+
+        blobs = [blob for blob, _ in self._media(output_path).values()]
+        signatures = sorted(blob[:4] for blob in blobs)
+        self.assertEqual(
+            signatures, sorted([b"\x89PNG", b"\x89PNG", b"\xff\xd8\xff\xe0"])
+        )
+        # Real renders replaced the tiny stand-ins, stored uncompressed.
+        for blob, compress_type in self._media(output_path).values():
+            self.assertGreater(len(blob), 1000)
+            self.assertEqual(compress_type, zipfile.ZIP_STORED)
+        # Page images are removed once they are in the package.
+        leftovers = os.listdir(os.path.dirname(output_path))
+        self.assertFalse([name for name in leftovers if name.startswith("page_")])
+
+    def test_slide_follows_page_aspect(self):
+        prs = Presentation(self._convert())
+        page = fitz.open(stream=_pdf_bytes(), filetype="pdf")[0].rect
+        self.assertAlmostEqual(
+            prs.slide_height / prs.slide_width, page.height / page.width, places=3
+        )
+
+    def test_editable_text_layer(self):
+        output_path = self._convert(editable_text=True)
+
+        prs = Presentation(output_path)
+        texts = [
+            shape.text_frame.text
+            for slide in prs.slides
+            for shape in slide.shapes
+            if shape.has_text_frame
+        ]
+        self.assertEqual(texts, ["Slide text 1", "Slide text 2", "Slide text 3"])
+        # The text is no longer part of the background picture.
+        doc = fitz.open(stream=_pdf_bytes(), filetype="pdf")
+        plain = doc[0].get_pixmap(dpi=utils.RENDER_DPI, alpha=False).tobytes("png")
+        blob = next(
+            blob
+            for name, (blob, _) in self._media(output_path).items()
+            if name.endswith(".png")
+        )
+        self.assertLess(len(blob), len(plain))
+
+    def test_cancellation_between_pages(self):
+        calls = {"n": 0}
+
+        def check_cancelled():
+            calls["n"] += 1
+            if calls["n"] == 2:
+                raise TaskCancelledException("cancelled")
+
+        with (
+            patch.object(utils, "_stand_in_image", wraps=utils._stand_in_image) as stub,
+            self.assertRaises(TaskCancelledException),
+        ):
+            self._convert(check_cancelled=check_cancelled)
+        self.assertEqual(stub.call_count, 1)
+
+    def test_invalid_pdf_is_rejected(self):
+        with self.assertRaises(InvalidPDFError):
+            self._convert(data=b"%PDF-1.4 not really a pdf")
+
+    def test_zero_width_page_is_rejected(self):
+        # MuPDF normalises an empty MediaBox on load, so fake the page size.
+        data = _pdf_bytes()
+        with (
+            patch.object(fitz.Page, "rect", fitz.Rect(0, 0, 0, 792)),
+            self.assertRaises(InvalidPDFError),
+        ):
+            self._convert(data=data)
+
+    def test_unexpected_errors_become_conversion_errors(self):
+        with (
+            patch.object(utils, "_add_text_layer", side_effect=TypeError("bad run")),
+            self.assertRaisesMessage(ConversionError, "bad run"),
+        ):
+            self._convert(editable_text=True)
@@ -0,0 +1,151 @@
+"""Tests for page-parallel PDF → DOCX (chunk plan, merge, orchestration).
+
+pdf2docx itself is replaced by a fake chunk converter that writes a small DOCX
+per page range with python-docx, so these tests exercise the split/merge logic
+rather than pdf2docx's layout analysis.
+"""
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase
+from docx import Document
+from docx.enum.section import WD_ORIENT
+from src.api.pdf_convert.pdf_to_word import chunked
+
+_MODULE = "src.api.pdf_convert.pdf_to_word.chunked"
+
+
+# Stands in for chunked._CHUNK_SCRIPT: same argv, writes a small DOCX per
+# page range with python-docx instead of running pdf2docx.
+_FAKE_CHUNK_SCRIPT = """\
+import io
+import sys
+
+from docx import Document
+from docx.enum.section import WD_ORIENT
+from docx.shared import Inches
+from PIL import Image
+
+out_path, start, end = sys.argv[2], int(sys.argv[3]), int(sys.argv[4])
+if start == FAIL_AT:
+    sys.exit("FzErrorFormat: broken page")
+doc = Document()
+for page in range(start, end):
+    doc.add_paragraph(f"page {page + 1}")
+buf = io.BytesIO()
+Image.new("RGB", (8, 8), "red" if start == 0 else "blue").save(buf, format="PNG")
+buf.seek(0)
+doc.add_picture(buf, width=Inches(1))
+if start > 0:
+    section = doc.sections[0]
+    section.orientation = WD_ORIENT.LANDSCAPE
+    section.page_width, section.page_height = section.page_height, section.page_width
+doc.save(out_path)
+"""
+
+
+def _fake_script(fail_at: int = -1) -> str:
+    return _FAKE_CHUNK_SCRIPT.replace("FAIL_AT", str(fail_at))
+
+
+def _perf(workers: int, chunk: int, parallel: bool = True) -> MagicMock:
+    perf = MagicMock()
+    perf.get_batch_size.return_value = chunk
+    perf.get_thread_workers.return_value = workers
+    perf.can_use_parallel_processing.return_value = parallel
+    return perf
+
+
+class ChunkPlanTests(SimpleTestCase):
+    def test_short_document_is_single_pass(self):
+        with patch(f"{_MODULE}.get_performance_config", return_value=_perf(4, 20)):
+            self.assertEqual(chunked.chunk_plan(20), (20, 1))
+
+    def test_low_memory_tier_is_single_pass(self):
+        with patch(
+            f"{_MODULE}.get_performance_config",
+            return_value=_perf(4, 20, parallel=False),
+        ):
+            self.assertEqual(chunked.chunk_plan(500), (20, 1))
+
+    def test_workers_capped_by_chunk_count(self):
+        with patch(f"{_MODULE}.get_performance_config", return_value=_perf(4, 20)):
+            self.assertEqual(chunked.chunk_plan(45), (20, 3))
+            self.assertEqual(chunked.chunk_plan(500), (20, 4))
+
+
+class ChunkedConversionTests(SimpleTestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp(prefix="test_pdf2docx_chunked_")
+        self.pdf_path = os.path.join(self.tmp, "in.pdf")
+        self.docx_path = os.path.join(self.tmp, "out.docx")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _run(self, page_count=7, chunk_size=3, check_cancelled=None, fail_at=-1):
+        with patch(f"{_MODULE}._CHUNK_SCRIPT", _fake_script(fail_at)):
+            chunked.convert_pdf_to_docx_chunked(
+                self.pdf_path,
+                self.docx_path,
+                page_count,
+                chunk_size,
+                2,
+                check_cancelled=check_cancelled,
+            )
+
+    def test_merged_document_keeps_page_order_images_and_sections(self):
+        self._run()
+
+        merged = Document(self.docx_path)
+        texts = [p.text for p in merged.paragraphs if p.text]
+        self.assertEqual(texts, [f"page {n}" for n in range(1, 8)])
+
+        # One section per chunk; later chunks keep their own (landscape) layout.
+        sections = merged.sections
+        self.assertEqual(len(sections), 3)
+        self.assertEqual(sections[0].orientation, WD_ORIENT.PORTRAIT)
+        self.assertEqual(sections[2].orientation, WD_ORIENT.LANDSCAPE)
+
+        # Images from every chunk were carried into the merged package, and
+        # drawing ids stay unique.
+        self.assertEqual(len(merged.inline_shapes), 3)
+        image_rels = [
+            rel for rel in merged.part.rels.values() if rel.reltype.endswith("/image")
+        ]
+        self.assertEqual(len(image_rels), 2)  # red + blue, deduplicated
+        ids = [
+            el.get("id")
+            for el in merged.element.body.iter(f"{{{chunked._WP_NS}}}docPr")
+        ]
+        self.assertEqual(len(ids), len(set(ids)))
+
+        # Chunk files are cleaned up.
+        self.assertEqual(sorted(os.listdir(self.tmp)), ["out.docx"])
+
+    def test_chunk_failure_raises_and_cleans_up(self):
+        with self.assertRaisesRegex(RuntimeError, "broken page"):
+            self._run(fail_at=3)
+        self.assertEqual(os.listdir(self.tmp), [])
+
+    def test_cancellation_stops_before_merge(self):
+        class Cancelled(Exception):
+            pass
+
+        def _cancel():
+            raise Cancelled()
+
+        with self.assertRaises(Cancelled):
+            self._run(check_cancelled=_cancel)
+        self.assertFalse(os.path.exists(self.docx_path))
+
+    def test_chunks_run_inside_a_daemonic_process(self):
+        """Celery prefork children are daemonic; chunk interpreters still start."""
+        with patch.dict(multiprocessing.current_process()._config, {"daemon": True}):
+            self._run()
+        texts = [p.text for p in Document(self.docx_path).paragraphs if p.text]
+        self.assertEqual(texts, [f"page {n}" for n in range(1, 8)])
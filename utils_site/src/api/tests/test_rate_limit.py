@@ -54,3 +54,23 @@ class NoDoubleCountTest(TestCase):
                 )
             r = client.post("/api/pdf-to-word/", {})
         self.assertEqual(r.status_code, 429, "31st hit should be limited (not earlier)")
+
+
+@override_settings(RATELIMIT_ENABLE=True, CACHES=_LOCMEM_CACHES)
+class RateLimitHeadersTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_headers_report_the_tightest_bucket(self):
+        client = APIClient()
+        r = client.post("/api/jpg-to-pdf/", {})
+        self.assertEqual(r["X-RateLimit-Limit"], "30")
+        self.assertEqual(r["X-RateLimit-Remaining"], "29")
+        self.assertFalse(r.has_header("Retry-After"))
+
+        cache.set("rate_limit:api_conversion:anon:127.0.0.1", 30, 3600)
+        r = client.post("/api/jpg-to-pdf/", {})
+        self.assertEqual(r.status_code, 429)
+        self.assertEqual(r["X-RateLimit-Remaining"], "0")
+        self.assertEqual(r["Retry-After"], "3600")
+        self.assertEqual(r.json()["limit_type"], "ip")
@@ -0,0 +1,78 @@
+"""On-disk conversion result cache (src/tasks/result_cache.py).
+
+Outputs of any size are kept as blobs on disk and served by hard link; Redis
+(the Django cache) only holds the index entry. Blobs are LRU-evicted down to
+the byte budget, and an index entry whose blob is gone is a clean miss.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+import time
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from src.tasks.result_cache import ResultCache
+
+
+class ResultCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix="test_result_cache_")
+        self.work = tempfile.mkdtemp(prefix="test_result_work_")
+        self.addCleanup(shutil.rmtree, self.root, True)
+        self.addCleanup(shutil.rmtree, self.work, True)
+        self.addCleanup(cache.clear)
+        self.rc = ResultCache(root=self.root, max_bytes=1000, max_entry_bytes=600)
+
+    def _output(self, name, size):
+        path = os.path.join(self.work, name)
+        with open(path, "wb") as fh:
+            fh.write(b"x" * size)
+        return path
+
+    def test_store_then_fetch_hardlinks_blob_and_keeps_bytes_out_of_redis(self):
+        out = self._output("a_convertica.zip", 100)
+        self.assertTrue(self.rc.store("conv_cache:k1", out))
+
+        entry = cache.get("conv_cache:k1")
+        self.assertNotIn("data", entry)
+        self.assertEqual(entry["ext"], ".zip")
+
+        task_dir = tempfile.mkdtemp(dir=self.work)
+        path, size = self.rc.fetch(
+            "conv_cache:k1", os.path.join(task_dir, "b_convertica"), ".pdf"
+        )
+        self.assertEqual(path, os.path.join(task_dir, "b_convertica.zip"))
+        self.assertEqual(size, 100)
+        self.assertGreaterEqual(os.stat(path).st_nlink, 2)
+
+    def test_oversized_entry_is_not_stored(self):
+        out = self._output("big.pdf", 700)
+        self.assertFalse(self.rc.store("conv_cache:big", out))
+        self.assertIsNone(cache.get("conv_cache:big"))
+
+    def test_least_recently_used_blob_is_evicted(self):
+        for n in range(3):
+            self.rc.store(f"conv_cache:k{n}", self._output(f"o{n}.pdf", 400))
+            # mtime drives LRU order; make it strictly increasing.
+            blob = self.rc._blob_path(cache.get(f"conv_cache:k{n}")["blob"])
+            os.utime(blob, (time.time() - 100 + n, time.time() - 100 + n))
+
+        # The budget (1000) fits two 400-byte blobs: k0, the oldest, goes.
+        self.assertIsNone(
+            self.rc.fetch("conv_cache:k0", os.path.join(self.work, "r0"), ".pdf")
+        )
+        self.assertIsNone(cache.get("conv_cache:k0"))
+        self.assertIsNotNone(
+            self.rc.fetch("conv_cache:k2", os.path.join(self.work, "r2"), ".pdf")
+        )
+
+    def test_legacy_inline_entry_is_still_served(self):
+        cache.set("conv_cache:old", {"ext": ".zip", "data": b"PK\x03\x04"})
+        path, size = self.rc.fetch(
+            "conv_cache:old", os.path.join(self.work, "legacy"), ".pdf"
+        )
+        self.assertTrue(path.endswith(".zip"))
+        self.assertEqual(size, 4)
@@ -1,8 +1,14 @@
+from datetime import timedelta
 from unittest.mock import patch
 
-from django.test import TestCase
-from src.api.webhook_delivery import deliver
-from src.users.models import User
+import requests
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from src.api import webhook_delivery
+from src.api.webhook_delivery import deliver, enqueue, send_due
+from src.tasks.webhooks import deliver_host_webhooks, dispatch_webhooks
+from src.users.models import User, WebhookDelivery
 
 
 class WebhookDeliveryTest(TestCase):
@@ -11,8 +17,9 @@ class WebhookDeliveryTest(TestCase):
         self.user.webhook_secret = "x" * 32
         self.user.save()
 
-    @patch("src.api.webhook_delivery.requests.post")
-    def test_delivers_with_hmac_signature(self, mock_post):
+    @patch("src.api.webhook_delivery._get_session")
+    def test_delivers_with_hmac_signature(self, mock_session):
+        mock_post = mock_session.return_value.post
         mock_post.return_value.status_code = 200
         ok = deliver(
             webhook_url="https://example.com/cb",
@@ -46,3 +53,166 @@ class WebhookDeliveryTest(TestCase):
             user=self.user,
         )
         self.assertFalse(ok)
+
+
+class _Response:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+@override_settings(
+    WEBHOOK_MAX_ATTEMPTS=3,
+    WEBHOOK_BACKOFF_BASE=30,
+    WEBHOOK_CIRCUIT_THRESHOLD=2,
+    WEBHOOK_CIRCUIT_COOLDOWN=300,
+)
+class WebhookOutboxTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="o@x.com", password="p")
+        self.user.webhook_secret = "y" * 32
+        self.user.save()
+        # No DNS in tests; the SSRF check itself is covered above.
+        patcher = patch.object(webhook_delivery, "_is_safe_url", return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        session = patch.object(webhook_delivery, "_get_session")
+        self.post = session.start().return_value.post
+        self.addCleanup(session.stop)
+
+    def _enqueue(self, url="https://hooks.example.com/cb", **payload):
+        with (
+            patch("src.tasks.webhooks.deliver_host_webhooks.delay") as kick,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            delivery = enqueue(
+                webhook_url=url, payload=payload or {"n": 1}, user=self.user
+            )
+        return delivery, kick
+
+    def test_enqueue_writes_outbox_and_kicks_host(self):
+        delivery, kick = self._enqueue()
+
+        self.assertEqual(delivery.host, "hooks.example.com")
+        self.assertEqual(delivery.status, WebhookDelivery.STATUS_PENDING)
+        kick.assert_called_once_with("hooks.example.com")
+        self.post.assert_not_called()
+        self.assertIsNone(
+            enqueue(webhook_url="http://x.test/", payload={}, user=self.user)
+        )
+
+    def test_send_reuses_session_and_records_latency(self):
+        self._enqueue(n=1)
+        self._enqueue(n=2)
+        self.post.return_value = _Response(204)
+
+        result = send_due("hooks.example.com")
+
+        self.assertEqual(result["delivered"], 2)
+        self.assertEqual(self.post.call_count, 2)
+        delivered = WebhookDelivery.objects.filter(
+            status=WebhookDelivery.STATUS_DELIVERED, latency_ms__isnull=False
+        )
+        self.assertEqual(delivered.count(), 2)
+        self.assertEqual(webhook_delivery.delivery_stats()["delivered"], 2)
+
+    def test_failure_backs_off_then_gives_up(self):
+        delivery, _ = self._enqueue()
+        self.post.return_value = _Response(503)
+
+        send_due("hooks.example.com")
+        delivery.refresh_from_db()
+        self.assertEqual(delivery.attempts, 1)
+        self.assertEqual(delivery.status, WebhookDelivery.STATUS_PENDING)
+        self.assertGreater(delivery.next_attempt_at, timezone.now())
+        # Not due yet: nothing is sent.
+        self.assertEqual(send_due("hooks.example.com")["failed"], 0)
+
+        cache.clear()  # keep the breaker out of this test
+        for _ in range(2):
+            WebhookDelivery.objects.update(next_attempt_at=timezone.now())
+            send_due("hooks.example.com")
+        delivery.refresh_from_db()
+        self.assertEqual(delivery.status, WebhookDelivery.STATUS_FAILED)
+        self.assertEqual(delivery.attempts, 3)
+        self.assertEqual(delivery.last_status_code, 503)
+
+    def test_circuit_breaker_parks_a_failing_host_only(self):
+        for n in range(4):
+            self._enqueue(n=n)
+        other, _ = self._enqueue(url="https://ok.example.org/cb")
+        self.post.side_effect = requests.ConnectionError("refused")
+
+        result = send_due("hooks.example.com")
+
+        self.assertEqual((result["failed"], result["deferred"]), (2, 2))
+        self.assertIsNotNone(webhook_delivery.circuit_open_until("hooks.example.com"))
+        parked = WebhookDelivery.objects.filter(host="hooks.example.com", attempts=0)
+        self.assertTrue(
+            all(
+                row.next_attempt_at > timezone.now() + timedelta(minutes=4)
+                for row in parked
+            )
+        )
+
+        self.post.side_effect = None
+        self.post.return_value = _Response(200)
+        # The (mocked) enqueue kick for ok.example.org never ran.
+        webhook_delivery.clear_kick("ok.example.org")
+        with patch("src.tasks.webhooks.deliver_host_webhooks.delay") as kick:
+            dispatch_webhooks()
+        kick.assert_called_once_with("ok.example.org")
+        self.assertEqual(send_due("ok.example.org")["delivered"], 1)
+        other.refresh_from_db()
+        self.assertEqual(other.status, WebhookDelivery.STATUS_DELIVERED)
+
+    def test_one_kick_per_host_until_its_sender_starts(self):
+        _delivery, first = self._enqueue(n=1)
+        _delivery, second = self._enqueue(n=2)
+        _delivery, other = self._enqueue(url="https://ok.example.org/cb")
+        first.assert_called_once_with("hooks.example.com")
+        second.assert_not_called()
+        other.assert_called_once_with("ok.example.org")
+        with patch("src.tasks.webhooks.deliver_host_webhooks.delay") as kick:
+            dispatch_webhooks()
+        kick.assert_not_called()
+
+        self.post.return_value = _Response(204)
+        deliver_host_webhooks("hooks.example.com")
+        _delivery, third = self._enqueue(n=3)
+        third.assert_called_once_with("hooks.example.com")
+
+    @override_settings(WEBHOOK_SEND_BUDGET=15)
+    def test_send_budget_hands_the_rest_to_a_fresh_sender(self):
+        for n in range(3):
+            self._enqueue(n=n)
+        clock = [0.0]
+
+        def slow_post(*args, **kwargs):
+            clock[0] += 10
+            return _Response(204)
+
+        self.post.side_effect = slow_post
+        with (
+            patch.object(webhook_delivery.time, "monotonic", lambda: clock[0]),
+            patch("src.tasks.webhooks.deliver_host_webhooks.delay") as kick,
+        ):
+            result = deliver_host_webhooks("hooks.example.com")
+
+        self.assertEqual((result["delivered"], result["deferred"]), (2, 1))
+        kick.assert_called_once_with("hooks.example.com")
+        left = WebhookDelivery.objects.get(status=WebhookDelivery.STATUS_PENDING)
+        self.assertEqual(left.attempts, 0)
+        self.assertLessEqual(left.next_attempt_at, timezone.now())
+
+    def test_webhook_tasks_use_their_own_queue(self):
+        from utils_site.celery import app
+
+        for name in ("webhooks.dispatch", "webhooks.deliver_host", "webhooks.prune"):
+            route = app.amqp.router.route({}, name)
+            self.assertEqual(route["queue"].name, "webhooks")
+
+    def test_deliver_host_has_no_celery_time_limits(self):
+        # The threads-pool webhook worker ignores them; send_due has a budget.
+        self.assertIsNone(deliver_host_webhooks.soft_time_limit)
+        self.assertIsNone(deliver_host_webhooks.time_limit)
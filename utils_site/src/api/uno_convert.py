@@ -0,0 +1,82 @@
+"""
+Convert one document on a running LibreOffice listener over UNO.
+
+Helper for ``src.api.libreoffice_pool``. It runs under LibreOffice's own Python
+(the interpreter that can ``import uno``), not the Django one, so it must stay
+free of project imports.
+
+Usage:
+    python uno_convert.py --port 2202 --filter writer_pdf_Export IN OUT
+
+Exit status: 0 converted, 1 conversion failed, 2 listener unreachable.
+"""
+
+import argparse
+import os
+import sys
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_UNREACHABLE = 2
+
+
+def _prop(name, value):
+    from com.sun.star.beans import PropertyValue
+
+    prop = PropertyValue()
+    prop.Name = name
+    prop.Value = value
+    return prop
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, required=True)
+    parser.add_argument("--filter", required=True)
+    parser.add_argument("input")
+    parser.add_argument("output")
+    args = parser.parse_args(argv)
+
+    import uno
+
+    local_ctx = uno.getComponentContext()
+    resolver = local_ctx.ServiceManager.createInstanceWithContext(
+        "com.sun.star.bridge.UnoUrlResolver", local_ctx
+    )
+    try:
+        ctx = resolver.resolve(
+            f"uno:socket,host=127.0.0.1,port={args.port};urp;"
+            "StarOffice.ComponentContext"
+        )
+    except Exception as exc:
+        print(f"listener unreachable: {exc}", file=sys.stderr)
+        return EXIT_UNREACHABLE
+
+    desktop = ctx.ServiceManager.createInstanceWithContext(
+        "com.sun.star.frame.Desktop", ctx
+    )
+    try:
+        doc = desktop.loadComponentFromURL(
+            uno.systemPathToFileUrl(os.path.abspath(args.input)),
+            "_blank",
+            0,
+            (_prop("Hidden", True), _prop("ReadOnly", True)),
+        )
+        if doc is None:
+            print("document could not be loaded", file=sys.stderr)
+            return EXIT_FAILED
+        try:
+            doc.storeToURL(
+                uno.systemPathToFileUrl(os.path.abspath(args.output)),
+                (_prop("FilterName", args.filter),),
+            )
+        finally:
+            doc.close(True)
+    except Exception as exc:
+        print(f"conversion failed: {exc}", file=sys.stderr)
+        return EXIT_FAILED
+    return EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -65,11 +65,12 @@ def convert_with_unoserver(
 
     Returns:
         True  – conversion completed successfully via unoserver.
-        False – unoserver is unavailable (connection refused / timeout);
-                caller should fall back to LibreOffice subprocess.
+        False – unoserver is unavailable (connection refused / connect
+                timeout); caller should fall back to LibreOffice subprocess.
 
     Raises:
-        ConversionError – unoserver returned an HTTP error (4xx/5xx).
+        ConversionError – unoserver returned an HTTP error (4xx/5xx) or did not
+                          finish the conversion within ``timeout``.
     """
     from src.exceptions import ConversionError
 
@@ -133,12 +134,17 @@ def convert_with_unoserver(
         )
         return False
 
-    except requests.exceptions.Timeout:
+    except requests.exceptions.Timeout as exc:
+        # Connect timeouts are ConnectionErrors and handled above: this is
+        # unoserver taking longer than ``timeout`` on the document. Retrying it
+        # on another LibreOffice would only repeat the wait.
         logger.warning(
-            "unoserver connect timeout, falling back to subprocess",
+            "unoserver conversion timed out",
             extra={"event": "unoserver_timeout", "url": UNOSERVER_URL},
         )
-        return False
+        raise ConversionError(
+            f"unoserver conversion timed out after {timeout}s"
+        ) from exc
 
     except requests.exceptions.HTTPError as exc:
         status = exc.response.status_code if exc.response is not None else "?"
@@ -1,4 +1,17 @@
-"""Deliver async-conversion results to caller-specified URLs."""
+"""Deliver async-conversion results to caller-specified URLs.
+
+Conversions don't POST inline: ``enqueue()`` writes a ``WebhookDelivery``
+outbox row and kicks the ``webhooks.deliver_host`` task for its host, unless
+one is already queued for that host. The tasks run on their own
+``webhooks`` queue and worker, so callbacks never take conversion slots.
+``send_due(host)`` claims that host's due rows and sends them over one
+pooled keep-alive session; a failure is rescheduled with exponential
+backoff until ``WEBHOOK_MAX_ATTEMPTS``. Each host runs in its own task, and
+a host that keeps failing trips a circuit breaker that parks its rows for
+``WEBHOOK_CIRCUIT_COOLDOWN`` seconds, so one slow or dead endpoint never
+holds up callbacks to the others. ``webhooks.dispatch`` (beat) picks up
+retries and anything whose kick was lost.
+"""
 
 import hashlib
 import hmac
@@ -6,9 +19,16 @@ import ipaddress
 import json
 import logging
 import socket
+import time
+from datetime import UTC, datetime, timedelta
 from urllib.parse import urlparse
 
 import requests
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
@@ -54,10 +74,49 @@ def _is_safe_url(url: str) -> bool:
         return False
 
 
+# (connect, read): a slow endpoint costs its own host task at most this.
+_TIMEOUT = (3.05, 10)
+# How long a claimed row is hidden from other senders while in flight.
+_CLAIM_LEASE = timedelta(minutes=5)
+
+_session = None
+
+
+def _get_session() -> requests.Session:
+    """Process-wide session: keep-alive connections pooled per host."""
+    global _session
+    if _session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=4, max_retries=0)
+        session.mount("https://", adapter)
+        session.headers["User-Agent"] = "convertica-webhook/1.0"
+        _session = session
+    return _session
+
+
+def _setting(name: str, default: int) -> int:
+    return getattr(settings, name, default)
+
+
+def _post(url: str, payload: dict, secret: str) -> requests.Response:
+    body = json.dumps(payload, sort_keys=True).encode()
+    sig = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return _get_session().post(
+        url,
+        data=body,
+        headers={
+            "Content-Type": "application/json",
+            "X-Convertica-Signature": f"sha256={sig}",
+        },
+        timeout=_TIMEOUT,
+    )
+
+
 def deliver(*, webhook_url: str, payload: dict, user) -> bool:
-    """POST `payload` to `webhook_url`, HMAC-signing the body.
+    """POST `payload` to `webhook_url` now, HMAC-signing the body.
 
-    Returns True on 2xx, False otherwise. Caller decides retry policy.
+    Returns True on 2xx, False otherwise. No retries — conversions go
+    through enqueue() instead.
     """
     if not _is_safe_url(webhook_url):
         logger.warning("webhook rejected (unsafe URL): %s", webhook_url)
@@ -65,19 +124,8 @@ def deliver(*, webhook_url: str, payload: dict, user) -> bool:
     if not user.webhook_secret:
         logger.warning("webhook delivery skipped — user %s has no secret", user.pk)
         return False
-    body = json.dumps(payload, sort_keys=True).encode()
-    sig = hmac.new(user.webhook_secret.encode(), body, hashlib.sha256).hexdigest()
     try:
-        r = requests.post(
-            webhook_url,
-            data=body,
-            headers={
-                "Content-Type": "application/json",
-                "X-Convertica-Signature": f"sha256={sig}",
-                "User-Agent": "convertica-webhook/1.0",
-            },
-            timeout=10,
-        )
+        r = _post(webhook_url, payload, user.webhook_secret)
         ok = 200 <= r.status_code < 300
         if not ok:
             logger.warning("webhook %s returned %d", webhook_url, r.status_code)
@@ -85,3 +133,272 @@ def deliver(*, webhook_url: str, payload: dict, user) -> bool:
     except requests.RequestException as e:
         logger.warning("webhook %s failed: %s", webhook_url, e)
         return False
+
+
+def enqueue(*, webhook_url: str, payload: dict, user):
+    """Add a callback to the outbox and kick its host's sender.
+
+    Returns the ``WebhookDelivery``, or None for a URL that can never be
+    delivered (the full SSRF check runs at send time, against fresh DNS).
+    """
+    from src.users.models import WebhookDelivery
+
+    parsed = urlparse(webhook_url)
+    host = (parsed.hostname or "").lower()
+    if parsed.scheme not in ALLOWED_SCHEMES or not host:
+        logger.warning("webhook rejected (unsafe URL): %s", webhook_url)
+        return None
+    delivery = WebhookDelivery.objects.create(
+        user=user, url=webhook_url, host=host, payload=payload
+    )
+
+    transaction.on_commit(lambda: kick_host(host))
+    return delivery
+
+
+# One queued sender per host is enough: it sends every row due when it
+# starts. Further kicks within this window are dropped; the sender clears the
+# mark as it starts, so rows enqueued while it runs get a kick of their own.
+_KICK_DEDUP_SECONDS = 30
+
+
+def _kick_key(host: str) -> str:
+    return f"webhook:kick:{host}"
+
+
+def kick_host(host: str) -> bool:
+    """Queue ``webhooks.deliver_host`` for ``host`` unless one is queued.
+
+    Returns True when a task was queued.
+    """
+    from src.tasks.webhooks import deliver_host_webhooks
+
+    key = _kick_key(host)
+    if not cache.add(key, 1, _KICK_DEDUP_SECONDS):
+        return False
+    try:
+        deliver_host_webhooks.delay(host)
+    except Exception:
+        # Broker hiccup: webhooks.dispatch picks the row up on its next run.
+        cache.delete(key)
+        logger.warning("webhook kick failed for %s", host, exc_info=True)
+        return False
+    return True
+
+
+def clear_kick(host: str) -> None:
+    """Mark the host's queued sender as started (see ``kick_host``)."""
+    cache.delete(_kick_key(host))
+
+
+def _backoff(attempts: int) -> timedelta:
+    base = _setting("WEBHOOK_BACKOFF_BASE", 30)
+    cap = _setting("WEBHOOK_BACKOFF_MAX", 3600)
+    return timedelta(seconds=min(base * 2 ** (attempts - 1), cap))
+
+
+# Circuit breaker per destination host, in the shared cache: consecutive
+# failures are counted; at WEBHOOK_CIRCUIT_THRESHOLD the circuit opens for
+# WEBHOOK_CIRCUIT_COOLDOWN seconds. The first send after that is a trial —
+# one more failure re-opens it immediately, a success closes it.
+def _circuit_keys(host: str) -> tuple[str, str, str]:
+    return (
+        f"webhook:circuit:{host}:failures",
+        f"webhook:circuit:{host}:open",
+        f"webhook:circuit:{host}:tripped",
+    )
+
+
+def circuit_open_until(host: str) -> float | None:
+    """Unix time the host's circuit reopens, or None when it is closed."""
+    return cache.get(_circuit_keys(host)[1])
+
+
+def _record_outcome(host: str, ok: bool) -> None:
+    failures_key, open_key, tripped_key = _circuit_keys(host)
+    if ok:
+        cache.delete_many([failures_key, tripped_key])
+        return
+    cooldown = _setting("WEBHOOK_CIRCUIT_COOLDOWN", 300)
+    cache.add(failures_key, 0, cooldown * 12)
+    try:
+        failures = cache.incr(failures_key)
+    except ValueError:
+        cache.add(failures_key, 1, cooldown * 12)
+        failures = 1
+    if cache.get(tripped_key) or failures >= _setting("WEBHOOK_CIRCUIT_THRESHOLD", 5):
+        cache.set(open_key, time.time() + cooldown, cooldown)
+        cache.set(tripped_key, 1, cooldown * 12)
+        cache.delete(failures_key)
+        logger.warning(
+            f"Webhook circuit opened for {host} for {cooldown}s",
+            extra={"event": "webhook_circuit_open", "host": host},
+        )
+
+
+def due_hosts(limit: int = 500) -> list[str]:
+    """Hosts with at least one pending delivery that is due now."""
+    from src.users.models import WebhookDelivery
+
+    return list(
+        WebhookDelivery.objects.filter(
+            status=WebhookDelivery.STATUS_PENDING, next_attempt_at__lte=timezone.now()
+        )
+        .order_by()
+        .values_list("host", flat=True)
+        .distinct()[:limit]
+    )
+
+
+def _claim(host: str, limit: int) -> list:
+    from src.users.models import WebhookDelivery
+
+    now = timezone.now()
+    with transaction.atomic():
+        rows = list(
+            WebhookDelivery.objects.select_for_update(skip_locked=True)
+            .select_related("user")
+            .filter(
+                host=host,
+                status=WebhookDelivery.STATUS_PENDING,
+                next_attempt_at__lte=now,
+            )
+            .order_by("next_attempt_at")[:limit]
+        )
+        WebhookDelivery.objects.filter(pk__in=[row.pk for row in rows]).update(
+            next_attempt_at=now + _CLAIM_LEASE
+        )
+    return rows
+
+
+def _send_one(delivery) -> bool:
+    """Attempt one delivery and record the outcome on the row."""
+    from src.users.models import WebhookDelivery
+
+    delivery.attempts += 1
+    now = timezone.now()
+    status_code, error, latency_ms = None, "", None
+    retryable = True
+    if not delivery.user.webhook_secret:
+        error, retryable = "user has no webhook secret", False
+    elif not _is_safe_url(delivery.url):
+        error, retryable = "unsafe URL", False
+    else:
+        started = time.monotonic()
+        try:
+            status_code = _post(
+                delivery.url, delivery.payload, delivery.user.webhook_secret
+            ).status_code
+        except requests.RequestException as e:
+            error = f"{type(e).__name__}: {e}"[:500]
+        latency_ms = int((time.monotonic() - started) * 1000)
+
+    ok = status_code is not None and 200 <= status_code < 300
+    delivery.last_status_code = status_code
+    delivery.last_error = error
+    delivery.latency_ms = latency_ms
+    if ok:
+        delivery.status = WebhookDelivery.STATUS_DELIVERED
+        delivery.delivered_at = now
+    elif not retryable or delivery.attempts >= _setting("WEBHOOK_MAX_ATTEMPTS", 8):
+        delivery.status = WebhookDelivery.STATUS_FAILED
+        logger.warning(
+            f"Webhook to {delivery.host} gave up after {delivery.attempts} "
+            f"attempt(s): {error or status_code}",
+            extra={"event": "webhook_failed", "host": delivery.host},
+        )
+    else:
+        delivery.next_attempt_at = now + _backoff(delivery.attempts)
+    delivery.save(
+        update_fields=[
+            "attempts",
+            "status",
+            "next_attempt_at",
+            "last_status_code",
+            "last_error",
+            "latency_ms",
+            "delivered_at",
+        ]
+    )
+    if retryable:
+        _record_outcome(delivery.host, ok)
+    return ok
+
+
+def _release(rows: list, at: datetime) -> int:
+    """Hand claimed but unsent rows back to the outbox, due at ``at``."""
+    from src.users.models import WebhookDelivery
+
+    return WebhookDelivery.objects.filter(pk__in=[row.pk for row in rows]).update(
+        next_attempt_at=at
+    )
+
+
+def send_due(host: str, limit: int | None = None) -> dict:
+    """Send one host's due deliveries, oldest first, over the pooled session.
+
+    Stops after ``WEBHOOK_SEND_BUDGET`` seconds (the webhook worker's
+    threads pool ignores Celery time limits), releases the rows it did not
+    get to and kicks a fresh sender for them.
+
+    Returns ``{"delivered", "failed", "deferred", "latency_ms"}`` where
+    latency is the mean of the attempts made.
+    """
+    result = {"delivered": 0, "failed": 0, "deferred": 0, "latency_ms": 0}
+    if circuit_open_until(host):
+        return result
+    deadline = time.monotonic() + _setting("WEBHOOK_SEND_BUDGET", 240)
+    rows = _claim(host, limit or _setting("WEBHOOK_BATCH_SIZE", 100))
+    latencies = []
+    for index, delivery in enumerate(rows):
+        reopen_at = circuit_open_until(host)
+        if reopen_at:
+            # Circuit tripped mid-batch: park the rest until it reopens.
+            result["deferred"] = _release(
+                rows[index:], datetime.fromtimestamp(reopen_at, tz=UTC)
+            )
+            break
+        if time.monotonic() >= deadline:
+            # Out of time: the rest go to a fresh run, still due now.
+            result["deferred"] = _release(rows[index:], timezone.now())
+            kick_host(host)
+            break
+        if _send_one(delivery):
+            result["delivered"] += 1
+        else:
+            result["failed"] += 1
+        if delivery.latency_ms is not None:
+            latencies.append(delivery.latency_ms)
+    if latencies:
+        result["latency_ms"] = sum(latencies) // len(latencies)
+    return result
+
+
+def delivery_stats(hours: int = 1) -> dict:
+    """Outbox depth plus delivery latency over the last ``hours``."""
+    from django.db.models import Count, Q
+    from src.users.models import WebhookDelivery
+
+    since = timezone.now() - timedelta(hours=hours)
+    counts = WebhookDelivery.objects.aggregate(
+        pending=Count("id", filter=Q(status=WebhookDelivery.STATUS_PENDING)),
+        delivered=Count(
+            "id",
+            filter=Q(status=WebhookDelivery.STATUS_DELIVERED, delivered_at__gte=since),
+        ),
+        failed=Count(
+            "id",
+            filter=Q(status=WebhookDelivery.STATUS_FAILED, created_at__gte=since),
+        ),
+    )
+    latencies = sorted(
+        WebhookDelivery.objects.filter(
+            status=WebhookDelivery.STATUS_DELIVERED,
+            delivered_at__gte=since,
+            latency_ms__isnull=False,
+        ).values_list("latency_ms", flat=True)[:10000]
+    )
+    if latencies:
+        counts["latency_p50_ms"] = latencies[len(latencies) // 2]
+        counts["latency_p95_ms"] = latencies[int(len(latencies) * 0.95)]
+    return counts
@@ -16,7 +16,7 @@ def notify_indexnow_on_article_save(
     sender, instance, created, **kwargs
 ):  # noqa: ARG001
     """
-    Automatically submit article URL to IndexNow when article is published or updated.
+    Queue the article's URLs for IndexNow when it is published or updated.
 
     Args:
         sender: The model class (Article)
@@ -42,49 +42,41 @@ def notify_indexnow_on_article_save(
         return
 
     try:
-        from src.frontend.indexnow import submit_url_to_indexnow
+        from src.frontend.indexnow import enqueue_urls
 
         # Get site base URL
         site_url = getattr(settings, "SITE_BASE_URL", "https://convertica.net")
 
-        # One ping per locale the article actually exists in. The English base
+        # One URL per locale the article actually exists in. The English base
         # always counts; others only when present in the translations JSON —
         # the same set the sitemap emits. Ping the locales, not just /en/:
         # otherwise the translated URLs are never announced and the only thing
         # that ever covered them was the daily full-sitemap batch sweep (which
-        # Bing flags as batch-mode abuse).
+        # Bing flags as batch-mode abuse). Queued, not sent inline: repeated
+        # saves coalesce and maintenance.flush_indexnow_queue submits them.
         default_language = getattr(settings, "LANGUAGE_CODE", "en")
         locales = [default_language] + [
             lang for lang in (instance.translations or {}) if lang != default_language
         ]
 
-        submitted = 0
-        for lang in locales:
-            if submit_url_to_indexnow(f"{site_url}/{lang}/blog/{instance.slug}/"):
-                submitted += 1
-
-        if submitted:
-            logger.info(
-                "Article '%s' (slug: %s) submitted to IndexNow for %d/%d locale(s)",
-                instance.title_en,
-                instance.slug,
-                submitted,
-                len(locales),
-            )
-        else:
-            logger.warning(
-                "Failed to submit article '%s' (slug: %s) to IndexNow",
-                instance.title_en,
-                instance.slug,
-            )
+        queued = enqueue_urls(
+            [f"{site_url}/{lang}/blog/{instance.slug}/" for lang in locales]
+        )
+        logger.info(
+            "Article '%s' (slug: %s) queued for IndexNow: %d new of %d locale(s)",
+            instance.title_en,
+            instance.slug,
+            queued,
+            len(locales),
+        )
 
     except ImportError:
         logger.error(
-            "Failed to import submit_url_to_indexnow - IndexNow integration not available"
+            "Failed to import enqueue_urls - IndexNow integration not available"
         )
     except Exception as e:  # noqa: BLE001
         logger.error(
-            "Error submitting article to IndexNow: %s",
+            "Error queueing article for IndexNow: %s",
             str(e),
             exc_info=True,
         )
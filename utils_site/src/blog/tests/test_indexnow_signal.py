@@ -3,7 +3,8 @@
 Bing Webmaster Tools flagged "IndexNow is in batch mode" because a nightly task
 re-submitted the whole sitemap (~735 URLs) via urlList. That sweep is gone; the
 per-article signal has to cover the translated URLs it used to cover, and must
-use the single-URL endpoint.
+use the single-URL endpoint. The URLs go through the IndexNow queue
+(src.frontend.indexnow.enqueue_urls), whose flush sends one GET per URL.
 """
 
 from __future__ import annotations
@@ -22,11 +23,11 @@ from src.blog.models import Article
 )
 class IndexNowSignalTests(TestCase):
     def _save_and_capture(self, **article_kwargs) -> list[str]:
-        # The signal skips test runs at the indexnow.py layer, so patch the
-        # submit function itself and assert on the URLs it was handed.
+        # The signal skips test runs, so patch argv/env and the enqueue
+        # function itself and assert on the URLs it was handed.
         with mock.patch(
-            "src.frontend.indexnow.submit_url_to_indexnow", return_value=True
-        ) as submit, mock.patch("src.blog.signals.os.environ", {}), mock.patch(
+            "src.frontend.indexnow.enqueue_urls", return_value=1
+        ) as enqueue, mock.patch("src.blog.signals.os.environ", {}), mock.patch(
             "src.blog.signals.sys.argv", ["manage.py"]
         ):
             Article.objects.create(
@@ -36,7 +37,7 @@ class IndexNowSignalTests(TestCase):
                 status="published",
                 **article_kwargs,
             )
-        return [call.args[0] for call in submit.call_args_list]
+        return [url for call in enqueue.call_args_list for url in call.args[0]]
 
     def test_pings_every_locale_the_article_exists_in(self):
         urls = self._save_and_capture(
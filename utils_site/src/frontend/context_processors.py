@@ -3,11 +3,14 @@ Context processors for frontend templates.
 """
 
 import os
+from functools import lru_cache
 
 from decouple import config
 from django.conf import settings
 from django.urls import NoReverseMatch, Resolver404, resolve, reverse
+from django.utils.translation import gettext_lazy
 
+from . import tool_registry
 from .seo import get_request_seo_context
 
 
@@ -196,11 +199,96 @@ def csp_nonce(request):
     """Add CSP nonce to template context for inline scripts.
 
     The nonce is generated by CSPNonceMiddleware and stored on the request.
-    This context processor makes it available to all templates.
+    This context processor makes it available to all templates. Pages whose
+    HTML is cached render a placeholder instead, filled in per request
+    (see anonymous_cache_page), so the cached body and its ETag are the same
+    for every visitor.
     """
+    if getattr(request, "csp_nonce_deferred", False):
+        from src.api.middleware import CSP_NONCE_PLACEHOLDER
+
+        return {"csp_nonce": CSP_NONCE_PLACEHOLDER}
     return {"csp_nonce": getattr(request, "csp_nonce", "")}
 
 
+#: view name -> breadcrumb leaf (translated lazily, at render time)
+_BREADCRUMB_NAMES = {
+    # PDF Conversion
+    "frontend:pdf_to_word_page": gettext_lazy("PDF to Word"),
+    "frontend:word_to_pdf_page": gettext_lazy("Word to PDF"),
+    "frontend:pdf_to_jpg_page": gettext_lazy("PDF to JPG"),
+    "frontend:jpg_to_pdf_page": gettext_lazy("JPG to PDF"),
+    "frontend:pdf_to_excel_page": gettext_lazy("PDF to Excel"),
+    "frontend:excel_to_pdf_page": gettext_lazy("Excel to PDF"),
+    "frontend:ppt_to_pdf_page": gettext_lazy("PowerPoint to PDF"),
+    "frontend:pdf_to_ppt_page": gettext_lazy("PDF to PowerPoint"),
+    "frontend:html_to_pdf_page": gettext_lazy("HTML to PDF"),
+    "frontend:pdf_to_html_page": gettext_lazy("PDF to HTML"),
+    "frontend:pdf_to_markdown_page": gettext_lazy("PDF to Markdown"),
+    "frontend:compare_pdf_page": gettext_lazy("Compare Two PDFs"),
+    "frontend:pdf_to_pdfa_page": gettext_lazy("PDF to PDF/A"),
+    # PDF Edit
+    "frontend:rotate_pdf_page": gettext_lazy("Rotate PDF"),
+    "frontend:add_page_numbers_page": gettext_lazy("Add Page Numbers"),
+    "frontend:add_watermark_page": gettext_lazy("Add Watermark"),
+    "frontend:crop_pdf_page": gettext_lazy("Crop PDF"),
+    "frontend:flatten_pdf_page": gettext_lazy("Flatten PDF"),
+    "frontend:resize_pdf_page": gettext_lazy("Change PDF Page Size"),
+    "frontend:sign_pdf_page": gettext_lazy("Sign PDF"),
+    "frontend:add_text_pdf_page": gettext_lazy("Add Text to PDF"),
+    "frontend:pdf_editor_page": gettext_lazy("PDF Editor"),
+    # PDF Organize
+    "frontend:merge_pdf_page": gettext_lazy("Merge PDF"),
+    "frontend:split_pdf_page": gettext_lazy("Split PDF"),
+    "frontend:remove_pages_page": gettext_lazy("Remove Pages"),
+    "frontend:extract_pages_page": gettext_lazy("Extract Pages"),
+    "frontend:organize_pdf_page": gettext_lazy("Organize PDF"),
+    "frontend:compress_pdf_page": gettext_lazy("Compress PDF"),
+    # PDF Security
+    "frontend:protect_pdf_page": gettext_lazy("Protect PDF"),
+    "frontend:unlock_pdf_page": gettext_lazy("Unlock PDF"),
+    # Other PDF
+    "frontend:pdf_to_text_page": gettext_lazy("PDF to Text"),
+    # Image tools
+    "frontend:optimize_image_page": gettext_lazy("Optimize Image"),
+    "frontend:convert_image_page": gettext_lazy("Convert Image"),
+    "frontend:favicon_generator_page": gettext_lazy("Favicon Generator"),
+    "frontend:png_to_ico_page": gettext_lazy("PNG to ICO"),
+    "frontend:jpg_to_ico_page": gettext_lazy("JPG to ICO"),
+    "frontend:svg_to_ico_page": gettext_lazy("SVG to ICO"),
+    "frontend:webp_to_ico_page": gettext_lazy("WebP to ICO"),
+    "frontend:ico_to_png_page": gettext_lazy("ICO to PNG"),
+    "frontend:password_protect_image_page": gettext_lazy("Password Protect Image"),
+    # Static pages
+    "frontend:all_tools_page": gettext_lazy("All Tools"),
+    "frontend:premium_tools_page": gettext_lazy("Premium Tools"),
+    "frontend:pricing": gettext_lazy("Pricing"),
+    "frontend:about_page": gettext_lazy("About"),
+    "frontend:faq_page": gettext_lazy("FAQ"),
+    "frontend:contact_page": gettext_lazy("Contact"),
+    "frontend:privacy_page": gettext_lazy("Privacy Policy"),
+    "frontend:terms_page": gettext_lazy("Terms of Service"),
+    # Premium tools
+    "frontend:epub_to_pdf_page": gettext_lazy("EPUB to PDF"),
+    "frontend:pdf_to_epub_page": gettext_lazy("PDF to EPUB"),
+    "frontend:ocr_pdf_to_word_page": gettext_lazy("Scanned PDF to Word"),
+    "frontend:batch_converter_page": gettext_lazy("Batch Converter Hub"),
+    "frontend:premium_workflows_page": gettext_lazy("Saved Workflows"),
+    "frontend:background_center_page": gettext_lazy("Background Queue Center"),
+    "frontend:saved_workflows_page": gettext_lazy("Saved Workflows"),
+    "frontend:background_tasks_page": gettext_lazy("Background Conversion"),
+    "frontend:install_page": gettext_lazy("Install the App"),
+}
+
+
+def _resolve_view_name(request):
+    """View name of the current request; reuses the resolver's match."""
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        match = resolve(request.path)
+    return match.view_name
+
+
 def breadcrumbs(request):
     """Generate breadcrumbs for BreadcrumbList Schema and visual display."""
     from django.utils.translation import gettext as _
@@ -224,81 +312,11 @@ def breadcrumbs(request):
 
     # Try to resolve URL to get view name
     try:
-        resolved = resolve(request.path)
-        view_name = resolved.view_name
-
-        # Map view names to breadcrumb names (translatable)
-        breadcrumb_names = {
-            # PDF Conversion
-            "frontend:pdf_to_word_page": _("PDF to Word"),
-            "frontend:word_to_pdf_page": _("Word to PDF"),
-            "frontend:pdf_to_jpg_page": _("PDF to JPG"),
-            "frontend:jpg_to_pdf_page": _("JPG to PDF"),
-            "frontend:pdf_to_excel_page": _("PDF to Excel"),
-            "frontend:excel_to_pdf_page": _("Excel to PDF"),
-            "frontend:ppt_to_pdf_page": _("PowerPoint to PDF"),
-            "frontend:pdf_to_ppt_page": _("PDF to PowerPoint"),
-            "frontend:html_to_pdf_page": _("HTML to PDF"),
-            "frontend:pdf_to_html_page": _("PDF to HTML"),
-            "frontend:pdf_to_markdown_page": _("PDF to Markdown"),
-            "frontend:compare_pdf_page": _("Compare Two PDFs"),
-            "frontend:pdf_to_pdfa_page": _("PDF to PDF/A"),
-            # PDF Edit
-            "frontend:rotate_pdf_page": _("Rotate PDF"),
-            "frontend:add_page_numbers_page": _("Add Page Numbers"),
-            "frontend:add_watermark_page": _("Add Watermark"),
-            "frontend:crop_pdf_page": _("Crop PDF"),
-            "frontend:flatten_pdf_page": _("Flatten PDF"),
-            "frontend:resize_pdf_page": _("Change PDF Page Size"),
-            "frontend:sign_pdf_page": _("Sign PDF"),
-            "frontend:add_text_pdf_page": _("Add Text to PDF"),
-            "frontend:pdf_editor_page": _("PDF Editor"),
-            # PDF Organize
-            "frontend:merge_pdf_page": _("Merge PDF"),
-            "frontend:split_pdf_page": _("Split PDF"),
-            "frontend:remove_pages_page": _("Remove Pages"),
-            "frontend:extract_pages_page": _("Extract Pages"),
-            "frontend:organize_pdf_page": _("Organize PDF"),
-            "frontend:compress_pdf_page": _("Compress PDF"),
-            # PDF Security
-            "frontend:protect_pdf_page": _("Protect PDF"),
-            "frontend:unlock_pdf_page": _("Unlock PDF"),
-            # Other PDF
-            "frontend:pdf_to_text_page": _("PDF to Text"),
-            # Image tools
-            "frontend:optimize_image_page": _("Optimize Image"),
-            "frontend:convert_image_page": _("Convert Image"),
-            "frontend:favicon_generator_page": _("Favicon Generator"),
-            "frontend:png_to_ico_page": _("PNG to ICO"),
-            "frontend:jpg_to_ico_page": _("JPG to ICO"),
-            "frontend:svg_to_ico_page": _("SVG to ICO"),
-            "frontend:webp_to_ico_page": _("WebP to ICO"),
-            "frontend:ico_to_png_page": _("ICO to PNG"),
-            "frontend:password_protect_image_page": _("Password Protect Image"),
-            # Static pages
-            "frontend:all_tools_page": _("All Tools"),
-            "frontend:premium_tools_page": _("Premium Tools"),
-            "frontend:pricing": _("Pricing"),
-            "frontend:about_page": _("About"),
-            "frontend:faq_page": _("FAQ"),
-            "frontend:contact_page": _("Contact"),
-            "frontend:privacy_page": _("Privacy Policy"),
-            "frontend:terms_page": _("Terms of Service"),
-            # Premium tools
-            "frontend:epub_to_pdf_page": _("EPUB to PDF"),
-            "frontend:pdf_to_epub_page": _("PDF to EPUB"),
-            "frontend:ocr_pdf_to_word_page": _("Scanned PDF to Word"),
-            "frontend:batch_converter_page": _("Batch Converter Hub"),
-            "frontend:premium_workflows_page": _("Saved Workflows"),
-            "frontend:background_center_page": _("Background Queue Center"),
-            "frontend:saved_workflows_page": _("Saved Workflows"),
-            "frontend:background_tasks_page": _("Background Conversion"),
-            "frontend:install_page": _("Install the App"),
-        }
+        view_name = _resolve_view_name(request)
 
-        if view_name in breadcrumb_names:
+        if view_name in _BREADCRUMB_NAMES:
             breadcrumbs_list.append(
-                {"name": breadcrumb_names[view_name], "url": request.path}
+                {"name": _BREADCRUMB_NAMES[view_name], "url": request.path}
             )
         else:
             # Fallback: use path segments. Always render the leaf as a single
@@ -330,219 +348,28 @@ def breadcrumbs(request):
     }
 
 
-def related_tools(request):
-    """Generate related tools suggestions based on current page."""
-    from django.urls import reverse
-    from django.utils.translation import gettext as _
+@lru_cache(maxsize=512)
+def _current_tool(view_name):
+    """Tool whose related tools apply to ``view_name`` (memoized).
 
-    # Define tool relationships for cross-promotion
-    tools_map = {
-        "pdf_to_word": ["word_to_pdf", "pdf_to_excel", "pdf_to_ppt"],
-        "word_to_pdf": ["pdf_to_word", "excel_to_pdf", "ppt_to_pdf"],
-        "pdf_to_jpg": ["jpg_to_pdf", "pdf_to_word", "compress_pdf"],
-        "jpg_to_pdf": ["pdf_to_jpg", "merge_pdf", "compress_pdf"],
-        "pdf_to_excel": ["excel_to_pdf", "pdf_to_word", "pdf_to_ppt"],
-        "excel_to_pdf": ["pdf_to_excel", "word_to_pdf", "ppt_to_pdf"],
-        "pdf_to_ppt": ["ppt_to_pdf", "pdf_to_word", "pdf_to_excel"],
-        "ppt_to_pdf": ["pdf_to_ppt", "word_to_pdf", "excel_to_pdf"],
-        "pdf_to_html": ["html_to_pdf", "pdf_to_word", "pdf_to_excel"],
-        "html_to_pdf": ["pdf_to_html", "word_to_pdf", "merge_pdf"],
-        "pdf_to_markdown": ["pdf_to_word", "pdf_to_html", "compare_pdf"],
-        "compare_pdf": ["pdf_to_markdown", "compress_pdf", "split_pdf"],
-        "merge_pdf": ["split_pdf", "organize_pdf", "compress_pdf"],
-        "split_pdf": ["merge_pdf", "extract_pages", "remove_pages"],
-        "compress_pdf": ["pdf_to_jpg", "merge_pdf", "rotate_pdf"],
-        "extract_pages": ["remove_pages", "split_pdf", "organize_pdf"],
-        "remove_pages": ["extract_pages", "split_pdf", "organize_pdf"],
-        "organize_pdf": ["merge_pdf", "split_pdf", "extract_pages"],
-        "rotate_pdf": ["crop_pdf", "add_watermark", "add_page_numbers"],
-        "crop_pdf": ["rotate_pdf", "add_watermark", "compress_pdf"],
-        "add_watermark": ["add_page_numbers", "rotate_pdf", "protect_pdf"],
-        "add_page_numbers": ["add_watermark", "rotate_pdf", "organize_pdf"],
-        "protect_pdf": ["unlock_pdf", "add_watermark", "compress_pdf"],
-        "unlock_pdf": ["protect_pdf", "merge_pdf", "split_pdf"],
-    }
+    A tool's own page maps exactly; any other view falls back to the first
+    ``TOOL_RELATIONS`` key contained in its name.
+    """
+    tool_key = tool_registry.tool_for_view(view_name)
+    if tool_key:
+        return tool_key
+    for tool_key in tool_registry.TOOL_RELATIONS:
+        if tool_key in view_name:
+            return tool_key
+    return None
 
-    # Tool metadata - icons and colors match header.html menu
-    tools_info = {
-        "pdf_to_word": {
-            "name": _("PDF to Word"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M8 7h12m0 0l-4-4m4 4l-4 4m0 6H4m0 0l4 4m-4-4l4-4"/>',  # noqa: E501
-            "gradient": "from-purple-500 to-purple-600",
-            "description": _("Convert PDF to Word"),
-        },
-        "word_to_pdf": {
-            "name": _("Word to PDF"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M9 12h6m-6 4h6m2 5H7a2 2 0 01-2-2V5a2 2 0 012-2h5.586a1 1 0 01.707.293l5.414 5.414a1 1 0 01.293.707V19a2 2 0 01-2 2z"/>',  # noqa: E501
-            "gradient": "from-blue-500 to-blue-600",
-            "description": _("Convert Word to PDF"),
-        },
-        "pdf_to_jpg": {
-            "name": _("PDF to JPG"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M7 21h10a2 2 0 002-2V9.414a1 1 0 00-.293-.707l-5.414-5.414A1 1 0 0012.586 3H7a2 2 0 00-2 2v14a2 2 0 002 2z"/>',  # noqa: E501
-            "gradient": "from-rose-500 to-rose-600",
-            "description": _("Convert PDF to JPG"),
-        },
-        "jpg_to_pdf": {
-            "name": _("JPG to PDF"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M4 16l4.586-4.586a2 2 0 012.828 0L16 16m-2-2l1.586-1.586a2 2 0 012.828 0L20 14m-6-6h.01M6 20h12a2 2 0 002-2V6a2 2 0 00-2-2H6a2 2 0 00-2 2v12a2 2 0 002 2z"/>',  # noqa: E501
-            "gradient": "from-pink-500 to-pink-600",
-            "description": _("Convert JPG to PDF"),
-        },
-        "pdf_to_excel": {
-            "name": _("PDF to Excel"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M3 10h18M3 14h18m-9-4v8m-7 0h14a2 2 0 002-2V8a2 2 0 00-2-2H5a2 2 0 00-2 2v8a2 2 0 002 2z"/>',  # noqa: E501
-            "gradient": "from-emerald-500 to-emerald-600",
-            "description": _("Convert PDF to Excel"),
-        },
-        "excel_to_pdf": {
-            "name": _("Excel to PDF"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M4 5h16v14H4V5zm4 0v14M4 9h16M4 13h16"/>',  # noqa: E501
-            "gradient": "from-green-500 to-green-600",
-            "description": _("Convert Excel to PDF"),
-        },
-        "merge_pdf": {
-            "name": _("Merge PDF"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M12 6v6m0 0v6m0-6h6m-6 0H6"/>',  # noqa: E501
-            "gradient": "from-green-500 to-green-600",
-            "description": _("Merge multiple PDFs"),
-        },
-        "split_pdf": {
-            "name": _("Split PDF"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M8 7h12m0 0l-4-4m4 4l-4 4m0 6H4m0 0l4 4m-4-4l4-4"/>',  # noqa: E501
-            "gradient": "from-blue-500 to-blue-600",
-            "description": _("Split PDF into parts"),
-        },
-        "compress_pdf": {
-            "name": _("Compress PDF"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M12 6V4m0 2a2 2 0 100 4m0-4a2 2 0 110 4m-6 8a2 2 0 100-4m0 4a2 2 0 110-4m0 4v2m0-6V4m6 6v10m6-2a2 2 0 100-4m0 4a2 2 0 110-4m0 4v2m0-6V4"/>',  # noqa: E501
-            "gradient": "from-orange-500 to-orange-600",
-            "description": _("Reduce PDF size"),
-        },
-        "rotate_pdf": {
-            "name": _("Rotate PDF"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M4 4v5h.582m15.356 2A8.001 8.001 0 004.582 9m0 0H9m11 11v-5h-.581m0 0a8.003 8.003 0 01-15.357-2m15.357 2H15"/>',  # noqa: E501
-            "gradient": "from-purple-500 to-purple-600",
-            "description": _("Rotate PDF pages"),
-        },
-        "protect_pdf": {
-            "name": _("Protect PDF"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M12 15v2m-6 4h12a2 2 0 002-2v-6a2 2 0 00-2-2H6a2 2 0 00-2 2v6a2 2 0 002 2zm10-10V7a4 4 0 00-8 0v4h8z"/>',  # noqa: E501
-            "gradient": "from-red-500 to-red-600",
-            "description": _("Password protect PDF"),
-        },
-        "unlock_pdf": {
-            "name": _("Unlock PDF"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M8 11V7a4 4 0 118 0m-4 8v2m-6 4h12a2 2 0 002-2v-6a2 2 0 00-2-2H6a2 2 0 00-2 2v6a2 2 0 002 2z"/>',  # noqa: E501
-            "gradient": "from-green-500 to-green-600",
-            "description": _("Remove PDF password"),
-        },
-        "organize_pdf": {
-            "name": _("Organize PDF"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M4 5a1 1 0 011-1h4a1 1 0 011 1v7a1 1 0 01-1 1H5a1 1 0 01-1-1V5zM14 5a1 1 0 011-1h4a1 1 0 011 1v7a1 1 0 01-1 1h-4a1 1 0 01-1-1V5zM4 16a1 1 0 011-1h4a1 1 0 011 1v3a1 1 0 01-1 1H5a1 1 0 01-1-1v-3zM14 16a1 1 0 011-1h4a1 1 0 011 1v3a1 1 0 01-1 1h-4a1 1 0 01-1-1v-3z"/>',  # noqa: E501
-            "gradient": "from-teal-500 to-teal-600",
-            "description": _("Reorder PDF pages"),
-        },
-        "extract_pages": {
-            "name": _("Extract Pages"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M12 10v6m0 0l-3-3m3 3l3-3m2 8H7a2 2 0 01-2-2V5a2 2 0 012-2h5.586a1 1 0 01.707.293l5.414 5.414a1 1 0 01.293.707V19a2 2 0 01-2 2z"/>',  # noqa: E501
-            "gradient": "from-yellow-500 to-yellow-600",
-            "description": _("Extract specific pages"),
-        },
-        "remove_pages": {
-            "name": _("Remove Pages"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M19 7l-.867 12.142A2 2 0 0116.138 21H7.862a2 2 0 01-1.995-1.858L5 7m5 4v6m4-6v6m1-10V4a1 1 0 00-1-1h-4a1 1 0 00-1 1v3M4 7h16"/>',  # noqa: E501
-            "gradient": "from-red-500 to-red-600",
-            "description": _("Remove pages from PDF"),
-        },
-        "crop_pdf": {
-            "name": _("Crop PDF"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M4 8V4m0 0h4M4 4l5 5m11-1V4m0 0h-4m4 0l-5 5M4 16v4m0 0h4m-4 0l5-5m11 5l-5-5m5 5v-4m0 4h-4"/>',  # noqa: E501
-            "gradient": "from-green-500 to-green-600",
-            "description": _("Crop PDF pages"),
-        },
-        "add_watermark": {
-            "name": _("Add Watermark"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M9 12l2 2 4-4m5.618-4.016A11.955 11.955 0 0112 2.944a11.955 11.955 0 01-8.618 3.04A12.02 12.02 0 003 9c0 5.591 3.824 10.29 9 11.622 5.176-1.332 9-6.03 9-11.622 0-1.042-.133-2.052-.382-3.016z"/>',  # noqa: E501
-            "gradient": "from-cyan-500 to-cyan-600",
-            "description": _("Add watermark to PDF"),
-        },
-        "add_page_numbers": {
-            "name": _("Add Page Numbers"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M7 20l4-16m2 16l4-16M6 9h14M4 15h14"/>',  # noqa: E501
-            "gradient": "from-blue-500 to-blue-600",
-            "description": _("Number PDF pages"),
-        },
-        "ppt_to_pdf": {
-            "name": _("PowerPoint to PDF"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M4 4h16v10H4V4zm6 16h4m-2-6v6"/>',  # noqa: E501
-            "gradient": "from-orange-500 to-orange-600",
-            "description": _("Convert PowerPoint to PDF"),
-        },
-        "pdf_to_ppt": {
-            "name": _("PDF to PowerPoint"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M4 4h16v10H4V4zm6 16h4m-2-6v6"/>',  # noqa: E501
-            "gradient": "from-amber-500 to-amber-600",
-            "description": _("Convert PDF to PowerPoint"),
-        },
-        "html_to_pdf": {
-            "name": _("HTML to PDF"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M10 20l4-16m4 4l4 4-4 4M6 16l-4-4 4-4"/>',  # noqa: E501
-            "gradient": "from-purple-500 to-purple-600",
-            "description": _("Convert HTML to PDF"),
-        },
-        "pdf_to_html": {
-            "name": _("PDF to HTML"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M10 20l4-16m4 4l4 4-4 4M6 16l-4-4 4-4"/>',  # noqa: E501
-            "gradient": "from-teal-500 to-teal-600",
-            "description": _("Convert PDF to HTML"),
-        },
-        "pdf_to_markdown": {
-            "name": _("PDF to Markdown"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M4 6h16M4 12h10M4 18h7m8-6l2 2 4-4"/>',  # noqa: E501
-            "gradient": "from-amber-500 to-orange-600",
-            "description": _("Convert PDF to structured Markdown"),
-        },
-        "compare_pdf": {
-            "name": _("Compare Two PDFs"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M10 9H6a2 2 0 00-2 2v7a2 2 0 002 2h4m4-11h4a2 2 0 012 2v7a2 2 0 01-2 2h-4m-4-11v11m0 0l-2-2m2 2l2-2"/>',  # noqa: E501
-            "gradient": "from-amber-500 to-orange-600",
-            "description": _("Visual diff and change report for two PDFs"),
-        },
-    }
 
-    # Try to determine current tool from URL
+def related_tools(request):
+    """Related tools for the current page, from the tool registry's graph."""
     try:
-        resolved = resolve(request.path)
-        view_name = resolved.view_name
-
-        # Extract tool name from view name
-        current_tool = None
-        for tool_key in tools_map.keys():
-            if tool_key in view_name:
-                current_tool = tool_key
-                break
-
-        # Get related tools
-        related_list = []
-        if current_tool and current_tool in tools_map:
-            for tool_key in tools_map[current_tool][:3]:  # Limit to 3 related tools
-                if tool_key in tools_info:
-                    tool = tools_info[tool_key]
-                    try:
-                        url = reverse(f"frontend:{tool_key}_page")
-                        related_list.append(
-                            {
-                                "name": tool["name"],
-                                "url": url,
-                                "icon": tool["icon"],
-                                "gradient": tool["gradient"],
-                                "description": tool["description"],
-                            }
-                        )
-                    except Exception:
-                        continue
-
-        return {"related_tools": related_list}
+        current_tool = _current_tool(_resolve_view_name(request))
+        if not current_tool:
+            return {"related_tools": []}
+        return {"related_tools": tool_registry.related_tools(current_tool)}
     except Exception:
         return {"related_tools": []}
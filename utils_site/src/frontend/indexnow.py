@@ -8,17 +8,67 @@ Supported search engines:
 - Yandex
 - Seznam
 - (Google is testing)
+
+Routine pings go through a Redis-backed queue: ``enqueue_urls()`` adds
+changed URLs to a sorted set (member = URL, score = first-seen time), so a URL
+changed five times before the next flush is submitted once. The
+``maintenance.flush_indexnow_queue`` beat task drains it oldest-first, one
+single-URL GET per URL over a pooled session (Bing flags urlList POSTs for
+routine changes as "IndexNow batch mode"), and removes URLs only once IndexNow
+accepted them; a 429/5xx/network error leaves them queued and backs off
+exponentially (or for Retry-After). Only the explicit sitemap sweep
+(``submit_sitemap_indexnow``) flushes with urlList batches of
+``INDEXNOW_BATCH_SIZE``. Without Redis, URLs are submitted directly as before.
 """
 
 import logging
 import os
 import sys
+import time
+from urllib.parse import urlsplit
 
 import requests
 from django.conf import settings
 
 logger = logging.getLogger(__name__)
 
+INDEXNOW_ENDPOINT_DEFAULT = "https://api.indexnow.org/indexnow"
+
+# Pending URLs: ZSET url -> unix time it was first enqueued.
+_QUEUE_KEY = "indexnow:pending"
+_FLUSH_LOCK = "indexnow:flush:lock"
+_FLUSH_LOCK_TTL = 300
+# Set (with a TTL) while backing off after a 429/5xx; consecutive failures
+# are counted in _FAILURES_KEY to grow the delay.
+_BACKOFF_KEY = "indexnow:backoff"
+_FAILURES_KEY = "indexnow:failures"
+# Hash of the last flush: latency, status, batch size, time.
+_STATS_KEY = "indexnow:stats"
+
+_session: requests.Session | None = None
+
+
+def _http() -> requests.Session:
+    """Process-wide session, so a flush reuses one keep-alive connection."""
+    global _session
+    if _session is None:
+        _session = requests.Session()
+    return _session
+
+
+def _endpoint() -> str:
+    return getattr(settings, "INDEXNOW_ENDPOINT", INDEXNOW_ENDPOINT_DEFAULT)
+
+
+def _redis():
+    """Raw Redis client for the submission queue, or None if unavailable."""
+    try:
+        from django_redis import get_redis_connection
+
+        return get_redis_connection("default")
+    except Exception:
+        return None
+
 
 def _indexnow_disabled() -> bool:
     """True when submissions must be skipped (dev, tests, disabled, no key)."""
@@ -64,7 +114,7 @@ def submit_url_to_indexnow(url: str) -> bool:
 
     try:
         response = requests.get(
-            "https://api.indexnow.org/indexnow",
+            _endpoint(),
             params={"url": url, "key": settings.INDEXNOW_KEY},
             timeout=10,
         )
@@ -87,9 +137,8 @@ def submit_urls_to_indexnow(urls: list[str]) -> bool:
     """
     Submit multiple URLs to IndexNow API in one batch request.
 
-    Batch mode — use only for one-shot backfills (see the
-    submit_sitemap_indexnow management command). Routine per-change pings must
-    go through submit_url_to_indexnow instead.
+    Batch mode, unqueued. Routine per-change pings go through enqueue_urls()
+    and the flush task instead; backfills through submit_sitemap_indexnow.
 
     Args:
         urls: List of full URLs to submit
@@ -118,7 +167,7 @@ def submit_urls_to_indexnow(urls: list[str]) -> bool:
     try:
         # Submit to IndexNow API
         response = requests.post(
-            "https://api.indexnow.org/indexnow",
+            _endpoint(),
             json=payload,
             headers={"Content-Type": "application/json; charset=utf-8"},
             timeout=10,
@@ -146,6 +195,174 @@ def submit_urls_to_indexnow(urls: list[str]) -> bool:
         return False
 
 
+def enqueue_urls(urls, conn=None) -> int:
+    """Queue changed URLs for the next flush. Returns how many were new.
+
+    A URL already pending keeps its original position. Falls back to an
+    immediate single-URL submit per URL when Redis is unavailable.
+    """
+    urls = list(dict.fromkeys(urls))
+    if not urls:
+        return 0
+    conn = conn if conn is not None else _redis()
+    if conn is not None:
+        try:
+            now = time.time()
+            return conn.zadd(_QUEUE_KEY, dict.fromkeys(urls, now), nx=True)
+        except Exception:
+            logger.warning("IndexNow queue unavailable, submitting directly")
+    return sum(submit_url_to_indexnow(url) for url in urls)
+
+
+def _submit_url(url: str) -> requests.Response:
+    """Single-URL GET, the mode Bing asks for on routine changes."""
+    return _http().get(
+        _endpoint(),
+        params={"url": url, "key": settings.INDEXNOW_KEY},
+        timeout=10,
+    )
+
+
+def _submit_batch(urls: list[str]) -> requests.Response:
+    """One urlList POST for ``urls`` (all on the same host). Sweeps only."""
+    return _http().post(
+        _endpoint(),
+        json={
+            "host": urlsplit(urls[0]).netloc,
+            "key": settings.INDEXNOW_KEY,
+            "urlList": urls,
+        },
+        headers={"Content-Type": "application/json; charset=utf-8"},
+        timeout=10,
+    )
+
+
+def _backoff_seconds(failures: int, response=None) -> int:
+    base = getattr(settings, "INDEXNOW_BACKOFF_BASE", 60)
+    cap = getattr(settings, "INDEXNOW_BACKOFF_MAX", 6 * 3600)
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after and retry_after.isdigit():
+        return min(int(retry_after), cap)
+    return min(base * 2 ** (failures - 1), cap)
+
+
+def flush_indexnow_queue(conn=None, max_batches=None, batch=False) -> dict | None:
+    """Submit pending URLs oldest first, ``INDEXNOW_BATCH_SIZE`` per round.
+
+    Each URL is sent as its own single-URL GET. ``batch=True`` sends each
+    round as one urlList POST instead; only the explicit sitemap sweep uses
+    it, since Bing flags routine batches as "IndexNow batch mode".
+
+    URLs leave the queue only once IndexNow answered 200/202 (or rejected
+    them outright with a 4xx, which a retry would not fix). A 429, 5xx or
+    network error stops the flush, keeps the URLs queued and sets a backoff
+    that doubles with each consecutive failure.
+
+    Returns ``{"submitted", "requests", "dropped", "latency_ms", "pending"}``
+    (plus ``"backoff": seconds`` when backing off), or None when Redis is
+    unavailable, IndexNow is disabled, or another flush holds the lock.
+    """
+    conn = conn if conn is not None else _redis()
+    if conn is None or _indexnow_disabled():
+        return None
+    if conn.get(_BACKOFF_KEY) or not conn.set(
+        _FLUSH_LOCK, 1, nx=True, ex=_FLUSH_LOCK_TTL
+    ):
+        return None
+
+    batch_size = getattr(settings, "INDEXNOW_BATCH_SIZE", 200)
+    if max_batches is None:
+        max_batches = getattr(settings, "INDEXNOW_MAX_BATCHES_PER_FLUSH", 10)
+    result = {"submitted": 0, "requests": 0, "dropped": 0, "latency_ms": 0}
+    try:
+        for _ in range(max_batches):
+            pending = [
+                url.decode() if isinstance(url, bytes) else url
+                for url in conn.zrange(_QUEUE_KEY, 0, batch_size - 1)
+            ]
+            if not pending:
+                break
+            if batch:
+                # IndexNow batches are per host.
+                host = urlsplit(pending[0]).netloc
+                rounds = [[url for url in pending if urlsplit(url).netloc == host]]
+            else:
+                rounds = [[url] for url in pending]
+            if not all(_submit(conn, urls, result) for urls in rounds):
+                break
+    finally:
+        conn.delete(_FLUSH_LOCK)
+    result["pending"] = conn.zcard(_QUEUE_KEY)
+    return result
+
+
+def _submit(conn, urls: list[str], result: dict) -> bool:
+    """Send ``urls`` in one request; False when the flush has to back off."""
+    started = time.monotonic()
+    response = None
+    try:
+        response = _submit_url(urls[0]) if len(urls) == 1 else _submit_batch(urls)
+        status = response.status_code
+    except requests.exceptions.RequestException as e:
+        status = 0
+        logger.warning(f"IndexNow request failed: {e}")
+    latency_ms = int((time.monotonic() - started) * 1000)
+    result["latency_ms"] += latency_ms
+    conn.hset(
+        _STATS_KEY,
+        mapping={
+            "last_flush_at": int(time.time()),
+            "last_status": status,
+            "last_batch_size": len(urls),
+            "last_latency_ms": latency_ms,
+        },
+    )
+
+    if status == 429 or status == 0 or status >= 500:
+        failures = conn.incr(_FAILURES_KEY)
+        delay = _backoff_seconds(failures, response)
+        conn.set(_BACKOFF_KEY, status, ex=delay)
+        result["backoff"] = delay
+        logger.warning(
+            f"IndexNow returned {status or 'no response'}; backing off "
+            f"{delay}s with {len(urls)} URL(s) kept queued",
+            extra={"event": "indexnow_backoff", "status": status},
+        )
+        return False
+
+    conn.zrem(_QUEUE_KEY, *urls)
+    conn.delete(_FAILURES_KEY)
+    result["requests"] += 1
+    if status in (200, 202):
+        result["submitted"] += len(urls)
+    else:
+        result["dropped"] += len(urls)
+        logger.error(
+            f"IndexNow rejected {len(urls)} URL(s) with status {status}",
+            extra={"event": "indexnow_rejected", "status": status},
+        )
+    return True
+
+
+def indexnow_queue_stats(conn=None) -> dict | None:
+    """Pending-queue depth, oldest item age and the last flush's latency."""
+    conn = conn if conn is not None else _redis()
+    if conn is None:
+        return None
+    oldest = conn.zrange(_QUEUE_KEY, 0, 0, withscores=True)
+    last = {
+        (k.decode() if isinstance(k, bytes) else k): int(v)
+        for k, v in conn.hgetall(_STATS_KEY).items()
+    }
+    backoff = conn.ttl(_BACKOFF_KEY)
+    return {
+        "pending": conn.zcard(_QUEUE_KEY),
+        "oldest_age_seconds": int(time.time() - oldest[0][1]) if oldest else 0,
+        "backoff_seconds": max(backoff, 0),
+        **last,
+    }
+
+
 def get_indexnow_key_content() -> str:
     """
     Get the content for the IndexNow key file.
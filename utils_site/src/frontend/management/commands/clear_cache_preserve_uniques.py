@@ -6,17 +6,24 @@ frontend.middleware.TrafficCountingMiddleware). Those live only in Redis, so a
 plain clear on every deploy resets the day's uniques to zero (page views, kept
 in Postgres, are unaffected). This command flushes everything on the cache DB
 *except* the `uv:*` keys, so deploys no longer truncate unique visitors.
+
+The `pv:*` page-view buffer (not yet flushed to Postgres by
+maintenance.flush_pageviews) is preserved the same way.
 """
 
 from django.core.management.base import BaseCommand
 
-# uv:* keys are written via a raw Redis connection with no django-redis key
-# prefix, so this bytes-prefix test cleanly separates them from cache entries.
-_UNIQUE_KEY_PREFIX = b"uv:"
+# uv:* and pv:* keys are written via a raw Redis connection with no
+# django-redis key prefix, so this bytes-prefix test cleanly separates them
+# from cache entries.
+_PRESERVED_KEY_PREFIXES = (b"uv:", b"pv:")
 
 
 class Command(BaseCommand):
-    help = "Clear the Django cache but preserve unique-visitor HLLs (uv:*)."
+    help = (
+        "Clear the Django cache but preserve unique-visitor HLLs (uv:*) and "
+        "buffered page views (pv:*)."
+    )
 
     def handle(self, *args, **options):
         try:
@@ -30,7 +37,7 @@ class Command(BaseCommand):
         deleted = 0
         batch = []
         for key in conn.scan_iter(match="*", count=500):
-            if key.startswith(_UNIQUE_KEY_PREFIX):
+            if key.startswith(_PRESERVED_KEY_PREFIXES):
                 continue
             batch.append(key)
             if len(batch) >= 500:
@@ -41,6 +48,6 @@ class Command(BaseCommand):
 
         self.stdout.write(
             self.style.SUCCESS(
-                f"Cleared {deleted} cache key(s), preserved uv:* uniques."
+                f"Cleared {deleted} cache key(s), preserved uv:*/pv:* traffic keys."
             )
         )
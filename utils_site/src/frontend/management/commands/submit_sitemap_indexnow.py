@@ -7,19 +7,24 @@ signal handler going forward, but historical pages need a one-shot push.
 Run on prod (after setting INDEXNOW_ENABLED=True and INDEXNOW_KEY=<32-char-hex>):
     python manage.py submit_sitemap_indexnow
 
-IndexNow's API accepts up to 10,000 URLs per request, but Bing recommends
-batches of ≤200 to avoid rate limits.
+The URLs are added to the IndexNow queue (deduplicated against what is
+already pending), which is then drained right away in urlList batches of
+INDEXNOW_BATCH_SIZE (Bing recommends ≤200), backing off on 429/5xx. This
+explicit sweep is the only batch-mode submitter; the beat flush sends routine
+changes as single-URL GETs. URLs left queued by a backoff go out that way.
+Pass --stats to print the pending depth and the last submit latency.
 """
 
 import re
-import time
 
 import requests
 from django.conf import settings
 from django.core.management.base import BaseCommand, CommandError
-from src.frontend.indexnow import submit_urls_to_indexnow
-
-BATCH_SIZE = 200
+from src.frontend.indexnow import (
+    enqueue_urls,
+    flush_indexnow_queue,
+    indexnow_queue_stats,
+)
 
 
 def fetch_sitemap_urls(base_url: str) -> list[str]:
@@ -45,13 +50,23 @@ def fetch_sitemap_urls(base_url: str) -> list[str]:
 
 
 class Command(BaseCommand):
-    help = "Submit every URL in sitemap.xml to IndexNow."
+    help = "Queue every URL in sitemap.xml for IndexNow."
 
     def add_arguments(self, parser):
         parser.add_argument("--base-url", default=None)
-        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            "--stats", action="store_true", help="Only print the queue stats."
+        )
 
     def handle(self, *args, **opts):
+        if opts["stats"]:
+            stats = indexnow_queue_stats()
+            if stats is None:
+                raise CommandError("IndexNow queue unavailable (no Redis).")
+            for key, value in stats.items():
+                self.stdout.write(f"{key}: {value}")
+            return
+
         if not getattr(settings, "INDEXNOW_ENABLED", False):
             raise CommandError(
                 "INDEXNOW_ENABLED is False. Set INDEXNOW_ENABLED=True and "
@@ -67,29 +82,16 @@ class Command(BaseCommand):
 
         self.stdout.write(f"Fetching sitemap from {base_url} ...")
         urls = fetch_sitemap_urls(base_url)
-        self.stdout.write(
-            f"Submitting {len(urls)} URL(s) in batches of {opts['batch_size']}..."
-        )
-
-        ok_batches = 0
-        fail_batches = 0
-        batch = opts["batch_size"]
-        for i in range(0, len(urls), batch):
-            chunk = urls[i : i + batch]
-            success = submit_urls_to_indexnow(chunk)
-            if success:
-                ok_batches += 1
-                self.stdout.write(
-                    self.style.SUCCESS(f"  ✓ batch {i//batch + 1}: {len(chunk)} URLs")
-                )
-            else:
-                fail_batches += 1
-                self.stdout.write(self.style.ERROR(f"  ✗ batch {i//batch + 1}: failed"))
-            # Be polite — Bing rate-limit recommendation
-            time.sleep(2)
+        queued = enqueue_urls(urls)
+        self.stdout.write(f"Queued {queued} new URL(s) of {len(urls)}.")
 
+        stats = flush_indexnow_queue(max_batches=10**6, batch=True)
+        if stats is None:
+            raise CommandError("IndexNow queue unavailable or already flushing.")
+        style = self.style.WARNING if "backoff" in stats else self.style.SUCCESS
         self.stdout.write(
-            self.style.SUCCESS(
-                f"\nDone: {ok_batches} batch(es) OK, {fail_batches} failed."
+            style(
+                f"Submitted {stats['submitted']} URL(s) in "
+                f"{stats['requests']} request(s); {stats['pending']} pending."
             )
         )
@@ -0,0 +1,43 @@
+"""Render every tool page in every language to fill the shared fragment cache.
+
+Run after the deploy cache clear (ci/deploy.sh), so the first visitor of a
+rarely-visited language variant — logged in or not — doesn't pay for
+rendering the SEO copy, help and related tools:
+    python manage.py warm_tool_pages
+
+Options:
+    --tool KEY       - only this tool (repeatable)
+    --language CODE  - only this language (repeatable)
+    --force          - drop the current fragments first and re-render them
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from src.frontend.tool_configs import TOOL_CONFIGS
+from src.frontend.tool_page_cache import clear_fragments, is_enabled, warm_tool_pages
+
+
+class Command(BaseCommand):
+    help = "Pre-render tool page fragments for every tool x language."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tool", action="append", dest="tools")
+        parser.add_argument("--language", action="append", dest="languages")
+        parser.add_argument("--force", action="store_true")
+
+    def handle(self, *args, **opts):
+        if not is_enabled():
+            self.stdout.write("Tool page fragment cache is disabled.")
+            return
+        unknown = sorted(set(opts["tools"] or ()) - set(TOOL_CONFIGS))
+        if unknown:
+            raise CommandError(f"Unknown tool(s): {', '.join(unknown)}")
+
+        if opts["force"]:
+            clear_fragments(opts["tools"], opts["languages"])
+        result = warm_tool_pages(opts["tools"], opts["languages"])
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Warmed {result['warmed']} tool page(s).")
+        )
+        for item in result["failed"]:
+            self.stdout.write(self.style.ERROR(f"  ✗ {item}"))
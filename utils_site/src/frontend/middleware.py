@@ -322,6 +322,16 @@ _SKIP_PREFIXES = (
 # HyperLogLog keys are kept ~400 days so a full year of history is queryable.
 _UV_TTL_SECONDS = 400 * 86400
 
+# Buffered page views: one Redis hash per day (``pv:<date>``, path -> views),
+# moved into ``PageViewDaily`` by ``maintenance.flush_pageviews``. The TTL only
+# bounds how long counts survive if the flush task stops running entirely.
+_PV_PREFIX = "pv:"
+_PV_TTL_SECONDS = 7 * 86400
+# A batch being flushed is renamed to ``pv:flush:<date>:<batch id>`` and
+# listed here until its counts are committed to Postgres.
+_PV_FLUSHING_SET = "pv:flushing"
+_PV_FLUSH_LOCK = "pv:flush:lock"
+
 
 def _redis():
     """Raw Redis client for HyperLogLog ops, or None if unavailable."""
@@ -351,29 +361,144 @@ def _bump_pageview(date, path):
         PageViewDaily.objects.filter(date=date, path=path).update(views=F("views") + 1)
 
 
-def _bump_unique(date, request, user_agent):
-    """Add this visitor to the day's HyperLogLog of approximate uniques.
+def _visitor_hash(day, request, user_agent):
+    """Member for the day's HyperLogLog of approximate unique visitors.
 
-    The member is a salted BLAKE2 hash of IP + User-Agent. The salt rotates
-    daily (the date is part of the hashed input, keyed by SECRET_KEY) and the
-    raw hash is never stored — only HLL's fixed-size sketch — so no persistent
-    or reversible identifier is retained. Aggregate, cookieless, consent-free.
+    A salted BLAKE2 hash of IP + User-Agent. The salt rotates daily (the date
+    is part of the hashed input, keyed by SECRET_KEY) and the raw hash is never
+    stored — only HLL's fixed-size sketch — so no persistent or reversible
+    identifier is retained. Aggregate, cookieless, consent-free.
     """
-    conn = _redis()
-    if conn is None:
-        return
     from src.api.client_ip import get_client_ip
 
     ip = get_client_ip(request) or "0.0.0.0"
-    day = date.isoformat()
-    member = hashlib.blake2s(
+    return hashlib.blake2s(
         f"{ip}|{user_agent}|{day}".encode(),
         key=settings.SECRET_KEY.encode()[:32],
         digest_size=16,
     ).digest()
-    key = f"uv:{day}"
-    conn.pfadd(key, member)
-    conn.expire(key, _UV_TTL_SECONDS)
+
+
+def _record_view(date, path, request, user_agent):
+    """Count one page view and its visitor.
+
+    With Redis available this is a single pipelined round trip (HINCRBY into
+    the day's buffer hash + PFADD into the day's HLL) and no database write;
+    the buffer reaches Postgres on the next flush. Without Redis (or with
+    ``PAGEVIEW_BUFFER_ENABLED`` off) the view goes straight to
+    ``PageViewDaily`` as before and uniques are not counted.
+    """
+    conn = _redis() if getattr(settings, "PAGEVIEW_BUFFER_ENABLED", True) else None
+    if conn is not None:
+        day = date.isoformat()
+        pv_key = f"{_PV_PREFIX}{day}"
+        uv_key = f"uv:{day}"
+        try:
+            pipe = conn.pipeline(transaction=False)
+            pipe.hincrby(pv_key, path, 1)
+            pipe.expire(pv_key, _PV_TTL_SECONDS)
+            pipe.pfadd(uv_key, _visitor_hash(day, request, user_agent))
+            pipe.expire(uv_key, _UV_TTL_SECONDS)
+            pipe.execute()
+            return
+        except Exception:
+            logger.debug("Page-view buffer unavailable, writing to DB", exc_info=True)
+    _bump_pageview(date, path)
+
+
+def _apply_pageview_batch(batch_id, date, counts):
+    """Add ``counts`` (path -> views) for ``date`` to ``PageViewDaily``.
+
+    One INSERT … ON CONFLICT per batch, committed together with the batch's
+    ``PageViewFlush`` ledger row. Returns False if the batch was already
+    applied by an earlier, interrupted flush.
+    """
+    from django.db import IntegrityError, connection, transaction
+    from src.users.models import PageViewDaily, PageViewFlush
+
+    table = connection.ops.quote_name(PageViewDaily._meta.db_table)
+    sql = (
+        f"INSERT INTO {table} (date, path, views) VALUES (%s, %s, %s) "
+        f"ON CONFLICT (date, path) DO UPDATE SET views = {table}.views + EXCLUDED.views"
+    )
+    try:
+        with transaction.atomic():
+            PageViewFlush.objects.create(batch_id=batch_id)
+            with connection.cursor() as cursor:
+                cursor.executemany(
+                    sql, [(date, path, views) for path, views in counts.items()]
+                )
+    except IntegrityError:
+        if PageViewFlush.objects.filter(batch_id=batch_id).exists():
+            return False
+        raise
+    return True
+
+
+def flush_buffered_pageviews(conn=None, lookback_days=None):
+    """Move buffered page views from Redis into ``PageViewDaily``.
+
+    Crash-safe handoff: each day's hash is atomically RENAMEd to a batch key
+    (new views keep landing in a fresh hash) and the batch key is recorded in
+    ``pv:flushing`` in the same MULTI. Batches are deleted from Redis only
+    after their counts and ledger row are committed, so a crash at any point
+    leaves either an unapplied batch (retried next run) or an applied one that
+    the ledger makes a no-op — never lost or doubled counts.
+
+    Returns ``{"batches": n, "rows": n, "views": n}``, or None when Redis is
+    unavailable or another flush holds the lock.
+    """
+    import datetime
+    import uuid
+
+    from django.utils import timezone
+
+    conn = conn if conn is not None else _redis()
+    if conn is None:
+        return None
+    if lookback_days is None:
+        lookback_days = _PV_TTL_SECONDS // 86400
+    if not conn.set(_PV_FLUSH_LOCK, "1", nx=True, ex=300):
+        return None
+
+    stats = {"batches": 0, "rows": 0, "views": 0}
+    try:
+        today = timezone.now().date()
+        days = [
+            (today - datetime.timedelta(days=offset)).isoformat()
+            for offset in range(lookback_days + 1)
+        ]
+        pipe = conn.pipeline(transaction=False)
+        for day in days:
+            pipe.exists(f"{_PV_PREFIX}{day}")
+        for day, present in zip(days, pipe.execute(), strict=True):
+            if not present:
+                continue
+            batch_key = f"{_PV_PREFIX}flush:{day}:{uuid.uuid4().hex}"
+            pipe = conn.pipeline(transaction=True)
+            pipe.rename(f"{_PV_PREFIX}{day}", batch_key)
+            pipe.sadd(_PV_FLUSHING_SET, batch_key)
+            pipe.execute()
+
+        for raw_key in conn.smembers(_PV_FLUSHING_SET):
+            batch_key = raw_key.decode() if isinstance(raw_key, bytes) else raw_key
+            _prefix, _flush, day, batch_id = batch_key.split(":", 3)
+            date = datetime.date.fromisoformat(day)
+            counts = {
+                (path.decode() if isinstance(path, bytes) else path): int(views)
+                for path, views in conn.hgetall(batch_key).items()
+            }
+            if counts and _apply_pageview_batch(batch_id, date, counts):
+                stats["batches"] += 1
+                stats["rows"] += len(counts)
+                stats["views"] += sum(counts.values())
+            pipe = conn.pipeline(transaction=True)
+            pipe.delete(batch_key)
+            pipe.srem(_PV_FLUSHING_SET, raw_key)
+            pipe.execute()
+    finally:
+        conn.delete(_PV_FLUSH_LOCK)
+    return stats
 
 
 class TrafficCountingMiddleware:
@@ -384,12 +509,19 @@ class TrafficCountingMiddleware:
     visit count that sits next to GA4 (which only sees users who accept the
     cookie banner) and Search Console. Counting never raises into the response.
 
+    Views are buffered in Redis and flushed to the table by
+    ``maintenance.flush_pageviews`` every ``PAGEVIEW_FLUSH_INTERVAL`` seconds,
+    so the request path never takes a row lock on hot pages like ``/``. The
+    current day's rows lag by up to one interval.
+
     Known systematic UNDERCOUNTS (the numbers are a floor, not the full total):
       * Cloudflare full-page cache: requests served from the CF edge (e.g. the
         /blog/ cache rule) never reach Django and so are never counted.
-      * HTTP 304 Not Modified: only 200 responses count, so repeat visitors
-        whose browser cache is still valid are missed.
-      * Redis down: page views still count, but uniques silently read 0.
+      * HTTP 304 Not Modified: only 200s and the 304s that
+        ``anonymous_cache_page`` answers for its cached pages (flagged
+        ``response.page_view``) count; other revalidations are missed.
+      * Redis down: page views still count (written directly to the table),
+        but uniques silently read 0.
     Each localized path (/, /ru/, /en/… ) is its own row by design — there is
     no cross-locale aggregation.
     """
@@ -406,9 +538,15 @@ class TrafficCountingMiddleware:
         return response
 
     def _count(self, request, response):
-        if request.method != "GET" or response.status_code != 200:
+        if request.method != "GET":
             return
-        if "text/html" not in response.get("Content-Type", ""):
+        if response.status_code == 304:
+            # A 304 has no Content-Type; count revalidated cached pages.
+            if not getattr(response, "page_view", False):
+                return
+        elif response.status_code != 200 or "text/html" not in response.get(
+            "Content-Type", ""
+        ):
             return
         path = request.path
         if path.startswith(_SKIP_PREFIXES):
@@ -419,9 +557,7 @@ class TrafficCountingMiddleware:
 
         from django.utils import timezone
 
-        today = timezone.now().date()
-        _bump_pageview(today, path[:255])
-        _bump_unique(today, request, user_agent)
+        _record_view(timezone.now().date(), path[:255], request, user_agent)
 
 
 class AnonymousCsrfCookieStripMiddleware:
@@ -0,0 +1,401 @@
+"""Sitemaps as prebuilt, gzip-precompressed static artifacts.
+
+Crawlers hit /sitemap.xml and /sitemap-<lang>.xml constantly. Building them
+walked every page x language x article in Python on each cache miss, so the
+XML is now produced by ``build_sitemaps()`` (Celery beat, blog publishing,
+or the first request after a cache clear) and written to ``SITEMAP_DIR``:
+
+- one sitemap per language, split into chunks of at most
+  ``SITEMAP_MAX_URLS`` URLs / ``SITEMAP_MAX_BYTES`` bytes. The first chunk
+  keeps the historical name ``sitemap-<lang>.xml``, later ones are
+  ``sitemap-<lang>-<n>.xml``; the index lists them all.
+- every artifact stored as ``<name>.<etag>.xml`` plus a ``.gz`` twin, so
+  files are immutable and a rebuild never changes a file a reader has open.
+- ``manifest.json`` maps public names to the current file, ETag and
+  Last-Modified. It is also kept in the cache for the serving view.
+
+Rebuilds are incremental. A cheap signature of the inputs (base URL, page
+list, static lastmod, languages, release, article count/max updated_at)
+skips the whole build when nothing changed. Otherwise each chunk is
+regenerated and only chunks whose bytes differ get a new file and a new
+Last-Modified, so conditional GETs for untouched languages keep hitting 304.
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import Http404, HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+logger = logging.getLogger(__name__)
+
+INDEX_NAME = "sitemap.xml"
+MANIFEST_CACHE_KEY = "sitemap_manifest_v1"
+_BUILD_LOCK_KEY = "sitemap_build_lock"
+_BUILD_LOCK_TTL = 300
+# Superseded files stay around this long for requests already holding an
+# older manifest (other workers' caches, parallel builders).
+_STALE_FILE_GRACE_SECONDS = 86400
+
+_URLSET_OPEN = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+    ' xmlns:xhtml="http://www.w3.org/1999/xhtml"'
+    ' xmlns:image="http://www.google.com/schemas/sitemap-image/1.1">\n'
+)
+_URLSET_CLOSE = "</urlset>"
+
+
+def sitemap_dir() -> Path:
+    return Path(settings.SITEMAP_DIR)
+
+
+def sitemap_base_url() -> str:
+    """Base URL for builds outside a request (Celery, management commands)."""
+    from decouple import config
+
+    site_domain = config("SITE_DOMAIN", default=None)
+    if site_domain:
+        scheme = "http" if settings.DEBUG else "https"
+        return f"{scheme}://{site_domain}"
+    return settings.SITE_URL.rstrip("/")
+
+
+def _language_codes() -> list[str]:
+    return [code for code, _name in getattr(settings, "LANGUAGES", [("en", "")])]
+
+
+def _alternates(base_url: str, path: str, langs) -> str:
+    """xhtml:link alternates for ``path`` (after the language prefix)."""
+    lines = [
+        f'    <xhtml:link rel="alternate" hreflang="{code}" '
+        f'href="{base_url}/{code}/{path}"/>\n'
+        for code in langs
+    ]
+    lines.append(
+        f'    <xhtml:link rel="alternate" hreflang="x-default" '
+        f'href="{base_url}/{settings.LANGUAGE_CODE}/{path}"/>\n'
+    )
+    return "".join(lines)
+
+
+def _page_entries(lang, base_url, pages, static_lastmod, languages):
+    from .views import _sitemap_page_image
+
+    for page in pages:
+        page_url = page["url"]
+        xml = "  <url>\n"
+        xml += f"    <loc>{base_url}/{lang}/{page_url}</loc>\n"
+        xml += f"    <lastmod>{static_lastmod}</lastmod>\n"
+        xml += f'    <changefreq>{page["changefreq"]}</changefreq>\n'
+        xml += f'    <priority>{page["priority"]}</priority>\n'
+        image_loc = _sitemap_page_image(page_url, base_url)
+        if image_loc:
+            xml += (
+                f"    <image:image><image:loc>{image_loc}</image:loc></image:image>\n"
+            )
+        xml += _alternates(base_url, page_url, languages)
+        xml += "  </url>\n"
+        yield xml, static_lastmod
+
+
+def _article_entries(lang, base_url, articles, languages):
+    default_language = settings.LANGUAGE_CODE
+    for article in articles:
+        # Languages this article actually exists in: the English base always
+        # counts; others only if present in the translations JSON. Emitting
+        # hreflang/sitemap entries for untranslated languages made Google see
+        # English content under a /xx/ URL as duplicate-without-canonical.
+        available_langs = {default_language} | set(article["translations"])
+        if lang not in available_langs:
+            continue
+
+        # The blog detail URL is /<lang>/blog/<slug>/ — the slug and the
+        # "blog/" prefix are locale-independent, only the prefix differs.
+        path = f"blog/{article['slug']}/"
+        xml = "  <url>\n"
+        xml += f"    <loc>{base_url}/{lang}/{path}</loc>\n"
+        xml += f"    <lastmod>{article['lastmod']}</lastmod>\n"
+        xml += "    <changefreq>monthly</changefreq>\n"
+        xml += "    <priority>0.7</priority>\n"
+        cover = article["cover"]
+        if cover and cover.startswith("/"):
+            xml += (
+                f"    <image:image><image:loc>{base_url}{cover}</image:loc>"
+                "</image:image>\n"
+            )
+        xml += _alternates(
+            base_url, path, [c for c in languages if c in available_langs]
+        )
+        xml += "  </url>\n"
+        yield xml, article["lastmod"]
+
+
+def _blog_page_entries(lang, base_url, total_published, static_lastmod, languages):
+    # Blog pagination pages: /<lang>/blog/?page=2..N. Each page is
+    # self-canonical and indexable; without sitemap entries Ahrefs flags them
+    # as "Indexable page not in sitemap". Page size mirrors
+    # Paginator(articles, 9) in src/blog/views.py:article_list.
+    blog_page_size = 9
+    total_pages = (total_published + blog_page_size - 1) // blog_page_size
+    for page_num in range(2, total_pages + 1):
+        path = f"blog/?page={page_num}"
+        xml = "  <url>\n"
+        xml += f"    <loc>{base_url}/{lang}/{path}</loc>\n"
+        xml += f"    <lastmod>{static_lastmod}</lastmod>\n"
+        xml += "    <changefreq>weekly</changefreq>\n"
+        xml += "    <priority>0.6</priority>\n"
+        xml += _alternates(base_url, path, languages)
+        xml += "  </url>\n"
+        yield xml, static_lastmod
+
+
+def _published_articles() -> list[dict]:
+    from src.blog.models import Article
+
+    today = time.strftime("%Y-%m-%d", time.gmtime())
+    articles = []
+    for article in (
+        Article.objects.filter(status="published")
+        .only("slug", "updated_at", "translations", "cover_image", "featured_image")
+        .order_by("-published_at")
+    ):
+        articles.append(
+            {
+                "slug": article.slug,
+                "lastmod": (
+                    article.updated_at.strftime("%Y-%m-%d")
+                    if article.updated_at
+                    else today
+                ),
+                "translations": sorted(article.translations or {}),
+                "cover": article.cover_image_url,
+            }
+        )
+    return articles
+
+
+def _chunks(entries):
+    """Split (xml, lastmod) entries into size-bounded lists."""
+    max_urls, max_bytes = settings.SITEMAP_MAX_URLS, settings.SITEMAP_MAX_BYTES
+    chunk, size = [], len(_URLSET_OPEN) + len(_URLSET_CLOSE)
+    for xml, lastmod in entries:
+        entry_size = len(xml.encode())
+        if chunk and (len(chunk) >= max_urls or size + entry_size > max_bytes):
+            yield chunk
+            chunk, size = [], len(_URLSET_OPEN) + len(_URLSET_CLOSE)
+        chunk.append((xml, lastmod))
+        size += entry_size
+    if chunk:
+        yield chunk
+
+
+def _chunk_name(lang: str, number: int) -> str:
+    return f"sitemap-{lang}.xml" if number == 1 else f"sitemap-{lang}-{number}.xml"
+
+
+def _inputs_signature(base_url: str) -> str:
+    from django.db.models import Count, Max, Q
+    from src.blog.models import Article
+
+    from .views import _get_sitemap_pages, _sitemap_static_lastmod
+
+    articles = Article.objects.aggregate(
+        total=Count("id"),
+        published=Count("id", filter=Q(status="published")),
+        updated=Max("updated_at"),
+    )
+    payload = json.dumps(
+        {
+            "base_url": base_url,
+            "static_lastmod": _sitemap_static_lastmod(),
+            "languages": _language_codes(),
+            "default_language": settings.LANGUAGE_CODE,
+            "pages": _get_sitemap_pages(),
+            "articles": articles,
+            # Code/static changes (screenshots, views) ship as a new release.
+            "release": settings.CACHES["default"].get("KEY_PREFIX", ""),
+            "limits": [settings.SITEMAP_MAX_URLS, settings.SITEMAP_MAX_BYTES],
+        },
+        default=str,
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _read_manifest() -> dict | None:
+    try:
+        with open(sitemap_dir() / "manifest.json", encoding="utf-8") as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as fh:
+        fh.write(data)
+    os.replace(tmp, path)
+
+
+def _files_present(manifest: dict) -> bool:
+    return all(
+        (sitemap_dir() / entry["file"]).is_file()
+        and (sitemap_dir() / f"{entry['file']}.gz").is_file()
+        for entry in manifest["files"].values()
+    )
+
+
+def _store(name: str, body: str, lastmod: str | None, previous: dict) -> dict:
+    """Write ``body`` unless the previous manifest already has these bytes."""
+    data = body.encode()
+    etag = hashlib.sha256(data).hexdigest()[:32]
+    old = previous.get(name)
+    if old and old["etag"] == etag and (sitemap_dir() / old["file"]).is_file():
+        return old
+    file_name = f"{name[:-4]}.{etag}.xml"
+    _atomic_write(sitemap_dir() / file_name, data)
+    _atomic_write(sitemap_dir() / f"{file_name}.gz", gzip.compress(data, mtime=0))
+    return {
+        "file": file_name,
+        "etag": etag,
+        "last_modified": int(time.time()),
+        "lastmod": lastmod,
+    }
+
+
+def _prune(manifest: dict) -> None:
+    keep = set()
+    for entry in manifest["files"].values():
+        keep.update((entry["file"], f"{entry['file']}.gz"))
+    cutoff = time.time() - _STALE_FILE_GRACE_SECONDS
+    for path in sitemap_dir().glob("sitemap*.xml*"):
+        try:
+            if path.name not in keep and path.stat().st_mtime < cutoff:
+                path.unlink()
+        except OSError:
+            pass
+
+
+def build_sitemaps(base_url: str | None = None, force: bool = False) -> dict:
+    """Bring the sitemap artifacts up to date and return the manifest."""
+    from .views import _get_sitemap_pages, _sitemap_static_lastmod
+
+    base_url = base_url or sitemap_base_url()
+    sitemap_dir().mkdir(parents=True, exist_ok=True)
+    signature = _inputs_signature(base_url)
+    previous = _read_manifest()
+    if (
+        not force
+        and previous
+        and previous.get("signature") == signature
+        and _files_present(previous)
+    ):
+        cache.set(MANIFEST_CACHE_KEY, previous, None)
+        return previous
+
+    previous_files = (previous or {}).get("files", {})
+    languages = _language_codes()
+    pages = _get_sitemap_pages()
+    static_lastmod = _sitemap_static_lastmod()
+    articles = _published_articles()
+
+    files = {}
+    for lang in languages:
+        entries = [
+            *_page_entries(lang, base_url, pages, static_lastmod, languages),
+            *_article_entries(lang, base_url, articles, languages),
+            *_blog_page_entries(
+                lang, base_url, len(articles), static_lastmod, languages
+            ),
+        ]
+        for number, chunk in enumerate(_chunks(entries), start=1):
+            name = _chunk_name(lang, number)
+            body = _URLSET_OPEN + "".join(xml for xml, _ in chunk) + _URLSET_CLOSE
+            lastmod = max(lastmod for _, lastmod in chunk)
+            files[name] = _store(name, body, lastmod, previous_files)
+
+    index = '<?xml version="1.0" encoding="UTF-8"?>\n'
+    index += '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+    for name, entry in files.items():
+        index += "  <sitemap>\n"
+        index += f"    <loc>{base_url}/{name}</loc>\n"
+        index += f"    <lastmod>{entry['lastmod']}</lastmod>\n"
+        index += "  </sitemap>\n"
+    index += "</sitemapindex>"
+    files[INDEX_NAME] = _store(INDEX_NAME, index, None, previous_files)
+
+    rebuilt = sorted(
+        name
+        for name, entry in files.items()
+        if previous_files.get(name, {}).get("etag") != entry["etag"]
+    )
+    manifest = {"signature": signature, "base_url": base_url, "files": files}
+    _atomic_write(
+        sitemap_dir() / "manifest.json", json.dumps(manifest, indent=1).encode()
+    )
+    cache.set(MANIFEST_CACHE_KEY, manifest, None)
+    _prune(manifest)
+    if rebuilt:
+        logger.info(
+            f"Sitemaps rebuilt: {', '.join(rebuilt)}",
+            extra={"event": "sitemaps_rebuilt", "files": rebuilt},
+        )
+    return manifest
+
+
+def _manifest_for_request(base_url: str) -> dict:
+    manifest = cache.get(MANIFEST_CACHE_KEY)
+    if manifest is not None:
+        return manifest
+    # Cache cleared (deploy) or first boot: bring the artifacts up to date
+    # unless another worker is already doing it and a manifest exists.
+    locked = cache.add(_BUILD_LOCK_KEY, 1, _BUILD_LOCK_TTL)
+    if not locked:
+        manifest = _read_manifest()
+        if manifest is not None and _files_present(manifest):
+            return manifest
+    try:
+        return build_sitemaps(base_url)
+    finally:
+        if locked:
+            cache.delete(_BUILD_LOCK_KEY)
+
+
+def serve_sitemap(request, name: str, base_url: str) -> HttpResponse:
+    """Serve a prebuilt sitemap with ETag/Last-Modified and gzip if accepted."""
+    manifest = _manifest_for_request(base_url)
+    entry = manifest["files"].get(name)
+    if entry is None:
+        raise Http404("Unknown sitemap")
+
+    use_gzip = "gzip" in request.META.get("HTTP_ACCEPT_ENCODING", "")
+    etag = f'"{entry["etag"]}{"-gz" if use_gzip else ""}"'
+    response = get_conditional_response(
+        request, etag=etag, last_modified=entry["last_modified"]
+    )
+    if response is None:
+        path = sitemap_dir() / (entry["file"] + (".gz" if use_gzip else ""))
+        try:
+            data = path.read_bytes()
+        except OSError:
+            # Pruned or never written on this host: rebuild and retry once.
+            entry = build_sitemaps(base_url, force=True)["files"][name]
+            path = sitemap_dir() / (entry["file"] + (".gz" if use_gzip else ""))
+            data = path.read_bytes()
+        response = HttpResponse(data, content_type="application/xml; charset=utf-8")
+        if use_gzip:
+            response["Content-Encoding"] = "gzip"
+    response["ETag"] = etag
+    response["Last-Modified"] = http_date(entry["last_modified"])
+    response["Cache-Control"] = "public, max-age=3600"
+    patch_vary_headers(response, ("Accept-Encoding",))
+    return response
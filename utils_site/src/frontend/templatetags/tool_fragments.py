@@ -0,0 +1,57 @@
+"""``{% tool_fragment %}``: cache a static part of a tool page.
+
+Usage::
+
+    {% load tool_fragments %}
+    {% tool_fragment "help" %}...{% endtool_fragment %}
+
+The markup is cached under the page's ``tool_fragment_key`` (set by
+``_render_tool_page``; see src/frontend/tool_page_cache.py). Without a key —
+any other page extending the generic templates — the block renders as is.
+Only wrap markup that depends on nothing but the tool and the language.
+"""
+
+from django import template
+from django.core.cache import cache
+from django.utils.safestring import mark_safe
+from src.frontend.tool_page_cache import (
+    FRAGMENT_NAMES,
+    FRAGMENT_TIMEOUT,
+    fragment_cache_key,
+)
+
+register = template.Library()
+
+
+class ToolFragmentNode(template.Node):
+    def __init__(self, name, nodelist):
+        self.name = name
+        self.nodelist = nodelist
+
+    def render(self, context):
+        key = context.get("tool_fragment_key")
+        if not key:
+            return self.nodelist.render(context)
+        cache_key = fragment_cache_key(key, self.name)
+        html = cache.get(cache_key)
+        if html is None:
+            html = self.nodelist.render(context)
+            cache.set(cache_key, str(html), FRAGMENT_TIMEOUT)
+        return mark_safe(html)
+
+
+@register.tag
+def tool_fragment(parser, token):
+    bits = token.split_contents()
+    if len(bits) != 2 or bits[1][0] not in "\"'" or bits[1][-1] != bits[1][0]:
+        raise template.TemplateSyntaxError(
+            f'{bits[0]} takes one quoted fragment name, e.g. {bits[0]} "help"'
+        )
+    name = bits[1][1:-1]
+    if name not in FRAGMENT_NAMES:
+        raise template.TemplateSyntaxError(
+            f"Unknown tool fragment {name!r}; add it to FRAGMENT_NAMES"
+        )
+    nodelist = parser.parse(("endtool_fragment",))
+    parser.delete_first_token()
+    return ToolFragmentNode(name, nodelist)
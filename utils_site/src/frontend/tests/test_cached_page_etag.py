@@ -0,0 +1,82 @@
+"""ETag / 304 for anonymous_cache_page and the late-filled CSP nonce."""
+
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import translation
+from src.api.middleware import CSP_NONCE_PLACEHOLDER
+from src.frontend import views
+from src.users.models import PageViewDaily
+
+BROWSER_UA = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/125.0 Safari/537.36"
+)
+
+
+class CachedPageETagTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        with translation.override("en"):
+            self.url = reverse("frontend:pdf_to_word_page")
+
+    def _get(self, **headers):
+        return self.client.get(self.url, HTTP_USER_AGENT=BROWSER_UA, **headers)
+
+    def test_etag_is_stable_while_nonce_is_per_request(self):
+        first, second = self._get(), self._get()
+
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(first["ETag"].startswith('"'))
+        self.assertEqual(first["ETag"], second["ETag"])
+
+        nonce = first.wsgi_request.csp_nonce
+        self.assertIn(f'nonce="{nonce}"', first.content.decode())
+        self.assertIn(
+            f'nonce="{second.wsgi_request.csp_nonce}"', second.content.decode()
+        )
+        self.assertNotIn(CSP_NONCE_PLACEHOLDER, second.content.decode())
+
+    def test_if_none_match_skips_render_and_counts_the_view(self):
+        etag = self._get()["ETag"]
+
+        with mock.patch.object(views, "_render_tool_page") as render:
+            resp = self._get(HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(resp["ETag"], etag)
+        self.assertIn("Cookie", resp["Vary"])
+        self.assertEqual(resp.content, b"")
+        render.assert_not_called()
+        self.assertEqual(PageViewDaily.objects.get(path=self.url).views, 2)
+
+    def test_stale_etag_gets_full_page(self):
+        self._get()
+        resp = self._get(HTTP_IF_NONE_MATCH='"stale"')
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.content)
+
+    def test_evicted_body_is_not_vouched_for(self):
+        first = self._get()
+        key = views._page_cache_key(first.wsgi_request)
+        cache.delete(key)
+
+        resp = self._get(HTTP_IF_NONE_MATCH=first["ETag"])
+
+        # Re-rendered (the CSRF token makes every render's bytes unique).
+        self.assertEqual(resp.status_code, 200)
+        self.assertIsNotNone(cache.get(key))
+        self.assertEqual(cache.get(f"{key}.etag"), resp["ETag"])
+
+    def test_authenticated_pages_are_not_etagged(self):
+        user = get_user_model().objects.create_user(email="e@t.test", password="p")
+        self.client.force_login(user)
+
+        resp = self._get()
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotIn("ETag", resp)
+        self.assertIn(f'nonce="{resp.wsgi_request.csp_nonce}"', resp.content.decode())
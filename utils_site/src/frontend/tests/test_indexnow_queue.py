@@ -0,0 +1,206 @@
+"""IndexNow submission queue: dedup, single-URL flush and backoff against a stub."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from urllib.parse import parse_qs, urlsplit
+
+from django.test import SimpleTestCase, override_settings
+from src.frontend import indexnow
+from src.frontend.indexnow import (
+    enqueue_urls,
+    flush_indexnow_queue,
+    indexnow_queue_stats,
+)
+
+
+class _FakeRedis:
+    """The handful of Redis commands the IndexNow queue uses."""
+
+    def __init__(self):
+        self.zsets, self.hashes, self.strings, self.expiry = {}, {}, {}, {}
+
+    def zadd(self, key, mapping, nx=False):
+        zset = self.zsets.setdefault(key, {})
+        added = 0
+        for member, score in mapping.items():
+            if nx and member in zset:
+                continue
+            added += member not in zset
+            zset[member] = score
+        return added
+
+    def zrange(self, key, start, end, withscores=False):
+        items = sorted(self.zsets.get(key, {}).items(), key=lambda kv: kv[1])
+        items = items[start : None if end == -1 else end + 1]
+        return items if withscores else [member for member, _ in items]
+
+    def zrem(self, key, *members):
+        for member in members:
+            self.zsets.get(key, {}).pop(member, None)
+
+    def zcard(self, key):
+        return len(self.zsets.get(key, {}))
+
+    def get(self, key):
+        return self.strings.get(key)
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.strings:
+            return False
+        self.strings[key] = value
+        if ex:
+            self.expiry[key] = ex
+        return True
+
+    def incr(self, key):
+        self.strings[key] = int(self.strings.get(key, 0)) + 1
+        return self.strings[key]
+
+    def delete(self, *keys):
+        for key in keys:
+            self.strings.pop(key, None)
+            self.expiry.pop(key, None)
+
+    def ttl(self, key):
+        return self.expiry.get(key, -2)
+
+    def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update(mapping)
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+
+class _StubIndexNow(BaseHTTPRequestHandler):
+    """Records requests; answers with the next queued status (default 200)."""
+
+    def do_GET(self):
+        self._answer([parse_qs(urlsplit(self.path).query)["url"][0]])
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self._answer(json.loads(body)["urlList"])
+
+    def _answer(self, urls):
+        server = self.server
+        server.received.append((self.command, urls))
+        status, headers = server.statuses.pop(0) if server.statuses else (200, {})
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@override_settings(
+    INDEXNOW_ENABLED=True,
+    INDEXNOW_KEY="0" * 32,
+    INDEXNOW_BATCH_SIZE=3,
+    INDEXNOW_BACKOFF_BASE=60,
+)
+class IndexNowQueueTests(SimpleTestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _StubIndexNow)
+        self.server.received, self.server.statuses = [], []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        endpoint = f"http://127.0.0.1:{self.server.server_port}/indexnow"
+        override = override_settings(INDEXNOW_ENDPOINT=endpoint)
+        override.enable()
+        self.addCleanup(override.disable)
+        # _indexnow_disabled() skips test runs.
+        patcher = mock.patch.object(indexnow, "_indexnow_disabled", return_value=False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.redis = _FakeRedis()
+
+    def _urls(self, n):
+        return [f"https://convertica.net/en/blog/post-{i}/" for i in range(n)]
+
+    def test_enqueue_deduplicates(self):
+        urls = self._urls(2)
+        self.assertEqual(enqueue_urls(urls + urls[:1], conn=self.redis), 2)
+        self.assertEqual(enqueue_urls(urls, conn=self.redis), 0)
+        self.assertEqual(indexnow_queue_stats(conn=self.redis)["pending"], 2)
+
+    def test_flush_sends_single_url_gets_and_records_latency(self):
+        # e.g. one article saved in four locales: routine changes must never
+        # go out as a urlList POST (Bing's "IndexNow batch mode" warning).
+        enqueue_urls(self._urls(4), conn=self.redis)
+
+        result = flush_indexnow_queue(conn=self.redis)
+
+        self.assertEqual(result["submitted"], 4)
+        self.assertEqual(result["pending"], 0)
+        self.assertEqual(
+            [(method, len(urls)) for method, urls in self.server.received],
+            [("GET", 1)] * 4,
+        )
+        stats = indexnow_queue_stats(conn=self.redis)
+        self.assertEqual(stats["last_status"], 200)
+        self.assertIn("last_latency_ms", stats)
+
+    def test_sweep_flush_sends_url_list_batches(self):
+        enqueue_urls(self._urls(4), conn=self.redis)
+
+        result = flush_indexnow_queue(conn=self.redis, batch=True)
+
+        self.assertEqual((result["submitted"], result["requests"]), (4, 2))
+        self.assertEqual(
+            [(method, len(urls)) for method, urls in self.server.received],
+            [("POST", 3), ("GET", 1)],
+        )
+
+    def test_rate_limit_keeps_urls_and_backs_off(self):
+        enqueue_urls(self._urls(2), conn=self.redis)
+        self.server.statuses = [(429, {}), (503, {"Retry-After": "7"})]
+
+        result = flush_indexnow_queue(conn=self.redis)
+        self.assertEqual(result["backoff"], 60)
+        self.assertEqual(result["pending"], 2)
+        # Still backing off: nothing is sent.
+        self.assertIsNone(flush_indexnow_queue(conn=self.redis))
+        self.assertEqual(len(self.server.received), 1)
+
+        self.redis.delete(indexnow._BACKOFF_KEY)
+        self.assertEqual(flush_indexnow_queue(conn=self.redis)["backoff"], 7)
+
+        self.redis.delete(indexnow._BACKOFF_KEY)
+        result = flush_indexnow_queue(conn=self.redis)
+        self.assertEqual(result["submitted"], 2)
+        self.assertIsNone(self.redis.get(indexnow._FAILURES_KEY))
+
+    def test_rejected_batch_is_dropped(self):
+        enqueue_urls(self._urls(1), conn=self.redis)
+        self.server.statuses = [(422, {})]
+
+        result = flush_indexnow_queue(conn=self.redis)
+
+        self.assertEqual((result["dropped"], result["pending"]), (1, 0))
+
+    def test_oldest_urls_go_first(self):
+        self.redis.zadd(indexnow._QUEUE_KEY, {"https://convertica.net/new/": 2.0})
+        self.redis.zadd(indexnow._QUEUE_KEY, {"https://convertica.net/old/": 1.0})
+        age = indexnow_queue_stats(conn=self.redis)["oldest_age_seconds"]
+        self.assertAlmostEqual(age, time.time() - 1, delta=5)
+
+        with self.settings(INDEXNOW_BATCH_SIZE=1):
+            flush_indexnow_queue(conn=self.redis, max_batches=1)
+
+        self.assertEqual(
+            self.server.received, [("GET", ["https://convertica.net/old/"])]
+        )
+        self.assertEqual(indexnow_queue_stats(conn=self.redis)["pending"], 1)
+
+    def test_without_redis_submits_directly(self):
+        with mock.patch.object(indexnow, "_redis", return_value=None):
+            self.assertEqual(enqueue_urls(self._urls(1)), 1)
+        self.assertEqual(self.server.received[0][0], "GET")
@@ -0,0 +1,89 @@
+"""Prebuilt sitemap artifacts: chunking, incremental rebuilds, conditional GET."""
+
+import gzip
+import tempfile
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from src.blog.models import Article
+from src.frontend import sitemaps
+from src.frontend.sitemaps import INDEX_NAME, build_sitemaps
+
+BASE_URL = "https://convertica.net"
+
+
+class SitemapArtifactTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        override = override_settings(SITEMAP_DIR=tmp.name)
+        override.enable()
+        self.addCleanup(override.disable)
+        cache.clear()
+
+    def _publish(self, slug):
+        return Article.objects.create(
+            title_en=slug, slug=slug, content_en="Body", status="published"
+        )
+
+    def test_large_language_sitemap_is_split_into_chunks(self):
+        with override_settings(SITEMAP_MAX_URLS=20):
+            files = build_sitemaps(BASE_URL)["files"]
+
+        self.assertIn("sitemap-en.xml", files)
+        self.assertIn("sitemap-en-2.xml", files)
+        index = (sitemaps.sitemap_dir() / files[INDEX_NAME]["file"]).read_text()
+        self.assertIn(f"<loc>{BASE_URL}/sitemap-en-2.xml</loc>", index)
+
+        resp = self.client.get("/sitemap-en-2.xml")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.content.decode().count("<url>"), 20)
+        self.assertEqual(self.client.get("/sitemap-en-999.xml").status_code, 404)
+
+    def test_unchanged_inputs_skip_the_build(self):
+        build_sitemaps(BASE_URL)
+        with mock.patch.object(sitemaps, "_store") as store:
+            build_sitemaps(BASE_URL)
+        store.assert_not_called()
+
+    def test_only_changed_sections_are_rewritten(self):
+        before = build_sitemaps(BASE_URL)["files"]
+        article = self._publish("new-post")
+        article.translations = {"ru": {"title": "Пост", "content": "Тело"}}
+        article.save()
+        after = build_sitemaps(BASE_URL)["files"]
+
+        changed = {name for name in after if after[name] != before.get(name)}
+        self.assertEqual(changed, {"sitemap-en.xml", "sitemap-ru.xml", INDEX_NAME})
+        body = (sitemaps.sitemap_dir() / after["sitemap-ru.xml"]["file"]).read_text()
+        self.assertIn(f"{BASE_URL}/ru/blog/new-post/", body)
+
+    def test_conditional_get_and_gzip_variant(self):
+        resp = self.client.get("/sitemap-en.xml")
+        etag = resp["ETag"]
+        self.assertEqual(resp["Content-Type"], "application/xml; charset=utf-8")
+        self.assertIn("Accept-Encoding", resp["Vary"])
+
+        resp = self.client.get("/sitemap-en.xml", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 304)
+        resp = self.client.get(
+            "/sitemap-en.xml", HTTP_IF_MODIFIED_SINCE=resp["Last-Modified"]
+        )
+        self.assertEqual(resp.status_code, 304)
+
+        resp = self.client.get("/sitemap.xml", HTTP_ACCEPT_ENCODING="gzip, br")
+        self.assertEqual(resp["Content-Encoding"], "gzip")
+        self.assertTrue(resp["ETag"].endswith('-gz"'))
+        self.assertIn(b"<sitemapindex", gzip.decompress(resp.content))
+
+    def test_publish_task_rebuilds_sitemaps(self):
+        from src.tasks import maintenance
+
+        build_sitemaps(BASE_URL)
+        with (
+            mock.patch("django.core.management.call_command"),
+            mock.patch.object(maintenance.build_sitemaps, "delay") as delay,
+        ):
+            self.assertEqual(maintenance.publish_scheduled_articles(), {"ok": True})
+        delay.assert_called_once_with()
@@ -0,0 +1,82 @@
+"""Shared tool page fragments (tool_page_cache + {% tool_fragment %})."""
+
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import translation
+from src.frontend import tool_page_cache
+from src.frontend.tool_configs import TOOL_CONFIGS
+from src.frontend.tool_page_cache import (
+    fragment_cache_key,
+    fragment_key,
+    warm_tool_pages,
+)
+
+
+class ToolPageFragmentTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        with translation.override("en"):
+            self.url = reverse("frontend:pdf_to_word_page")
+            self.key = fragment_key("pdf_to_word", "en")
+
+    def test_logged_in_users_share_cached_fragments(self):
+        cache.set(fragment_cache_key(self.key, "help"), "<p>SHARED-HELP</p>")
+        user = get_user_model().objects.create_user(email="u@t.test", password="p")
+        self.client.force_login(user)
+
+        resp = self.client.get(self.url)
+
+        self.assertContains(resp, "<p>SHARED-HELP</p>")
+        # Per-user context is still computed live.
+        self.assertFalse(resp.context["is_premium"])
+        self.assertEqual(resp.context["tool_fragment_key"], self.key)
+
+    def test_first_render_fills_fragments(self):
+        self.client.get(self.url)
+        help_html = cache.get(fragment_cache_key(self.key, "help"))
+        self.assertIn("</h2>", help_html)
+        self.assertNotIn("csrfmiddlewaretoken", help_html)
+        self.assertIsNotNone(cache.get(fragment_cache_key(self.key, "related")))
+
+    def test_version_follows_config_and_language(self):
+        base = tool_page_cache._compute_version("pdf_to_word", "en")
+        self.assertNotEqual(base, tool_page_cache._compute_version("pdf_to_word", "ru"))
+
+        config = dict(TOOL_CONFIGS["pdf_to_word"])
+        config["seo"] = {**config["seo"], "page_faq": []}
+        with mock.patch.dict(TOOL_CONFIGS, {"pdf_to_word": config}):
+            changed = tool_page_cache._compute_version("pdf_to_word", "en")
+        self.assertNotEqual(base, changed)
+
+    def test_disabled_cache_renders_without_key(self):
+        with self.settings(TOOL_PAGE_FRAGMENT_CACHE_ENABLED=False):
+            resp = self.client.get(self.url)
+        self.assertEqual(resp.context["tool_fragment_key"], "")
+        self.assertIsNone(cache.get(fragment_cache_key(self.key, "help")))
+
+    def test_warm_renders_every_tool_and_language(self):
+        result = warm_tool_pages(languages=["en", "ru"])
+
+        self.assertEqual(result["failed"], [])
+        self.assertEqual(result["warmed"], 2 * len(TOOL_CONFIGS))
+        ru_key = fragment_key("merge_pdf", "ru")
+        self.assertIsNotNone(cache.get(fragment_cache_key(ru_key, "help")))
+
+    def test_command_force_rewarms(self):
+        cache.set(fragment_cache_key(self.key, "help"), "stale")
+        out = StringIO()
+        call_command(
+            "warm_tool_pages",
+            "--tool=pdf_to_word",
+            "--language=en",
+            "--force",
+            stdout=out,
+        )
+        self.assertIn("Warmed 1 tool page(s).", out.getvalue())
+        self.assertNotEqual(cache.get(fragment_cache_key(self.key, "help")), "stale")
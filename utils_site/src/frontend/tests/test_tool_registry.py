@@ -0,0 +1,124 @@
+"""Lazy tool config index and the compiled tool registry."""
+
+from unittest import mock
+
+from django.test import RequestFactory, SimpleTestCase
+from django.urls import reverse
+from django.utils import translation
+from django.utils.functional import Promise
+from src.frontend import context_processors, tool_configs, tool_registry
+from src.frontend.tool_configs import (
+    CATEGORY_MODULES,
+    TOOL_CONFIGS,
+    TOOL_INDEX,
+    LazyToolConfigs,
+    load_category,
+)
+from src.frontend.tool_registry import (
+    TOOL_RELATIONS,
+    related_tools,
+    tool_for_view,
+    tools_in_category,
+)
+
+
+class ToolIndexTests(SimpleTestCase):
+    def test_index_matches_category_modules(self):
+        for category in CATEGORY_MODULES:
+            indexed = [key for key, cat in TOOL_INDEX.items() if cat == category]
+            self.assertEqual(
+                indexed,
+                list(load_category(category)),
+                f"TOOL_INDEX out of date for tool_configs/{category}.py",
+            )
+
+    def test_reading_a_tool_imports_only_its_category(self):
+        configs = LazyToolConfigs(TOOL_INDEX)
+        with mock.patch.object(
+            tool_configs, "load_category", wraps=load_category
+        ) as load:
+            self.assertEqual(len(configs), len(TOOL_INDEX))
+            self.assertIn("merge_pdf", configs)
+            load.assert_not_called()
+
+            configs["merge_pdf"]
+            configs["split_pdf"]
+            load.assert_called_once_with("pdf_organize")
+
+        with self.assertRaises(KeyError):
+            configs["no_such_tool"]
+
+    def test_patch_dict_round_trip_keeps_categories(self):
+        original = TOOL_CONFIGS["pdf_to_word"]
+        with mock.patch.dict(TOOL_CONFIGS, {"pdf_to_word": {"template": "x"}}):
+            self.assertEqual(TOOL_CONFIGS["pdf_to_word"], {"template": "x"})
+        self.assertIs(TOOL_CONFIGS["pdf_to_word"], original)
+        self.assertEqual(TOOL_CONFIGS.category("pdf_to_word"), "pdf_convert")
+
+
+class ToolRegistryTests(SimpleTestCase):
+    def test_view_and_category_lookups(self):
+        self.assertEqual(
+            tool_for_view("frontend:favicon_generator_page"), "generate_favicon"
+        )
+        self.assertEqual(tool_for_view("frontend:merge_pdf_page"), "merge_pdf")
+        self.assertIsNone(tool_for_view("frontend:pricing"))
+        self.assertIn("protect_zip", tools_in_category("archive_tools"))
+
+    def test_related_tools_are_reversed_per_language(self):
+        with translation.override("en"):
+            en = related_tools("merge_pdf")
+        with translation.override("ru"):
+            ru = related_tools("merge_pdf")
+            expected = reverse("frontend:split_pdf_page")
+
+        self.assertEqual(len(en), len(TOOL_RELATIONS["merge_pdf"]))
+        self.assertEqual(ru[0]["url"], expected)
+        self.assertNotEqual(en[0]["url"], ru[0]["url"])
+        ru[0]["url"] = "mutated"
+        with translation.override("ru"):
+            self.assertEqual(related_tools("merge_pdf")[0]["url"], expected)
+
+
+class ContextProcessorLookupTests(SimpleTestCase):
+    def setUp(self):
+        # URLs resolve under the request's language, as in LocaleMiddleware.
+        translation.activate("en")
+        self.addCleanup(translation.deactivate)
+
+    def _request(self, url_name):
+        return RequestFactory().get(reverse(f"frontend:{url_name}"))
+
+    def test_breadcrumb_leaf_is_translated_at_render(self):
+        request = self._request("merge_pdf_page")
+        crumbs = context_processors.breadcrumbs(request)["breadcrumb_items"]
+        # Lazy, so the table is built once, not per request and language
+        # (CI has no compiled catalogs to compare translations against).
+        self.assertIsInstance(crumbs[-1]["name"], Promise)
+        self.assertEqual(str(crumbs[-1]["name"]), "Merge PDF")
+
+    def test_related_tools_view_match_is_memoized(self):
+        context_processors._current_tool.cache_clear()
+        request = self._request("pdf_to_word_page")
+        first = context_processors.related_tools(request)["related_tools"]
+        context_processors.related_tools(request)
+
+        self.assertEqual(len(first), 3)
+        self.assertEqual(context_processors._current_tool.cache_info().hits, 1)
+
+    def test_related_tools_context_uses_the_registry_graph(self):
+        for url_name, tool_key in (
+            ("pdf_to_word_page", "pdf_to_word"),
+            ("favicon_generator_page", "generate_favicon"),
+            ("pdf_editor_page", "pdf_editor"),
+        ):
+            request = self._request(url_name)
+            cards = context_processors.related_tools(request)["related_tools"]
+            self.assertEqual(cards, related_tools(tool_key))
+            self.assertEqual(
+                [card["url"] for card in cards],
+                [
+                    reverse(f"frontend:{tool_registry.tool_url_name(key)}")
+                    for key in TOOL_RELATIONS[tool_key]
+                ],
+            )
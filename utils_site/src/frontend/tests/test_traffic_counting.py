@@ -1,10 +1,13 @@
+from unittest.mock import patch
+
 from django.contrib.auth import get_user_model
 from django.http import HttpResponse
 from django.test import RequestFactory, TestCase
 from django.urls import reverse
 from django.utils import timezone
-from src.frontend.middleware import TrafficCountingMiddleware
-from src.users.models import PageViewDaily
+from src.frontend import middleware
+from src.frontend.middleware import TrafficCountingMiddleware, flush_buffered_pageviews
+from src.users.models import PageViewDaily, PageViewFlush
 
 BROWSER_UA = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
@@ -103,6 +106,146 @@ class TrafficCountingMiddlewareTest(TestCase):
         )
 
 
+class _FakeRedis:
+    """The handful of Redis commands the page-view buffer uses."""
+
+    def __init__(self):
+        self.data = {}
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+    def hincrby(self, key, field, amount):
+        bucket = self.data.setdefault(key, {})
+        bucket[field.encode()] = bucket.get(field.encode(), 0) + amount
+
+    def hgetall(self, key):
+        return {f: str(v).encode() for f, v in self.data.get(key, {}).items()}
+
+    def pfadd(self, key, member):
+        self.data.setdefault(key, set()).add(member)
+
+    def expire(self, key, seconds):
+        return key in self.data
+
+    def exists(self, key):
+        return int(key in self.data)
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    def rename(self, src, dst):
+        self.data[dst] = self.data.pop(src)
+
+    def sadd(self, key, member):
+        self.data.setdefault(key, set()).add(member.encode())
+
+    def srem(self, key, member):
+        self.data.get(key, set()).discard(member)
+
+    def smembers(self, key):
+        return set(self.data.get(key, set()))
+
+    def delete(self, *keys):
+        return sum(self.data.pop(k, None) is not None for k in keys)
+
+
+class _FakePipeline:
+    def __init__(self, conn):
+        self.conn = conn
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *a, **kw: self.calls.append((name, a, kw))
+
+    def execute(self):
+        return [getattr(self.conn, n)(*a, **kw) for n, a, kw in self.calls]
+
+
+class BufferedPageViewTest(TestCase):
+    def setUp(self):
+        self.redis = _FakeRedis()
+        patcher = patch.object(middleware, "_redis", return_value=self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mw = TrafficCountingMiddleware(_html_response)
+        self.factory = RequestFactory()
+        self.day = timezone.now().date()
+
+    def _get(self, path):
+        return self.mw(self.factory.get(path, HTTP_USER_AGENT=BROWSER_UA))
+
+    def test_views_are_buffered_not_written(self):
+        self._get("/")
+        self._get("/")
+        self._get("/en/pdf-to-word/")
+
+        self.assertFalse(PageViewDaily.objects.exists())
+        self.assertEqual(
+            self.redis.hgetall(f"pv:{self.day.isoformat()}"),
+            {b"/": b"2", b"/en/pdf-to-word/": b"1"},
+        )
+        self.assertEqual(len(self.redis.data[f"uv:{self.day.isoformat()}"]), 1)
+
+    def test_flush_adds_to_existing_rows_and_empties_buffer(self):
+        PageViewDaily.objects.create(date=self.day, path="/", views=10)
+        self._get("/")
+        self._get("/")
+        self._get("/en/pdf-to-word/")
+
+        stats = flush_buffered_pageviews()
+
+        self.assertEqual(stats, {"batches": 1, "rows": 2, "views": 3})
+        self.assertEqual(PageViewDaily.objects.get(path="/").views, 12)
+        self.assertEqual(PageViewDaily.objects.get(path="/en/pdf-to-word/").views, 1)
+        self.assertFalse(
+            [k for k in self.redis.data if k.startswith("pv:") and k != "pv:flushing"]
+        )
+        # A second flush with nothing new changes nothing.
+        self.assertEqual(flush_buffered_pageviews()["views"], 0)
+        self.assertEqual(PageViewDaily.objects.get(path="/").views, 12)
+
+    def test_batch_left_by_crash_after_commit_is_not_counted_twice(self):
+        self._get("/")
+        with (
+            patch.object(self.redis, "delete", side_effect=RuntimeError("crash")),
+            self.assertRaises(RuntimeError),
+        ):
+            flush_buffered_pageviews()
+        self.assertEqual(PageViewDaily.objects.get(path="/").views, 1)
+        self.redis.data.pop("pv:flush:lock")  # the dead worker's lock expired
+
+        self._get("/")
+        stats = flush_buffered_pageviews()
+
+        self.assertEqual(stats["batches"], 1)
+        self.assertEqual(PageViewDaily.objects.get(path="/").views, 2)
+        self.assertEqual(PageViewFlush.objects.count(), 2)
+        self.assertEqual(self.redis.smembers("pv:flushing"), set())
+
+    def test_batch_left_by_crash_before_commit_is_retried(self):
+        self._get("/")
+        with (
+            patch.object(
+                middleware, "_apply_pageview_batch", side_effect=RuntimeError("down")
+            ),
+            self.assertRaises(RuntimeError),
+        ):
+            flush_buffered_pageviews()
+        self.assertFalse(PageViewDaily.objects.exists())
+
+        flush_buffered_pageviews()
+        self.assertEqual(PageViewDaily.objects.get(path="/").views, 1)
+
+    def test_redis_failure_falls_back_to_direct_write(self):
+        with patch.object(self.redis, "pipeline", side_effect=ConnectionError()):
+            self._get("/")
+        self.assertEqual(PageViewDaily.objects.get(path="/").views, 1)
+
+
 class PageViewDailyAdminTest(TestCase):
     def test_changelist_renders_traffic_summary(self):
         admin = get_user_model().objects.create_superuser(
@@ -6,6 +6,7 @@ and fail the deploy gate.
 """
 
 import re
+from collections.abc import Mapping
 from pathlib import Path
 
 from django.conf import settings
@@ -47,7 +48,7 @@ def _po_text(lang):
 def _collect_lazy_strings(obj, out):
     if isinstance(obj, Promise):
         out.add(str(obj))
-    elif isinstance(obj, dict):
+    elif isinstance(obj, Mapping):
         for v in obj.values():
             _collect_lazy_strings(v, out)
     elif isinstance(obj, list | tuple):
@@ -14,25 +14,146 @@ pdf_security.py    – Protect / unlock
 epub_and_other.py  – EPUB, Markdown, …
 image_tools.py     – Optimize / convert images
 archive_tools.py   – Protect / unlock ZIP
+
+Loading
+───────
+The category modules are ~6800 lines of dict literals, so they are not
+imported up front: TOOL_CONFIGS is a mapping over TOOL_INDEX (tool key ->
+category module) that imports a category the first time one of its tools
+is read. Keys, ``in`` and ``len()`` come from the index alone. Adding a tool
+means adding it to its category module *and* to TOOL_INDEX —
+test_tool_registry checks the two agree.
 """
 
+from collections.abc import MutableMapping
+from importlib import import_module
+
 from ._batch_api_map import BATCH_API_MAP
-from .archive_tools import ARCHIVE_TOOLS_CONFIGS
-from .epub_and_other import EPUB_AND_OTHER_CONFIGS
-from .image_tools import IMAGE_TOOLS_CONFIGS
-from .pdf_convert import PDF_CONVERT_CONFIGS
-from .pdf_edit import PDF_EDIT_CONFIGS
-from .pdf_organize import PDF_ORGANIZE_CONFIGS
-from .pdf_security import PDF_SECURITY_CONFIGS
-
-TOOL_CONFIGS = {
-    **PDF_CONVERT_CONFIGS,
-    **PDF_EDIT_CONFIGS,
-    **PDF_ORGANIZE_CONFIGS,
-    **PDF_SECURITY_CONFIGS,
-    **EPUB_AND_OTHER_CONFIGS,
-    **IMAGE_TOOLS_CONFIGS,
-    **ARCHIVE_TOOLS_CONFIGS,
+
+#: category module -> name of its config dict
+CATEGORY_MODULES = {
+    "pdf_convert": "PDF_CONVERT_CONFIGS",
+    "pdf_edit": "PDF_EDIT_CONFIGS",
+    "pdf_organize": "PDF_ORGANIZE_CONFIGS",
+    "pdf_security": "PDF_SECURITY_CONFIGS",
+    "epub_and_other": "EPUB_AND_OTHER_CONFIGS",
+    "image_tools": "IMAGE_TOOLS_CONFIGS",
+    "archive_tools": "ARCHIVE_TOOLS_CONFIGS",
 }
 
-__all__ = ["BATCH_API_MAP", "TOOL_CONFIGS"]
+#: tool key -> category module, in the order the categories are merged.
+TOOL_INDEX = {
+    # pdf_convert
+    "pdf_to_word": "pdf_convert",
+    "word_to_pdf": "pdf_convert",
+    "pdf_to_jpg": "pdf_convert",
+    "jpg_to_pdf": "pdf_convert",
+    "pdf_to_excel": "pdf_convert",
+    "excel_to_pdf": "pdf_convert",
+    "ppt_to_pdf": "pdf_convert",
+    "html_to_pdf": "pdf_convert",
+    "text_to_pdf": "pdf_convert",
+    "pdf_to_ppt": "pdf_convert",
+    "pdf_to_html": "pdf_convert",
+    "pdf_to_text": "pdf_convert",
+    "pdf_to_pdfa": "pdf_convert",
+    # pdf_edit
+    "rotate_pdf": "pdf_edit",
+    "add_page_numbers": "pdf_edit",
+    "add_watermark": "pdf_edit",
+    "crop_pdf": "pdf_edit",
+    "resize_pdf": "pdf_edit",
+    "flatten_pdf": "pdf_edit",
+    "sign_pdf": "pdf_edit",
+    "add_text_pdf": "pdf_edit",
+    "pdf_editor": "pdf_edit",
+    # pdf_organize
+    "merge_pdf": "pdf_organize",
+    "split_pdf": "pdf_organize",
+    "remove_pages": "pdf_organize",
+    "extract_pages": "pdf_organize",
+    "organize_pdf": "pdf_organize",
+    "compress_pdf": "pdf_organize",
+    # pdf_security
+    "protect_pdf": "pdf_security",
+    "unlock_pdf": "pdf_security",
+    # epub_and_other
+    "epub_to_pdf": "epub_and_other",
+    "pdf_to_epub": "epub_and_other",
+    "pdf_to_markdown": "epub_and_other",
+    # image_tools
+    "optimize_image": "image_tools",
+    "convert_image": "image_tools",
+    "heic_to_jpg": "image_tools",
+    "png_to_ico": "image_tools",
+    "jpg_to_ico": "image_tools",
+    "svg_to_ico": "image_tools",
+    "webp_to_ico": "image_tools",
+    "generate_favicon": "image_tools",
+    "ico_to_png": "image_tools",
+    "image_to_text": "image_tools",
+    "password_protect_image": "image_tools",
+    # archive_tools
+    "protect_zip": "archive_tools",
+    "unlock_zip": "archive_tools",
+}
+
+
+def load_category(category: str) -> dict:
+    """Import a category module and return its config dict."""
+    module = import_module(f"{__name__}.{category}")
+    return getattr(module, CATEGORY_MODULES[category])
+
+
+class LazyToolConfigs(MutableMapping):
+    """``TOOL_CONFIGS``: tool key -> config, loading categories on demand."""
+
+    def __init__(self, index):
+        self._categories = dict(index)
+        self._index = dict(index)
+        self._data = {}
+        self._loaded = set()
+
+    def _load(self, category):
+        for key, config in load_category(category).items():
+            if self._index.get(key) == category:
+                self._data.setdefault(key, config)
+        # Marked only once filled: a concurrent reader must not see a
+        # "loaded" category with its keys still missing.
+        self._loaded.add(category)
+
+    def __getitem__(self, key):
+        if key not in self._data:
+            category = self._index.get(key)
+            if category is None or category in self._loaded:
+                raise KeyError(key)
+            self._load(category)
+        return self._data[key]
+
+    def __setitem__(self, key, value):
+        self._index[key] = self._categories.get(key)
+        self._data[key] = value
+
+    def __delitem__(self, key):
+        del self._index[key]
+        self._data.pop(key, None)
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def __repr__(self):
+        return f"<LazyToolConfigs: {len(self)} tools, loaded {sorted(self._loaded)}>"
+
+    def category(self, key):
+        return self._categories.get(key)
+
+
+TOOL_CONFIGS = LazyToolConfigs(TOOL_INDEX)
+
+__all__ = ["BATCH_API_MAP", "TOOL_CONFIGS", "TOOL_INDEX"]
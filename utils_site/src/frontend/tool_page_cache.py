@@ -0,0 +1,178 @@
+"""Shared render fragments for the standard tool pages.
+
+Most of a tool page is the same for everyone who reads it in a given
+language: the SEO copy (content/benefits/tips/FAQ), the "How it works" help,
+the FAQPage JSON-LD and the related-tools grid. ``anonymous_cache_page`` only
+helps anonymous visitors, so every logged-in request re-rendered all of it.
+
+``_render_tool_page`` puts a ``tool_fragment_key`` into the context and the
+``{% tool_fragment %}`` tag (templatetags/tool_fragments.py) caches the
+wrapped markup under that key. The key is ``<tool>:<language>:<version>``
+where the version hashes everything the fragments are built from — the
+tool's config rendered in that language, the template sources, the compiled
+catalog and the conversion limits — so a changed config, template or
+translation gets new fragments without anyone clearing the cache. Per-user
+bits (premium badge, batch mode, file-size quota, CSRF, CSP nonce) are kept
+outside the fragments and rendered live.
+
+Fragments are filled at deploy by ``manage.py warm_tool_pages``.
+"""
+
+import hashlib
+import json
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.template import TemplateDoesNotExist
+from django.template.loader import get_template
+from django.utils import translation
+
+logger = logging.getLogger(__name__)
+
+FRAGMENT_TIMEOUT = getattr(settings, "TOOL_PAGE_FRAGMENT_TIMEOUT", 7 * 86400)
+FRAGMENT_PREFIX = "toolpage"
+
+# Templates rendered inside the fragments besides the tool's own template.
+_FRAGMENT_TEMPLATES = (
+    "frontend/converter_generic.html",
+    "frontend/edit_pdf_generic.html",
+    "frontend/includes/seo_content.html",
+    "frontend/includes/seo_benefits.html",
+    "frontend/includes/seo_tips.html",
+    "frontend/includes/seo_faq.html",
+    "frontend/includes/related_tools.html",
+)
+
+#: Names used by the ``{% tool_fragment %}`` blocks in the templates.
+FRAGMENT_NAMES = ("faq_schema", "help", "related")
+
+#: (tool_key, language) -> version; templates and catalogs only change on
+#: deploy, which restarts the workers.
+_VERSIONS: dict[tuple[str, str], str] = {}
+
+
+def is_enabled() -> bool:
+    return getattr(settings, "TOOL_PAGE_FRAGMENT_CACHE_ENABLED", True)
+
+
+def _template_source(name: str) -> str:
+    try:
+        return get_template(name).template.source
+    except TemplateDoesNotExist:
+        return ""
+
+
+def _catalog_digest(language: str) -> str:
+    digest = hashlib.sha256()
+    for locale_dir in getattr(settings, "LOCALE_PATHS", []):
+        path = f"{locale_dir}/{language}/LC_MESSAGES/django.mo"
+        try:
+            with open(path, "rb") as fh:
+                digest.update(fh.read())
+        except OSError:
+            continue
+    return digest.hexdigest()
+
+
+def _compute_version(tool_key: str, language: str) -> str:
+    from .context_processors import conversion_limits
+    from .tool_configs import TOOL_CONFIGS
+    from .views import _get_related_tools
+
+    config = TOOL_CONFIGS[tool_key]
+    with translation.override(language):
+        # default=str resolves the gettext_lazy proxies in this language.
+        payload = json.dumps(
+            {
+                "config": config,
+                "related": _get_related_tools(tool_key),
+                "limits": conversion_limits(None),
+            },
+            default=str,
+            sort_keys=True,
+        )
+    digest = hashlib.sha256(payload.encode())
+    for name in (config["template"], *_FRAGMENT_TEMPLATES):
+        digest.update(_template_source(name).encode())
+    digest.update(_catalog_digest(language).encode())
+    return digest.hexdigest()[:16]
+
+
+def fragment_version(tool_key: str, language: str | None = None) -> str:
+    language = language or translation.get_language() or settings.LANGUAGE_CODE
+    if settings.DEBUG:
+        # Templates are edited in place during development.
+        return _compute_version(tool_key, language)
+    version = _VERSIONS.get((tool_key, language))
+    if version is None:
+        version = _VERSIONS[(tool_key, language)] = _compute_version(tool_key, language)
+    return version
+
+
+def fragment_key(tool_key: str, language: str | None = None) -> str:
+    """Context value for ``{% tool_fragment %}``, or "" when disabled."""
+    if not is_enabled():
+        return ""
+    language = language or translation.get_language() or settings.LANGUAGE_CODE
+    return f"{tool_key}:{language}:{fragment_version(tool_key, language)}"
+
+
+def fragment_cache_key(key: str, name: str) -> str:
+    return f"{FRAGMENT_PREFIX}:{name}:{key}"
+
+
+def warm_tool_pages(tool_keys=None, languages=None) -> dict:
+    """Render every tool x language page once so its fragments are cached.
+
+    Renders through ``_render_tool_page`` directly (no HTTP, no page cache)
+    as an anonymous visitor, so no per-user state ends up in a fragment.
+    """
+    from django.contrib.auth.models import AnonymousUser
+    from django.test import RequestFactory
+    from django.urls import reverse
+
+    from .tool_configs import TOOL_CONFIGS
+    from .tool_registry import tool_url_name
+    from .views import _render_tool_page
+
+    tool_keys = list(tool_keys or TOOL_CONFIGS)
+    languages = list(languages or (code for code, _name in settings.LANGUAGES))
+    factory = RequestFactory()
+    warmed, failed = 0, []
+    for language in languages:
+        with translation.override(language):
+            for tool_key in tool_keys:
+                try:
+                    request = factory.get(
+                        reverse(f"frontend:{tool_url_name(tool_key)}")
+                    )
+                    request.user = AnonymousUser()
+                    request.LANGUAGE_CODE = language
+                    response = _render_tool_page(request, tool_key)
+                    if response.status_code != 200:
+                        raise ValueError(f"status {response.status_code}")
+                    warmed += 1
+                except Exception as exc:
+                    logger.warning(
+                        f"Tool page warm failed for {tool_key}/{language}: {exc}",
+                        extra={"event": "tool_page_warm_failed"},
+                    )
+                    failed.append(f"{tool_key}/{language}")
+    return {"warmed": warmed, "failed": failed}
+
+
+def clear_fragments(tool_keys=None, languages=None) -> None:
+    """Drop the current-version fragments (e.g. before a forced re-warm)."""
+    from .tool_configs import TOOL_CONFIGS
+
+    tool_keys = list(tool_keys or TOOL_CONFIGS)
+    languages = list(languages or (code for code, _name in settings.LANGUAGES))
+    cache.delete_many(
+        [
+            fragment_cache_key(fragment_key(tool_key, language), name)
+            for tool_key in tool_keys
+            for language in languages
+            for name in FRAGMENT_NAMES
+        ]
+    )
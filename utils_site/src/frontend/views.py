@@ -1,12 +1,20 @@
 # utils_site/src/frontend/views.py
 
-from datetime import datetime
+import hashlib
 from functools import wraps
 
 from django.conf import settings
+from django.core.cache import caches
 from django.http import HttpResponse
+from django.middleware.csrf import get_token
 from django.shortcuts import redirect, render
 from django.urls import reverse
+from django.utils.cache import (
+    get_cache_key,
+    get_conditional_response,
+    patch_response_headers,
+    patch_vary_headers,
+)
 from django.utils.decorators import method_decorator
 from django.utils.translation import gettext_lazy as _
 from django.views.decorators.cache import cache_page
@@ -15,15 +23,90 @@ from django.views.decorators.vary import vary_on_cookie
 from django.views.generic import TemplateView
 from src.api.conversion_limits import get_file_size_limits
 from src.frontend.tool_configs import BATCH_API_MAP, TOOL_CONFIGS
+from src.frontend.tool_page_cache import fragment_key
+from src.frontend.tool_registry import related_tools, tool_url_name
 from src.frontend.tool_videos import TOOL_VIDEOS
 
 
+def _page_cache_key(request):
+    """Key ``cache_page`` stores this request's response under, or None."""
+    return get_cache_key(
+        request,
+        key_prefix=settings.CACHE_MIDDLEWARE_KEY_PREFIX,
+        method="GET",
+        cache=caches[settings.CACHE_MIDDLEWARE_ALIAS],
+    )
+
+
+def _not_modified(request, timeout):
+    """304 for a cached page whose stored ETag the client already holds.
+
+    Costs the Vary header-list lookup, the ETag and an EXISTS on the body —
+    the page is neither rendered nor read from the cache.
+    """
+    if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+    if not if_none_match or request.method not in ("GET", "HEAD"):
+        return None
+    key = _page_cache_key(request)
+    if key is None:
+        return None
+    page_cache = caches[settings.CACHE_MIDDLEWARE_ALIAS]
+    etag = page_cache.get(f"{key}.etag")
+    # The ETag may outlive an evicted body; only vouch for pages still cached.
+    if etag is None or not page_cache.has_key(key):
+        return None
+    response = get_conditional_response(request, etag=etag)
+    if response is not None:
+        response["ETag"] = etag
+        patch_response_headers(response, timeout)
+        patch_vary_headers(response, ("Cookie",))
+        # TrafficCountingMiddleware counts revalidated page views too.
+        response.page_view = True
+    return response
+
+
+def _finish_cached_page(request, response, timeout):
+    """ETag the shared body, answer If-None-Match, then fill in the nonce."""
+    from src.api.middleware import CSP_NONCE_PLACEHOLDER
+
+    if getattr(response, "streaming", False):
+        return response
+    if hasattr(response, "render") and not response.is_rendered:
+        response.render()
+
+    if request.method in ("GET", "HEAD") and response.status_code == 200:
+        # The body still carries the placeholder, so the hash is the same
+        # for every visitor served this cache entry.
+        etag = f'"{hashlib.sha256(response.content).hexdigest()[:32]}"'
+        key = _page_cache_key(request)
+        if key is not None:
+            page_cache = caches[settings.CACHE_MIDDLEWARE_ALIAS]
+            if page_cache.get(f"{key}.etag") != etag:
+                page_cache.set(f"{key}.etag", etag, timeout)
+        response["ETag"] = etag
+        not_modified = get_conditional_response(request, etag=etag, response=response)
+        if not_modified is not response:
+            not_modified.page_view = True
+            return not_modified
+
+    placeholder = CSP_NONCE_PLACEHOLDER.encode()
+    if placeholder in response.content:
+        nonce = getattr(request, "csp_nonce", "").encode()
+        response.content = response.content.replace(placeholder, nonce)
+    return response
+
+
 def anonymous_cache_page(timeout):
     """Cache page only for anonymous users.
 
     Authenticated users always get fresh responses (needed for premium-specific content).
     Anonymous users get cached responses for better performance.
     Cache varies by cookie to keep CSRF tokens valid in cached templates.
+
+    Anonymous responses carry a strong ETag (hash of the cached body) and
+    If-None-Match is answered with 304 before the page is rendered or its
+    body fetched. The CSP nonce is rendered as a placeholder and filled in
+    per request, so it neither freezes into the cache nor changes the ETag.
     """
 
     def decorator(view_func):
@@ -38,7 +121,14 @@ def anonymous_cache_page(timeout):
         def wrapper(request, *args, **kwargs):
             if request.user.is_authenticated:
                 return uncached_view(request, *args, **kwargs)
-            return cached_view(request, *args, **kwargs)
+            response = _not_modified(request, timeout)
+            if response is not None:
+                # What ensure_csrf_cookie does for the rendered page.
+                get_token(request)
+                return response
+            request.csp_nonce_deferred = True
+            response = cached_view(request, *args, **kwargs)
+            return _finish_cached_page(request, response, timeout)
 
         return wrapper
 
@@ -82,326 +172,7 @@ def _redirect_for_premium_access(request):
 
 def _get_related_tools(current_tool):
     """Get related tools for internal linking."""
-    all_tools = {
-        "pdf_to_word": {
-            "name": _("PDF to Word"),
-            "url": "frontend:pdf_to_word_page",
-            "description": _("Convert PDF to editable Word documents"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M9 12h6m-6 4h6m2 5H7a2 2 0 01-2-2V5a2 2 0 012-2h5.586a1 1 0 01.707.293l5.414 5.414a1 1 0 01.293.707V19a2 2 0 01-2 2z"/>',
-            "gradient": "from-blue-500 to-blue-600",
-        },
-        "word_to_pdf": {
-            "name": _("Word to PDF"),
-            "url": "frontend:word_to_pdf_page",
-            "description": _("Convert Word documents to PDF format"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M7 21h10a2 2 0 002-2V9.414a1 1 0 00-.293-.707l-5.414-5.414A1 1 0 0012.586 3H7a2 2 0 00-2 2v14a2 2 0 002 2z"/>',
-            "gradient": "from-red-500 to-red-600",
-        },
-        "pdf_to_jpg": {
-            "name": _("PDF to JPG"),
-            "url": "frontend:pdf_to_jpg_page",
-            "description": _("Convert PDF pages to JPG images"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M4 16l4.586-4.586a2 2 0 012.828 0L16 16m-2-2l1.586-1.586a2 2 0 012.828 0L20 14m-6-6h.01M6 20h12a2 2 0 002-2V6a2 2 0 00-2-2H6a2 2 0 00-2 2v12a2 2 0 002 2z"/>',
-            "gradient": "from-green-500 to-green-600",
-        },
-        "jpg_to_pdf": {
-            "name": _("JPG to PDF"),
-            "url": "frontend:jpg_to_pdf_page",
-            "description": _("Convert images to PDF documents"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M4 16l4.586-4.586a2 2 0 012.828 0L16 16m-2-2l1.586-1.586a2 2 0 012.828 0L20 14m-6-6h.01M6 20h12a2 2 0 002-2V6a2 2 0 00-2-2H6a2 2 0 00-2 2v12a2 2 0 002 2z"/>',
-            "gradient": "from-purple-500 to-purple-600",
-        },
-        "merge_pdf": {
-            "name": _("Merge PDF"),
-            "url": "frontend:merge_pdf_page",
-            "description": _("Combine multiple PDFs into one"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M12 6v6m0 0v6m0-6h6m-6 0H6"/>',
-            "gradient": "from-indigo-500 to-indigo-600",
-        },
-        "split_pdf": {
-            "name": _("Split PDF"),
-            "url": "frontend:split_pdf_page",
-            "description": _("Split PDF into multiple files"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M8 7h12m0 0l-4-4m4 4l-4 4m0 6H4m0 0l4 4m-4-4l4-4"/>',
-            "gradient": "from-orange-500 to-orange-600",
-        },
-        "compress_pdf": {
-            "name": _("Compress PDF"),
-            "url": "frontend:compress_pdf_page",
-            "description": _("Reduce PDF file size"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M19 14l-7 7m0 0l-7-7m7 7V3"/>',
-            "gradient": "from-teal-500 to-teal-600",
-        },
-        "rotate_pdf": {
-            "name": _("Rotate PDF"),
-            "url": "frontend:rotate_pdf_page",
-            "description": _("Rotate PDF pages"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M4 4v5h.582m15.356 2A8.001 8.001 0 004.582 9m0 0H9m11 11v-5h-.581m0 0a8.003 8.003 0 01-15.357-2m15.357 2H15"/>',
-            "gradient": "from-cyan-500 to-cyan-600",
-        },
-        "protect_pdf": {
-            "name": _("Protect PDF"),
-            "url": "frontend:protect_pdf_page",
-            "description": _("Add password protection"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M12 15v2m-6 4h12a2 2 0 002-2v-6a2 2 0 00-2-2H6a2 2 0 00-2 2v6a2 2 0 002 2zm10-10V7a4 4 0 00-8 0v4h8z"/>',
-            "gradient": "from-red-500 to-pink-600",
-        },
-        "unlock_pdf": {
-            "name": _("Unlock PDF"),
-            "url": "frontend:unlock_pdf_page",
-            "description": _("Remove PDF password"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M8 11V7a4 4 0 118 0m-4 8v2m-6 4h12a2 2 0 002-2v-6a2 2 0 00-2-2H6a2 2 0 00-2 2v6a2 2 0 002 2z"/>',
-            "gradient": "from-green-500 to-emerald-600",
-        },
-        "pdf_to_excel": {
-            "name": _("PDF to Excel"),
-            "url": "frontend:pdf_to_excel_page",
-            "description": _("Extract tables to Excel"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M3 10h18M3 14h18m-9-4v8m-7 0h14a2 2 0 002-2V8a2 2 0 00-2-2H5a2 2 0 00-2 2v8a2 2 0 002 2z"/>',
-            "gradient": "from-green-600 to-green-700",
-        },
-        "organize_pdf": {
-            "name": _("Organize PDF"),
-            "url": "frontend:organize_pdf_page",
-            "description": _("Reorder PDF pages"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M4 5a1 1 0 011-1h14a1 1 0 011 1v2a1 1 0 01-1 1H5a1 1 0 01-1-1V5zM4 13a1 1 0 011-1h6a1 1 0 011 1v6a1 1 0 01-1 1H5a1 1 0 01-1-1v-6zM16 13a1 1 0 011-1h2a1 1 0 011 1v6a1 1 0 01-1 1h-2a1 1 0 01-1-1v-6z"/>',
-            "gradient": "from-violet-500 to-violet-600",
-        },
-        "epub_to_pdf": {
-            "name": _("EPUB to PDF"),
-            "url": "frontend:epub_to_pdf_page",
-            "description": _("Convert EPUB eBooks to PDF"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M7 7h10M7 12h10M7 17h6"/>',
-            "gradient": "from-amber-500 to-orange-600",
-        },
-        "pdf_to_epub": {
-            "name": _("PDF to EPUB"),
-            "url": "frontend:pdf_to_epub_page",
-            "description": _("Convert PDFs to EPUB eBooks"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M4 7h12M4 12h8m-8 5h12m4-10v10a2 2 0 01-2 2h-1"/>',
-            "gradient": "from-amber-500 to-orange-600",
-        },
-        "pdf_to_markdown": {
-            "name": _("PDF to Markdown"),
-            "url": "frontend:pdf_to_markdown_page",
-            "description": _("Convert PDF to structured Markdown"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M4 6h16M4 12h10M4 18h7m8-6l2 2 4-4"/>',
-            "gradient": "from-amber-500 to-orange-600",
-        },
-        "compare_pdf": {
-            "name": _("Compare Two PDFs"),
-            "url": "frontend:compare_pdf_page",
-            "description": _("Visual diff and change report for two PDFs"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M10 9H6a2 2 0 00-2 2v7a2 2 0 002 2h4m4-11h4a2 2 0 012 2v7a2 2 0 01-2 2h-4m-4-11v11m0 0l-2-2m2 2l2-2"/>',
-            "gradient": "from-amber-500 to-orange-600",
-        },
-        "text_to_pdf": {
-            "name": _("Text to PDF"),
-            "url": "frontend:text_to_pdf_page",
-            "description": _("Paste text and turn it into a styled PDF"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M4 6h16M4 12h16M4 18h7"/>',
-            "gradient": "from-blue-500 to-blue-600",
-        },
-        "pdf_to_pdfa": {
-            "name": _("PDF to PDF/A"),
-            "url": "frontend:pdf_to_pdfa_page",
-            "description": _("Convert PDF to archival PDF/A (ISO 19005)"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M3 6l9-4 9 4v6c0 5-3.8 8.5-9 10-5.2-1.5-9-5-9-10V6z"/><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M9 12l2 2 4-4"/>',
-            "gradient": "from-amber-500 to-orange-600",
-        },
-        # Tools without a previous entry — they exist as views but didn't
-        # appear as a related-tool target anywhere, so other pages couldn't
-        # link back to them. Adding them here lets the relations map below
-        # surface them as incoming links from sibling tools.
-        "flatten_pdf": {
-            "name": _("Flatten PDF"),
-            "url": "frontend:flatten_pdf_page",
-            "description": _("Remove form fields and annotations"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M19 7l-.867 12.142A2 2 0 0116.138 21H7.862a2 2 0 01-1.995-1.858L5 7m5 4v6m4-6v6m1-10V4a1 1 0 00-1-1h-4a1 1 0 00-1 1v3M4 7h16"/>',
-            "gradient": "from-cyan-500 to-blue-600",
-        },
-        "resize_pdf": {
-            "name": _("Change PDF Page Size"),
-            "url": "frontend:resize_pdf_page",
-            "description": _("Move pages to A4, US Letter or Legal"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M4 8V6a2 2 0 012-2h2M16 4h2a2 2 0 012 2v2M20 16v2a2 2 0 01-2 2h-2M8 20H6a2 2 0 01-2-2v-2"/>',
-            "gradient": "from-sky-500 to-indigo-600",
-        },
-        "sign_pdf": {
-            "name": _("Sign PDF"),
-            "url": "frontend:sign_pdf_page",
-            "description": _("Add an image signature to PDF pages"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M15.232 5.232l3.536 3.536m-2.036-5.036a2.5 2.5 0 113.536 3.536L6.5 21.036H3v-3.572L16.732 3.732z"/>',
-            "gradient": "from-amber-500 to-orange-600",
-        },
-        "add_text_pdf": {
-            "name": _("Add Text to PDF"),
-            "url": "frontend:add_text_pdf_page",
-            "description": _("Type text, whiteout, and highlights onto PDF pages"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M11 5H6a2 2 0 00-2 2v11a2 2 0 002 2h11a2 2 0 002-2v-5m-1.414-9.414a2 2 0 112.828 2.828L11.828 15H9v-2.828l8.586-8.586z"/>',
-            "gradient": "from-teal-500 to-emerald-600",
-        },
-        "pdf_editor": {
-            "name": _("PDF Editor"),
-            "url": "frontend:pdf_editor_page",
-            "description": _(
-                "Add text, images, shapes, signatures and drawings to PDF"
-            ),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M11 5H6a2 2 0 00-2 2v11a2 2 0 002 2h11a2 2 0 002-2v-5m-1.414-9.414a2 2 0 112.828 2.828L11.828 15H9v-2.828l8.586-8.586z"/>',
-            "gradient": "from-violet-500 to-fuchsia-600",
-        },
-        "pdf_to_text": {
-            "name": _("PDF to Text"),
-            "url": "frontend:pdf_to_text_page",
-            "description": _("Extract plain text from a PDF document"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M7 8h10M7 12h4m1 8l-4-4H5a2 2 0 01-2-2V6a2 2 0 012-2h14a2 2 0 012 2v8a2 2 0 01-2 2h-3l-4 4z"/>',
-            "gradient": "from-slate-500 to-slate-600",
-        },
-        "optimize_image": {
-            "name": _("Optimize Image"),
-            "url": "frontend:optimize_image_page",
-            "description": _("Compress and resize JPEG/PNG/WebP images"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M4 16l4.586-4.586a2 2 0 012.828 0L16 16m-2-2l1.586-1.586a2 2 0 012.828 0L20 14m-6-6h.01M6 20h12a2 2 0 002-2V6a2 2 0 00-2-2H6a2 2 0 00-2 2v12a2 2 0 002 2z"/>',
-            "gradient": "from-emerald-500 to-emerald-600",
-        },
-        "convert_image": {
-            "name": _("Convert Image"),
-            "url": "frontend:convert_image_page",
-            "description": _("Convert between JPEG, PNG, WebP, GIF and BMP"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M4 16l4.586-4.586a2 2 0 012.828 0L16 16m-2-2l1.586-1.586a2 2 0 012.828 0L20 14m-6-6h.01M6 20h12a2 2 0 002-2V6a2 2 0 00-2-2H6a2 2 0 00-2 2v12a2 2 0 002 2z"/>',
-            "gradient": "from-pink-500 to-pink-600",
-        },
-        "heic_to_jpg": {
-            "name": _("HEIC to JPG"),
-            "url": "frontend:heic_to_jpg_page",
-            "description": _("Convert iPhone HEIC photos to JPG, PNG, or PDF"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M12 18h.01M8 21h8a2 2 0 002-2V5a2 2 0 00-2-2H8a2 2 0 00-2 2v14a2 2 0 002 2z"/>',
-            "gradient": "from-rose-500 to-pink-600",
-        },
-        # Favicon / ICO cluster. NOTE: the favicon generator's config key (and
-        # thus its current_tool / relations key) is "generate_favicon", while
-        # its route name is "favicon_generator_page".
-        "generate_favicon": {
-            "name": _("Favicon Generator"),
-            "url": "frontend:favicon_generator_page",
-            "description": _("Create a complete favicon package from any image"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M5 3v4M3 5h4M6 17v4m-2-2h4m5-16l2.286 6.857L21 12l-5.714 2.143L13 21l-2.286-6.857L5 12l5.714-2.143L13 3z"/>',
-            "gradient": "from-amber-500 to-orange-600",
-        },
-        "png_to_ico": {
-            "name": _("PNG to ICO"),
-            "url": "frontend:png_to_ico_page",
-            "description": _("Convert PNG images to .ico favicons"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M4 16l4.586-4.586a2 2 0 012.828 0L16 16m-2-2l1.586-1.586a2 2 0 012.828 0L20 14m-6-6h.01M6 20h12a2 2 0 002-2V6a2 2 0 00-2-2H6a2 2 0 00-2 2v12a2 2 0 002 2z"/>',
-            "gradient": "from-amber-500 to-orange-600",
-        },
-        "jpg_to_ico": {
-            "name": _("JPG to ICO"),
-            "url": "frontend:jpg_to_ico_page",
-            "description": _("Convert JPG images to .ico favicons"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M3 9a2 2 0 012-2h.93a2 2 0 001.664-.89l.812-1.22A2 2 0 0110.07 4h3.86a2 2 0 011.664.89l.812 1.22A2 2 0 0018.07 7H19a2 2 0 012 2v9a2 2 0 01-2 2H5a2 2 0 01-2-2V9z"/><path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M15 13a3 3 0 11-6 0 3 3 0 016 0z"/>',
-            "gradient": "from-amber-500 to-orange-600",
-        },
-        "svg_to_ico": {
-            "name": _("SVG to ICO"),
-            "url": "frontend:svg_to_ico_page",
-            "description": _("Convert SVG vectors to .ico favicons"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M10 20l4-16m4 4l4 4-4 4M6 16l-4-4 4-4"/>',
-            "gradient": "from-amber-500 to-orange-600",
-        },
-        "webp_to_ico": {
-            "name": _("WebP to ICO"),
-            "url": "frontend:webp_to_ico_page",
-            "description": _("Convert WebP images to .ico favicons"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M4 5a1 1 0 011-1h4a1 1 0 011 1v4a1 1 0 01-1 1H5a1 1 0 01-1-1V5zM14 5a1 1 0 011-1h4a1 1 0 011 1v4a1 1 0 01-1 1h-4a1 1 0 01-1-1V5zM4 15a1 1 0 011-1h4a1 1 0 011 1v4a1 1 0 01-1 1H5a1 1 0 01-1-1v-4zM14 15a1 1 0 011-1h4a1 1 0 011 1v4a1 1 0 01-1 1h-4a1 1 0 01-1-1v-4z"/>',
-            "gradient": "from-amber-500 to-orange-600",
-        },
-        "ico_to_png": {
-            "name": _("ICO to PNG"),
-            "url": "frontend:ico_to_png_page",
-            "description": _("Extract a PNG from an .ico file"),
-            "icon": '<path stroke-linecap="round" stroke-linejoin="round" stroke-width="2" d="M4 16v1a3 3 0 003 3h10a3 3 0 003-3v-1m-4-4l-4 4m0 0l-4-4m4 4V4"/>',
-            "gradient": "from-amber-500 to-orange-600",
-        },
-    }
-
-    # Define related tools for each tool. Each tool gets 3 outgoing links;
-    # collectively the map ensures every tool appears as a related target on
-    # at least 2 sibling pages (closes Ahrefs' "only one dofollow incoming
-    # internal link" warnings on the long-tail tool pages).
-    relations = {
-        "pdf_to_word": ["word_to_pdf", "pdf_to_excel", "pdf_to_text"],
-        "word_to_pdf": ["pdf_to_word", "merge_pdf", "compress_pdf"],
-        "pdf_to_jpg": ["jpg_to_pdf", "convert_image", "split_pdf"],
-        "jpg_to_pdf": ["pdf_to_jpg", "resize_pdf", "convert_image"],
-        "rotate_pdf": ["organize_pdf", "crop_pdf", "flatten_pdf"],
-        "add_page_numbers": ["rotate_pdf", "organize_pdf", "add_watermark"],
-        "add_watermark": ["protect_pdf", "sign_pdf", "flatten_pdf"],
-        "crop_pdf": ["resize_pdf", "rotate_pdf", "compress_pdf"],
-        "merge_pdf": ["split_pdf", "compress_pdf", "organize_pdf"],
-        "split_pdf": ["merge_pdf", "extract_pages", "organize_pdf"],
-        "remove_pages": ["split_pdf", "organize_pdf", "extract_pages"],
-        "extract_pages": ["split_pdf", "merge_pdf", "remove_pages"],
-        "organize_pdf": ["merge_pdf", "split_pdf", "rotate_pdf"],
-        "pdf_to_excel": ["pdf_to_word", "merge_pdf", "pdf_to_text"],
-        "excel_to_pdf": ["pdf_to_excel", "merge_pdf", "compress_pdf"],
-        "ppt_to_pdf": ["merge_pdf", "compress_pdf", "protect_pdf"],
-        "html_to_pdf": ["text_to_pdf", "merge_pdf", "pdf_to_text"],
-        "text_to_pdf": ["html_to_pdf", "pdf_to_text", "add_text_pdf"],
-        "pdf_to_ppt": ["merge_pdf", "compress_pdf", "split_pdf"],
-        "pdf_to_html": ["pdf_to_word", "pdf_to_text", "split_pdf"],
-        "epub_to_pdf": ["pdf_to_epub", "pdf_to_word", "pdf_to_jpg"],
-        "pdf_to_epub": ["epub_to_pdf", "pdf_to_word", "pdf_to_text"],
-        "pdf_to_markdown": ["pdf_to_word", "pdf_to_html", "pdf_to_text"],
-        "compare_pdf": ["pdf_to_markdown", "compress_pdf", "split_pdf"],
-        "pdf_to_pdfa": ["compress_pdf", "protect_pdf", "pdf_to_text"],
-        "compress_pdf": ["merge_pdf", "optimize_image", "protect_pdf"],
-        "protect_pdf": ["unlock_pdf", "sign_pdf", "flatten_pdf"],
-        "unlock_pdf": ["protect_pdf", "compress_pdf", "merge_pdf"],
-        # Below: tool keys that previously had no relations entry, so the
-        # related_tools block on their pages was empty. Each tool now points
-        # at three siblings to give every page at least three outgoing
-        # internal links — closes the "only one dofollow incoming internal
-        # link" warnings on these tool/category pairs.
-        "flatten_pdf": ["add_watermark", "rotate_pdf", "resize_pdf"],
-        "resize_pdf": ["crop_pdf", "jpg_to_pdf", "compress_pdf"],
-        "sign_pdf": ["add_text_pdf", "add_watermark", "protect_pdf"],
-        "add_text_pdf": ["pdf_editor", "sign_pdf", "add_watermark", "flatten_pdf"],
-        "pdf_editor": ["sign_pdf", "add_text_pdf", "flatten_pdf", "organize_pdf"],
-        "pdf_to_text": ["text_to_pdf", "pdf_to_word", "pdf_to_markdown"],
-        "optimize_image": [
-            "convert_image",
-            "heic_to_jpg",
-            "jpg_to_pdf",
-            "generate_favicon",
-            "png_to_ico",
-        ],
-        "convert_image": [
-            "optimize_image",
-            "heic_to_jpg",
-            "jpg_to_pdf",
-            "generate_favicon",
-            "png_to_ico",
-        ],
-        "heic_to_jpg": ["convert_image", "optimize_image", "jpg_to_pdf"],
-        # Favicon / ICO cluster. The favicon generator's relations key is
-        # "generate_favicon" (its config key), not "favicon_generator".
-        "generate_favicon": ["png_to_ico", "convert_image", "optimize_image"],
-        "png_to_ico": ["generate_favicon", "jpg_to_ico", "convert_image"],
-        "jpg_to_ico": ["generate_favicon", "png_to_ico", "convert_image"],
-        "svg_to_ico": ["generate_favicon", "png_to_ico", "convert_image"],
-        "webp_to_ico": ["generate_favicon", "png_to_ico", "convert_image"],
-        "ico_to_png": ["generate_favicon", "convert_image", "optimize_image"],
-    }
-
-    related_keys = relations.get(current_tool, [])
-    result = []
-    for key in related_keys:
-        if key in all_tools:
-            tool = all_tools[key].copy()
-            tool["url"] = reverse(tool["url"])
-            result.append(tool)
-    return result
+    return related_tools(current_tool)
 
 
 #: homepage marquee cards: (url_name, screenshot slug, translated label).
@@ -583,10 +354,6 @@ def _get_converter_context(
 _TOOL_SCREENSHOT_CACHE: dict[str, tuple[str, str] | None] = {}
 
 
-#: tool_keys whose URL pattern name doesn't follow the "<tool_key>_page" rule
-_TOOL_URL_NAME_OVERRIDES = {"generate_favicon": "favicon_generator_page"}
-
-
 def _tool_screenshot_paths(tool_key: str) -> tuple[str, str] | None:
     """Static rel paths of the tool's screenshot (generated by
     scripts/gen_tool_screenshots.py under static/images/tools/)."""
@@ -597,8 +364,7 @@ def _tool_screenshot_paths(tool_key: str) -> tuple[str, str] | None:
 
     result = None
     try:
-        url_name = _TOOL_URL_NAME_OVERRIDES.get(tool_key, f"{tool_key}_page")
-        path = reverse(f"frontend:{url_name}")
+        path = reverse(f"frontend:{tool_url_name(tool_key)}")
         slug = path.strip("/").split("/", 1)[-1].replace("/", "-")
         webp_rel = f"images/tools/{slug}.webp"
         jpg_rel = f"images/tools/{slug}.jpg"
@@ -651,6 +417,9 @@ def _render_tool_page(request, tool_key: str) -> HttpResponse:
         context.setdefault("og_image_filename", shots[1])
     if "extra" in config:
         context.update(config["extra"])
+    # SEO copy, help and related tools are cached per tool x language and
+    # shared by every visitor, logged in or not (see tool_page_cache).
+    context["tool_fragment_key"] = fragment_key(tool_key)
     return render(request, config["template"], context)
 
 
@@ -2201,198 +1970,26 @@ def _sitemap_static_lastmod() -> str:
 
 
 def sitemap_index(request):
-    """Generate sitemap index pointing to language-specific sitemaps."""
-
-    from django.core.cache import cache
-
-    cache_key = "sitemap_index_v2"
-    cached = cache.get(cache_key)
-    if cached:
-        return HttpResponse(cached, content_type="application/xml; charset=utf-8")
-
-    base_url = _get_sitemap_base_url(request)
-    static_lastmod = _sitemap_static_lastmod()
-    languages = getattr(settings, "LANGUAGES", [("en", "English")])
-
-    xml = '<?xml version="1.0" encoding="UTF-8"?>\n'
-    xml += '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
-
-    for lang_code, _ in languages:
-        xml += "  <sitemap>\n"
-        xml += f"    <loc>{base_url}/sitemap-{lang_code}.xml</loc>\n"
-        xml += f"    <lastmod>{static_lastmod}</lastmod>\n"
-        xml += "  </sitemap>\n"
-
-    xml += "</sitemapindex>"
-
-    cache.set(cache_key, xml, 86400)
-    return HttpResponse(xml, content_type="application/xml; charset=utf-8")
+    """Sitemap index pointing to every language sitemap chunk.
 
+    Served from the prebuilt artifacts in src.frontend.sitemaps.
+    """
+    from src.frontend.sitemaps import INDEX_NAME, serve_sitemap
 
-def sitemap_lang(request, lang: str):
-    """Generate sitemap for a specific language with hreflang annotations."""
+    return serve_sitemap(request, INDEX_NAME, _get_sitemap_base_url(request))
 
-    from django.core.cache import cache
-    from django.utils.translation import activate, get_language
-    from src.blog.models import Article
 
-    languages = getattr(settings, "LANGUAGES", [("en", "English")])
-    lang_codes = [code for code, _ in languages]
-
-    if lang not in lang_codes:
-        from django.http import Http404
+def sitemap_lang(request, lang: str, chunk: int = 1):
+    """Sitemap for one language (with hreflang annotations), or one chunk of it."""
+    from django.http import Http404
+    from src.frontend.sitemaps import serve_sitemap
 
+    lang_codes = [code for code, _ in getattr(settings, "LANGUAGES", [])]
+    if lang not in lang_codes or chunk < 1:
         raise Http404("Invalid language")
 
-    # v8: image/password-protect-image/ (v7) + /pdf-edit/page-size/ — both
-    # landed as v7 on separate branches, so bump again or the cached
-    # sitemap never picks up the second one.
-    cache_key = f"sitemap_{lang}_v8"
-    cached = cache.get(cache_key)
-    if cached:
-        return HttpResponse(cached, content_type="application/xml; charset=utf-8")
-
-    base_url = _get_sitemap_base_url(request)
-    current_date = datetime.now().strftime("%Y-%m-%d")
-    static_lastmod = _sitemap_static_lastmod()
-    default_language = settings.LANGUAGE_CODE
-    old_lang = get_language()
-    pages = _get_sitemap_pages()
-
-    xml = '<?xml version="1.0" encoding="UTF-8"?>\n'
-    xml += (
-        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
-        ' xmlns:xhtml="http://www.w3.org/1999/xhtml"'
-        ' xmlns:image="http://www.google.com/schemas/sitemap-image/1.1">\n'
-    )
-
-    for page in pages:
-        page_url = page["url"]
-        url = (
-            f"{base_url}/{lang}/" if page_url == "" else f"{base_url}/{lang}/{page_url}"
-        )
-
-        xml += "  <url>\n"
-        xml += f"    <loc>{url}</loc>\n"
-        xml += f"    <lastmod>{static_lastmod}</lastmod>\n"
-        xml += f'    <changefreq>{page["changefreq"]}</changefreq>\n'
-        xml += f'    <priority>{page["priority"]}</priority>\n'
-        image_loc = _sitemap_page_image(page_url, base_url)
-        if image_loc:
-            xml += (
-                f"    <image:image><image:loc>{image_loc}</image:loc></image:image>\n"
-            )
-
-        for alt_lang_code, _ in languages:
-            alt_url = (
-                f"{base_url}/{alt_lang_code}/"
-                if page_url == ""
-                else f"{base_url}/{alt_lang_code}/{page_url}"
-            )
-            xml += (
-                f'    <xhtml:link rel="alternate" hreflang="{alt_lang_code}" href="{alt_url}"/>'
-                + "\n"
-            )
-
-        default_url = (
-            f"{base_url}/{default_language}/"
-            if page_url == ""
-            else f"{base_url}/{default_language}/{page_url}"
-        )
-        xml += (
-            f'    <xhtml:link rel="alternate" hreflang="x-default" href="{default_url}"/>'
-            + "\n"
-        )
-        xml += "  </url>\n"
-
-    published_articles = (
-        Article.objects.filter(status="published")
-        .only("slug", "updated_at", "translations", "cover_image", "featured_image")
-        .order_by("-published_at")
-    )
-
-    for article in published_articles:
-        # Languages this article actually exists in: the English base always
-        # counts; others only if present in the translations JSON. Emitting
-        # hreflang/sitemap entries for untranslated languages made Google see
-        # English content under a /xx/ URL as duplicate-without-canonical.
-        available_langs = {default_language} | set(article.translations or {})
-        if lang not in available_langs:
-            continue
-
-        lastmod = (
-            article.updated_at.strftime("%Y-%m-%d")
-            if article.updated_at
-            else current_date
-        )
-
-        # The blog detail URL is /<lang>/blog/<slug>/ — the slug and the "blog/"
-        # prefix are locale-independent, only the language prefix differs. Build
-        # it directly instead of activate()+reverse() per article × per locale
-        # (which swapped the translation catalog 2 + N_langs times per article).
-        full_url = f"{base_url}/{lang}/blog/{article.slug}/"
-
-        xml += "  <url>\n"
-        xml += f"    <loc>{full_url}</loc>\n"
-        xml += f"    <lastmod>{lastmod}</lastmod>\n"
-        xml += "    <changefreq>monthly</changefreq>\n"
-        xml += "    <priority>0.7</priority>\n"
-        cover = article.cover_image_url
-        if cover and cover.startswith("/"):
-            xml += (
-                f"    <image:image><image:loc>{base_url}{cover}</image:loc>"
-                "</image:image>\n"
-            )
-
-        for alt_lang_code, _ in languages:
-            if alt_lang_code not in available_langs:
-                continue
-            alt_url = f"{base_url}/{alt_lang_code}/blog/{article.slug}/"
-            xml += f'    <xhtml:link rel="alternate" hreflang="{alt_lang_code}" href="{alt_url}"/>\n'
-
-        default_url = f"{base_url}/{default_language}/blog/{article.slug}/"
-        xml += f'    <xhtml:link rel="alternate" hreflang="x-default" href="{default_url}"/>\n'
-
-        xml += "  </url>\n"
-
-    # Blog pagination pages: /<lang>/blog/?page=2..N. Each page is self-canonical
-    # (per test_blog_pagination_keeps_indexable_self_canonical) and indexable.
-    # Without sitemap entries Ahrefs flags them as "Indexable page not in sitemap".
-    # Page size mirrors Paginator(articles, 9) in src/blog/views.py:article_list.
-    blog_page_size = 9
-    # len() reuses the queryset's result cache (already evaluated by the loop
-    # above) instead of issuing a second COUNT(*) query.
-    total_published = len(published_articles)
-    blog_total_pages = (
-        (total_published + blog_page_size - 1) // blog_page_size
-        if total_published
-        else 0
-    )
-    for page_num in range(2, blog_total_pages + 1):
-        page_loc = f"{base_url}/{lang}/blog/?page={page_num}"
-        xml += "  <url>\n"
-        xml += f"    <loc>{page_loc}</loc>\n"
-        xml += f"    <lastmod>{static_lastmod}</lastmod>\n"
-        xml += "    <changefreq>weekly</changefreq>\n"
-        xml += "    <priority>0.6</priority>\n"
-        for alt_lang_code, _ in languages:
-            alt_page_url = f"{base_url}/{alt_lang_code}/blog/?page={page_num}"
-            xml += (
-                f'    <xhtml:link rel="alternate" hreflang="{alt_lang_code}" '
-                f'href="{alt_page_url}"/>\n'
-            )
-        default_page_url = f"{base_url}/{default_language}/blog/?page={page_num}"
-        xml += (
-            f'    <xhtml:link rel="alternate" hreflang="x-default" '
-            f'href="{default_page_url}"/>\n'
-        )
-        xml += "  </url>\n"
-
-    activate(old_lang)
-    xml += "</urlset>"
-
-    cache.set(cache_key, xml, 86400)
-    return HttpResponse(xml, content_type="application/xml; charset=utf-8")
+    name = f"sitemap-{lang}.xml" if chunk == 1 else f"sitemap-{lang}-{chunk}.xml"
+    return serve_sitemap(request, name, _get_sitemap_base_url(request))
 
 
 def sitemap_xml(request):
@@ -6,6 +6,13 @@ LibreOffice in the web container (outside the worker memory budget) and
 raced the Cloudflare 100 s edge timeout. This task moves the loop onto the
 worker and reuses each batch view's own ``convert_single`` for per-tool
 conversion logic, so sync and async batch behaviour cannot drift apart.
+
+With ``BATCH_FANOUT_ENABLED`` the loop is replaced by a chord: one
+``batch.convert_item`` subtask per file plus a ``batch.assemble`` callback
+that zips the results. The callback inherits the batch task id (via
+``Task.replace``), so /api/tasks/ status, result and token handling see the
+same task id and result payload in both modes; wall-clock latency drops to
+roughly the slowest single item when several premium workers are free.
 """
 
 import importlib
@@ -14,14 +21,19 @@ import shutil
 import time
 import zipfile
 
-from celery import shared_task
-from celery.exceptions import SoftTimeLimitExceeded
+from celery import chord, group, shared_task
+from django.conf import settings
+from django.core.cache import cache
 from src.api.logging_utils import get_logger
 from src.exceptions import ConversionError, EncryptedPDFError, InvalidPDFError
 from src.tasks.pdf_conversion import _PeakRSSSampler, update_progress
 
 logger = get_logger(__name__)
 
+# Per-batch counter of finished fan-out items (progress roll-up).
+_DONE_KEY_PREFIX = "batch_done:"
+_DONE_KEY_TTL = 3600  # matches the async temp dir lifetime
+
 
 def _load_view_class(dotted: str):
     module_path, class_name = dotted.rsplit(".", 1)
@@ -38,6 +50,234 @@ def _mark_operation(task_id: str, **fields) -> None:
         logger.warning("OperationRun update failed for %s: %s", task_id, db_exc)
 
 
+def _mark_failed(task_id: str, started_ts: float, exc: BaseException) -> None:
+    from django.utils import timezone
+
+    _mark_operation(
+        task_id,
+        status="error",
+        finished_at=timezone.now(),
+        duration_ms=int((time.time() - started_ts) * 1000),
+        error_type=type(exc).__name__,
+    )
+
+
+def _broadcast(task_id: str, event_type: str, **payload) -> None:
+    """Best-effort push to ``BatchConversionConsumer`` (ws/batch/<task_id>/)."""
+    try:
+        from asgiref.sync import async_to_sync
+        from channels.layers import get_channel_layer
+
+        layer = get_channel_layer()
+        if layer is None:
+            return
+        async_to_sync(layer.group_send)(
+            f"batch_{task_id}", {"type": event_type, **payload}
+        )
+    except Exception as ws_exc:
+        logger.debug("batch ws broadcast failed for %s: %s", task_id, ws_exc)
+
+
+def _convert_item(view, entry: dict, idx: int, params: dict, context: dict) -> dict:
+    """Convert one batch entry via ``view.convert_single``; never raises.
+
+    Returns ``{"index", "name", "output_path", "cleanup_dir"}`` on success or
+    ``{"index", "name", "error", "user_input"}`` on failure — the same
+    partial-failure contract the sync batch path applies per file.
+    """
+    from django.core.files import File
+
+    name = entry["name"]
+    try:
+        with open(entry["path"], "rb") as fp:
+            uploaded = File(fp, name=name)
+            uploaded.content_type = ""  # match UploadedFile surface
+            cleanup_dir, output_path = view.convert_single(uploaded, context, **params)
+        return {
+            "index": idx,
+            "name": name,
+            "output_path": output_path,
+            "cleanup_dir": cleanup_dir,
+        }
+    except Exception as e:  # mirror the sync batch failure contract
+        is_user_input = isinstance(e, EncryptedPDFError | InvalidPDFError)
+        log = logger.warning if is_user_input else logger.error
+        log(
+            f"Batch item failed {name}: {e}",
+            extra={**context, "file_index": idx},
+        )
+        reason = (
+            str(e).strip()
+            if isinstance(e, ConversionError) and str(e).strip()
+            else "conversion failed"
+        )
+        return {
+            "index": idx,
+            "name": name or f"file_{idx + 1}",
+            "error": reason,
+            "user_input": is_user_input,
+        }
+
+
+def _publish_item_output(item: dict, task_dir: str) -> dict:
+    """Move a fan-out item's output from worker-local temp into ``task_dir``.
+
+    ``convert_single`` writes under the converting worker's own temp dir, but
+    the chord callback may run on another worker or container, where only
+    MEDIA_ROOT/async_temp is shared. Each item gets its own subdirectory so the
+    output keeps its basename (``get_zip_entry_name`` derives ZIP names from it).
+    """
+    from src.api.base_batch_views import is_removable_cleanup_dir
+
+    if "error" in item:
+        return item
+    item_dir = os.path.join(task_dir, f"item_{item['index']}")
+    local_dir = item.get("cleanup_dir")
+    try:
+        os.makedirs(item_dir, exist_ok=True)
+        shared_path = os.path.join(item_dir, os.path.basename(item["output_path"]))
+        shutil.move(item["output_path"], shared_path)
+    except OSError as e:
+        logger.error("Batch item %s: cannot publish output: %s", item["name"], e)
+        shutil.rmtree(item_dir, ignore_errors=True)
+        item = {
+            "index": item["index"],
+            "name": item["name"],
+            "error": "conversion failed",
+            "user_input": False,
+        }
+    else:
+        item = {**item, "output_path": shared_path, "cleanup_dir": item_dir}
+    finally:
+        if is_removable_cleanup_dir(local_dir):
+            shutil.rmtree(local_dir, ignore_errors=True)
+    return item
+
+
+def _assemble_batch(
+    task,
+    task_id: str,
+    view,
+    items: list[dict],
+    task_dir: str,
+    output_zip_filename: str,
+    started_ts: float,
+    notify_user_id: int | None,
+    notify_lang: str,
+) -> dict:
+    """Zip successful items (in upload order), record success, notify."""
+    from django.utils import timezone
+
+    items = sorted(items, key=lambda item: item["index"])
+    output_files = [
+        (item["name"], item["output_path"]) for item in items if "error" not in item
+    ]
+    failed_files = [(item["name"], item["error"]) for item in items if "error" in item]
+    all_failures_user_input = all(
+        item.get("user_input", False) for item in items if "error" in item
+    )
+
+    if not output_files:
+        raise ConversionError(
+            "Failed to process any files"
+            if all_failures_user_input
+            else "Batch conversion failed"
+        )
+
+    update_progress(task, 92, "Packing archive...", task_id=task_id)
+    zip_path = os.path.join(task_dir, output_zip_filename)
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zipf:
+        for original_name, output_path in output_files:
+            zipf.write(output_path, view.get_zip_entry_name(original_name, output_path))
+        if failed_files:
+            zipf.writestr(
+                "conversion_errors.txt",
+                "".join(f"{n}: {r}\n" for n, r in failed_files),
+            )
+
+    _mark_operation(
+        task_id,
+        status="success",
+        finished_at=timezone.now(),
+        duration_ms=int((time.time() - started_ts) * 1000),
+        output_size=os.path.getsize(zip_path),
+    )
+
+    # Opt-in "email me the result" (set by the batch view layer).
+    if notify_user_id:
+        try:
+            from src.tasks.email import send_conversion_result
+
+            send_conversion_result.delay(
+                user_id=notify_user_id,
+                task_id=task_id,
+                output_path=zip_path,
+                output_filename=output_zip_filename,
+                lang=notify_lang,
+            )
+        except Exception as email_exc:
+            logger.warning("result email enqueue failed, ignoring: %s", email_exc)
+
+    # Web-push for batches sent to background (webhook/email pattern).
+    try:
+        from src.api.cancel_task_view import is_task_background
+
+        if is_task_background(task_id):
+            from src.tasks.push import send_conversion_ready
+            from src.users.models import OperationRun
+
+            push_user_id = (
+                OperationRun.objects.filter(task_id=task_id)
+                .values_list("user_id", flat=True)
+                .first()
+            )
+            if push_user_id:
+                send_conversion_ready.delay(
+                    user_id=push_user_id,
+                    task_id=task_id,
+                    output_filename=output_zip_filename,
+                    lang=notify_lang,
+                )
+    except Exception as push_exc:
+        logger.warning("push enqueue failed, ignoring: %s", push_exc)
+
+    _broadcast(
+        task_id,
+        "batch.completed",
+        total_files=len(items),
+        successful_files=len(output_files),
+        failed_files=len(failed_files),
+    )
+
+    return {
+        "output_path": zip_path,
+        "output_filename": output_zip_filename,
+        "batch_count": len(output_files),
+        "batch_failed_count": len(failed_files),
+    }
+
+
+def _cleanup_batch(items: list[dict], input_files: list[dict]) -> None:
+    from src.api.base_batch_views import is_removable_cleanup_dir
+
+    for item in items:
+        d = item.get("cleanup_dir")
+        if is_removable_cleanup_dir(d):
+            shutil.rmtree(d, ignore_errors=True)
+    # Inputs are no longer needed once outputs are zipped (or the task
+    # failed); the ZIP stays in task_dir for TaskResultAPIView. The
+    # async_temp reaper sweeps the whole dir after expiry regardless.
+    for entry in input_files:
+        try:
+            os.remove(entry["path"])
+        except OSError:
+            pass
+
+
+def _use_fanout(input_files: list[dict]) -> bool:
+    return getattr(settings, "BATCH_FANOUT_ENABLED", False) and len(input_files) > 1
+
+
 @shared_task(
     bind=True,
     name="batch.convert",
@@ -66,7 +306,6 @@ def batch_conversion_task(
         params: tool-specific POST params (already premium-validated in the view)
         output_zip_filename: user-facing ZIP name (view's OUTPUT_ZIP_FILENAME)
     """
-    from django.core.files import File
     from django.utils import timezone
 
     started_ts = time.time()
@@ -89,18 +328,52 @@ def batch_conversion_task(
     except Exception as db_exc:
         logger.warning("OperationRun 'running' update failed: %s", db_exc)
 
+    if _use_fanout(input_files):
+        total = len(input_files)
+        cache.set(f"{_DONE_KEY_PREFIX}{task_id}", 0, _DONE_KEY_TTL)
+        update_progress(self, 5, f"Converting {total} files...")
+        # Keep items and the callback on the queue this batch was routed to
+        # (premium), so fan-out never spills onto the free-tier workers.
+        queue = (self.request.delivery_info or {}).get("routing_key") or "premium"
+        header = group(
+            batch_convert_item_task.s(
+                task_id=task_id,
+                view_dotted=view_dotted,
+                entry=entry,
+                index=idx,
+                total=total,
+                params=params,
+            ).set(queue=queue)
+            for idx, entry in enumerate(input_files)
+        )
+        body = batch_assemble_task.s(
+            task_id=task_id,
+            view_dotted=view_dotted,
+            input_files=input_files,
+            output_zip_filename=output_zip_filename,
+            started_ts=started_ts,
+            notify_user_id=notify_user_id,
+            notify_lang=notify_lang,
+        ).set(queue=queue)
+        # A header item lost to SIGKILL/OOM fails the whole chord; the errback
+        # records the error instead of leaving the run "running" until the
+        # stuck-operations reaper finds it.
+        body.on_error(
+            batch_fanout_failed.s(
+                task_id=task_id, started_ts=started_ts, input_files=input_files
+            ).set(queue=queue)
+        )
+        raise self.replace(chord(header, body))
+
     peak_sampler = _PeakRSSSampler()
     peak_sampler.start()
 
     view = _load_view_class(view_dotted)()
     context = {"task_id": task_id, "batch_view": view_dotted}
     task_dir = os.path.dirname(input_files[0]["path"]) if input_files else None
-    cleanup_dirs: set[str] = set()
+    items: list[dict] = []
 
     try:
-        output_files: list[tuple[str, str]] = []
-        failed_files: list[tuple[str, str]] = []
-        all_failures_user_input = True
         total = len(input_files)
 
         for idx, entry in enumerate(input_files):
@@ -109,135 +382,171 @@ def batch_conversion_task(
                 int(5 + (idx / max(total, 1)) * 85),
                 f"Converting file {idx + 1}/{total}...",
             )
-            name = entry["name"]
-            try:
-                with open(entry["path"], "rb") as fp:
-                    uploaded = File(fp, name=name)
-                    uploaded.content_type = ""  # match UploadedFile surface
-                    cleanup_dir, output_path = view.convert_single(
-                        uploaded, context, **params
-                    )
-                cleanup_dirs.add(cleanup_dir)
-                output_files.append((name, output_path))
-            except Exception as e:  # mirror the sync batch failure contract
-                is_user_input = isinstance(e, EncryptedPDFError | InvalidPDFError)
-                if not is_user_input:
-                    all_failures_user_input = False
-                log = logger.warning if is_user_input else logger.error
-                log(
-                    f"Batch item failed {name}: {e}",
-                    extra={**context, "file_index": idx},
-                )
-                reason = (
-                    str(e).strip()
-                    if isinstance(e, ConversionError) and str(e).strip()
-                    else "conversion failed"
-                )
-                failed_files.append((name or f"file_{idx + 1}", reason))
-
-        if not output_files:
-            raise ConversionError(
-                "Failed to process any files"
-                if all_failures_user_input
-                else "Batch conversion failed"
+            item = _convert_item(view, entry, idx, params, context)
+            items.append(item)
+            _broadcast(
+                task_id,
+                "batch.file_completed",
+                filename=item["name"],
+                file_index=idx,
+                message=item.get("error", ""),
             )
 
-        update_progress(self, 92, "Packing archive...")
-        zip_path = os.path.join(task_dir, output_zip_filename)
-        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zipf:
-            for original_name, output_path in output_files:
-                zipf.write(
-                    output_path, view.get_zip_entry_name(original_name, output_path)
-                )
-            if failed_files:
-                zipf.writestr(
-                    "conversion_errors.txt",
-                    "".join(f"{n}: {r}\n" for n, r in failed_files),
-                )
-
-        _mark_operation(
+        return _assemble_batch(
+            self,
             task_id,
-            status="success",
-            finished_at=timezone.now(),
-            duration_ms=int((time.time() - started_ts) * 1000),
-            output_size=os.path.getsize(zip_path),
+            view,
+            items,
+            task_dir,
+            output_zip_filename,
+            started_ts,
+            notify_user_id,
+            notify_lang,
         )
 
-        # Opt-in "email me the result" (set by the batch view layer).
-        if notify_user_id:
-            try:
-                from src.tasks.email import send_conversion_result
+    except Exception as exc:  # incl. SoftTimeLimitExceeded
+        _mark_failed(task_id, started_ts, exc)
+        raise
+    finally:
+        _cleanup_batch(items, input_files)
+        peak_sampler.stop()
+        if peak_sampler.peak_mb is not None:
+            _mark_operation(task_id, peak_rss_mb=peak_sampler.peak_mb)
+
 
-                send_conversion_result.delay(
-                    user_id=notify_user_id,
-                    task_id=task_id,
-                    output_path=zip_path,
-                    output_filename=output_zip_filename,
-                    lang=notify_lang,
-                )
-            except Exception as email_exc:
-                logger.warning("result email enqueue failed, ignoring: %s", email_exc)
+@shared_task(
+    bind=True,
+    name="batch.convert_item",
+    # One file of a fanned-out batch: same budget as a single conversion.
+    soft_time_limit=420,
+    time_limit=480,
+    max_retries=0,
+)
+def batch_convert_item_task(
+    self,
+    task_id: str,
+    view_dotted: str,
+    entry: dict,
+    index: int,
+    total: int,
+    params: dict,
+) -> dict:
+    """Convert one file of a fanned-out batch and roll progress up to the batch.
+
+    Always returns an item outcome (see ``_convert_item``) instead of raising,
+    so one bad file cannot fail the chord and the callback can still build the
+    partial ZIP plus ``conversion_errors.txt``. Successful outputs are moved
+    into the batch's shared async_temp dir, so the callback can read them
+    from whichever worker it lands on.
+    """
+    from src.api.cancel_task_view import is_task_cancelled
 
-        # Web-push for batches sent to background (webhook/email pattern).
+    if is_task_cancelled(task_id):
+        item = {
+            "index": index,
+            "name": entry["name"] or f"file_{index + 1}",
+            "error": "cancelled",
+            "user_input": True,
+        }
+    else:
+        peak_sampler = _PeakRSSSampler()
+        peak_sampler.start()
         try:
-            from src.api.cancel_task_view import is_task_background
+            view = _load_view_class(view_dotted)()
+            context = {"task_id": task_id, "batch_view": view_dotted}
+            item = _convert_item(view, entry, index, params, context)
+            item = _publish_item_output(item, os.path.dirname(entry["path"]))
+        finally:
+            peak_sampler.stop()
+        item["peak_rss_mb"] = peak_sampler.peak_mb
 
-            if is_task_background(task_id):
-                from src.tasks.push import send_conversion_ready
-                from src.users.models import OperationRun
+    done_key = f"{_DONE_KEY_PREFIX}{task_id}"
+    try:
+        done = cache.incr(done_key)
+    except ValueError:  # key evicted/expired: count this item at least
+        cache.add(done_key, 1, _DONE_KEY_TTL)
+        done = 1
+    done = min(done, total)
+    progress = int(5 + (done / max(total, 1)) * 85)
+    message = f"Converted {done}/{total} files..."
+    try:
+        update_progress(self, progress, message, task_id=task_id)
+    except Exception as state_exc:
+        logger.warning("batch progress update failed for %s: %s", task_id, state_exc)
+    _broadcast(
+        task_id,
+        "batch.file_completed",
+        filename=item["name"],
+        file_index=index,
+        message=item.get("error", ""),
+    )
+    _broadcast(
+        task_id,
+        "batch.progress",
+        total_files=total,
+        completed_files=done,
+        current_file=item["name"],
+        progress=progress,
+        message=message,
+    )
+    return item
 
-                push_user_id = (
-                    OperationRun.objects.filter(task_id=task_id)
-                    .values_list("user_id", flat=True)
-                    .first()
-                )
-                if push_user_id:
-                    send_conversion_ready.delay(
-                        user_id=push_user_id,
-                        task_id=task_id,
-                        output_filename=output_zip_filename,
-                        lang=notify_lang,
-                    )
-        except Exception as push_exc:
-            logger.warning("push enqueue failed, ignoring: %s", push_exc)
 
-        return {
-            "output_path": zip_path,
-            "output_filename": output_zip_filename,
-            "batch_count": len(output_files),
-            "batch_failed_count": len(failed_files),
-        }
+@shared_task(
+    bind=True,
+    name="batch.assemble",
+    soft_time_limit=300,
+    time_limit=360,
+    max_retries=0,
+)
+def batch_assemble_task(
+    self,
+    items: list[dict],
+    task_id: str,
+    view_dotted: str,
+    input_files: list[dict],
+    output_zip_filename: str,
+    started_ts: float,
+    notify_user_id: int | None = None,
+    notify_lang: str = "",
+) -> dict:
+    """Chord callback: zip the fanned-out item outputs into the batch result.
 
-    except SoftTimeLimitExceeded:
-        _mark_operation(
+    Runs under the original batch task id (``Task.replace``), so it returns
+    exactly what the serial ``batch_conversion_task`` would have returned.
+    """
+    view = _load_view_class(view_dotted)()
+    task_dir = os.path.dirname(input_files[0]["path"])
+
+    try:
+        return _assemble_batch(
+            self,
             task_id,
-            status="error",
-            finished_at=timezone.now(),
-            duration_ms=int((time.time() - started_ts) * 1000),
-            error_type="SoftTimeLimitExceeded",
+            view,
+            items,
+            task_dir,
+            output_zip_filename,
+            started_ts,
+            notify_user_id,
+            notify_lang,
         )
-        raise
     except Exception as exc:
-        _mark_operation(
-            task_id,
-            status="error",
-            finished_at=timezone.now(),
-            duration_ms=int((time.time() - started_ts) * 1000),
-            error_type=type(exc).__name__,
-        )
+        _mark_failed(task_id, started_ts, exc)
         raise
     finally:
-        for d in cleanup_dirs:
-            if d and os.path.isdir(d):
-                shutil.rmtree(d, ignore_errors=True)
-        # Inputs are no longer needed once outputs are zipped (or the task
-        # failed); the ZIP stays in task_dir for TaskResultAPIView. The
-        # async_temp reaper sweeps the whole dir after expiry regardless.
-        for entry in input_files:
-            try:
-                os.remove(entry["path"])
-            except OSError:
-                pass
-        peak_sampler.stop()
-        if peak_sampler.peak_mb is not None:
-            _mark_operation(task_id, peak_rss_mb=peak_sampler.peak_mb)
+        _cleanup_batch(items, input_files)
+        cache.delete(f"{_DONE_KEY_PREFIX}{task_id}")
+        peaks = [item["peak_rss_mb"] for item in items if item.get("peak_rss_mb")]
+        if peaks:
+            _mark_operation(task_id, peak_rss_mb=max(peaks))
+
+
+@shared_task(name="batch.fanout_failed", max_retries=0)
+def batch_fanout_failed(
+    request, exc, traceback, task_id: str, started_ts: float, input_files: list[dict]
+) -> None:
+    """Chord errback: a header item died without returning an outcome."""
+    logger.error("Batch fan-out failed for %s: %s", task_id, exc)
+    _mark_failed(task_id, started_ts, exc)
+    _cleanup_batch([], input_files)
+    cache.delete(f"{_DONE_KEY_PREFIX}{task_id}")
@@ -6,6 +6,9 @@ cleaning up temporary files, updating statistics, etc.
 """
 
 import gc
+import gzip
+import json
+import os
 import shutil
 import time
 from pathlib import Path
@@ -277,6 +280,7 @@ def update_subscription_daily():
 
     try:
         from django.contrib.auth import get_user_model
+        from src.users.local_cache import invalidate_premium_status
 
         User = get_user_model()
         now = timezone.now()
@@ -329,9 +333,7 @@ def update_subscription_daily():
             # bulk_update bypasses User.save(), so the per-user premium caches
             # aren't invalidated. Delete them explicitly, otherwise an expired
             # user keeps premium behaviour until the short cache TTL lapses.
-            for user in users_to_update_expired:
-                cache.delete(f"user_premium_active:{user.id}")
-                cache.delete(f"user_subscription_status_{user.id}")
+            invalidate_premium_status(*[user.id for user in users_to_update_expired])
 
         cache.delete("site_heroes")
         cache.delete("top_subscribers_10")
@@ -543,112 +545,156 @@ def cleanup_stuck_operations(
         return {"status": "error", "message": str(exc)}
 
 
+# Where cleanup_old_operations archives expired OperationRun rows.
+OPERATION_EXPORT_DIR = Path(
+    getattr(settings, "OPERATION_EXPORT_DIR", "/app/logs/operation_exports")
+)
+_OPERATION_EXPORT_FIELDS = (
+    "id",
+    "conversion_type",
+    "status",
+    "user_id",
+    "is_premium",
+    "created_at",
+    "finished_at",
+    "duration_ms",
+    "input_size",
+    "output_size",
+    "error_message",
+)
+# Watermark of an export in progress; present only while a run is unfinished.
+_CLEANUP_STATE_FILE = "cleanup_old_operations.state.json"
+
+
+def _operation_export_line(row: dict) -> bytes:
+    for field in ("created_at", "finished_at"):
+        row[field] = row[field].isoformat() if row[field] else None
+    return json.dumps(row, ensure_ascii=False).encode() + b"\n"
+
+
+def _write_cleanup_state(path: Path, state: dict) -> None:
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(state))
+    os.replace(tmp_path, path)
+
+
 @shared_task(name="maintenance.cleanup_old_operations", queue="maintenance")
-def cleanup_old_operations(retention_days: int = 365):
+def cleanup_old_operations(retention_days: int = 365, chunk_size: int = 2000):
     """
     Delete old OperationRun records with export.
 
-    Exports operation records to JSON before deletion, then removes records
-    older than retention_days to keep database size manageable.
+    Streams records older than retention_days to a gzip-compressed NDJSON
+    file (one JSON object per line; read with ``zcat … | jq``) and deletes
+    them chunk by chunk, so neither the export nor the DELETE grows with the
+    size of the backlog.
+
+    Each chunk is a keyset page (``id > watermark``) read with ``iterator()``
+    and written as its own gzip member. After the member is fsynced, the
+    watermark (last exported id, file size) is saved next to the export, and
+    only then is the chunk deleted in its own short transaction. A run that
+    dies midway is resumed by the next one: it truncates a half-written
+    member, deletes the rows it had already exported, and continues with the
+    same cutoff and file — nothing is lost or exported twice.
 
     Args:
         retention_days: Number of days to retain operation records (default: 365)
+        chunk_size: Rows exported and deleted per transaction
     """
+    lock_key = "maintenance:cleanup_old_operations:lock"
+    if not cache.add(lock_key, "1", timeout=6 * 3600):
+        logger.info("Cleanup old operations already running, skipping")
+        return {"status": "skipped"}
+
     try:
-        import json
-        from datetime import timedelta
-        from pathlib import Path
+        from datetime import datetime, timedelta
 
         from src.users.models import OperationRun
 
-        cutoff_time = timezone.now() - timedelta(days=retention_days)
-
-        old_operations = OperationRun.objects.filter(created_at__lt=cutoff_time)
-        deleted_count = old_operations.count()
-
-        if deleted_count > 0:
-            # Export to JSON before deletion
-            export_dir = Path("/app/logs/operation_exports")
-            export_dir.mkdir(parents=True, exist_ok=True)
+        export_dir = Path(OPERATION_EXPORT_DIR)
+        export_dir.mkdir(parents=True, exist_ok=True)
+        state_path = export_dir / _CLEANUP_STATE_FILE
 
-            export_file = (
-                export_dir
-                / f"operations_export_{timezone.now().strftime('%Y%m%d_%H%M%S')}.json"
-            )
+        resumed = state_path.exists()
+        if resumed:
+            state = json.loads(state_path.read_text())
+        else:
+            stamp = timezone.now().strftime("%Y%m%d_%H%M%S")
+            state = {
+                "cutoff": (timezone.now() - timedelta(days=retention_days)).isoformat(),
+                "retention_days": retention_days,
+                "export_file": str(export_dir / f"operations_export_{stamp}.ndjson.gz"),
+                "exported_through": 0,
+                "bytes": 0,
+                "records": 0,
+            }
+        export_file = Path(state["export_file"])
+        expired = OperationRun.objects.filter(
+            created_at__lt=datetime.fromisoformat(state["cutoff"])
+        )
 
-            # Prepare data for export
-            export_data = []
-            for op in old_operations.values(
-                "id",
-                "conversion_type",
-                "status",
-                "user_id",
-                "is_premium",
-                "created_at",
-                "finished_at",
-                "duration_ms",
-                "input_size",
-                "output_size",
-                "error_message",
-            ):
-                # Convert datetime to string for JSON serialization
-                op["created_at"] = (
-                    op["created_at"].isoformat() if op["created_at"] else None
-                )
-                op["finished_at"] = (
-                    op["finished_at"].isoformat() if op["finished_at"] else None
+        # Rows an interrupted run had exported but not yet deleted.
+        expired.filter(pk__lte=state["exported_through"]).delete()
+
+        with open(export_file, "ab") as fh:
+            # Drop a gzip member that was cut off mid-write.
+            fh.truncate(state["bytes"])
+            while True:
+                low = state["exported_through"]
+                page = (
+                    expired.filter(pk__gt=low)
+                    .order_by("pk")
+                    .values(*_OPERATION_EXPORT_FIELDS)[:chunk_size]
                 )
-                export_data.append(op)
-
-            # Write to file
-            with open(export_file, "w") as f:
-                json.dump(
-                    {
-                        "export_date": timezone.now().isoformat(),
-                        "retention_days": retention_days,
-                        "records_count": deleted_count,
-                        "operations": export_data,
-                    },
-                    f,
-                    indent=2,
+                count = 0
+                with gzip.GzipFile(fileobj=fh, mode="wb") as gz:
+                    for row in page.iterator(chunk_size=chunk_size):
+                        gz.write(_operation_export_line(row))
+                        high = row["id"]
+                        count += 1
+                if not count:
+                    fh.truncate(state["bytes"])
+                    break
+                fh.flush()
+                os.fsync(fh.fileno())
+
+                state.update(
+                    exported_through=high,
+                    bytes=fh.tell(),
+                    records=state["records"] + count,
                 )
-
-            logger.info(
-                f"Exported {deleted_count} operations to {export_file}",
-                extra={
-                    "event": "operations_exported",
-                    "count": deleted_count,
-                    "file": str(export_file),
-                },
-            )
-
-            # Now delete
-            old_operations.delete()
-
+                _write_cleanup_state(state_path, state)
+                # One short transaction per chunk (QuerySet.delete is atomic).
+                expired.filter(pk__gt=low, pk__lte=high).delete()
+
+        state_path.unlink(missing_ok=True)
+        deleted_count = state["records"]
+        if not deleted_count:
+            export_file.unlink(missing_ok=True)
             logger.info(
-                f"Cleanup old operations completed: {deleted_count} operations deleted",
+                "No old operations to cleanup",
                 extra={
                     "event": "cleanup_old_operations",
-                    "deleted_count": deleted_count,
                     "retention_days": retention_days,
-                    "export_file": str(export_file),
                 },
             )
+            return {"status": "success", "deleted_count": 0}
 
-            return {
-                "status": "success",
+        logger.info(
+            f"Cleanup old operations completed: {deleted_count} operations "
+            f"exported to {export_file} and deleted",
+            extra={
+                "event": "cleanup_old_operations",
                 "deleted_count": deleted_count,
+                "retention_days": state["retention_days"],
                 "export_file": str(export_file),
-            }
-        else:
-            logger.info(
-                "No old operations to cleanup",
-                extra={
-                    "event": "cleanup_old_operations",
-                    "retention_days": retention_days,
-                },
-            )
-            return {"status": "success", "deleted_count": 0}
+                "resumed": resumed,
+            },
+        )
+        return {
+            "status": "success",
+            "deleted_count": deleted_count,
+            "export_file": str(export_file),
+        }
 
     except Exception as exc:
         logger.error(
@@ -657,6 +703,77 @@ def cleanup_old_operations(retention_days: int = 365):
             extra={"event": "cleanup_old_operations_failed"},
         )
         return {"status": "error", "message": str(exc)}
+    finally:
+        cache.delete(lock_key)
+
+
+@shared_task(name="maintenance.rollup_operation_runs", queue="maintenance")
+def rollup_operation_runs():
+    """Fold settled OperationRun rows into the admin analytics rollups.
+
+    Incremental from the stored high-water mark; see
+    ``src.users.operation_rollups``.
+    """
+    from src.users.operation_rollups import rollup_operation_runs as _rollup
+
+    try:
+        result = _rollup()
+    except Exception as exc:
+        logger.error(
+            f"Operation rollup failed: {str(exc)}",
+            exc_info=True,
+            extra={"event": "rollup_operation_runs_failed"},
+        )
+        return {"status": "error", "message": str(exc)}
+    if result["days"]:
+        logger.info(
+            "Operation rollups updated",
+            extra={"event": "rollup_operation_runs", **result},
+        )
+    return {"status": "success", **result}
+
+
+@shared_task(name="maintenance.export_operation_runs", queue="maintenance")
+def export_operation_runs(user_id: int, query_string: str, name: str):
+    """Write an OperationRun CSV export requested from the admin changelist.
+
+    The changelist is rebuilt from the admin's own query string for the
+    requesting staff user, so the job exports exactly the filtered rows the
+    streaming export would. The file is downloaded from the admin.
+    """
+    from django.contrib import admin
+    from django.contrib.auth import get_user_model
+    from django.http import HttpRequest, QueryDict
+    from src.users.models import OperationRun
+    from src.users.operation_export import write_export
+
+    try:
+        request = HttpRequest()
+        request.method = "GET"
+        request.GET = QueryDict(query_string)
+        request.user = get_user_model().objects.get(pk=user_id, is_staff=True)
+        model_admin = admin.site._registry[OperationRun]
+        queryset = model_admin.get_changelist_instance(request).get_queryset(request)
+
+        started = time.monotonic()
+        path = write_export(queryset, name)
+        logger.info(
+            "Operation export written",
+            extra={
+                "event": "operation_export_written",
+                "file": str(path),
+                "bytes": path.stat().st_size,
+                "seconds": round(time.monotonic() - started, 1),
+            },
+        )
+        return {"status": "success", "file": str(path)}
+    except Exception as exc:
+        logger.error(
+            f"Operation export failed: {str(exc)}",
+            exc_info=True,
+            extra={"event": "operation_export_failed"},
+        )
+        return {"status": "error", "message": str(exc)}
 
 
 @shared_task(name="maintenance.update_statistics", queue="maintenance")
@@ -707,15 +824,65 @@ def detect_stuck_webhooks():
     return {"stuck": stuck}
 
 
+@shared_task(name="maintenance.flush_pageviews", queue="maintenance")
+def flush_pageviews():
+    """Move buffered page views from Redis into ``PageViewDaily``.
+
+    ``TrafficCountingMiddleware`` only HINCRBYs a per-day Redis hash; this
+    task applies the accumulated counts in one upsert per day and prunes the
+    flush ledger. See ``src.frontend.middleware.flush_buffered_pageviews`` for
+    the crash-safe handoff.
+    """
+    from datetime import timedelta
+
+    from src.frontend.middleware import flush_buffered_pageviews
+    from src.users.models import PageViewFlush
+
+    stats = flush_buffered_pageviews()
+    if stats is None:
+        return {"skipped": True}
+    # The ledger only has to outlive a batch's Redis key (7-day TTL).
+    PageViewFlush.objects.filter(
+        flushed_at__lt=timezone.now() - timedelta(days=14)
+    ).delete()
+    if stats["batches"]:
+        logger.info(
+            "Flushed buffered page views",
+            extra={"event": "pageviews_flushed", **stats},
+        )
+    return stats
+
+
+@shared_task(name="maintenance.flush_indexnow_queue", queue="maintenance")
+def flush_indexnow_queue():
+    """Submit queued IndexNow URLs as single-URL GETs, with backoff on 429/5xx.
+
+    See ``src.frontend.indexnow.flush_indexnow_queue``.
+    """
+    from src.frontend.indexnow import flush_indexnow_queue as flush
+
+    stats = flush()
+    if stats is None:
+        return {"skipped": True}
+    if stats["requests"] or "backoff" in stats:
+        logger.info(
+            "Flushed IndexNow queue",
+            extra={"event": "indexnow_flushed", **stats},
+        )
+    return stats
+
+
 @shared_task(name="maintenance.submit_sitemap_indexnow", queue="maintenance")
 def submit_sitemap_indexnow():
     """Bulk-submit every sitemap URL to IndexNow. Manual / one-shot only.
 
     Deliberately NOT on the beat schedule: a nightly full sweep is exactly the
     "IndexNow is in batch mode" warning in Bing Webmaster Tools (excessive load
-    + indexing delays). Blog articles are pinged per locale on real change by
+    + indexing delays). Blog articles are queued per locale on real change by
     src.blog.signals; use this task by hand after publishing a batch of new
-    tool pages that nothing else announces.
+    tool pages that nothing else announces. The URLs go into the same queue,
+    so ones already pending are not sent twice, and the queue is drained in
+    urlList batches right away.
 
     No-op when IndexNow is disabled/unconfigured (e.g. dev).
     """
@@ -729,7 +896,7 @@ def submit_sitemap_indexnow():
 
     try:
         call_command("submit_sitemap_indexnow")
-        logger.info("Submitted sitemap URLs to IndexNow")
+        logger.info("Queued sitemap URLs for IndexNow")
         return {"submitted": True}
     except Exception as e:
         logger.warning("IndexNow sitemap submit failed: %s: %s", type(e).__name__, e)
@@ -752,7 +919,27 @@ def publish_scheduled_articles():
     try:
         call_command("import_blog_articles", verbosity=0)
         logger.info("Scheduled-article check complete")
-        return {"ok": True}
     except Exception as e:
         logger.warning("Scheduled-article publish failed: %s: %s", type(e).__name__, e)
         return {"ok": False, "error": str(e)}
+    # A newly published article has to show up in the prebuilt sitemaps now,
+    # not at the next hourly build. A no-op when nothing changed.
+    build_sitemaps.delay()
+    return {"ok": True}
+
+
+@shared_task(name="maintenance.build_sitemaps", queue="maintenance")
+def build_sitemaps(force: bool = False):
+    """Rebuild the static sitemap artifacts whose inputs changed."""
+    from src.frontend.sitemaps import build_sitemaps as build
+
+    try:
+        manifest = build(force=force)
+        return {"ok": True, "files": len(manifest["files"])}
+    except Exception as e:
+        logger.error(
+            f"Sitemap build failed: {e}",
+            exc_info=True,
+            extra={"event": "sitemap_build_failed"},
+        )
+        return {"ok": False, "error": str(e)}
@@ -20,6 +20,7 @@ from celery.exceptions import Ignore, SoftTimeLimitExceeded
 from django.core.files.base import File
 from src.api.cancel_task_view import clear_task_cancelled, is_task_cancelled
 from src.api.logging_utils import get_logger
+from src.api.pdf_info import PdfInfo, remember_pdf_info
 
 logger = get_logger(__name__)
 
@@ -47,21 +48,16 @@ FAST_CONVERSION_TYPES: frozenset[str] = frozenset(
 # PDF. Everything else in FAST_CONVERSION_TYPES emits a single ``.pdf``.
 _ZIP_OUTPUT_TYPES: frozenset[str] = frozenset({"pdf_to_jpg", "split_pdf"})
 
-# Maximum output file size (bytes) eligible for SHA-256 result caching.
-# Large files are not cached to avoid filling Redis.
-_CACHE_MAX_BYTES = 5 * 1024 * 1024  # 5 MB
-_CACHE_TTL = 86400  # 24 hours
-
 
 def _cached_output_ext(conversion_type: str) -> str:
     """Output file extension to use when serving a FAST conversion from cache.
 
-    Fresh cache entries store their real extension alongside the bytes (taken
-    from the actual output path), so this is only the fallback for legacy
-    bytes-only entries written before that change. ``pdf_to_jpg``/``split_pdf``
-    emit a ZIP; every other FAST type emits a single PDF. Historically this
-    fallback defaulted unknown types to ``.pdf``, which served ``split_pdf``
-    ZIP bytes under a ``.pdf`` name — a corrupt download.
+    Cache entries store their real extension (taken from the actual output
+    path), so this is only the fallback for legacy bytes-only entries written
+    before that change. ``pdf_to_jpg``/``split_pdf`` emit a ZIP; every other
+    FAST type emits a single PDF. Historically this fallback defaulted unknown
+    types to ``.pdf``, which served ``split_pdf`` ZIP bytes under a ``.pdf``
+    name — a corrupt download.
     """
     return ".zip" if conversion_type in _ZIP_OUTPUT_TYPES else ".pdf"
 
@@ -123,9 +119,20 @@ def check_task_cancelled(task_id: str) -> None:
         raise TaskCancelledException(f"Task {task_id} cancelled by user")
 
 
-def update_progress(task, progress: int, current_step: str = "", total_steps: int = 0):
-    """Helper to update task progress."""
+def update_progress(
+    task,
+    progress: int,
+    current_step: str = "",
+    total_steps: int = 0,
+    task_id: str | None = None,
+):
+    """Helper to update task progress.
+
+    ``task_id`` targets another task's state (e.g. a batch item reporting into
+    its parent batch id); by default the running task's own id is used.
+    """
     task.update_state(
+        task_id=task_id,
         state="PROGRESS",
         meta={
             "progress": progress,
@@ -213,11 +220,12 @@ def _success_notifications(
             from datetime import timedelta
 
             from django.utils import timezone as _tz
-            from src.api.webhook_delivery import deliver
+            from src.api.webhook_delivery import enqueue
             from src.users.models import User
 
             user = User.objects.get(pk=api_key_user_id)
-            deliver(
+            # Outbox: sent by the webhooks.* tasks, retried with backoff.
+            enqueue(
                 webhook_url=webhook_url,
                 payload={
                     "task_id": task_id,
@@ -228,7 +236,7 @@ def _success_notifications(
                 user=user,
             )
         except Exception as webhook_exc:
-            logger.warning("webhook delivery raised, ignoring: %s", webhook_exc)
+            logger.warning("webhook enqueue raised, ignoring: %s", webhook_exc)
 
     # Opt-in "email me the result" (premium, set by the view layer).
     # Enqueue-only here; rendering/attachment happen in the email task.
@@ -315,6 +323,9 @@ def generic_conversion_task(
     # FAST_CONVERSION_TYPES, `== "pdf_to_word"` branches all use lowercase). A
     # caller that hands us the UPPER analytics label must not blow up dispatch.
     conversion_type = str(conversion_type or "").lower()
+    # Parsed-PDF metadata from the view (PdfInfo.to_dict()). Not a converter
+    # parameter, so it stays out of the converter kwargs and the cache key.
+    pdf_info_data = kwargs.pop("pdf_info", None)
     task_dir = os.path.dirname(input_path)
     output_path = None
     # Use the task_id parameter (same as self.request.id, but explicit)
@@ -399,11 +410,21 @@ def generic_conversion_task(
             raise
 
         # Compute SHA-256 once — used for both Sentry context and result cache.
-        # Skip it for large non-cacheable inputs: hashing a heavy file is a
-        # full extra read that buys nothing (the cache only serves FAST types).
+        # With the result cache disabled, skip it for large inputs: hashing a
+        # heavy file is then a full extra read that buys nothing.
+        from src.tasks.result_cache import result_cache
+
         file_sha256: str | None = None
-        if (
-            conversion_type in FAST_CONVERSION_TYPES
+        if pdf_info_data:
+            # The view already hashed and parsed this exact file; seed this
+            # process so the converter's validation finds it by hash.
+            try:
+                file_sha256 = remember_pdf_info(PdfInfo.from_dict(pdf_info_data)).sha256
+            except (TypeError, ValueError) as info_exc:
+                logger.debug("Ignoring malformed pdf_info kwarg: %s", info_exc)
+        if file_sha256 is None and (
+            result_cache.enabled
+            or conversion_type in FAST_CONVERSION_TYPES
             or os.path.getsize(input_path) < 20 * 1024 * 1024
         ):
             try:
@@ -436,48 +457,30 @@ def generic_conversion_task(
                 "Failed to enrich Sentry context with file details: %s", sentry_exc
             )
 
-        # --- SHA-256 result cache (idempotent operations only) ---
-        # For FAST_CONVERSION_TYPES we check if an identical file+params combo
-        # was already converted recently and serve the cached output directly.
-        # Only small outputs (<5 MB) are cached to avoid bloating Redis.
-        cached_output: bytes | None = None
+        # --- SHA-256 result cache ---
+        # If an identical file+params combo was converted recently, serve the
+        # cached output directly. Outputs of every size and type live on disk
+        # (tasks/result_cache); Redis only holds the index entry.
+        cache_hit: tuple[str, int] | None = None
         cache_key_str: str | None = None
-        if conversion_type in FAST_CONVERSION_TYPES:
+        if result_cache.enabled:
             try:
-                from django.core.cache import cache as django_cache
-
                 if file_sha256 is None:
                     file_sha256 = _sha256_file(input_path)
                 cache_key_str = _cache_key(file_sha256, conversion_type, kwargs)
-                cached_output = django_cache.get(cache_key_str)
-                if cached_output is not None:
-                    logger.info(
-                        f"Cache hit for {conversion_type} (sha256={file_sha256[:12]}…)",
-                        extra={"event": "conversion_cache_hit"},
-                    )
+                base_name = os.path.splitext(original_filename)[0]
+                cache_hit = result_cache.fetch(
+                    cache_key_str,
+                    os.path.join(task_dir, f"{base_name}_convertica"),
+                    _cached_output_ext(conversion_type),
+                )
             except Exception as cache_exc:
                 logger.debug(f"Cache lookup skipped: {cache_exc}")
-                cached_output = None
+                cache_hit = None
 
-        if cached_output is not None:
-            # Write cached bytes to the task output directory and return.
-
-            # Fresh entries are stored as {"ext": ..., "data": ...} so the
-            # served extension matches the original output exactly; legacy
-            # entries are raw bytes and fall back to the per-type extension.
-            if isinstance(cached_output, dict):
-                out_ext = cached_output.get("ext") or _cached_output_ext(
-                    conversion_type
-                )
-                cached_output = cached_output.get("data") or b""
-            else:
-                out_ext = _cached_output_ext(conversion_type)
-
-            base_name = os.path.splitext(original_filename)[0]
-            output_filename = f"{base_name}_convertica{out_ext}"
-            final_output_path = os.path.join(task_dir, output_filename)
-            with open(final_output_path, "wb") as fh:
-                fh.write(cached_output)
+        if cache_hit is not None:
+            final_output_path, cached_size = cache_hit
+            output_filename = os.path.basename(final_output_path)
             update_progress(self, 100, "Complete!", 5)
             clear_task_cancelled(cancellation_id)
             logger.info(f"Served {conversion_type} from cache: {final_output_path}")
@@ -492,7 +495,7 @@ def generic_conversion_task(
                     status="success",
                     finished_at=now,
                     duration_ms=duration_ms,
-                    output_size=len(cached_output),
+                    output_size=cached_size,
                 )
             except Exception as db_exc:
                 logger.warning(
@@ -715,29 +718,8 @@ def generic_conversion_task(
         update_progress(self, 100, "Complete!", 5)
 
         # --- Store result in SHA-256 cache for future identical requests ---
-        if cache_key_str is not None and conversion_type in FAST_CONVERSION_TYPES:
-            try:
-                out_size = os.path.getsize(final_output_path)
-                if out_size <= _CACHE_MAX_BYTES:
-                    from django.core.cache import cache as django_cache
-
-                    # Store the real output extension with the bytes so cache
-                    # hits serve the correct filename (e.g. split_pdf → .zip).
-                    with open(final_output_path, "rb") as fh:
-                        django_cache.set(
-                            cache_key_str,
-                            {
-                                "ext": os.path.splitext(final_output_path)[1],
-                                "data": fh.read(),
-                            },
-                            timeout=_CACHE_TTL,
-                        )
-                    logger.debug(
-                        f"Cached {conversion_type} result ({out_size} bytes, ttl={_CACHE_TTL}s)",
-                        extra={"event": "conversion_cache_store"},
-                    )
-            except Exception as cache_exc:
-                logger.debug(f"Cache store skipped: {cache_exc}")
+        if cache_key_str is not None:
+            result_cache.store(cache_key_str, final_output_path)
 
         # Clear cancelled flag if task completed successfully
         clear_task_cancelled(cancellation_id)
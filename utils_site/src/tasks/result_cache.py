@@ -0,0 +1,220 @@
+"""
+On-disk conversion result cache.
+
+``generic_conversion_task`` keys results by input SHA-256 + operation +
+parameters (``_cache_key``). The outputs themselves live here, on local disk or
+a shared volume next to ``async_temp``, so a hit can be hard-linked straight
+into the task directory instead of being copied through Redis. Redis only
+holds a small index entry per key (blob name, extension, size) with the usual
+24h TTL; the blobs are bounded by ``CONVERSION_RESULT_CACHE_MAX_MB`` and
+evicted least-recently-used first (a hit refreshes the blob's mtime).
+
+Everything here is best-effort: any failure degrades to a cache miss and the
+conversion simply runs.
+"""
+
+import contextlib
+import hashlib
+import os
+import shutil
+
+from django.conf import settings
+from django.core.cache import cache
+from src.api.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    from prometheus_client import Counter
+
+    RESULT_CACHE_EVENTS = Counter(
+        "convertica_result_cache_events_total",
+        "Conversion result cache events",
+        ["event"],
+    )
+    RESULT_CACHE_BYTES_SAVED = Counter(
+        "convertica_result_cache_bytes_saved_total",
+        "Output bytes served from the conversion result cache",
+    )
+    _PROMETHEUS_AVAILABLE = True
+except ImportError:
+    _PROMETHEUS_AVAILABLE = False
+
+# Evict down to this fraction of the budget so every store doesn't re-walk.
+_EVICT_LOW_WATERMARK = 0.9
+
+
+def _count(event: str, saved_bytes: int = 0) -> None:
+    if not _PROMETHEUS_AVAILABLE:
+        return
+    RESULT_CACHE_EVENTS.labels(event=event).inc()
+    if saved_bytes:
+        RESULT_CACHE_BYTES_SAVED.inc(saved_bytes)
+
+
+def _link_or_copy(src: str, dst: str) -> None:
+    """Hard-link ``src`` to ``dst``; copy (sendfile) across filesystems."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+class ResultCache:
+    """Size-bounded LRU blob store indexed by the Django (Redis) cache."""
+
+    def __init__(
+        self,
+        root: str | None = None,
+        max_bytes: int | None = None,
+        max_entry_bytes: int | None = None,
+        ttl: int = 86400,
+    ):
+        self.root = str(
+            root
+            or getattr(settings, "CONVERSION_RESULT_CACHE_DIR", None)
+            or os.path.join(settings.MEDIA_ROOT, "result_cache")
+        )
+        self.max_bytes = max_bytes or (
+            getattr(settings, "CONVERSION_RESULT_CACHE_MAX_MB", 2048) * 1024 * 1024
+        )
+        self.max_entry_bytes = max_entry_bytes or (
+            getattr(settings, "CONVERSION_RESULT_CACHE_MAX_ENTRY_MB", 200) * 1024 * 1024
+        )
+        self.ttl = ttl
+
+    @property
+    def enabled(self) -> bool:
+        return bool(getattr(settings, "CONVERSION_RESULT_CACHE_ENABLED", True))
+
+    def _blob_path(self, blob: str) -> str:
+        return os.path.join(self.root, blob[:2], blob)
+
+    @staticmethod
+    def _blob_name(key: str) -> str:
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def fetch(
+        self, key: str, dest_stem: str, default_ext: str
+    ) -> tuple[str, int] | None:
+        """Materialize the cached output for ``key`` at ``dest_stem + ext``.
+
+        Returns ``(path, size)`` on a hit, ``None`` on a miss. Entries written
+        before the disk tier existed carried the bytes inline in Redis; they
+        are still served until their TTL runs out.
+        """
+        try:
+            entry = cache.get(key)
+        except Exception as exc:
+            logger.debug(f"Result cache lookup skipped: {exc}")
+            return None
+
+        try:
+            if isinstance(entry, bytes):
+                entry = {"data": entry}
+            if isinstance(entry, dict) and "data" in entry:
+                data = entry.get("data") or b""
+                dest = f"{dest_stem}{entry.get('ext') or default_ext}"
+                with open(dest, "wb") as fh:
+                    fh.write(data)
+                size = len(data)
+            elif isinstance(entry, dict) and entry.get("blob"):
+                blob_path = self._blob_path(entry["blob"])
+                dest = f"{dest_stem}{entry.get('ext') or default_ext}"
+                _link_or_copy(blob_path, dest)
+                with contextlib.suppress(OSError):
+                    os.utime(blob_path)  # LRU recency
+                size = os.path.getsize(dest)
+            else:
+                _count("miss")
+                return None
+        except OSError as exc:
+            # Blob evicted (or volume unavailable) since the index was written.
+            logger.debug(f"Result cache entry unusable, dropping: {exc}")
+            with contextlib.suppress(Exception):
+                cache.delete(key)
+            _count("miss")
+            return None
+
+        _count("hit", saved_bytes=size)
+        logger.info(
+            "Result cache hit",
+            extra={"event": "conversion_cache_hit", "output_size": size},
+        )
+        return dest, size
+
+    def store(self, key: str, output_path: str) -> bool:
+        """Add ``output_path`` under ``key``; returns whether it was stored."""
+        try:
+            size = os.path.getsize(output_path)
+            if size > self.max_entry_bytes:
+                _count("skip")
+                return False
+            blob = self._blob_name(key)
+            blob_path = self._blob_path(blob)
+            os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+            tmp_path = f"{blob_path}.{os.getpid()}.tmp"
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(tmp_path)
+            _link_or_copy(output_path, tmp_path)
+            os.replace(tmp_path, blob_path)
+            cache.set(
+                key,
+                {
+                    "blob": blob,
+                    "ext": os.path.splitext(output_path)[1],
+                    "size": size,
+                },
+                timeout=self.ttl,
+            )
+        except Exception as exc:
+            logger.debug(f"Result cache store skipped: {exc}")
+            return False
+
+        _count("store")
+        logger.debug(
+            f"Cached conversion result ({size} bytes)",
+            extra={"event": "conversion_cache_store"},
+        )
+        self.evict()
+        return True
+
+    def _blobs(self) -> list[tuple[float, int, str]]:
+        entries = []
+        with contextlib.suppress(FileNotFoundError):
+            for shard in os.scandir(self.root):
+                if not shard.is_dir():
+                    continue
+                for item in os.scandir(shard.path):
+                    with contextlib.suppress(OSError):
+                        st = item.stat()
+                        entries.append((st.st_mtime, st.st_size, item.path))
+        return entries
+
+    def evict(self) -> int:
+        """Drop least-recently-used blobs until under budget; returns bytes freed.
+
+        Index entries pointing at evicted blobs are left to expire; ``fetch``
+        treats a missing blob as a miss and deletes the index entry.
+        """
+        entries = self._blobs()
+        total = sum(size for _mtime, size, _path in entries)
+        if total <= self.max_bytes:
+            return 0
+        target = int(self.max_bytes * _EVICT_LOW_WATERMARK)
+        freed = 0
+        for _mtime, size, path in sorted(entries):
+            if total - freed <= target:
+                break
+            with contextlib.suppress(OSError):
+                os.remove(path)
+                freed += size
+                _count("evict")
+        logger.info(
+            "Result cache evicted",
+            extra={"event": "conversion_cache_evict", "bytes_freed": freed},
+        )
+        return freed
+
+
+result_cache = ResultCache()
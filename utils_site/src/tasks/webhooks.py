@@ -0,0 +1,60 @@
+"""Outbox-driven delivery of API webhook callbacks.
+
+``src.api.webhook_delivery.enqueue`` writes the outbox row and kicks
+``deliver_host`` for its host; ``dispatch`` (beat) fans out one
+``deliver_host`` per host that has retries or lost kicks due. Either way at
+most one sender per host is queued at a time. All of these run on the
+``webhooks`` queue, served by its own worker so a slow endpoint can't hold
+the conversion workers. See ``src.api.webhook_delivery`` for backoff and
+the per-host circuit breaker.
+"""
+
+from datetime import timedelta
+
+from celery import shared_task
+from django.utils import timezone
+from src.api.logging_utils import get_logger
+
+logger = get_logger(__name__)
+
+
+@shared_task(name="webhooks.dispatch", queue="webhooks")
+def dispatch_webhooks():
+    """Queue one sender task per destination host with due deliveries."""
+    from src.api.webhook_delivery import circuit_open_until, due_hosts, kick_host
+
+    hosts = [host for host in due_hosts() if not circuit_open_until(host)]
+    kicked = sum(1 for host in hosts if kick_host(host))
+    return {"hosts": len(hosts), "kicked": kicked}
+
+
+@shared_task(name="webhooks.deliver_host", queue="webhooks")
+def deliver_host_webhooks(host: str):
+    """Send the due deliveries for one host over the pooled session.
+
+    No Celery time limits: the webhooks worker runs a threads pool, which
+    doesn't enforce them. ``send_due`` keeps to ``WEBHOOK_SEND_BUDGET``.
+    """
+    from src.api.webhook_delivery import clear_kick, send_due
+
+    clear_kick(host)
+    result = send_due(host)
+    if result["delivered"] or result["failed"] or result["deferred"]:
+        logger.info(
+            "Webhook deliveries sent",
+            extra={"event": "webhooks_sent", "host": host, **result},
+        )
+    return result
+
+
+@shared_task(name="webhooks.prune", queue="webhooks")
+def prune_webhook_deliveries(retention_days: int = 14):
+    """Drop finished outbox rows older than ``retention_days``."""
+    from src.users.models import WebhookDelivery
+
+    deleted, _ = (
+        WebhookDelivery.objects.exclude(status=WebhookDelivery.STATUS_PENDING)
+        .filter(created_at__lt=timezone.now() - timedelta(days=retention_days))
+        .delete()
+    )
+    return {"deleted": deleted}
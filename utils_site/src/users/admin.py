@@ -1,5 +1,4 @@
 # pylint: skip-file
-import csv
 import json
 
 from allauth.account.models import EmailAddress
@@ -9,7 +8,7 @@ from django.contrib.auth import get_user_model
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import Group
 from django.db.models import Exists, OuterRef
-from django.http import HttpResponse
+from django.http import StreamingHttpResponse
 from django.urls import path, reverse
 from django.utils import timezone
 from django.utils.html import format_html
@@ -24,6 +23,7 @@ from .models import (
     RuntimeSetting,
     SubscriptionPlan,
     UserSubscription,
+    WebhookDelivery,
     WebhookEvent,
 )
 
@@ -33,9 +33,9 @@ User = get_user_model()
 def analytics_window_start(request, default_months: int = 12):
     """Start of the analytics window for the OperationRun admin reports.
 
-    Defaults to ~``default_months`` ago so the unbounded aggregations over the
-    high-volume OperationRun table stay bounded (and the (status, -created_at)
-    indexes apply). ``?all=1`` returns None to scan the full history on demand.
+    Defaults to ~``default_months`` ago so the reports stay bounded. They read
+    the pre-aggregated rollups (``operation_rollups``) plus the raw rows of
+    the unsettled last hours. ``?all=1`` returns None for the full history.
     """
     from datetime import timedelta
 
@@ -737,6 +737,16 @@ class OperationRunAdmin(admin.ModelAdmin):
                 self.admin_site.admin_view(self.export_csv_view),
                 name="users_operationrun_export",
             ),
+            path(
+                "export/background/",
+                self.admin_site.admin_view(self.export_background_view),
+                name="users_operationrun_export_background",
+            ),
+            path(
+                "export/download/<str:name>/",
+                self.admin_site.admin_view(self.export_download_view),
+                name="users_operationrun_export_download",
+            ),
             path(
                 "monthly-stats/",
                 self.admin_site.admin_view(self.monthly_stats_view),
@@ -755,124 +765,100 @@ class OperationRunAdmin(admin.ModelAdmin):
         ]
         return custom_urls + urls
 
-    def export_csv_view(self, request):
+    def _export_queryset(self, request):
+        """Changelist queryset (filters, search, date drill-down) to export.
+
+        Strips the export's own ``gzip`` flag first so the changelist doesn't
+        reject it as an unknown lookup.
+        """
+        params = request.GET.copy()
+        compress = params.pop("gzip", None) is not None
+        request.GET = params
         cl = self.get_changelist_instance(request)
-        queryset = cl.get_queryset(request)
-
-        response = HttpResponse(content_type="text/csv")
-        response["Content-Disposition"] = "attachment; filename=operation_runs.csv"
-
-        writer = csv.writer(response)
-        writer.writerow(
-            [
-                "id",
-                "conversion_type",
-                "status",
-                "is_premium",
-                "user_email",
-                "created_at",
-                "queued_at",
-                "started_at",
-                "finished_at",
-                "duration_s",
-                "queue_wait_s",
-                "input_size",
-                "output_size",
-                "peak_rss_mb",
-                "remote_addr",
-                "path",
-                "error_type",
-            ]
-        )
+        return cl.get_queryset(request), compress
 
-        queryset = queryset.select_related("user")
-        for obj in queryset.iterator(chunk_size=2000):
-            writer.writerow(
-                [
-                    obj.pk,
-                    obj.conversion_type,
-                    obj.status,
-                    obj.is_premium,
-                    (obj.user.email if obj.user else ""),
-                    obj.created_at,
-                    obj.queued_at,
-                    obj.started_at,
-                    obj.finished_at,
-                    (
-                        round(obj.duration_ms / 1000.0, 3)
-                        if obj.duration_ms is not None
-                        else ""
-                    ),
-                    (
-                        round(obj.queue_wait_ms / 1000.0, 3)
-                        if obj.queue_wait_ms is not None
-                        else ""
-                    ),
-                    obj.input_size,
-                    obj.output_size,
-                    obj.peak_rss_mb,
-                    obj.remote_addr,
-                    obj.path,
-                    obj.error_type,
-                ]
-            )
+    def export_csv_view(self, request):
+        """Stream the filtered changelist as CSV (``?gzip=1`` for .csv.gz)."""
+        from .operation_export import csv_chunks, gzip_chunks
 
+        queryset, compress = self._export_queryset(request)
+        if compress:
+            response = StreamingHttpResponse(
+                gzip_chunks(csv_chunks(queryset)), content_type="application/gzip"
+            )
+            filename = "operation_runs.csv.gz"
+        else:
+            response = StreamingHttpResponse(
+                csv_chunks(queryset), content_type="text/csv"
+            )
+            filename = "operation_runs.csv"
+        response["Content-Disposition"] = f"attachment; filename={filename}"
         return response
 
+    def export_background_view(self, request):
+        """Queue the export as a Celery job for very large ranges."""
+        from django.contrib import messages
+        from django.shortcuts import redirect
+        from src.tasks.maintenance import export_operation_runs
+
+        from .operation_export import new_export_name
+
+        self._export_queryset(request)  # validate the filters now, not in the job
+        name = new_export_name(compress=True)
+        export_operation_runs.delay(request.user.pk, request.GET.urlencode(), name)
+        download_url = reverse("admin:users_operationrun_export_download", args=[name])
+        messages.info(
+            request,
+            format_html(
+                'Export started. It will be available at <a href="{}">{}</a> '
+                "once finished (kept for 7 days).",
+                download_url,
+                name,
+            ),
+        )
+        changelist_url = reverse("admin:users_operationrun_changelist")
+        query = request.GET.urlencode()
+        return redirect(f"{changelist_url}?{query}" if query else changelist_url)
+
+    def export_download_view(self, request, name):
+        """Serve a finished background export."""
+        from django.contrib import messages
+        from django.http import FileResponse
+        from django.shortcuts import redirect
+
+        from .operation_export import export_path
+
+        path = export_path(name)
+        if path is None:
+            messages.warning(request, f"Export {name} is not ready (or has expired).")
+            return redirect("admin:users_operationrun_changelist")
+        return FileResponse(open(path, "rb"), as_attachment=True, filename=name)
+
     def monthly_stats_view(self, request):
         """Monthly statistics view for operations."""
         from collections import defaultdict
 
-        from django.db.models import Count, Q
-        from django.db.models.functions import TruncMonth
         from django.shortcuts import render
 
-        # Bound the scan to a recent window by default (?all=1 to expand).
-        since = analytics_window_start(request)
-        base = (
-            OperationRun.objects.all()
-            if since is None
-            else OperationRun.objects.filter(created_at__gte=since)
+        from .operation_rollups import (
+            monthly_uniques,
+            operation_counts,
+            status_breakdown,
         )
 
-        # Get all unique conversion types
-        conversion_types = (
-            base.values_list("conversion_type", flat=True)
-            .distinct()
-            .order_by("conversion_type")
+        # Bound the window to recent months by default (?all=1 to expand).
+        # Counts come from the hourly rollups plus the raw unsettled tail.
+        since = analytics_window_start(request)
+        monthly_data = sorted(
+            status_breakdown(
+                operation_counts(since, by_month=True), ("month", "conversion_type")
+            ),
+            key=lambda row: row["conversion_type"],
         )
+        conversion_types = sorted({row["conversion_type"] for row in monthly_data})
 
-        # Aggregate data by month and conversion_type
-        monthly_data = (
-            base.annotate(month=TruncMonth("created_at"))
-            .values("month", "conversion_type")
-            .annotate(
-                total=Count("id"),
-                success=Count("id", filter=Q(status="success")),
-                error=Count("id", filter=Q(status="error")),
-                rejected=Count("id", filter=Q(status="rejected")),
-                cancelled=Count(
-                    "id", filter=Q(status__in=["cancelled", "cancel_requested"])
-                ),
-                abandoned=Count("id", filter=Q(status="abandoned")),
-                other=Count(
-                    "id",
-                    filter=Q(status__in=["started", "queued", "running"]),
-                ),
-            )
-            .order_by("-month", "conversion_type")
-        )
-
-        # Unique users and IPs per month (separate query for correctness)
-        monthly_uniques = (
-            base.annotate(month=TruncMonth("created_at"))
-            .values("month")
-            .annotate(
-                unique_users=Count("user", distinct=True, filter=Q(user__isnull=False)),
-                unique_ips=Count("remote_addr", distinct=True),
-            )
-        )
-        uniques_by_month = {row["month"]: row for row in monthly_uniques}
+        # Unique users and IPs per month (distinct counts, stored per month)
+        uniques_by_month = monthly_uniques(since)
 
         # Organize data by month
         months_dict = defaultdict(
@@ -991,9 +977,10 @@ class OperationRunAdmin(admin.ModelAdmin):
 
     def user_activity_view(self, request):
         """Top users by operation count, with min_ops filter."""
-        from django.db.models import Count, Max, Min, Q
         from django.shortcuts import render
 
+        from .operation_rollups import user_operation_counts
+
         min_ops = request.GET.get("min_ops", "")
         try:
             min_ops_int = max(1, int(min_ops))
@@ -1001,28 +988,19 @@ class OperationRunAdmin(admin.ModelAdmin):
             min_ops_int = 1
 
         since = analytics_window_start(request)
-        base = (
-            OperationRun.objects.filter(user__isnull=False)
-            if since is None
-            else OperationRun.objects.filter(user__isnull=False, created_at__gte=since)
-        )
-        qs = (
-            base.values("user__email", "user__id")
-            .annotate(
-                total=Count("id"),
-                success=Count("id", filter=Q(status="success")),
-                error=Count("id", filter=Q(status="error")),
-                first_op=Min("created_at"),
-                last_op=Max("created_at"),
-            )
-            .filter(total__gte=min_ops_int)
-            .order_by("-total")[:200]
-        )
+        users = sorted(
+            (
+                row
+                for row in user_operation_counts(since)
+                if row["total"] >= min_ops_int
+            ),
+            key=lambda row: -row["total"],
+        )[:200]
 
         context = {
             **self.admin_site.each_context(request),
             "title": "User Activity",
-            "users": list(qs),
+            "users": users,
             "min_ops": min_ops_int,
             "opts": self.model._meta,
         }
@@ -1035,9 +1013,10 @@ class OperationRunAdmin(admin.ModelAdmin):
         conversion_type and hides tools below the ?min_ops threshold. Same
         analytics window as the other reports (~12 months; ?all=1 for full).
         """
-        from django.db.models import Count, Max, Min, Q
         from django.shortcuts import render
 
+        from .operation_rollups import operation_counts, status_breakdown
+
         min_ops = request.GET.get("min_ops", "")
         try:
             min_ops_int = max(1, int(min_ops))
@@ -1045,30 +1024,21 @@ class OperationRunAdmin(admin.ModelAdmin):
             min_ops_int = 1
 
         since = analytics_window_start(request)
-        base = (
-            OperationRun.objects.all()
-            if since is None
-            else OperationRun.objects.filter(created_at__gte=since)
-        )
-        qs = (
-            base.values("conversion_type")
-            .annotate(
-                total=Count("id"),
-                success=Count("id", filter=Q(status="success")),
-                error=Count("id", filter=Q(status="error")),
-                rejected=Count("id", filter=Q(status="rejected")),
-                abandoned=Count("id", filter=Q(status="abandoned")),
-                first_op=Min("created_at"),
-                last_op=Max("created_at"),
-            )
-            .filter(total__gte=min_ops_int)
-            .order_by("-total")
+        tools = sorted(
+            (
+                row
+                for row in status_breakdown(
+                    operation_counts(since), ("conversion_type",)
+                )
+                if row["total"] >= min_ops_int
+            ),
+            key=lambda row: -row["total"],
         )
 
         context = {
             **self.admin_site.each_context(request),
             "title": "Tool Activity",
-            "tools": list(qs),
+            "tools": tools,
             "min_ops": min_ops_int,
             "opts": self.model._meta,
         }
@@ -1107,6 +1077,30 @@ class WebhookEventAdmin(admin.ModelAdmin):
         return False
 
 
+@admin.register(WebhookDelivery)
+class WebhookDeliveryAdmin(admin.ModelAdmin):
+    """Outbox of API webhook callbacks (read-only, written by conversions)."""
+
+    list_display = (
+        "host",
+        "user",
+        "status",
+        "attempts",
+        "last_status_code",
+        "latency_ms",
+        "next_attempt_at",
+        "created_at",
+    )
+    list_filter = ("status",)
+    search_fields = ("host", "user__email")
+    list_select_related = ("user",)
+    readonly_fields = [f.name for f in WebhookDelivery._meta.fields]
+    ordering = ("-created_at",)
+
+    def has_add_permission(self, request):
+        return False
+
+
 @admin.register(APIKey)
 class APIKeyAdmin(admin.ModelAdmin):
     """Admin for developer API keys.
@@ -0,0 +1,171 @@
+"""
+Process-local L1 cache in front of the shared (Redis) cache.
+
+Premium status and runtime settings are read on nearly every request, each
+read a Redis round trip (and a lock + module reload for runtime settings).
+Both change rarely, so each web/worker process keeps its own copy:
+
+- Entries live for at most ``ttl`` seconds.
+- Every namespace has a version token in the shared cache. When another
+  process invalidates, it replaces the token and every process drops its
+  whole namespace the next time it looks.
+- Inside ``request_scope()`` (opened by ``RuntimeSettingsMiddleware``) the
+  tokens of all namespaces are fetched once, in one ``get_many``, so a
+  request costs one round trip however many lookups it makes. Outside a
+  request (Celery, shell) the token is read on every lookup.
+
+A version token that disappears (eviction, ``cache.clear()``) is replaced
+by a new one, which invalidates every process too.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Hashable
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from django.core.cache import cache
+
+VERSION_KEY_PREFIX = "local_cache:version:"
+
+MISSING = object()
+
+_namespaces: dict[str, LocalCache] = {}
+_scope: ContextVar[dict[str, str] | None] = ContextVar(
+    "local_cache_scope", default=None
+)
+
+
+class LocalCache:
+    """TTL-bounded LRU dict for one namespace, validated by its version token."""
+
+    def __init__(self, namespace: str, ttl: float, max_entries: int = 10_000):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.version_key = f"{VERSION_KEY_PREFIX}{namespace}"
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._version: str | None = None
+        self._lock = threading.Lock()
+        _namespaces[namespace] = self
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        """Return the local value for ``key`` or ``default`` on a miss."""
+        try:
+            version = self.current_version()
+        except Exception:
+            # Shared cache unavailable: the version can't be checked.
+            return default
+        now = time.monotonic()
+        with self._lock:
+            if version != self._version:
+                self._entries.clear()
+                self._version = version
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires, value = entry
+            if expires <= now:
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            if self._version is None:
+                # Never validated against the shared version; don't trust it.
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, *keys: Hashable) -> None:
+        """Drop ``keys`` in this process only (all keys if none are given)."""
+        with self._lock:
+            if not keys:
+                self._entries.clear()
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def invalidate(self, *keys: Hashable) -> None:
+        """Drop ``keys`` here and the whole namespace in every other process."""
+        version = uuid.uuid4().hex
+        try:
+            cache.set(self.version_key, version, None)
+        except Exception:
+            version = None
+        with self._lock:
+            self._version = version
+            if not keys:
+                self._entries.clear()
+            for key in keys:
+                self._entries.pop(key, None)
+        scope = _scope.get()
+        if scope is not None:
+            if version is None:
+                scope.pop(self.namespace, None)
+            else:
+                scope[self.namespace] = version
+
+    def current_version(self) -> str:
+        """The namespace's shared version token, read once per request scope."""
+        scope = _scope.get()
+        if scope is None:
+            return _load_versions([self])[self.namespace]
+        if self.namespace not in scope:
+            pending = [x for x in _namespaces.values() if x.namespace not in scope]
+            scope.update(_load_versions(pending))
+        return scope[self.namespace]
+
+
+def _load_versions(namespaces: list[LocalCache]) -> dict[str, str]:
+    stored = cache.get_many([x.version_key for x in namespaces])
+    versions = {}
+    for local in namespaces:
+        version = stored.get(local.version_key)
+        if version is None:
+            version = uuid.uuid4().hex
+            if not cache.add(local.version_key, version, None):
+                version = cache.get(local.version_key) or version
+        versions[local.namespace] = version
+    return versions
+
+
+@contextmanager
+def request_scope():
+    """Read each namespace's version at most once until the block exits."""
+    token = _scope.set({})
+    try:
+        yield
+    finally:
+        _scope.reset(token)
+
+
+# Premium status of a user, by pk: ``is_premium_active`` and
+# ``User.is_subscription_active``. Both also sit in Redis for longer.
+premium_status = LocalCache("premium", ttl=30)
+
+
+def invalidate_premium_status(*user_ids) -> None:
+    """Forget cached premium status of ``user_ids`` in Redis and every process.
+
+    Call after anything that can change whether a user is premium without
+    going through ``User.save()`` (which calls it itself), e.g. ``bulk_update``.
+    """
+    if not user_ids:
+        return
+    cache.delete_many(
+        [f"user_premium_active:{pk}" for pk in user_ids]
+        + [f"user_subscription_status_{pk}" for pk in user_ids]
+    )
+    premium_status.invalidate(
+        *[("active", pk) for pk in user_ids],
+        *[("subscription", pk) for pk in user_ids],
+    )
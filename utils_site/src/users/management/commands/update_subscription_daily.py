@@ -1,6 +1,7 @@
 from django.core.cache import cache
 from django.core.management.base import BaseCommand
 from django.utils import timezone
+from src.users.local_cache import invalidate_premium_status
 from src.users.models import User
 
 
@@ -75,8 +76,9 @@ class Command(BaseCommand):
         cache.delete("top_subscribers_10")
 
         # Also clear individual user subscription caches for updated users
-        for user in users_to_update_active + users_to_update_expired:
-            cache.delete(f"user_subscription_status_{user.id}")
+        invalidate_premium_status(
+            *[user.id for user in users_to_update_active + users_to_update_expired]
+        )
 
         active_count = len(users_to_update_active)
         expired_count = len(users_to_update_expired)
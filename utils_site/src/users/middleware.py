@@ -7,6 +7,7 @@ from django.template import TemplateDoesNotExist
 from django.template.loader import render_to_string
 
 from .account_adapter import EmailDeliveryError
+from .local_cache import request_scope
 from .runtime_settings import apply_runtime_settings
 
 logger = logging.getLogger(__name__)
@@ -19,8 +20,10 @@ class RuntimeSettingsMiddleware:
         self.get_response = get_response
 
     def __call__(self, request):
-        apply_runtime_settings()
-        return self.get_response(request)
+        # One version check per request for every process-local cache.
+        with request_scope():
+            apply_runtime_settings()
+            return self.get_response(request)
 
 
 class EmailDeliveryErrorMiddleware:
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.16 on 2026-10-16 19:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0030_fill_site_identity"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PageViewFlush",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("batch_id", models.CharField(max_length=64, unique=True)),
+                ("flushed_at", models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                "verbose_name": "Page view flush",
+                "verbose_name_plural": "Page view flushes",
+            },
+        ),
+    ]
@@ -0,0 +1,116 @@
+# Generated by Django 5.2.16 on 2026-10-16 19:25
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0031_pageviewflush"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OperationRunMonthRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("month", models.DateTimeField(unique=True)),
+                ("unique_users", models.PositiveIntegerField(default=0)),
+                ("unique_ips", models.PositiveIntegerField(default=0)),
+                ("rolled_up_until", models.DateTimeField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name="OperationRunRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("hour", models.DateTimeField()),
+                ("conversion_type", models.CharField(max_length=80)),
+                ("status", models.CharField(max_length=20)),
+                ("is_premium", models.BooleanField(default=False)),
+                ("total", models.PositiveIntegerField(default=0)),
+                ("duration_count", models.PositiveIntegerField(default=0)),
+                ("duration_sum_ms", models.BigIntegerField(default=0)),
+                ("duration_p50_ms", models.IntegerField(blank=True, null=True)),
+                ("duration_p95_ms", models.IntegerField(blank=True, null=True)),
+                ("duration_max_ms", models.IntegerField(blank=True, null=True)),
+                ("input_bytes", models.BigIntegerField(default=0)),
+                ("output_bytes", models.BigIntegerField(default=0)),
+                ("first_op", models.DateTimeField()),
+                ("last_op", models.DateTimeField()),
+            ],
+            options={
+                "verbose_name": "Operation rollup (hourly)",
+                "verbose_name_plural": "Operation rollups (hourly)",
+            },
+        ),
+        migrations.CreateModel(
+            name="OperationRunUserRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("total", models.PositiveIntegerField(default=0)),
+                ("success", models.PositiveIntegerField(default=0)),
+                ("error", models.PositiveIntegerField(default=0)),
+                ("first_op", models.DateTimeField()),
+                ("last_op", models.DateTimeField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="operationrun",
+            index=models.Index(
+                fields=["created_at"], name="users_opera_created_4c30fd_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="operationrunrollup",
+            index=models.Index(fields=["-hour"], name="users_opera_hour_6075b6_idx"),
+        ),
+        migrations.AlterUniqueTogether(
+            name="operationrunrollup",
+            unique_together={("hour", "conversion_type", "status", "is_premium")},
+        ),
+        migrations.AddField(
+            model_name="operationrunuserrollup",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="operation_rollups",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="operationrunuserrollup",
+            index=models.Index(fields=["-day"], name="users_opera_day_580f1d_idx"),
+        ),
+        migrations.AlterUniqueTogether(
+            name="operationrunuserrollup",
+            unique_together={("day", "user")},
+        ),
+    ]
@@ -7,6 +7,8 @@ from django.db import models
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from .local_cache import MISSING, invalidate_premium_status, premium_status
+
 
 class UserManager(BaseUserManager):
     use_in_migrations = True
@@ -120,13 +122,14 @@ class User(AbstractUser):
 
         # Clear cache when subscription data changes (must happen BEFORE is_subscription_active())
         if getattr(self, "_subscription_changed", False):
-            cache.delete(f"user_subscription_status_{self.id}")
-            # Also invalidate the premium-active cache used by api.premium_utils
-            # so a subscription flip propagates within the next request, not
-            # 60s later.
-            cache.delete(f"user_premium_active:{self.id}")
+            # Covers the premium-active cache used by api.premium_utils and
+            # every process's local copy, so a subscription flip propagates
+            # within the next request, not 60s later.
+            invalidate_premium_status(self.id)
 
         super().save(*args, **kwargs)
+        # Any save: this process re-reads premium status on its next lookup.
+        premium_status.discard(("active", self.id), ("subscription", self.id))
 
     def _calculate_subscription_days(self):
         """Calculate total and consecutive subscription days based on dates.
@@ -170,10 +173,16 @@ class User(AbstractUser):
 
     def is_subscription_active(self):
         """Check if user's subscription is currently active with Redis caching."""
+        local_key = ("subscription", self.id)
+        cached_status = premium_status.get(local_key)
+        if cached_status is not MISSING:
+            return cached_status
+
         cache_key = f"user_subscription_status_{self.id}"
         cached_status = cache.get(cache_key)
 
         if cached_status is not None:
+            premium_status.set(local_key, cached_status)
             return cached_status
 
         if not self.subscription_end_date:
@@ -184,6 +193,7 @@ class User(AbstractUser):
 
         # Cache for 5 minutes
         cache.set(cache_key, status, 300)
+        premium_status.set(local_key, status)
         return status
 
     @property
@@ -659,12 +669,12 @@ class Payment(models.Model):
         if (is_new and self.status == "completed") or (
             old_status != "completed" and self.status == "completed"
         ):
-            cache.delete(f"user_subscription_status_{self.user.id}")
+            invalidate_premium_status(self.user.id)
             # Activate subscription (extend_if_active=False to avoid overwriting
             # dates that were already set by webhook)
             self.user.activate_subscription(self.plan, extend_if_active=False)
         elif old_status == "completed" and self.status in ["refunded", "failed"]:
-            cache.delete(f"user_subscription_status_{self.user.id}")
+            invalidate_premium_status(self.user.id)
             # Cancel subscription
             self.user.cancel_subscription()
 
@@ -871,12 +881,87 @@ class OperationRun(models.Model):
             models.Index(
                 fields=["conversion_type", "status", "-created_at"]
             ),  # Conversion analytics
+            # Time-range scans: rollup task, raw tail of the admin reports.
+            models.Index(fields=["created_at"]),
         ]
 
     def __str__(self):
         return f"{self.conversion_type} ({self.status})"
 
 
+class OperationRunRollup(models.Model):
+    """Hourly OperationRun aggregates for the admin analytics reports.
+
+    One row per (hour, conversion_type, status, is_premium), maintained by
+    ``maintenance.rollup_operation_runs`` (see ``src.users.operation_rollups``).
+    Durations are summarised per bucket; percentiles are not additive, so
+    coarser reports use the counts and byte totals only.
+    """
+
+    hour = models.DateTimeField()
+    conversion_type = models.CharField(max_length=80)
+    status = models.CharField(max_length=20)
+    is_premium = models.BooleanField(default=False)
+
+    total = models.PositiveIntegerField(default=0)
+    duration_count = models.PositiveIntegerField(default=0)
+    duration_sum_ms = models.BigIntegerField(default=0)
+    duration_p50_ms = models.IntegerField(null=True, blank=True)
+    duration_p95_ms = models.IntegerField(null=True, blank=True)
+    duration_max_ms = models.IntegerField(null=True, blank=True)
+    input_bytes = models.BigIntegerField(default=0)
+    output_bytes = models.BigIntegerField(default=0)
+    first_op = models.DateTimeField()
+    last_op = models.DateTimeField()
+
+    class Meta:
+        unique_together = [("hour", "conversion_type", "status", "is_premium")]
+        indexes = [models.Index(fields=["-hour"])]
+        verbose_name = "Operation rollup (hourly)"
+        verbose_name_plural = "Operation rollups (hourly)"
+
+    def __str__(self):
+        return f"{self.hour:%Y-%m-%d %H}h {self.conversion_type} {self.status}"
+
+
+class OperationRunUserRollup(models.Model):
+    """Daily per-user OperationRun counts for the User Activity report."""
+
+    day = models.DateField()
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="operation_rollups"
+    )
+    total = models.PositiveIntegerField(default=0)
+    success = models.PositiveIntegerField(default=0)
+    error = models.PositiveIntegerField(default=0)
+    first_op = models.DateTimeField()
+    last_op = models.DateTimeField()
+
+    class Meta:
+        unique_together = [("day", "user")]
+        indexes = [models.Index(fields=["-day"])]
+
+    def __str__(self):
+        return f"{self.day} user={self.user_id} total={self.total}"
+
+
+class OperationRunMonthRollup(models.Model):
+    """Per-month distinct counts and the rollup high-water mark.
+
+    Distinct users/IPs can't be summed from hourly rows, so they are counted
+    once per month. ``rolled_up_until`` is how far the month's rollups reach;
+    the latest value is the point after which reports read raw rows.
+    """
+
+    month = models.DateTimeField(unique=True)
+    unique_users = models.PositiveIntegerField(default=0)
+    unique_ips = models.PositiveIntegerField(default=0)
+    rolled_up_until = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.month:%Y-%m} rolled up until {self.rolled_up_until}"
+
+
 class APIKey(models.Model):
     """Long-lived API key. One user can have multiple.
 
@@ -1083,3 +1168,70 @@ class PageViewDaily(models.Model):
 
     def __str__(self):
         return f"{self.date} {self.path} = {self.views}"
+
+
+class PageViewFlush(models.Model):
+    """Ledger of page-view buffer batches already applied to ``PageViewDaily``.
+
+    ``TrafficCountingMiddleware`` counts into Redis and
+    ``maintenance.flush_pageviews`` moves each batch into Postgres. The batch
+    id is written in the same transaction as the counts, so a flush that dies
+    after COMMIT but before deleting the Redis batch is recognised on the next
+    run and the batch is dropped instead of being counted twice.
+    """
+
+    batch_id = models.CharField(max_length=64, unique=True)
+    flushed_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        verbose_name = "Page view flush"
+        verbose_name_plural = "Page view flushes"
+
+    def __str__(self):
+        return f"PageViewFlush({self.batch_id})"
+
+
+class WebhookDelivery(models.Model):
+    """Outbox of API webhook callbacks (``src.api.webhook_delivery``).
+
+    A finished conversion only inserts a row; the ``webhooks.*`` tasks send
+    it over a pooled session, one task per destination host, and reschedule
+    failures with exponential backoff until ``WEBHOOK_MAX_ATTEMPTS``.
+    """
+
+    STATUS_PENDING = "pending"
+    STATUS_DELIVERED = "delivered"
+    STATUS_FAILED = "failed"
+    STATUS_CHOICES = [
+        (STATUS_PENDING, "Pending"),
+        (STATUS_DELIVERED, "Delivered"),
+        (STATUS_FAILED, "Failed"),
+    ]
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="webhook_deliveries"
+    )
+    url = models.TextField()
+    host = models.CharField(max_length=255)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(
+        max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    latency_ms = models.PositiveIntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    delivered_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"]),
+            models.Index(fields=["host", "status", "next_attempt_at"]),
+        ]
+        verbose_name = "Webhook delivery"
+        verbose_name_plural = "Webhook deliveries"
+
+    def __str__(self):
+        return f"WebhookDelivery({self.host}, {self.status}, {self.attempts})"
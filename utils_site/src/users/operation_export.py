@@ -0,0 +1,140 @@
+"""Streaming CSV export of OperationRun rows (admin "Export CSV").
+
+Rows are read with ``values_list(...).iterator()`` — no model instances, and
+the user's email comes from the SQL join instead of ``select_related`` object
+building — and encoded chunk by chunk, so memory stays flat however many rows
+are exported. The same generator feeds the ``StreamingHttpResponse`` of the
+admin view and the background export job, optionally through gzip.
+"""
+
+import csv
+import re
+import time
+import uuid
+import zlib
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from django.conf import settings
+
+EXPORT_COLUMNS = (
+    # (CSV header, values_list field)
+    ("id", "pk"),
+    ("conversion_type", "conversion_type"),
+    ("status", "status"),
+    ("is_premium", "is_premium"),
+    ("user_email", "user__email"),
+    ("created_at", "created_at"),
+    ("queued_at", "queued_at"),
+    ("started_at", "started_at"),
+    ("finished_at", "finished_at"),
+    ("duration_s", "duration_ms"),
+    ("queue_wait_s", "queue_wait_ms"),
+    ("input_size", "input_size"),
+    ("output_size", "output_size"),
+    ("peak_rss_mb", "peak_rss_mb"),
+    ("remote_addr", "remote_addr"),
+    ("path", "path"),
+    ("error_type", "error_type"),
+)
+_MS_COLUMNS = frozenset(
+    i for i, (_header, field) in enumerate(EXPORT_COLUMNS) if field.endswith("_ms")
+)
+_EMAIL_COLUMN = [field for _header, field in EXPORT_COLUMNS].index("user__email")
+
+ITERATOR_CHUNK_SIZE = 2000
+# Text handed to the response/file per yield.
+_FLUSH_BYTES = 64 * 1024
+
+# Background exports. Kept under MEDIA_ROOT (shared by web and Celery
+# containers); nginx denies direct access, downloads go through the admin.
+EXPORT_DIR = Path(
+    getattr(settings, "ADMIN_EXPORT_DIR", Path(settings.MEDIA_ROOT) / "admin_exports")
+)
+EXPORT_MAX_AGE_SECONDS = 7 * 86400
+_EXPORT_NAME_RE = re.compile(r"^operation_runs_[0-9a-f]{32}\.csv(\.gz)?$")
+
+
+class _Echo:
+    """File-like object whose ``write`` hands the CSV line back."""
+
+    def write(self, value):
+        return value
+
+
+def _format(row: tuple) -> list:
+    values = list(row)
+    for index in _MS_COLUMNS:
+        if values[index] is not None:
+            values[index] = round(values[index] / 1000.0, 3)
+        else:
+            values[index] = ""
+    if values[_EMAIL_COLUMN] is None:
+        values[_EMAIL_COLUMN] = ""
+    return values
+
+
+def csv_chunks(queryset) -> Iterator[str]:
+    """Yield the CSV for ``queryset`` in ~64 KiB text chunks."""
+    writer = csv.writer(_Echo())
+    buffer = [writer.writerow([header for header, _field in EXPORT_COLUMNS])]
+    size = len(buffer[0])
+    rows = queryset.values_list(*(field for _header, field in EXPORT_COLUMNS))
+    for row in rows.iterator(chunk_size=ITERATOR_CHUNK_SIZE):
+        line = writer.writerow(_format(row))
+        buffer.append(line)
+        size += len(line)
+        if size >= _FLUSH_BYTES:
+            yield "".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def gzip_chunks(chunks: Iterable[str], level: int = 6) -> Iterator[bytes]:
+    """Gzip-encode a stream of text chunks (a single ``.gz`` member)."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def new_export_name(compress: bool) -> str:
+    return f"operation_runs_{uuid.uuid4().hex}.csv" + (".gz" if compress else "")
+
+
+def export_path(name: str) -> Path | None:
+    """Path of a finished background export, or None if unknown/not ready."""
+    if not _EXPORT_NAME_RE.match(name):
+        return None
+    path = EXPORT_DIR / name
+    return path if path.is_file() else None
+
+
+def write_export(queryset, name: str) -> Path:
+    """Write the export to ``EXPORT_DIR/name`` (visible only once complete)."""
+    EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+    cutoff = time.time() - EXPORT_MAX_AGE_SECONDS
+    for old in EXPORT_DIR.glob("operation_runs_*"):
+        try:
+            if old.stat().st_mtime < cutoff:
+                old.unlink()
+        except OSError:
+            pass
+
+    path = EXPORT_DIR / name
+    part = path.with_name(name + ".part")
+    chunks = csv_chunks(queryset)
+    encoded = (
+        gzip_chunks(chunks) if name.endswith(".gz") else (c.encode() for c in chunks)
+    )
+    try:
+        with open(part, "wb") as fh:
+            for data in encoded:
+                fh.write(data)
+        part.replace(path)
+    finally:
+        part.unlink(missing_ok=True)
+    return path
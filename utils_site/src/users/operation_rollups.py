@@ -0,0 +1,427 @@
+"""Pre-aggregated OperationRun statistics for the admin analytics reports.
+
+The Monthly Statistics, User Activity and Tool Activity pages used to run
+``TruncMonth``/``Count`` aggregations over the raw OperationRun table on every
+load. ``rollup_operation_runs`` (beat: ``maintenance.rollup_operation_runs``)
+folds settled rows into three small tables instead:
+
+* ``OperationRunRollup`` — per hour / conversion_type / status / premium flag:
+  counts, duration summary (p50/p95/max), byte totals, first/last op.
+* ``OperationRunUserRollup`` — per day / user: total, success, error.
+* ``OperationRunMonthRollup`` — per month distinct users/IPs and the
+  high-water mark (``rolled_up_until``).
+
+Rows keep changing status for a while after they are created (queued →
+running → success; the stuck-operation reaper marks dead ones abandoned after
+an hour), so only hours older than ``SETTLE`` are rolled up. Each run
+recomputes whole UTC days from the watermark day onward and replaces their
+rollup rows in one transaction per day, so a re-run or a crash never double
+counts. The report helpers below combine rollups before the watermark with
+raw rows after it (the unsettled last couple of hours).
+"""
+
+import math
+from datetime import UTC, datetime, timedelta
+
+from django.db import transaction
+from django.db.models import Count, Max, Min, Q, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import (
+    OperationRun,
+    OperationRunMonthRollup,
+    OperationRunRollup,
+    OperationRunUserRollup,
+)
+
+# Rows younger than this may still change status.
+SETTLE = timedelta(hours=2)
+# Bound one run's work (the first run backfills the whole history).
+MAX_DAYS_PER_RUN = 31
+
+_HOUR = timedelta(hours=1)
+_DAY = timedelta(days=1)
+
+
+def _floor_hour(value: datetime) -> datetime:
+    return value.astimezone(UTC).replace(minute=0, second=0, microsecond=0)
+
+
+def _ceil_hour(value: datetime) -> datetime:
+    floor = _floor_hour(value)
+    return floor if floor == value else floor + _HOUR
+
+
+def _floor_day(value: datetime) -> datetime:
+    return _floor_hour(value).replace(hour=0)
+
+
+def _ceil_day(value: datetime) -> datetime:
+    floor = _floor_day(value)
+    return floor if floor == value else floor + _DAY
+
+
+def _month_start(value: datetime) -> datetime:
+    return _floor_day(value).replace(day=1)
+
+
+def _next_month(month: datetime) -> datetime:
+    return (month + timedelta(days=32)).replace(day=1)
+
+
+def _percentile(ordered: list[int], fraction: float) -> int | None:
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return None
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+
+def rolled_up_until() -> datetime | None:
+    """End of the rolled-up range (reports read raw rows from here on)."""
+    return OperationRunMonthRollup.objects.aggregate(end=Max("rolled_up_until"))["end"]
+
+
+def _rollup_day(day: datetime, end: datetime) -> int:
+    """Replace the rollups of ``[day, end)`` (``end`` at most one day later)."""
+    hourly: dict[tuple, dict] = {}
+    users: dict[int, dict] = {}
+    rows = (
+        OperationRun.objects.filter(created_at__gte=day, created_at__lt=end)
+        .values_list(
+            "created_at",
+            "conversion_type",
+            "status",
+            "is_premium",
+            "duration_ms",
+            "input_size",
+            "output_size",
+            "user_id",
+        )
+        .order_by()
+    )
+    for (
+        created_at,
+        conversion_type,
+        status,
+        is_premium,
+        duration_ms,
+        input_size,
+        output_size,
+        user_id,
+    ) in rows.iterator(chunk_size=5000):
+        key = (_floor_hour(created_at), conversion_type, status, is_premium)
+        bucket = hourly.get(key)
+        if bucket is None:
+            bucket = hourly[key] = {
+                "total": 0,
+                "durations": [],
+                "input_bytes": 0,
+                "output_bytes": 0,
+                "first_op": created_at,
+                "last_op": created_at,
+            }
+        bucket["total"] += 1
+        if duration_ms is not None:
+            bucket["durations"].append(duration_ms)
+        bucket["input_bytes"] += input_size or 0
+        bucket["output_bytes"] += output_size or 0
+        bucket["first_op"] = min(bucket["first_op"], created_at)
+        bucket["last_op"] = max(bucket["last_op"], created_at)
+
+        if user_id is not None:
+            user = users.get(user_id)
+            if user is None:
+                user = users[user_id] = {
+                    "total": 0,
+                    "success": 0,
+                    "error": 0,
+                    "first_op": created_at,
+                    "last_op": created_at,
+                }
+            user["total"] += 1
+            if status in ("success", "error"):
+                user[status] += 1
+            user["first_op"] = min(user["first_op"], created_at)
+            user["last_op"] = max(user["last_op"], created_at)
+
+    rollups = []
+    for (hour, conversion_type, status, is_premium), bucket in hourly.items():
+        durations = sorted(bucket.pop("durations"))
+        rollups.append(
+            OperationRunRollup(
+                hour=hour,
+                conversion_type=conversion_type,
+                status=status,
+                is_premium=is_premium,
+                duration_count=len(durations),
+                duration_sum_ms=sum(durations),
+                duration_p50_ms=_percentile(durations, 0.50),
+                duration_p95_ms=_percentile(durations, 0.95),
+                duration_max_ms=durations[-1] if durations else None,
+                **bucket,
+            )
+        )
+
+    OperationRunRollup.objects.filter(hour__gte=day, hour__lt=end).delete()
+    OperationRunRollup.objects.bulk_create(rollups, batch_size=1000)
+    OperationRunUserRollup.objects.filter(day=day.date()).delete()
+    OperationRunUserRollup.objects.bulk_create(
+        [
+            OperationRunUserRollup(day=day.date(), user_id=user_id, **counts)
+            for user_id, counts in users.items()
+        ],
+        batch_size=1000,
+    )
+    return len(rollups)
+
+
+def _update_month(month: datetime, end: datetime, with_uniques: bool) -> None:
+    defaults = {"rolled_up_until": end}
+    if with_uniques:
+        defaults.update(
+            OperationRun.objects.filter(
+                created_at__gte=month, created_at__lt=end
+            ).aggregate(
+                unique_users=Count("user", distinct=True, filter=Q(user__isnull=False)),
+                unique_ips=Count("remote_addr", distinct=True),
+            )
+        )
+    OperationRunMonthRollup.objects.update_or_create(month=month, defaults=defaults)
+
+
+def rollup_operation_runs(
+    now: datetime | None = None, max_days: int = MAX_DAYS_PER_RUN
+):
+    """Roll settled OperationRun rows up from the high-water mark.
+
+    Returns ``{"days": n, "rollup_rows": n, "rolled_up_until": iso | None}``.
+    """
+    end = _floor_hour((now or timezone.now()) - SETTLE)
+    start = rolled_up_until()
+    if start is None:
+        first = OperationRun.objects.aggregate(first=Min("created_at"))["first"]
+        if first is None:
+            return {"days": 0, "rollup_rows": 0, "rolled_up_until": None}
+        start = first
+
+    day = _floor_day(start)
+    days = 0
+    rollup_rows = 0
+    while day < end and days < max_days:
+        chunk_end = min(day + _DAY, end)
+        month = _month_start(day)
+        # Distinct counts need the whole month so far: compute them once per
+        # month per run, on its last chunk.
+        month_done = chunk_end >= _next_month(month)
+        last_chunk = chunk_end >= end or days + 1 >= max_days
+        with transaction.atomic():
+            rollup_rows += _rollup_day(day, chunk_end)
+            _update_month(month, chunk_end, with_uniques=month_done or last_chunk)
+        day = chunk_end
+        days += 1
+
+    until = rolled_up_until()
+    return {
+        "days": days,
+        "rollup_rows": rollup_rows,
+        "rolled_up_until": until.isoformat() if until else None,
+    }
+
+
+# --- Report helpers ---------------------------------------------------------
+
+
+def _windows(since, until, ceil):
+    """Split the report window into a rolled-up part and a raw-rows filter.
+
+    Returns ``(use_rollups, rollup_start, raw_q)``: rollups cover
+    ``[rollup_start, until)`` (``rollup_start`` None = from the beginning) and
+    ``raw_q`` selects the raw rows for the rest — the unsettled tail after
+    ``until`` and, when ``since`` is not on a bucket boundary, the sliver
+    before the first whole bucket.
+    """
+    if until is None:
+        return False, None, Q(created_at__gte=since) if since else Q()
+    if since is None:
+        return True, None, Q(created_at__gte=until)
+    start = ceil(since)
+    if start >= until:
+        return False, None, Q(created_at__gte=since)
+    raw_q = Q(created_at__gte=since, created_at__lt=start) | Q(created_at__gte=until)
+    return True, start, raw_q
+
+
+def _merge(rows, keys, sums=("total",)):
+    merged: dict[tuple, dict] = {}
+    for row in rows:
+        key = tuple(row[k] for k in keys)
+        current = merged.get(key)
+        if current is None:
+            merged[key] = dict(row)
+            continue
+        for name in sums:
+            current[name] += row[name]
+        current["first_op"] = min(current["first_op"], row["first_op"])
+        current["last_op"] = max(current["last_op"], row["last_op"])
+    return list(merged.values())
+
+
+def operation_counts(since=None, by_month=False):
+    """Operation counts per conversion_type and status (and month).
+
+    Each row: ``conversion_type``, ``status``, ``total``, ``first_op``,
+    ``last_op`` and, with ``by_month``, ``month``.
+    """
+    keys = (
+        ("month", "conversion_type", "status")
+        if by_month
+        else ("conversion_type", "status")
+    )
+    until = rolled_up_until()
+    use_rollups, rollup_start, raw_q = _windows(since, until, _ceil_hour)
+
+    rows = []
+    if use_rollups:
+        rollups = OperationRunRollup.objects.filter(hour__lt=until)
+        if rollup_start is not None:
+            rollups = rollups.filter(hour__gte=rollup_start)
+        if by_month:
+            rollups = rollups.annotate(month=TruncMonth("hour"))
+        rows += (
+            rollups.values(*keys)
+            .annotate(
+                total=Sum("total"), first_op=Min("first_op"), last_op=Max("last_op")
+            )
+            .order_by()
+        )
+
+    raw = OperationRun.objects.filter(raw_q)
+    if by_month:
+        raw = raw.annotate(month=TruncMonth("created_at"))
+    rows += (
+        raw.values(*keys)
+        .annotate(
+            total=Count("id"), first_op=Min("created_at"), last_op=Max("created_at")
+        )
+        .order_by()
+    )
+    return _merge(rows, keys)
+
+
+def user_operation_counts(since=None):
+    """Per-user ``total``/``success``/``error`` and first/last op.
+
+    Rows carry ``user__id`` and ``user__email`` like the raw-table query did.
+    """
+    keys = ("user__id", "user__email")
+    sums = ("total", "success", "error")
+    until = rolled_up_until()
+    use_rollups, rollup_start, raw_q = _windows(since, until, _ceil_day)
+
+    rows = []
+    if use_rollups:
+        rollups = OperationRunUserRollup.objects.filter(day__lt=_ceil_day(until).date())
+        if rollup_start is not None:
+            rollups = rollups.filter(day__gte=rollup_start.date())
+        rows += (
+            rollups.values(*keys)
+            .annotate(
+                total=Sum("total"),
+                success=Sum("success"),
+                error=Sum("error"),
+                first_op=Min("first_op"),
+                last_op=Max("last_op"),
+            )
+            .order_by()
+        )
+    rows += (
+        OperationRun.objects.filter(raw_q, user__isnull=False)
+        .values(*keys)
+        .annotate(
+            total=Count("id"),
+            success=Count("id", filter=Q(status="success")),
+            error=Count("id", filter=Q(status="error")),
+            first_op=Min("created_at"),
+            last_op=Max("created_at"),
+        )
+        .order_by()
+    )
+    return _merge(rows, keys, sums)
+
+
+def monthly_uniques(since=None) -> dict:
+    """``{month: {"unique_users": n, "unique_ips": n}}``.
+
+    Months already rolled up use their stored distinct counts (which trail the
+    current month by up to ``SETTLE``); months not rolled up yet are counted
+    from raw rows.
+    """
+    stored = OperationRunMonthRollup.objects.all()
+    if since is not None:
+        stored = stored.filter(month__gte=_month_start(since))
+    result = {
+        row["month"]: row
+        for row in stored.values("month", "unique_users", "unique_ips")
+    }
+
+    # Every month before the high-water mark has a stored row; only the
+    # months from there on may still need counting from raw rows.
+    until = rolled_up_until()
+    raw = OperationRun.objects.all()
+    if until is not None:
+        month = _month_start(until)
+        raw = raw.filter(
+            created_at__gte=_next_month(month) if month in result else month
+        )
+    if since is not None:
+        raw = raw.filter(created_at__gte=since)
+    for row in (
+        raw.annotate(month=TruncMonth("created_at"))
+        .values("month")
+        .annotate(
+            unique_users=Count("user", distinct=True, filter=Q(user__isnull=False)),
+            unique_ips=Count("remote_addr", distinct=True),
+        )
+        .order_by()
+    ):
+        result.setdefault(row["month"], row)
+    return result
+
+
+# How the reports group OperationRun statuses.
+STATUS_BUCKETS = {
+    "success": "success",
+    "error": "error",
+    "rejected": "rejected",
+    "cancelled": "cancelled",
+    "cancel_requested": "cancelled",
+    "abandoned": "abandoned",
+    "started": "other",
+    "queued": "other",
+    "running": "other",
+}
+
+
+def status_breakdown(rows, keys) -> list[dict]:
+    """Fold per-status rows into one row per ``keys`` with bucket counts."""
+    folded: dict[tuple, dict] = {}
+    for row in rows:
+        key = tuple(row[k] for k in keys)
+        entry = folded.get(key)
+        if entry is None:
+            entry = folded[key] = {
+                **{k: row[k] for k in keys},
+                "total": 0,
+                **dict.fromkeys(STATUS_BUCKETS.values(), 0),
+                "first_op": row["first_op"],
+                "last_op": row["last_op"],
+            }
+        entry["total"] += row["total"]
+        bucket = STATUS_BUCKETS.get(row["status"])
+        if bucket:
+            entry[bucket] += row["total"]
+        entry["first_op"] = min(entry["first_op"], row["first_op"])
+        entry["last_op"] = max(entry["last_op"], row["last_op"])
+    return list(folded.values())
@@ -9,8 +9,14 @@ from django.conf import settings
 from django.core.cache import cache
 from django.db.utils import OperationalError, ProgrammingError
 
+from .local_cache import MISSING, LocalCache
+
 RUNTIME_SETTINGS_CACHE_KEY = "runtime_settings:active_overrides:v1"
 
+# Overrides currently applied in this process. Re-applied only when another
+# process changes them (version bump) or, as a backstop, every 60 seconds.
+_applied = LocalCache("runtime_settings", ttl=60)
+
 _runtime_lock = Lock()
 _MISSING = object()
 _original_values: dict[str, Any] = {}
@@ -88,8 +94,9 @@ def get_active_runtime_overrides() -> dict[str, Any]:
 
 
 def invalidate_runtime_settings_cache() -> None:
-    """Invalidate cached runtime settings overrides."""
+    """Invalidate cached runtime settings overrides in every process."""
     cache.delete(RUNTIME_SETTINGS_CACHE_KEY)
+    _applied.invalidate()
 
 
 def _refresh_dependent_modules() -> None:
@@ -132,9 +139,15 @@ def _apply_overrides(overrides: dict[str, Any]) -> None:
 
 
 def apply_runtime_settings() -> None:
-    """Apply active runtime overrides to django.conf.settings."""
+    """Apply active runtime overrides to django.conf.settings.
+
+    A no-op while the overrides this process applied last are still current.
+    """
+    if _applied.get("overrides") is not MISSING:
+        return
     overrides = get_active_runtime_overrides()
     _apply_overrides(overrides)
+    _applied.set("overrides", overrides)
 
 
 def apply_cached_runtime_settings() -> None:
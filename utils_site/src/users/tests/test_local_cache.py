@@ -0,0 +1,95 @@
+"""Process-local cache: version invalidation, TTL, request scope, consumers."""
+
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase
+from src.api import premium_utils
+from src.api.premium_utils import is_premium_active
+from src.users import local_cache, runtime_settings
+from src.users.local_cache import (
+    MISSING,
+    LocalCache,
+    premium_status,
+    request_scope,
+)
+from src.users.models import User
+
+
+class LocalCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.local = LocalCache("test", ttl=30)
+        self.addCleanup(local_cache._namespaces.pop, "test", None)
+
+    def test_version_bump_elsewhere_drops_namespace(self):
+        self.assertIs(self.local.get("a"), MISSING)
+        self.local.set("a", 1)
+        self.assertEqual(self.local.get("a"), 1)
+
+        # Another process invalidated.
+        cache.set(self.local.version_key, "other", None)
+        self.assertIs(self.local.get("a"), MISSING)
+
+        # So does losing the token (eviction, cache.clear()).
+        self.local.set("a", 1)
+        cache.clear()
+        self.assertIs(self.local.get("a"), MISSING)
+
+    def test_entries_expire(self):
+        self.local.get("a")
+        with patch.object(local_cache.time, "monotonic", return_value=1000.0):
+            self.local.set("a", 1)
+        with patch.object(local_cache.time, "monotonic", return_value=1029.0):
+            self.assertEqual(self.local.get("a"), 1)
+        with patch.object(local_cache.time, "monotonic", return_value=1031.0):
+            self.assertIs(self.local.get("a"), MISSING)
+
+    def test_invalidate_keeps_other_local_keys(self):
+        self.local.get("a")
+        self.local.set("a", 1)
+        self.local.set("b", 2)
+        self.local.invalidate("a")
+        self.assertIs(self.local.get("a"), MISSING)
+        self.assertEqual(self.local.get("b"), 2)
+
+    def test_request_scope_reads_versions_once(self):
+        self.local.get("a")
+        self.local.set("a", 1)
+        with (
+            patch.object(local_cache.cache, "get_many", wraps=cache.get_many) as gm,
+            request_scope(),
+        ):
+            for _ in range(3):
+                self.assertEqual(self.local.get("a"), 1)
+                premium_status.get(("active", 0))
+        gm.assert_called_once()
+
+
+class LocalCacheConsumerTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_premium_status_is_served_locally_until_a_flip(self):
+        user = User.objects.create_user(email="l1@t.test", password="x")
+        self.assertFalse(is_premium_active(user))
+
+        with patch.object(premium_utils, "cache") as shared:
+            self.assertFalse(is_premium_active(user))
+        shared.get.assert_not_called()
+
+        user.is_premium = True
+        user._subscription_changed = True
+        user.save()
+        self.assertTrue(is_premium_active(User.objects.get(pk=user.pk)))
+
+    def test_runtime_settings_reapplied_only_on_version_change(self):
+        runtime_settings.refresh_runtime_settings()
+        with patch.object(runtime_settings, "_apply_overrides") as apply:
+            runtime_settings.apply_runtime_settings()
+            runtime_settings.apply_runtime_settings()
+            apply.assert_not_called()
+
+            cache.set(runtime_settings._applied.version_key, "other", None)
+            runtime_settings.apply_runtime_settings()
+            apply.assert_called_once()
@@ -0,0 +1,145 @@
+"""OperationRun rollups: incremental aggregation and rollup+raw report reads."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from src.users.models import (
+    OperationRun,
+    OperationRunMonthRollup,
+    OperationRunRollup,
+    OperationRunUserRollup,
+)
+from src.users.operation_rollups import (
+    monthly_uniques,
+    operation_counts,
+    rolled_up_until,
+    rollup_operation_runs,
+    status_breakdown,
+    user_operation_counts,
+)
+
+
+def _by_type(since=None):
+    return {
+        row["conversion_type"]: row
+        for row in status_breakdown(operation_counts(since), ("conversion_type",))
+    }
+
+
+class OperationRollupTests(TestCase):
+    def setUp(self):
+        # Midday, so "hours ago" offsets used below stay within one UTC day.
+        self.now = timezone.now().replace(hour=12, minute=30)
+        self.user = get_user_model().objects.create_user(
+            email="u@example.com", password="pw"
+        )
+
+    def _make(self, conversion_type, status, hours_ago, n=1, **fields):
+        for _ in range(n):
+            op = OperationRun.objects.create(
+                conversion_type=conversion_type, status=status, **fields
+            )
+            OperationRun.objects.filter(pk=op.pk).update(
+                created_at=self.now - timedelta(hours=hours_ago)
+            )
+
+    def test_settled_rows_are_rolled_up_with_duration_summary(self):
+        for ms in (100, 200, 300, 4000):
+            self._make("pdf_to_word", "success", 30, duration_ms=ms, input_size=10)
+        self._make("pdf_to_word", "running", 0.2)  # unsettled
+
+        result = rollup_operation_runs(now=self.now)
+
+        self.assertGreaterEqual(result["days"], 1)
+        rollup = OperationRunRollup.objects.get(
+            conversion_type="pdf_to_word", status="success"
+        )
+        self.assertEqual(rollup.total, 4)
+        self.assertEqual(rollup.duration_p50_ms, 200)
+        self.assertEqual(rollup.duration_p95_ms, 4000)
+        self.assertEqual(rollup.input_bytes, 40)
+        self.assertFalse(OperationRunRollup.objects.filter(status="running").exists())
+        self.assertLessEqual(rolled_up_until(), self.now - timedelta(hours=2))
+
+    def test_rerun_replaces_instead_of_double_counting(self):
+        self._make("compress_pdf", "success", 5, n=3)
+        rollup_operation_runs(now=self.now)
+        # A late status change inside the recomputed day is picked up too.
+        self._make("compress_pdf", "error", 4)
+        rollup_operation_runs(now=self.now + timedelta(hours=1))
+
+        totals = {
+            r.status: r.total
+            for r in OperationRunRollup.objects.filter(conversion_type="compress_pdf")
+        }
+        self.assertEqual(totals, {"success": 3, "error": 1})
+
+    def test_reports_combine_rollups_and_raw_tail(self):
+        self._make("pdf_to_word", "success", 50, n=2, user=self.user)
+        self._make("pdf_to_word", "error", 26, user=self.user)
+        self._make("merge_pdf", "rejected", 3)
+        self._make("pdf_to_word", "success", 0.5, user=self.user)
+        since = self.now - timedelta(days=10)
+        before = (_by_type(since), user_operation_counts(since))
+
+        rollup_operation_runs(now=self.now)
+
+        self.assertTrue(OperationRunRollup.objects.exists())
+        self.assertEqual((_by_type(since), user_operation_counts(since)), before)
+        tools = _by_type(since)
+        self.assertEqual(tools["pdf_to_word"]["total"], 4)
+        self.assertEqual(tools["pdf_to_word"]["error"], 1)
+        self.assertEqual(tools["merge_pdf"]["rejected"], 1)
+        [user_row] = user_operation_counts(None)
+        self.assertEqual(
+            (user_row["total"], user_row["success"], user_row["error"]), (4, 3, 1)
+        )
+        self.assertEqual(OperationRunUserRollup.objects.count(), 2)
+
+    def test_rolled_up_history_survives_raw_row_deletion(self):
+        self._make("pdf_to_word", "success", 60, n=2, user=self.user)
+        rollup_operation_runs(now=self.now)
+        month = OperationRunMonthRollup.objects.get(unique_users__gt=0)
+        self.assertEqual(month.unique_users, 1)
+
+        OperationRun.objects.all().delete()
+
+        self.assertEqual(_by_type()["pdf_to_word"]["total"], 2)
+        self.assertEqual(monthly_uniques()[month.month]["unique_users"], 1)
+
+    def test_backfill_is_bounded_per_run(self):
+        self._make("pdf_to_word", "success", 24 * 5)
+        first = rollup_operation_runs(now=self.now, max_days=2)
+        self.assertEqual(first["days"], 2)
+        second = rollup_operation_runs(now=self.now)
+        self.assertGreaterEqual(second["days"], 4)
+        self.assertEqual(_by_type()["pdf_to_word"]["total"], 1)
+
+
+class RollupBackedAdminViewTests(TestCase):
+    def setUp(self):
+        admin = get_user_model().objects.create_superuser(
+            email="admin@example.com", password="pw"
+        )
+        self.client.force_login(admin)
+
+    def test_tool_activity_reads_rollups(self):
+        for _ in range(3):
+            op = OperationRun.objects.create(
+                conversion_type="OLD_TOOL", status="success"
+            )
+            OperationRun.objects.filter(pk=op.pk).update(
+                created_at=timezone.now() - timedelta(days=3)
+            )
+        rollup_operation_runs()
+        OperationRun.objects.create(conversion_type="NEW_TOOL", status="success")
+
+        resp = self.client.get(reverse("admin:users_operationrun_tool_activity"))
+
+        tools = {t["conversion_type"]: t["total"] for t in resp.context["tools"]}
+        self.assertEqual(tools, {"OLD_TOOL": 3, "NEW_TOOL": 1})
@@ -0,0 +1,100 @@
+"""OperationRun admin CSV export: streaming, gzip and background job."""
+
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from src.tasks.maintenance import export_operation_runs
+from src.users import operation_export
+from src.users.models import OperationRun
+
+
+def _rows(content: bytes) -> list[list[str]]:
+    return list(csv.reader(io.StringIO(content.decode())))
+
+
+class OperationRunExportTests(TestCase):
+    def setUp(self):
+        self.admin = get_user_model().objects.create_superuser(
+            email="admin@example.com", password="pw"
+        )
+        self.client.force_login(self.admin)
+        OperationRun.objects.create(
+            conversion_type="pdf_to_word",
+            status="success",
+            user=self.admin,
+            duration_ms=1500,
+        )
+        OperationRun.objects.create(conversion_type="merge_pdf", status="error")
+        self.url = reverse("admin:users_operationrun_export")
+
+        self.export_dir = Path(tempfile.mkdtemp(prefix="test_op_csv_"))
+        patcher = patch.object(operation_export, "EXPORT_DIR", self.export_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.export_dir, ignore_errors=True)
+
+    def test_streams_csv_without_model_instances(self):
+        with patch.object(
+            OperationRun, "__init__", side_effect=AssertionError("model built")
+        ):
+            resp = self.client.get(self.url)
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.streaming)
+        rows = _rows(b"".join(resp.streaming_content))
+        self.assertEqual(rows[0][:3], ["id", "conversion_type", "status"])
+        by_type = {row[1]: row for row in rows[1:]}
+        self.assertEqual(by_type["pdf_to_word"][4], "admin@example.com")
+        self.assertEqual(by_type["pdf_to_word"][9], "1.5")
+        self.assertEqual(by_type["merge_pdf"][4], "")
+
+    def test_changelist_filters_apply(self):
+        resp = self.client.get(self.url, {"status__exact": "error"})
+        rows = _rows(b"".join(resp.streaming_content))
+        self.assertEqual([row[1] for row in rows[1:]], ["merge_pdf"])
+
+    def test_gzip_export_matches_plain(self):
+        plain = b"".join(self.client.get(self.url).streaming_content)
+        resp = self.client.get(self.url, {"gzip": "1"})
+
+        self.assertEqual(resp["Content-Type"], "application/gzip")
+        self.assertIn("operation_runs.csv.gz", resp["Content-Disposition"])
+        self.assertEqual(gzip.decompress(b"".join(resp.streaming_content)), plain)
+
+    def test_background_export_is_downloadable(self):
+        with patch("src.tasks.maintenance.export_operation_runs.delay") as delay:
+            resp = self.client.get(
+                reverse("admin:users_operationrun_export_background"),
+                {"status__exact": "success"},
+            )
+        self.assertEqual(resp.status_code, 302)
+        user_id, query_string, name = delay.call_args.args
+        self.assertEqual(query_string, "status__exact=success")
+
+        download = reverse("admin:users_operationrun_export_download", args=[name])
+        self.assertEqual(self.client.get(download).status_code, 302)  # not ready
+
+        result = export_operation_runs(user_id, query_string, name)
+        self.assertEqual(result["status"], "success")
+        resp = self.client.get(download)
+        rows = _rows(gzip.decompress(b"".join(resp.streaming_content)))
+        self.assertEqual([row[1] for row in rows[1:]], ["pdf_to_word"])
+
+    def test_download_rejects_foreign_names(self):
+        (self.export_dir / "secrets.txt").write_text("x")
+        resp = self.client.get(
+            reverse("admin:users_operationrun_export_download", args=["secrets.txt"])
+        )
+        self.assertEqual(resp.status_code, 302)
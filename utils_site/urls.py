@@ -90,6 +90,8 @@ urlpatterns = [
     path("livez/", liveness_check, name="liveness_check"),
     # SEO - sitemaps should be accessible without language prefix
     path("sitemap.xml", sitemap_index, name="sitemap_index"),
+    # Chunk pattern first: <str:lang> would otherwise swallow "en-2".
+    path("sitemap-<str:lang>-<int:chunk>.xml", sitemap_lang, name="sitemap_lang_chunk"),
     path("sitemap-<str:lang>.xml", sitemap_lang, name="sitemap_lang"),
     # Admin panel - should be accessible without language prefix
     # Read ADMIN_URL_PATH dynamically from settings